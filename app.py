@@ -82,64 +82,16 @@ def display_single_skill_table(learner_id: str, skill_id: str, backend: Dict):
     """Display activity history table for a single skill with proper mathematical functioning"""
     try:
         # Get skill name from domain model
-        domain_model = backend['config'].get_config('domain_model')
-        skill_name = f"Skill {skill_id}"
-        if domain_model and 'skills' in domain_model:
-            for skill in domain_model['skills']:
-                if skill.get('id') == skill_id:
-                    skill_name = skill.get('name', f"Skill {skill_id}")
-                    break
+        skill_name = backend['config'].get_domain_model_index().get_skill_name(skill_id, f"Skill {skill_id}")
         
         # Display skill header
         st.markdown(f"### 📊 {skill_id}: {skill_name}")
         st.divider()
         
-        # Get all activity records for this skill (only scored activities)
-        with backend['learner_manager']._get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get scored activities from activity_history
-            cursor.execute('''
-                SELECT activity_id, completion_timestamp, activity_title,
-                       performance_score, cumulative_performance,
-                       target_evidence_volume, adjusted_evidence_volume, cumulative_evidence,
-                       validity_modifier, decay_factor, cumulative_evidence_weight,
-                       decay_adjusted_evidence_volume
-                FROM activity_history
-                WHERE learner_id = ? AND skill_id = ?
-                ORDER BY completion_timestamp DESC
-            ''', (learner_id, skill_id))
-            
-            all_activity_records = cursor.fetchall()
-        
-        # Process all activity records
-        all_records = []
-        
-        for record in all_activity_records:
-            # Determine if this activity has been scored based on performance score
-            is_scored = record['performance_score'] is not None and record['performance_score'] >= 0
-            
-            # Handle the case where decay_adjusted_evidence_volume might not exist in older records
-            try:
-                decay_adjusted_evidence_volume = record['decay_adjusted_evidence_volume']
-            except (KeyError, IndexError):
-                decay_adjusted_evidence_volume = 0.0
-            
-            all_records.append({
-                'activity_id': record['activity_id'],
-                'activity_title': record['activity_title'],
-                'performance_score': record['performance_score'],
-                'cumulative_performance': record['cumulative_performance'],
-                'target_evidence_volume': record['target_evidence_volume'],
-                'adjusted_evidence_volume': record['adjusted_evidence_volume'],
-                'decay_adjusted_evidence_volume': decay_adjusted_evidence_volume,
-                'cumulative_evidence': record['cumulative_evidence'],
-                'validity_modifier': record['validity_modifier'],
-                'decay_factor': record['decay_factor'],
-                'cumulative_evidence_weight': record['cumulative_evidence_weight'],
-                'completion_timestamp': record['completion_timestamp'],
-                'scored': is_scored
-            })
+        # Activity history with decay and cumulative values from one prefix scan
+        # (cached by data version), most recent first for display
+        scoring_engine = backend['scoring_engine']
+        all_records = list(reversed(scoring_engine.get_skill_timeseries(learner_id, skill_id)))
         
         if not all_records:
             st.info(f"No activity records found for skill {skill_id}")
@@ -147,86 +99,34 @@ def display_single_skill_table(learner_id: str, skill_id: str, backend: Dict):
         
         # Create DataFrame for display
         import pandas as pd
-        from datetime import datetime
         
         # Prepare data for display
         display_data = []
+        base_decay_factor = scoring_engine.decay_factor
         
-        # Pre-calculate all decay-adjusted evidence weights for cumulative calculation
-        decay_adjusted_weights = []
         for i, record in enumerate(all_records):
-            # Calculate the actual decay factor applied to this activity
-            base_decay_factor = backend['scoring_engine'].decay_factor
+            # All activities are scored since they're from activity_history
+            is_scored = record['performance_score'] is not None and record['performance_score'] >= 0
             
-            # For the most recent activity (first row), no decay
-            # For older activities, calculate evidence accumulated since they were completed
-            if i == 0:
-                # Most recent activity: no decay
-                actual_decay_factor = 1.0
-            else:
-                # Calculate evidence accumulated since this activity was completed
-                evidence_accumulated_since = 0.0
-                for j in range(i):
-                    # Sum evidence from all activities that came before this one (more recent)
-                    more_recent_record = all_records[j]
-                    if more_recent_record['adjusted_evidence_volume'] is not None:
-                        evidence_accumulated_since += more_recent_record['adjusted_evidence_volume']
-                
-                # Apply decay based on evidence accumulated since this activity was completed
-                actual_decay_factor = base_decay_factor ** evidence_accumulated_since
-            
-            # Calculate the decay-adjusted evidence weight by applying the decay factor
-            decay_adjusted_evidence = record['adjusted_evidence_volume'] * actual_decay_factor
-            decay_adjusted_weights.append(decay_adjusted_evidence)
-        
-        # Now process each record with proper cumulative evidence calculation
-        for i, record in enumerate(all_records):
-            # Initialize variables
-            decay_adjusted_evidence = decay_adjusted_weights[i]
-            decay_adjusted_evidence_display = f"{decay_adjusted_evidence:.1f}"
+            decay_adjusted_evidence_display = f"{record['decay_adjusted_evidence_volume']:.1f}"
             
             # Format scores as percentages
-            # All activities are scored since they're from activity_history
             performance_score = f"{record['performance_score']:.1%}"
             cumulative_performance = f"{record['cumulative_performance']:.1%}"
             
             # Format evidence volumes
             target_evidence = f"{record['target_evidence_volume']:.1f}"
             adjusted_evidence = f"{record['adjusted_evidence_volume']:.1f}"
-            
-            # Calculate cumulative evidence: total of all adjusted evidence (same for all activities)
-            cumulative_evidence_sum = sum(record['adjusted_evidence_volume'] for record in all_records)
-            
-            cumulative_evidence = f"{cumulative_evidence_sum:.1f}"
+            cumulative_evidence = f"{record['cumulative_evidence']:.1f}"
             
             # Format validity modifier
             validity_modifier = f"{record['validity_modifier']:.2f}"
             
-            # Calculate the actual decay factor applied to this activity
-            base_decay_factor = backend['scoring_engine'].decay_factor
-            
-            # For the most recent activity (first row), no decay
-            # For older activities, calculate evidence accumulated since they were completed
-            if i == 0:
-                # Most recent activity: no decay
-                actual_decay_factor = 1.0
-            else:
-                # Calculate evidence accumulated since this activity was completed
-                evidence_accumulated_since = 0.0
-                for j in range(i):
-                    # Sum evidence from all activities that came before this one (more recent)
-                    more_recent_record = all_records[j]
-                    if more_recent_record['adjusted_evidence_volume'] is not None:
-                        evidence_accumulated_since += more_recent_record['adjusted_evidence_volume']
-                
-                # Apply decay based on evidence accumulated since this activity was completed
-                actual_decay_factor = base_decay_factor ** evidence_accumulated_since
-            
-            # Show both the base decay factor and the calculated decay factor
-            decay_factor_info = f"{base_decay_factor:.3f} → {actual_decay_factor:.3f}"
+            # Show both the base decay factor and the decay applied to this activity
+            decay_factor_info = f"{base_decay_factor:.3f} → {record['evidence_based_decay']:.3f}"
             
             # Make cumulative values bold for the most recent row (i == 0)
-            if i == 0:  # Most recent row (first row since data is ordered DESC)
+            if i == 0:
                 if is_scored:
                     cumulative_performance = f"**{cumulative_performance}**"
                     cumulative_evidence = f"**{cumulative_evidence}**"
@@ -249,19 +149,14 @@ def display_single_skill_table(learner_id: str, skill_id: str, backend: Dict):
                 'Status': '✅ Scored'
             })
         
-        # Show summary statistics for scored activities
-        scored_records = [r for r in all_records if r['scored']]
-        if scored_records:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                latest_performance = scored_records[0]['cumulative_performance']
-                st.metric("Current Performance", f"{latest_performance:.1%}")
-            
-            with col2:
-                # Calculate current evidence volume consistently with activity table
-                current_evidence_volume = sum(record['adjusted_evidence_volume'] for record in all_records)
-                st.metric("Current Evidence Volume", f"{current_evidence_volume:.1f}")
+        # Show summary statistics as of the most recent activity
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("Current Performance", f"{all_records[0]['cumulative_performance']:.1%}")
+        
+        with col2:
+            st.metric("Current Evidence Volume", f"{all_records[0]['cumulative_evidence']:.1f}")
         
         # Create DataFrame and display
         df = pd.DataFrame(display_data)
@@ -3171,41 +3066,41 @@ Respond as the character would, staying in role and helping advance the educatio
                     
                     elif activity_type == 'BR':
                         st.subheader("🌳 Interactive Scenario")
+                        # Steps come from the compiled decision graph; the state lives in the
+                        # session (the cached backend is rebuilt every minute) and is submitted
+                        # as-is, so the BR scorer can grade the path taken
+                        graph = backend['activity_manager'].get_branching_graph(activity_id)
                         scenario_key = f"scenario_{activity_id}"
-                        if scenario_key not in st.session_state:
-                            st.session_state[scenario_key] = {
-                                'current_node': 'start',
-                                'score': 0,
-                                'decisions': [],
-                                'completed': False
-                            }
-                        scenario_state = st.session_state[scenario_key]
-                        st.markdown("**Current Situation:**")
-                        st.info(activity.get('scenario_description', 'Scenario description not available'))
-                        st.markdown(f"**Current Score:** {scenario_state['score']}")
-                        if not scenario_state['completed']:
-                            st.markdown("**What do you choose to do?**")
-                            options = [
-                                "Option A - Conservative approach",
-                                "Option B - Balanced approach", 
-                                "Option C - Aggressive approach"
-                            ]
-                            selected_option = st.radio("Select your decision:", options, key=f"br_decision_{activity_id}", index=None)
-                            if st.button("Make Decision", key=f"br_submit_{activity_id}"):
-                                decision_score = 1.0 if "Balanced" in selected_option else 0.5
-                                scenario_state['score'] += decision_score
-                                scenario_state['decisions'].append({
-                                    'decision': selected_option,
-                                    'score': decision_score,
-                                    'timestamp': datetime.now().isoformat()
-                                })
-                                if len(scenario_state['decisions']) >= 3:
-                                    scenario_state['completed'] = True
-                                st.rerun()
+                        if graph is None:
+                            st.warning("No decision points found in this scenario.")
+                            combined_response = ''
                         else:
-                            st.success("Scenario completed!")
-                            st.markdown(f"**Final Score:** {scenario_state['score']}")
-                        combined_response = json.dumps(scenario_state)
+                            if scenario_key not in st.session_state:
+                                st.session_state[scenario_key] = graph.initial_state()
+                            scenario_state = st.session_state[scenario_key]
+                            st.markdown("**Current Situation:**")
+                            st.info(scenario_state.get('scenario_state') or 'Scenario description not available')
+                            for decision in scenario_state['decisions_made']:
+                                node = graph.get_node(decision['decision_id'])
+                                st.markdown(f"**You chose:** {node.options[decision['option_id']].option_text}")
+                                if decision.get('consequences'):
+                                    st.caption(decision['consequences'])
+                            node = graph.get_node(scenario_state['current_node'])
+                            if not scenario_state['completed'] and node is not None:
+                                st.markdown(f"**{node.decision_prompt or 'What do you choose to do?'}**")
+                                selected_option = st.radio(
+                                    "Select your decision:",
+                                    list(node.options),
+                                    format_func=lambda option_id: node.options[option_id].option_text,
+                                    key=f"br_decision_{activity_id}_{node.decision_id}",
+                                    index=None
+                                )
+                                if st.button("Make Decision", key=f"br_submit_{activity_id}", disabled=selected_option is None):
+                                    graph.advance(scenario_state, selected_option)
+                                    st.rerun()
+                            else:
+                                st.success("Scenario completed!")
+                            combined_response = json.dumps(scenario_state)
                     
                     # Submit button
                     if combined_response.strip():
@@ -3305,18 +3200,35 @@ Respond as the character would, staying in role and helping advance the educatio
                         activity_transcript = item.get('activity_transcript', {})
                         
                         # Run evaluation in real-time with progress updates
+                        # (bare module name: the pipeline emits pipeline_events, not src.pipeline_events)
+                        from pipeline_events import PhaseStarted, PhaseCompleted, ScoringUpdated, EvaluationCompleted
                         evaluation_result = None
                         try:
-                            with st.spinner("Running evaluation pipeline..."):
-                                # Update status to show we're starting
-                                st.session_state.pipeline_status['current_phase'] = 'rubric_evaluation'
-                                
-                                evaluation_result = backend['pipeline'].evaluate_activity(
+                            with st.status("Running evaluation pipeline...", expanded=True) as pipeline_progress:
+                                # Phases are reported as they start and finish instead of after the whole run
+                                for event in backend['pipeline'].evaluate_activity_iter(
                                     activity_id=activity_id,
                                     learner_id=learner_id,
                                     activity_transcript=activity_transcript,
                                     evaluation_mode='full'
-                                )
+                                ):
+                                    if isinstance(event, PhaseStarted):
+                                        st.session_state.pipeline_status['current_phase'] = event.phase
+                                        pipeline_progress.update(label=f"Running {event.phase.replace('_', ' ')}...")
+                                    elif isinstance(event, PhaseCompleted):
+                                        phase_result = event.phase_result
+                                        elapsed = (phase_result.execution_time_ms or 0) / 1000
+                                        icon = "✅" if phase_result.success else "❌"
+                                        st.write(f"{icon} {event.phase.replace('_', ' ').title()} ({elapsed:.1f}s)")
+                                    elif isinstance(event, ScoringUpdated) and event.activity_score is not None:
+                                        st.write(f"📊 Activity score: {event.activity_score:.2f}")
+                                    elif isinstance(event, EvaluationCompleted):
+                                        evaluation_result = event.result
+                                
+                                succeeded = evaluation_result is not None and evaluation_result.overall_success
+                                pipeline_progress.update(label="Evaluation pipeline finished",
+                                                         state="complete" if succeeded else "error",
+                                                         expanded=False)
                         except Exception as pipeline_error:
                             st.error(f"❌ Pipeline execution failed: {str(pipeline_error)}")
                             st.error(f"Error details: {traceback.format_exc()}")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Script to move evaluation result and transcript JSON stored inline in
+activity_records and activity_history into the compressed, content-addressed
+blobs table. Safe to interrupt and run again; use --vacuum to shrink the file.
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.config_manager import ConfigManager
+from src.learner_manager import LearnerManager
+
+def main():
+    """Migrate inline JSON columns to blob references"""
+    parser = argparse.ArgumentParser(description='Move inline evaluation/transcript JSON into the blobs table')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Rows converted per transaction')
+    parser.add_argument('--vacuum', action='store_true', help='VACUUM afterwards to return freed space to the filesystem')
+    args = parser.parse_args()
+
+    # Initialize components
+    config_manager = ConfigManager()
+    learner_manager = LearnerManager(config_manager)
+    size_before = os.path.getsize(learner_manager.db_path)
+
+    def progress(report):
+        print(f"  {report['activity_records']} activity records, {report['activity_history']} activity history rows")
+
+    print(f"Compressing with {learner_manager.blob_store.codec}...")
+    report = learner_manager.migrate_json_to_blobs(chunk_size=args.chunk_size, progress_callback=progress)
+    if report is None:
+        print("❌ Migration failed, see the error log")
+        return 1
+
+    pruned = learner_manager.prune_unreferenced_blobs()
+    print(f"✅ Converted {report['activity_records']} activity records and {report['activity_history']} "
+          f"activity history rows")
+    print(f"   {report['inline_bytes']} bytes of inline JSON -> {report['blobs_created']} new blobs "
+          f"({report['blob_stored_bytes']} bytes stored in all blobs), {max(pruned, 0)} unreferenced blobs removed")
+
+    if args.vacuum:
+        with learner_manager._get_db_connection() as conn:
+            conn.execute('VACUUM')
+            # In WAL mode the rewritten pages reach the main file at a checkpoint
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        print(f"   Database file: {size_before} -> {os.path.getsize(learner_manager.db_path)} bytes")
+
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
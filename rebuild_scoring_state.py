@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the incremental skill scoring state from activity history.
+Use --verify to compare the stored state against the history without writing.
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.config_manager import ConfigManager
+from src.learner_manager import LearnerManager
+from src.scoring_engine import ScoringEngine
+
+def main():
+    """Rebuild or verify skill scoring state"""
+    parser = argparse.ArgumentParser(description='Rebuild per-learner skill scoring state from activity history')
+    parser.add_argument('--learner', help='Only this learner (default: all learners)')
+    parser.add_argument('--skill', help='Only this skill (default: all skills)')
+    parser.add_argument('--verify', action='store_true', help='Report mismatches without writing')
+    args = parser.parse_args()
+
+    # Initialize components
+    config_manager = ConfigManager()
+    learner_manager = LearnerManager(config_manager)
+    scoring_engine = ScoringEngine(config_manager, learner_manager)
+
+    report = scoring_engine.rebuild_skill_scoring_state(args.learner, args.skill, verify_only=args.verify)
+
+    print(f"Checked {report['checked']} learner/skill scoring states")
+    for mismatch in report['mismatches']:
+        print(f"  ⚠️  {mismatch['learner_id']} / {mismatch['skill_id']}")
+        for field_name, (stored, rebuilt) in mismatch['differences'].items():
+            print(f"      {field_name}: stored={stored} rebuilt={rebuilt}")
+
+    if args.verify:
+        if report['mismatches']:
+            print(f"❌ {len(report['mismatches'])} scoring states differ from activity history")
+            return 1
+        print("✅ All scoring states match activity history")
+    else:
+        print(f"✅ Rebuilt {report['rebuilt']} scoring states")
+
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Script to simulate decay factor and gate threshold changes over the whole database.
+Opens the database read-only and reports how mastery statuses would shift.
+"""
+
+import sys
+import os
+import json
+import argparse
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.config_manager import ConfigManager
+from src.learner_manager import LearnerManager
+from src.scoring_engine import ScoringEngine
+from src.scoring_simulator import ScoringSimulator
+
+def main():
+    """Run a what-if sweep and print the status distributions"""
+    parser = argparse.ArgumentParser(description='Read-only decay/threshold what-if simulator')
+    parser.add_argument('--decay', type=float, nargs='+', help='Decay factors to try (default: current)')
+    parser.add_argument('--performance', type=float, nargs='+', help='Gate 1 pass thresholds (default: current)')
+    parser.add_argument('--evidence', type=float, nargs='+', help='Gate 2 pass thresholds (default: current)')
+    parser.add_argument('--learner', action='append', dest='learner_ids', help='Only these learners')
+    parser.add_argument('--skill', action='append', dest='skill_ids', help='Only these skills')
+    parser.add_argument('--json', action='store_true', help='Print the full JSON report')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    # Initialize components
+    config_manager = ConfigManager()
+    learner_manager = LearnerManager(config_manager, read_only=True)
+    scoring_engine = ScoringEngine(config_manager, learner_manager)
+
+    simulator = ScoringSimulator(scoring_engine, learner_manager)
+    simulator.load(args.learner_ids, args.skill_ids)
+    report = simulator.simulate(args.decay, args.performance, args.evidence)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    cohort = report['cohort']
+    print(f"Cohort: {cohort['learners']} learners, {cohort['skill_pairs']} learner/skill pairs, "
+          f"{cohort['activities']} activities ({report['duration_seconds']}s)")
+    if not report['baseline']:
+        print("No activity history to simulate")
+        return 0
+
+    header = f"{'decay':>7} {'gate 1':>7} {'gate 2':>7} {'mastered':>9} {'approach':>9} {'develop':>9} {'needs':>7} {'changed':>8} {'+mast':>6} {'-mast':>6}"
+    print(header)
+    baseline = report['baseline']
+    rows = [dict(baseline, shifts={})] + report['scenarios']
+    for index, scenario in enumerate(rows):
+        counts = scenario['status_counts']
+        shifts = scenario['shifts']
+        label = ' (current)' if index == 0 else ''
+        print(f"{scenario['decay_factor']:>7.3f} {scenario['performance_threshold']:>7.2f} "
+              f"{scenario['evidence_threshold']:>7.1f} {counts['mastered']:>9} {counts['approaching']:>9} "
+              f"{counts['developing']:>9} {counts['needs_improvement']:>7} {shifts.get('changed', 0):>8} "
+              f"{shifts.get('newly_mastered', 0):>6} {shifts.get('lost_mastery', 0):>6}{label}")
+
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
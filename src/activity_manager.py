@@ -19,6 +19,7 @@ import hashlib
 
 from config_manager import ConfigManager
 from logger import get_logger
+from branching_scenario import BranchingGraph, compile_branching_graph
 
 
 @dataclass
@@ -95,6 +96,9 @@ class ActivityManager:
         # Interactive session tracking
         self._active_sessions = {}
         
+        # Compiled decision graphs for BR activities
+        self._branching_graphs: Dict[str, BranchingGraph] = {}
+        
         # Valid activity types
         self.valid_activity_types = {'CR', 'COD', 'RP', 'SR', 'BR'}
         
@@ -225,6 +229,9 @@ class ActivityManager:
                 version=activity_data.get('version', '1.0')
             )
             
+            if activity.activity_type == 'BR':
+                self._compile_branching_graph(activity)
+            
             self.logger.log_system_event('activity_manager', 'activity_loaded', 
                                        f'Activity {activity.activity_id} loaded successfully',
                                        {'file_path': str(file_path), 'type': activity.activity_type})
@@ -455,8 +462,9 @@ class ActivityManager:
                 'conversation_phase': 'introduction'
             }
         else:  # BR
+            graph = self.get_branching_graph(activity_id)
             initial_state = {
-                'current_node': 'start',
+                'current_node': graph.start_decision_id if graph else 'start',
                 'path_taken': [],
                 'decisions_made': [],
                 'scenario_state': activity.content.get('initial_scenario', {})
@@ -533,6 +541,34 @@ class ActivityManager:
                                 str(e), {'session_id': session_id})
             return False
 
+    def _compile_branching_graph(self, activity: ActivitySpec) -> Optional[BranchingGraph]:
+        try:
+            graph = compile_branching_graph(activity)
+        except Exception as e:
+            self.logger.log_error('activity_manager', f'Failed to compile branching graph for {activity.activity_id}: {str(e)}',
+                                str(e), {'activity_id': activity.activity_id})
+            return None
+        if graph is not None:
+            self._branching_graphs[activity.activity_id] = graph
+        return graph
+
+    def get_branching_graph(self, activity_id: str) -> Optional[BranchingGraph]:
+        """
+        Get the compiled decision graph for a BR activity.
+        
+        Args:
+            activity_id: Activity identifier
+            
+        Returns:
+            BranchingGraph or None if the activity is not a BR activity with decision points
+        """
+        graph = self._branching_graphs.get(activity_id)
+        if graph is None:
+            activity = self.get_activity(activity_id)
+            if activity and activity.activity_type == 'BR':
+                graph = self._branching_graphs.get(activity_id) or self._compile_branching_graph(activity)
+        return graph
+
     def complete_interactive_session(self, session_id: str) -> bool:
         """
         Mark interactive session as complete.
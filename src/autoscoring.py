@@ -0,0 +1,571 @@
+"""
+Autoscoring for Evaluator v16
+In-process grading for activity types with an answer key (SR) or authored
+decision paths (BR), producing the
+same combined-evaluation and intelligent-feedback shapes as the LLM phases so the
+pipeline can skip the LLM calls entirely.
+"""
+
+import json
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Any, Optional
+
+
+# Validity modifiers for assistance, matching the activity assistance_impact_guidelines
+ASSISTANCE_MODIFIERS = {
+    'clarification': 0.95,
+    'guidance': 0.8,
+    'hint': 0.5,
+    'answer': 0.5
+}
+DEFAULT_ASSISTANCE_MODIFIER = 0.95
+
+
+@dataclass
+class SRQuestion:
+    """Single selected-response question from an activity's answer key"""
+    question_id: str
+    question_text: str
+    options: List[Dict[str, Any]]
+    correct_answer: str
+    explanation: str = ''
+    weight: float = 1.0
+    subskill_targeting: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class QuestionGrade:
+    """Grading outcome for one question"""
+    question_id: str
+    selected_option: Optional[str]
+    correct_answer: str
+    correct: bool
+    weight: float
+    explanation: str = ''
+    credit: Optional[float] = None  # Partial credit (BR option quality); defaults to correct/incorrect
+
+
+@dataclass
+class AutoscoreResult:
+    """Locally computed evaluation for an autoscored activity"""
+    activity_id: str
+    performance_score: float
+    validity_modifier: float
+    validity_analysis: str
+    question_grades: List[QuestionGrade]
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def correct_count(self) -> int:
+        return sum(1 for grade in self.question_grades if grade.correct)
+
+    @property
+    def answered_count(self) -> int:
+        return sum(1 for grade in self.question_grades if grade.selected_option is not None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result['correct_count'] = self.correct_count
+        result['answered_count'] = self.answered_count
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AutoscoreResult':
+        return cls(
+            activity_id=data['activity_id'],
+            performance_score=data['performance_score'],
+            validity_modifier=data['validity_modifier'],
+            validity_analysis=data.get('validity_analysis', ''),
+            question_grades=[QuestionGrade(**grade) for grade in data.get('question_grades', [])],
+            details=data.get('details', {})
+        )
+
+
+def _unwrap_transcript(activity_transcript: Dict[str, Any]) -> Dict[str, Any]:
+    transcript = activity_transcript or {}
+    if isinstance(transcript.get('activity_transcript'), dict):
+        transcript = transcript['activity_transcript']
+    return transcript
+
+
+def assess_validity(activity_transcript: Dict[str, Any]):
+    """Validity modifier and analysis from the transcript's assistance log"""
+    transcript = _unwrap_transcript(activity_transcript)
+    engagement = transcript.get('student_engagement') or {}
+    assistance = engagement.get('assistance_log') or transcript.get('assistance_provided') or []
+    if not assistance:
+        return 1.0, 'No assistance used; responses graded locally.'
+    modifier = 1.0
+    for entry in assistance:
+        kind = ''
+        if isinstance(entry, dict):
+            kind = str(entry.get('assistance_type') or entry.get('type') or entry.get('level') or '').lower()
+        modifier = min(modifier, ASSISTANCE_MODIFIERS.get(kind, DEFAULT_ASSISTANCE_MODIFIER))
+    return modifier, f'{len(assistance)} assistance event(s) recorded; validity modifier {modifier:.2f}.'
+
+
+def _performance_rating(ratio: float):
+    if ratio >= 0.8:
+        return 'proficient', 'low'
+    if ratio >= 0.5:
+        return 'developing', 'medium'
+    return 'needs_improvement', 'high'
+
+
+class SelectedResponseScorer:
+    """Grades SR activities against the answer key in the activity specification"""
+
+    def __init__(self, domain_index=None):
+        self.domain_index = domain_index
+        self._answer_keys: Dict[str, List[SRQuestion]] = {}
+
+    def can_score(self, activity, activity_transcript: Optional[Dict[str, Any]] = None) -> bool:
+        """True when the activity has an answer key and (if given) every selection in the transcript is one of its options"""
+        questions = self.get_answer_key(activity)
+        if not questions:
+            return False
+        if activity_transcript is None:
+            return True
+        selections = self._extract_selections(activity_transcript, questions)
+        answered = [(question, selections[question.question_id]) for question in questions
+                    if selections.get(question.question_id) is not None]
+        return bool(answered) and all(self._match_option(question, selection) is not None
+                                      for question, selection in answered)
+
+    def get_answer_key(self, activity) -> List[SRQuestion]:
+        """Questions with correct answers, cached per activity"""
+        cache_key = f'{activity.activity_id}:{getattr(activity, "version", "")}'
+        if cache_key not in self._answer_keys:
+            self._answer_keys[cache_key] = self._build_answer_key(activity)
+        return self._answer_keys[cache_key]
+
+    def _build_answer_key(self, activity) -> List[SRQuestion]:
+        questions = []
+        generation_output = getattr(activity, 'activity_generation_output', None) or {}
+        for index, component in enumerate(generation_output.get('components', [])):
+            question = component.get('question') if isinstance(component, dict) else None
+            if not isinstance(question, dict) or not question.get('correct_answer'):
+                continue
+            questions.append(SRQuestion(
+                question_id=component.get('component_id') or f'q{index + 1}',
+                question_text=question.get('question_text', ''),
+                options=question.get('options', []),
+                correct_answer=str(question['correct_answer']),
+                explanation=question.get('explanation', ''),
+                weight=float(component.get('component_weight') or 1.0),
+                subskill_targeting=component.get('subskill_targeting', [])
+            ))
+        if questions:
+            return questions
+
+        # Single-question activities keep the key in content
+        content = getattr(activity, 'content', None) or {}
+        if content.get('correct_answer'):
+            questions.append(SRQuestion(
+                question_id='q1',
+                question_text=content.get('question', ''),
+                options=content.get('options', []),
+                correct_answer=str(content['correct_answer']),
+                explanation=content.get('explanation', ''),
+                subskill_targeting=generation_output.get('activity_level_subskill_targeting', [])
+            ))
+        return questions
+
+    def score(self, activity, activity_transcript: Dict[str, Any]) -> AutoscoreResult:
+        """
+        Grade the learner's selections.
+
+        Args:
+            activity: ActivitySpec with an SR answer key
+            activity_transcript: Submitted transcript
+
+        Returns:
+            AutoscoreResult with the weighted performance score and validity modifier
+        """
+        questions = self.get_answer_key(activity)
+        if not questions:
+            raise ValueError(f'Activity {activity.activity_id} has no answer key')
+
+        selections = self._extract_selections(activity_transcript, questions)
+        grades = []
+        for question in questions:
+            selected = self._resolve_option(question, selections.get(question.question_id))
+            grades.append(QuestionGrade(
+                question_id=question.question_id,
+                selected_option=selected,
+                correct_answer=question.correct_answer,
+                correct=selected is not None and selected.lower() == question.correct_answer.lower(),
+                weight=question.weight,
+                explanation=question.explanation
+            ))
+
+        total_weight = sum(grade.weight for grade in grades) or 1.0
+        performance_score = sum(grade.weight for grade in grades if grade.correct) / total_weight
+        validity_modifier, validity_analysis = assess_validity(activity_transcript)
+        return AutoscoreResult(
+            activity_id=activity.activity_id,
+            performance_score=round(performance_score, 4),
+            validity_modifier=validity_modifier,
+            validity_analysis=validity_analysis,
+            question_grades=grades
+        )
+
+    def _extract_selections(self, activity_transcript: Dict[str, Any],
+                            questions: List[SRQuestion]) -> Dict[str, Any]:
+        """Map question_id -> raw selection from the supported transcript shapes"""
+        transcript = _unwrap_transcript(activity_transcript)
+        engagement = transcript.get('student_engagement') or {}
+        question_ids = [question.question_id for question in questions]
+        selections: Dict[str, Any] = {}
+
+        responses = engagement.get('component_responses') or transcript.get('component_responses') or []
+        for response in responses:
+            if not isinstance(response, dict):
+                continue
+            content = response.get('response_content')
+            component_id = response.get('component_id')
+            if component_id in question_ids:
+                selections[component_id] = content
+                continue
+            # The app submits all selections as JSON in a single main_response
+            if isinstance(content, str):
+                try:
+                    content = json.loads(content)
+                except (json.JSONDecodeError, ValueError):
+                    if len(question_ids) == 1:
+                        selections[question_ids[0]] = content
+                    continue
+            if isinstance(content, dict):
+                answers = content.get('component_responses', content.get('answers'))
+                if isinstance(answers, dict):
+                    selections.update({key: value for key, value in answers.items() if key in question_ids})
+                elif isinstance(answers, list):
+                    selections.update(zip(question_ids, answers))
+                elif len(question_ids) == 1 and content.get('selected_option') is not None:
+                    selections[question_ids[0]] = content['selected_option']
+            elif isinstance(content, list):
+                selections.update(zip(question_ids, content))
+
+        if not selections and len(question_ids) == 1:
+            for key in ('selected_option', 'selected_answer', 'answer'):
+                if transcript.get(key) is not None:
+                    selections[question_ids[0]] = transcript[key]
+                    break
+        return selections
+
+    def _resolve_option(self, question: SRQuestion, selection: Any) -> Optional[str]:
+        """Normalize an option id, option text or option dict to the option id"""
+        if isinstance(selection, dict):
+            selection = selection.get('option_id') or selection.get('text')
+        if selection is None:
+            return None
+        text = str(selection).strip()
+        if not text:
+            return None
+        return self._match_option(question, text) or text
+
+    def _match_option(self, question: SRQuestion, selection: Any) -> Optional[str]:
+        """Option id a selection names, or None when it matches none of the question's options"""
+        if isinstance(selection, dict):
+            selection = selection.get('option_id') or selection.get('text')
+        text = str(selection).strip() if selection is not None else ''
+        if not text:
+            return None
+        lowered = text.lower()
+        for option in question.options:
+            if not isinstance(option, dict):
+                if str(option).strip().lower() == lowered:
+                    return str(option)
+                continue
+            option_id = str(option.get('option_id', ''))
+            option_text = str(option.get('text', '')).strip().lower()
+            if lowered == option_id.lower() or lowered == option_text:
+                return option_id
+            # Accept "b) ..." / "B. ..." style labels
+            if option_id and len(text) > 1 and lowered[0] == option_id.lower() and text[1] in ').:':
+                return option_id
+        return None
+
+    def build_combined_result(self, activity, result: AutoscoreResult) -> Dict[str, Any]:
+        """Combined-evaluation shaped result consumed by the scoring phase"""
+        questions = {question.question_id: question for question in self.get_answer_key(activity)}
+        aspect_scores = []
+        for grade in result.question_grades:
+            question = questions[grade.question_id]
+            aspect_scores.append({
+                'aspect_id': grade.question_id,
+                'aspect_name': question.question_text[:80] or grade.question_id,
+                'score': 1.0 if grade.correct else 0.0,
+                'weight': grade.weight,
+                'rationale': (f'Selected {grade.selected_option or "nothing"}; '
+                              f'correct answer is {grade.correct_answer}.')
+            })
+        return {
+            'aspect_scores': aspect_scores,
+            'overall_score': result.performance_score,
+            'rationale': (f'Autoscored: {result.correct_count} of {len(result.question_grades)} '
+                          f'questions answered correctly.'),
+            'validity_modifier': result.validity_modifier,
+            'validity_analysis': result.validity_analysis,
+            'validity_reason': 'Deterministic answer-key grading',
+            'autoscored': True,
+            'autoscore': result.to_dict()
+        }
+
+    def build_feedback(self, activity, result: AutoscoreResult) -> Dict[str, Any]:
+        """Templated intelligent-feedback result built from the grading"""
+        questions = {question.question_id: question for question in self.get_answer_key(activity)}
+        correct = [grade for grade in result.question_grades if grade.correct]
+        missed = [grade for grade in result.question_grades if not grade.correct]
+        total = len(result.question_grades)
+
+        strengths = [f'Correct: {questions[grade.question_id].question_text[:120]}' for grade in correct]
+        weaknesses = [
+            f'Missed: {questions[grade.question_id].question_text[:120]} {grade.explanation}'.strip()
+            for grade in missed
+        ]
+        overview = (f'{result.correct_count} of {total} correct '
+                    f'(score {result.performance_score:.2f}, validity {result.validity_modifier:.2f}).')
+        if result.answered_count < total:
+            overview += f' {total - result.answered_count} question(s) unanswered.'
+
+        if not missed:
+            overall = 'Excellent work - every question was answered correctly.'
+        elif not correct:
+            overall = 'None of the answers were correct this time; review the explanations below before retrying.'
+        else:
+            overall = f'You answered {result.correct_count} of {total} questions correctly.'
+
+        return {
+            'intelligent_feedback': {
+                'backend_intelligence': {
+                    'overview': overview,
+                    'strengths': strengths,
+                    'weaknesses': weaknesses,
+                    'subskill_ratings': self._subskill_ratings(result, questions)
+                },
+                'learner_feedback': {
+                    'overall': overall,
+                    'strengths': ' '.join(strengths) if strengths else 'Keep practising - strengths will show as answers improve.',
+                    'opportunities': ' '.join(grade.explanation for grade in missed if grade.explanation)
+                                     or 'No gaps identified on this activity.'
+                }
+            },
+            'autoscored': True
+        }
+
+    def _subskill_ratings(self, result: AutoscoreResult,
+                          questions: Dict[str, SRQuestion]) -> List[Dict[str, Any]]:
+        totals: Dict[str, List[float]] = {}
+        for grade in result.question_grades:
+            for targeting in questions[grade.question_id].subskill_targeting:
+                subskill_id = targeting.get('subskill_id')
+                if not subskill_id:
+                    continue
+                weight = float(targeting.get('weight_in_component') or 1.0)
+                earned, possible = totals.get(subskill_id, [0.0, 0.0])
+                totals[subskill_id] = [earned + (weight if grade.correct else 0.0), possible + weight]
+
+        ratings = []
+        for subskill_id, (earned, possible) in sorted(totals.items()):
+            level, priority = _performance_rating(earned / possible if possible else 0.0)
+            subskill = (self.domain_index.get_subskill(subskill_id) if self.domain_index else None) or {}
+            ratings.append({
+                'subskill_id': subskill_id,
+                'subskill_name': subskill.get('name') or subskill.get('description') or subskill_id,
+                'performance_level': level,
+                'development_priority': priority
+            })
+        return ratings
+
+
+class BranchingScenarioScorer:
+    """Scores BR activities from the learner's decisions against the compiled decision graph"""
+
+    def __init__(self, graph_provider, domain_index=None):
+        """
+        Args:
+            graph_provider: Callable activity_id -> BranchingGraph (ActivityManager.get_branching_graph)
+            domain_index: Optional DomainModelIndex for subskill names
+        """
+        self.graph_provider = graph_provider
+        self.domain_index = domain_index
+
+    def can_score(self, activity, activity_transcript: Optional[Dict[str, Any]] = None) -> bool:
+        """True when the activity has a graph and (if given) the transcript holds decisions on it"""
+        graph = self.graph_provider(activity.activity_id)
+        if graph is None or not graph.nodes:
+            return False
+        if activity_transcript is None:
+            return True
+        return bool(self._walk(graph, self._extract_decisions(activity_transcript)))
+
+    def score(self, activity, activity_transcript: Dict[str, Any]) -> AutoscoreResult:
+        """
+        Score the learner's path through the scenario.
+
+        Args:
+            activity: BR ActivitySpec
+            activity_transcript: Submitted transcript or session state
+
+        Returns:
+            AutoscoreResult with one grade per decision point and the matched path in details
+        """
+        graph = self.graph_provider(activity.activity_id)
+        if graph is None:
+            raise ValueError(f'Activity {activity.activity_id} has no decision graph')
+
+        decisions = self._walk(graph, self._extract_decisions(activity_transcript))
+        path_score = graph.score_path(decisions)
+        grades = []
+        for decision in path_score.decision_scores:
+            node = graph.nodes[decision['decision_id']]
+            grades.append(QuestionGrade(
+                question_id=decision['decision_id'],
+                selected_option=decision['option_id'],
+                correct_answer=node.best_option_id or '',
+                correct=decision['option_id'] is not None and decision['option_id'] == node.best_option_id,
+                weight=decision['weight'],
+                explanation=decision['rationale'],
+                credit=decision['quality']
+            ))
+        validity_modifier, validity_analysis = assess_validity(activity_transcript)
+        return AutoscoreResult(
+            activity_id=activity.activity_id,
+            performance_score=path_score.score,
+            validity_modifier=validity_modifier,
+            validity_analysis=validity_analysis,
+            question_grades=grades,
+            details={
+                'matched_path_id': path_score.matched_path_id,
+                'path_outcome': path_score.path_outcome,
+                'completed': path_score.completed,
+                'path_taken': [f'{decision_id}:{option_id}' for decision_id, option_id in decisions]
+            }
+        )
+
+    def _extract_decisions(self, activity_transcript: Dict[str, Any]) -> List[Any]:
+        """Raw decisions in the order taken, from session state or the submitted response"""
+        transcript = _unwrap_transcript(activity_transcript)
+        for key in ('decisions_made', 'path_taken', 'decisions'):
+            if isinstance(transcript.get(key), list):
+                return transcript[key]
+        engagement = transcript.get('student_engagement') or {}
+        for response in engagement.get('component_responses') or []:
+            content = response.get('response_content') if isinstance(response, dict) else None
+            if isinstance(content, str):
+                try:
+                    content = json.loads(content)
+                except (json.JSONDecodeError, ValueError):
+                    continue
+            if isinstance(content, dict):
+                for key in ('decisions_made', 'path_taken', 'decisions'):
+                    if isinstance(content.get(key), list):
+                        return content[key]
+            elif isinstance(content, list):
+                return content
+        return []
+
+    def _walk(self, graph, raw_decisions: List[Any]) -> List[tuple]:
+        """Replay decisions through the graph, resolving ids or text at each step"""
+        decisions = []
+        current = graph.start_decision_id
+        for raw in raw_decisions:
+            if current is None:
+                break
+            decision_id, selection = current, raw
+            if isinstance(raw, str) and ':' in raw:
+                decision_id, selection = raw.split(':', 1)
+            elif isinstance(raw, dict) and raw.get('decision_id') in graph.nodes:
+                decision_id = raw['decision_id']
+            option_id = graph.resolve_option(decision_id, selection)
+            if option_id is None:
+                continue
+            decisions.append((decision_id, option_id))
+            current = graph.transitions.get((decision_id, option_id))
+        return decisions
+
+    def build_combined_result(self, activity, result: AutoscoreResult) -> Dict[str, Any]:
+        """Combined-evaluation shaped result consumed by the scoring phase"""
+        graph = self.graph_provider(activity.activity_id)
+        aspect_scores = []
+        for grade in result.question_grades:
+            node = graph.nodes.get(grade.question_id) if graph else None
+            aspect_scores.append({
+                'aspect_id': grade.question_id,
+                'aspect_name': (node.decision_prompt[:80] if node else '') or grade.question_id,
+                'score': grade.credit or 0.0,
+                'weight': grade.weight,
+                'rationale': grade.explanation or 'Decision point not reached'
+            })
+        matched = result.details.get('path_outcome')
+        return {
+            'aspect_scores': aspect_scores,
+            'overall_score': result.performance_score,
+            'rationale': (f'Autoscored path: {matched}.' if matched else
+                          f'Autoscored path through {len(result.details.get("path_taken", []))} '
+                          f'of {len(result.question_grades)} decision points.'),
+            'validity_modifier': result.validity_modifier,
+            'validity_analysis': result.validity_analysis,
+            'validity_reason': 'Deterministic path scoring against authored paths',
+            'autoscored': True,
+            'autoscore': result.to_dict()
+        }
+
+    def build_feedback(self, activity, result: AutoscoreResult) -> Dict[str, Any]:
+        """Templated intelligent-feedback result built from the path scoring"""
+        graph = self.graph_provider(activity.activity_id)
+        strengths, weaknesses, opportunities = [], [], []
+        for grade in result.question_grades:
+            node = graph.nodes.get(grade.question_id) if graph else None
+            if node is None:
+                continue
+            if grade.selected_option is None:
+                weaknesses.append(f'Did not reach: {node.decision_prompt[:120]}')
+            elif grade.correct:
+                strengths.append(f'{node.options[grade.selected_option].option_text} - {grade.explanation}'.strip(' -'))
+            else:
+                best = node.options.get(grade.correct_answer)
+                weaknesses.append(f'{node.options[grade.selected_option].option_text} - {grade.explanation}'.strip(' -'))
+                if best:
+                    opportunities.append(f'Consider: {best.option_text} ({best.rationale})')
+
+        overview = f'Path score {result.performance_score:.2f} (validity {result.validity_modifier:.2f}).'
+        if result.details.get('path_outcome'):
+            overview += f' Outcome: {result.details["path_outcome"]}.'
+        return {
+            'intelligent_feedback': {
+                'backend_intelligence': {
+                    'overview': overview,
+                    'strengths': strengths,
+                    'weaknesses': weaknesses,
+                    'subskill_ratings': self._subskill_ratings(activity, result)
+                },
+                'learner_feedback': {
+                    'overall': result.details.get('path_outcome') or overview,
+                    'strengths': ' '.join(strengths) if strengths else 'Keep practising - strengths will show as decisions improve.',
+                    'opportunities': ' '.join(opportunities) or 'No gaps identified on this scenario.'
+                }
+            },
+            'autoscored': True
+        }
+
+    def _subskill_ratings(self, activity, result: AutoscoreResult) -> List[Dict[str, Any]]:
+        """Path score applied to every subskill the scenario targets"""
+        generation_output = getattr(activity, 'activity_generation_output', None) or {}
+        subskill_ids = []
+        for component in generation_output.get('components', []):
+            for targeting in component.get('subskill_targeting', []) if isinstance(component, dict) else []:
+                if targeting.get('subskill_id') and targeting['subskill_id'] not in subskill_ids:
+                    subskill_ids.append(targeting['subskill_id'])
+        level, priority = _performance_rating(result.performance_score)
+        ratings = []
+        for subskill_id in subskill_ids:
+            subskill = (self.domain_index.get_subskill(subskill_id) if self.domain_index else None) or {}
+            ratings.append({
+                'subskill_id': subskill_id,
+                'subskill_name': subskill.get('name') or subskill.get('description') or subskill_id,
+                'performance_level': level,
+                'development_priority': priority
+            })
+        return ratings
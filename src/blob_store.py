@@ -0,0 +1,107 @@
+"""
+Blob Storage for Evaluator v16
+Content-addressed, compressed storage for the evaluation result and transcript
+JSON of activity_records and activity_history. Each distinct document is kept
+once in the blobs table, keyed by the SHA-256 of its JSON text and compressed
+with zstd (when installed) or zlib; the original columns hold a 'blob:<hash>'
+reference instead of the text. Columns still holding plain JSON (rows written
+before the migration) are read as before.
+"""
+
+import hashlib
+import json
+import zlib
+from typing import Any, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+BLOB_REFERENCE_PREFIX = 'blob:'
+
+DEFAULT_BLOB_SETTINGS = {
+    'codec': 'zstd',  # zstd, zlib or none; zstd falls back to zlib without the zstandard package
+    'level': None  # codec default
+}
+
+
+def available_codec(codec: str) -> str:
+    """The codec actually used for a configured one"""
+    if codec == 'zstd' and zstandard is None:
+        return 'zlib'
+    if codec not in ('zstd', 'zlib', 'none'):
+        raise ValueError(f'Unknown blob codec: {codec}')
+    return codec
+
+
+def is_blob_reference(stored: Optional[str]) -> bool:
+    return isinstance(stored, str) and stored.startswith(BLOB_REFERENCE_PREFIX)
+
+
+def compress(data: bytes, codec: str, level: Optional[int] = None) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+    if codec == 'zlib':
+        return zlib.compress(data, 6 if level is None else level)
+    return data
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError('The zstandard package is required to read zstd-compressed blobs')
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    if codec == 'none':
+        return data
+    raise ValueError(f'Unknown blob codec: {codec}')
+
+
+class BlobStore:
+    """Reads and writes blobs through a caller's cursor, inside its transaction"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = {**DEFAULT_BLOB_SETTINGS, **(settings or {})}
+        self.codec = available_codec(settings['codec'])
+        self.level = settings['level']
+
+    def put_text(self, cursor, text: str) -> str:
+        """Store JSON text once and return its reference, inside the caller's transaction"""
+        data = text.encode('utf-8')
+        content_hash = hashlib.sha256(data).hexdigest()
+        codec = self.codec
+        compressed = compress(data, codec, self.level)
+        if len(compressed) >= len(data):
+            # Small documents such as {} don't shrink
+            codec, compressed = 'none', data
+        # Always write, even when the blob exists: the insert takes the write lock,
+        # so a concurrent reset or prune can't delete the blob before the caller's
+        # referencing row commits in the same transaction
+        cursor.execute('''
+            INSERT OR IGNORE INTO blobs (hash, codec, size, data)
+            VALUES (?, ?, ?, ?)
+        ''', (content_hash, codec, len(data), compressed))
+        return BLOB_REFERENCE_PREFIX + content_hash
+
+    def put_json(self, cursor, value: Any) -> str:
+        """Serialize a value as the JSON columns always have and store it"""
+        return self.put_text(cursor, json.dumps(value, ensure_ascii=False))
+
+    def get_text(self, cursor, stored: Optional[str]) -> Optional[str]:
+        """JSON text behind a column value, which is a reference or legacy plain JSON"""
+        if not is_blob_reference(stored):
+            return stored
+        content_hash = stored[len(BLOB_REFERENCE_PREFIX):]
+        cursor.execute('SELECT codec, data FROM blobs WHERE hash = ?', (content_hash,))
+        row = cursor.fetchone()
+        if row is None:
+            raise KeyError(f'Missing blob {content_hash}')
+        return decompress(bytes(row[1]), row[0]).decode('utf-8')
+
+    def get_json(self, cursor, stored: Optional[str]) -> Any:
+        """Decoded value of a column holding a reference or legacy plain JSON"""
+        text = self.get_text(cursor, stored)
+        return json.loads(text) if text is not None else None
@@ -0,0 +1,275 @@
+"""
+Branching Scenario Engine for Evaluator v16
+Compiles BR activity content (initial_scenario, decision_points, paths) into a
+decision graph once at load time, giving constant-time step transitions during
+interactive sessions and local path-quality scoring from the authored paths.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+
+@dataclass
+class BranchOption:
+    """One choice at a decision point"""
+    option_id: str
+    option_text: str
+    rationale: str = ''
+    consequences: str = ''
+    next_decision_id: Optional[str] = None
+    quality: float = 0.0
+
+
+@dataclass
+class DecisionNode:
+    """A decision point and its options"""
+    decision_id: str
+    decision_prompt: str
+    context_update: str
+    weight: float
+    options: Dict[str, BranchOption] = field(default_factory=dict)
+    best_option_id: Optional[str] = None
+
+
+@dataclass
+class BranchStep:
+    """Outcome of taking one option"""
+    decision_id: str
+    option_id: str
+    next_decision_id: Optional[str]
+    consequences: str
+    quality: float
+    completed: bool
+    next_prompt: Optional[str] = None
+    next_context_update: Optional[str] = None
+
+
+@dataclass
+class PathScore:
+    """Quality of a sequence of decisions against the authored paths"""
+    score: float
+    decision_scores: List[Dict[str, Any]]
+    matched_path_id: Optional[str] = None
+    path_outcome: Optional[str] = None
+    completed: bool = False
+
+
+class BranchingGraph:
+    """Precompiled decision graph for a BR activity"""
+
+    def __init__(self, activity_id: str, initial_scenario: str, nodes: Dict[str, DecisionNode],
+                 start_decision_id: Optional[str], paths: List[Dict[str, Any]]):
+        self.activity_id = activity_id
+        self.initial_scenario = initial_scenario
+        self.nodes = nodes
+        self.start_decision_id = start_decision_id
+        self.paths = paths
+        # (decision_id, option_id) -> next decision id, for O(1) transitions
+        self.transitions: Dict[Tuple[str, str], Optional[str]] = {
+            (node.decision_id, option.option_id): option.next_decision_id
+            for node in nodes.values() for option in node.options.values()
+        }
+        # Full decision signature -> authored path
+        self.paths_by_signature: Dict[Tuple[Tuple[str, str], ...], Dict[str, Any]] = {
+            path['signature']: path for path in paths
+        }
+
+    def get_node(self, decision_id: str) -> Optional[DecisionNode]:
+        return self.nodes.get(decision_id)
+
+    def resolve_option(self, decision_id: str, selection: Any) -> Optional[str]:
+        """Map an option id, option text or option dict to the option id at a decision"""
+        node = self.nodes.get(decision_id)
+        if node is None or selection is None:
+            return None
+        if isinstance(selection, dict):
+            selection = selection.get('option_id') or selection.get('option_text') or selection.get('decision')
+        text = str(selection).strip()
+        if text in node.options:
+            return text
+        lowered = text.lower()
+        for option in node.options.values():
+            if lowered == option.option_id.lower() or lowered == option.option_text.strip().lower():
+                return option.option_id
+        return None
+
+    def step(self, decision_id: str, option_id: str) -> BranchStep:
+        """Take an option at a decision point"""
+        key = (decision_id, option_id)
+        if key not in self.transitions:
+            raise ValueError(f'Invalid option {option_id} at decision {decision_id}')
+        option = self.nodes[decision_id].options[option_id]
+        next_decision_id = self.transitions[key]
+        next_node = self.nodes.get(next_decision_id) if next_decision_id else None
+        return BranchStep(
+            decision_id=decision_id,
+            option_id=option_id,
+            next_decision_id=next_decision_id,
+            consequences=option.consequences,
+            quality=option.quality,
+            completed=next_node is None,
+            next_prompt=next_node.decision_prompt if next_node else None,
+            next_context_update=next_node.context_update if next_node else None
+        )
+
+    def initial_state(self) -> Dict[str, Any]:
+        """Plain-dict state for a learner starting the scenario"""
+        return {
+            'current_node': self.start_decision_id,
+            'path_taken': [],
+            'decisions_made': [],
+            'scenario_state': self.initial_scenario,
+            'completed': self.start_decision_id is None
+        }
+
+    def advance(self, state: Dict[str, Any], selection: Any) -> Optional[BranchStep]:
+        """
+        Take a decision in a scenario state from initial_state, updating it in place.
+
+        Args:
+            state: Scenario state dict (JSON-serializable, so callers can keep it anywhere)
+            selection: Option id, option text or option dict at the current decision point
+
+        Returns:
+            BranchStep for the transition, or None if the scenario is complete or the option is invalid
+        """
+        decision_id = state.get('current_node')
+        if state.get('completed') or decision_id not in self.nodes:
+            return None
+        option_id = self.resolve_option(decision_id, selection)
+        if option_id is None:
+            return None
+        step = self.step(decision_id, option_id)
+        state['current_node'] = step.next_decision_id
+        state['path_taken'] = state.get('path_taken', []) + [f'{decision_id}:{option_id}']
+        state['decisions_made'] = state.get('decisions_made', []) + [{
+            'decision_id': decision_id, 'option_id': option_id, 'consequences': step.consequences
+        }]
+        state['scenario_state'] = step.next_context_update or state.get('scenario_state')
+        state['completed'] = step.completed
+        return step
+
+    def score_path(self, decisions: List[Tuple[str, str]]) -> PathScore:
+        """
+        Score a sequence of (decision_id, option_id) pairs.
+
+        Each decision contributes its chosen option's quality weighted by the
+        decision weight; decision points never reached score zero.
+        """
+        chosen = dict(decisions)
+        total_weight = sum(node.weight for node in self.nodes.values()) or 1.0
+        earned = 0.0
+        decision_scores = []
+        for node in self.nodes.values():
+            option_id = chosen.get(node.decision_id)
+            option = node.options.get(option_id) if option_id else None
+            quality = option.quality if option else 0.0
+            earned += quality * node.weight
+            decision_scores.append({
+                'decision_id': node.decision_id,
+                'option_id': option_id,
+                'quality': quality,
+                'weight': node.weight,
+                'best_option_id': node.best_option_id,
+                'rationale': option.rationale if option else ''
+            })
+        matched = self.paths_by_signature.get(tuple(decisions))
+        return PathScore(
+            score=round(earned / total_weight, 4),
+            decision_scores=decision_scores,
+            matched_path_id=matched['path_id'] if matched else None,
+            path_outcome=matched.get('path_outcome') if matched else None,
+            completed=bool(decisions) and decisions[-1] in self.transitions and self.transitions[decisions[-1]] is None
+        )
+
+
+def _path_quality(path: Dict[str, Any], rank: int, path_count: int) -> float:
+    """Explicit path score if authored, otherwise by authored order (best first)"""
+    for key in ('quality_score', 'path_score', 'score'):
+        if isinstance(path.get(key), (int, float)):
+            return max(0.0, min(1.0, float(path[key])))
+    if path_count <= 1:
+        return 1.0
+    return 1.0 - 0.5 * rank / (path_count - 1)
+
+
+def compile_branching_graph(activity) -> Optional[BranchingGraph]:
+    """
+    Build the decision graph for a BR ActivitySpec.
+
+    Decision points follow each other in authored order unless an option names a
+    next_decision_id. Option quality is taken from the option itself when authored,
+    otherwise from the best authored path that uses it; options on no path score 0.
+
+    Returns:
+        BranchingGraph, or None when the activity has no decision points
+    """
+    content = getattr(activity, 'content', None) or {}
+    decision_points = content.get('decision_points')
+    if not decision_points:
+        generation_output = getattr(activity, 'activity_generation_output', None) or {}
+        for component in generation_output.get('components', []):
+            if isinstance(component, dict) and component.get('branching_decisions'):
+                decision_points = component['branching_decisions']
+                break
+    if not decision_points:
+        return None
+
+    authored_paths = content.get('paths') or []
+    option_quality: Dict[Tuple[str, str], float] = {}
+    paths = []
+    for rank, path in enumerate(authored_paths):
+        signature = []
+        for decision in path.get('decisions', []):
+            if isinstance(decision, dict):
+                signature.append((decision.get('decision_id'), decision.get('option_id')))
+            elif isinstance(decision, str) and ':' in decision:
+                decision_id, option_id = decision.split(':', 1)
+                signature.append((decision_id, option_id))
+        quality = _path_quality(path, rank, len(authored_paths))
+        for key in signature:
+            option_quality[key] = max(option_quality.get(key, 0.0), quality)
+        paths.append({
+            'path_id': path.get('path_id', f'path_{rank + 1}'),
+            'path_outcome': path.get('path_outcome', ''),
+            'quality': quality,
+            'signature': tuple(signature)
+        })
+
+    nodes: Dict[str, DecisionNode] = {}
+    ordered_ids = [point.get('decision_id') or f'decision_{index + 1}'
+                   for index, point in enumerate(decision_points)]
+    for index, point in enumerate(decision_points):
+        decision_id = ordered_ids[index]
+        default_next = ordered_ids[index + 1] if index + 1 < len(ordered_ids) else None
+        node = DecisionNode(
+            decision_id=decision_id,
+            decision_prompt=point.get('decision_prompt', ''),
+            context_update=point.get('context_update', ''),
+            weight=float(point.get('decision_weight') or 1.0)
+        )
+        for option in point.get('options', []):
+            option_id = option.get('option_id')
+            if not option_id:
+                continue
+            explicit = option.get('quality', option.get('score'))
+            node.options[option_id] = BranchOption(
+                option_id=option_id,
+                option_text=option.get('option_text', ''),
+                rationale=option.get('rationale', ''),
+                consequences=option.get('consequences', ''),
+                next_decision_id=option.get('next_decision_id', default_next),
+                quality=float(explicit) if isinstance(explicit, (int, float))
+                else option_quality.get((decision_id, option_id), 0.0)
+            )
+        if node.options:
+            node.best_option_id = max(node.options.values(), key=lambda o: o.quality).option_id
+        nodes[decision_id] = node
+
+    return BranchingGraph(
+        activity_id=activity.activity_id,
+        initial_scenario=content.get('initial_scenario', ''),
+        nodes=nodes,
+        start_decision_id=ordered_ids[0] if ordered_ids else None,
+        paths=paths
+    )
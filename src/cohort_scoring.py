@@ -0,0 +1,241 @@
+"""
+Cohort Scoring for Evaluator v16
+Batch rescoring of many learners at once: loads activity_history in a single
+query into contiguous arrays grouped by (learner, skill) and computes cumulative
+scores, evidence totals, gates, SEM and confidence intervals with segmented
+NumPy operations. Falls back to the scalar ScoringEngine path without NumPy.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+from src.logger import get_logger
+from src.scoring_engine import ScoringEngine, SkillScore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+STATUS_LEVELS = ['needs_improvement', 'developing', 'approaching', 'passed']
+OVERALL_STATUSES = ['needs_improvement', 'developing', 'approaching', 'mastered']
+
+
+@dataclass
+class CohortArrays:
+    """Activity history for a cohort, one contiguous segment per (learner, skill)"""
+    keys: List[Tuple[str, str]]  # (learner_id, skill_id) per segment
+    starts: Any  # segment start offsets
+    counts: Any  # activities per segment
+    performance_score: Any
+    target_evidence: Any
+    validity_modifier: Any
+
+    @property
+    def activity_count(self) -> int:
+        return len(self.performance_score)
+
+
+def gate_levels(values, passed: float, approaching: float, developing: float):
+    """Index into STATUS_LEVELS for each value"""
+    return np.where(values >= passed, 3, np.where(values >= approaching, 2, np.where(values >= developing, 1, 0)))
+
+
+def overall_levels(gate_1, gate_2):
+    """
+    Index into OVERALL_STATUSES for each pair of gate levels.
+
+    Mirrors ScoringEngine._determine_overall_status: mastered needs both gates
+    passed, otherwise the lower gate decides, capped at approaching.
+    """
+    return np.where((gate_1 == 3) & (gate_2 == 3), 3, np.minimum(np.minimum(gate_1, gate_2), 2))
+
+
+class CohortScoringEngine:
+    """Rescores whole cohorts with the same model as ScoringEngine"""
+
+    def __init__(self, scoring_engine: ScoringEngine, learner_manager=None):
+        self.scoring_engine = scoring_engine
+        self.learner_manager = learner_manager or scoring_engine.learner_manager
+        self.logger = get_logger()
+
+    @property
+    def vectorized(self) -> bool:
+        return np is not None
+
+    def score_cohort(self, learner_ids: Optional[List[str]] = None,
+                     skill_ids: Optional[List[str]] = None) -> Dict[Tuple[str, str], SkillScore]:
+        """
+        Score every (learner, skill) with activity history.
+
+        Args:
+            learner_ids: Optional learners to restrict to. If None, scores all learners.
+            skill_ids: Optional skills to restrict to
+
+        Returns:
+            Dict mapping (learner_id, skill_id) to SkillScore
+        """
+        rows = self.learner_manager.get_activity_history_for_scoring(learner_ids, skill_ids)
+        window = self.scoring_engine.scoring_window
+        if not self.vectorized:
+            results = self._score_rows_scalar(rows, window)
+        else:
+            results = self.score_arrays(self.build_arrays(rows, window))
+        self.logger.log_system_event('cohort_scoring', 'cohort_scored',
+                                     f'Scored {len(results)} learner/skill pairs from {len(rows)} activities',
+                                     vectorized=self.vectorized)
+        return results
+
+    def build_arrays(self, rows: List[Any], max_activities: Optional[int] = None) -> CohortArrays:
+        """
+        Pack rows ordered by learner, skill and completion time into segment arrays,
+        keeping only the most recent max_activities of each segment if given
+        """
+        if np is None:
+            raise RuntimeError('NumPy is required for vectorized cohort scoring')
+        keys: List[Tuple[str, str]] = []
+        starts: List[int] = []
+        for index, row in enumerate(rows):
+            key = (row['learner_id'], row['skill_id'])
+            if not keys or keys[-1] != key:
+                keys.append(key)
+                starts.append(index)
+        starts_array = np.asarray(starts, dtype=np.intp)
+        counts = np.diff(np.append(starts_array, len(rows)))
+        arrays = CohortArrays(
+            keys=keys,
+            starts=starts_array,
+            counts=counts,
+            performance_score=np.fromiter((row['performance_score'] for row in rows), dtype=np.float64, count=len(rows)),
+            target_evidence=np.fromiter((row['target_evidence_volume'] for row in rows), dtype=np.float64, count=len(rows)),
+            validity_modifier=np.fromiter((row['validity_modifier'] for row in rows), dtype=np.float64, count=len(rows))
+        )
+        if max_activities:
+            arrays = self.window_arrays(arrays, max_activities)
+        return arrays
+
+    def window_arrays(self, arrays: CohortArrays, max_activities: int) -> CohortArrays:
+        """Keep the most recent max_activities of every segment (ScoringEngine.scoring_window)"""
+        counts = arrays.counts
+        if not arrays.keys or counts.max() <= max_activities:
+            return arrays
+        # Position of each activity within its segment, kept if among the last max_activities
+        positions = np.arange(arrays.activity_count) - np.repeat(arrays.starts, counts)
+        keep = positions >= np.repeat(counts - max_activities, counts)
+        window_counts = np.minimum(counts, max_activities)
+        window_starts = np.concatenate(([0], np.cumsum(window_counts)[:-1])).astype(np.intp)
+        return CohortArrays(
+            keys=arrays.keys,
+            starts=window_starts,
+            counts=window_counts,
+            performance_score=arrays.performance_score[keep],
+            target_evidence=arrays.target_evidence[keep],
+            validity_modifier=arrays.validity_modifier[keep]
+        )
+
+    def cumulative_scores(self, arrays: CohortArrays, decay_factor: float):
+        """Cumulative score of every segment under the given decay factor"""
+        starts, counts = arrays.starts, arrays.counts
+
+        # Evidence accumulated before each activity within its segment: exclusive
+        # prefix sum over the whole cohort minus the prefix at the segment start
+        adjusted = arrays.target_evidence * arrays.validity_modifier
+        exclusive = np.concatenate(([0.0], np.cumsum(adjusted)[:-1]))
+        accumulated_before = exclusive - np.repeat(exclusive[starts], counts)
+        weights = adjusted * np.power(decay_factor, accumulated_before)
+
+        weighted_sum = np.add.reduceat(arrays.performance_score * weights, starts)
+        total_weight = np.add.reduceat(weights, starts)
+        safe_weight = np.where(total_weight == 0, 1.0, total_weight)
+        return np.where(total_weight == 0, self.scoring_engine.prior_mean, weighted_sum / safe_weight)
+
+    def evidence_totals(self, arrays: CohortArrays):
+        """Total adjusted evidence of every segment"""
+        return np.add.reduceat(arrays.target_evidence * arrays.validity_modifier, arrays.starts)
+
+    def score_arrays(self, arrays: CohortArrays) -> Dict[Tuple[str, str], SkillScore]:
+        """Segmented version of ScoringEngine's scalar scoring over every segment at once"""
+        if not arrays.keys:
+            return {}
+        engine = self.scoring_engine
+        counts = arrays.counts
+
+        scores = self.cumulative_scores(arrays, engine.decay_factor)
+        total_evidence = self.evidence_totals(arrays)
+        total_target = np.add.reduceat(arrays.target_evidence, arrays.starts)
+
+        performance = engine.performance_thresholds
+        gate_1 = gate_levels(scores, performance.get('at_level', 0.75),
+                             performance.get('approaching', 0.65), performance.get('developing', 0.50))
+        evidence = engine.evidence_thresholds
+        gate_2 = gate_levels(total_evidence, evidence.get('sufficient', 30.0),
+                             evidence.get('approaching', 20.0), evidence.get('developing', 10.0))
+        overall = overall_levels(gate_1, gate_2)
+
+        # Same formula as ScoringEngine._standard_error_from_totals
+        sem = 0.20 * (1 / np.sqrt(counts)) * (1 / np.sqrt(np.maximum(total_target, 1)))
+        sem = np.where(counts < 2, 0.15, np.maximum(0.05, np.minimum(0.25, sem)))
+        margin = 1.96 * sem
+        lower = np.maximum(0.0, scores - margin)
+        upper = np.minimum(1.0, scores + margin)
+
+        last_updated = datetime.utcnow().isoformat()
+        skill_names: Dict[str, str] = {}
+        results = {}
+        for index, (learner_id, skill_id) in enumerate(arrays.keys):
+            if skill_id not in skill_names:
+                skill_names[skill_id] = engine._get_skill_name(skill_id)
+            level_1, level_2 = int(gate_1[index]), int(gate_2[index])
+            results[(learner_id, skill_id)] = SkillScore(
+                skill_id=skill_id,
+                skill_name=skill_names[skill_id],
+                cumulative_score=float(scores[index]),
+                total_adjusted_evidence=float(total_evidence[index]),
+                activity_count=int(counts[index]),
+                gate_1_status=STATUS_LEVELS[level_1],
+                gate_2_status=STATUS_LEVELS[level_2],
+                overall_status=OVERALL_STATUSES[int(overall[index])],
+                standard_error=float(sem[index]),
+                confidence_interval=(float(lower[index]), float(upper[index])),
+                last_updated=last_updated
+            )
+        return results
+
+    def _score_rows_scalar(self, rows: List[Any],
+                           max_activities: Optional[int] = None) -> Dict[Tuple[str, str], SkillScore]:
+        """Scalar fallback: one ScoringEngine pass per (learner, skill) segment"""
+        engine = self.scoring_engine
+        segments: Dict[Tuple[str, str], List[Dict[str, float]]] = {}
+        for row in rows:
+            segments.setdefault((row['learner_id'], row['skill_id']), []).append({
+                'performance_score': row['performance_score'],
+                'target_evidence': row['target_evidence_volume'],
+                'validity_modifier': row['validity_modifier']
+            })
+
+        last_updated = datetime.utcnow().isoformat()
+        results = {}
+        for (learner_id, skill_id), activities in segments.items():
+            if max_activities:
+                activities = activities[-max_activities:]
+            score = engine._calculate_cumulative_score(activities)
+            total_evidence = engine._calculate_total_evidence(activities)
+            gate_1_status = engine._determine_performance_gate_status(score)
+            gate_2_status = engine._determine_evidence_gate_status(total_evidence)
+            standard_error = engine._calculate_standard_error(activities)
+            results[(learner_id, skill_id)] = SkillScore(
+                skill_id=skill_id,
+                skill_name=engine._get_skill_name(skill_id),
+                cumulative_score=score,
+                total_adjusted_evidence=total_evidence,
+                activity_count=len(activities),
+                gate_1_status=gate_1_status,
+                gate_2_status=gate_2_status,
+                overall_status=engine._determine_overall_status(gate_1_status, gate_2_status),
+                standard_error=standard_error,
+                confidence_interval=engine._calculate_confidence_interval(score, standard_error),
+                last_updated=last_updated
+            )
+        return results
@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
 from src.logger import get_logger
+from src.domain_model_index import DomainModelIndex
 
 class ConfigManager:
     """Centralized configuration management for Evaluator v16"""
@@ -17,6 +18,8 @@ class ConfigManager:
         self.config_path = Path(config_path)
         self.configs = {}
         self.logger = get_logger()
+        self._config_versions = {}
+        self._domain_model_index = None
         
         # Ensure config directory exists
         self.config_path.mkdir(exist_ok=True)
@@ -51,6 +54,20 @@ class ConfigManager:
             except Exception as e:
                 self.logger.log_error('config_manager', f"Error loading {filename}: {e}", str(e))
                 self.configs[config_key] = self._get_default_config(config_key)
+            
+            self._bump_config_version(config_key)
+    
+    def _bump_config_version(self, config_key: str) -> str:
+        """Record a content hash for a config so derived caches know when to rebuild"""
+        version = DomainModelIndex.compute_version(self.configs.get(config_key, {}))
+        self._config_versions[config_key] = version
+        return version
+    
+    def get_config_version(self, config_key: str) -> Optional[str]:
+        """Get the content hash of the currently loaded config"""
+        if config_key not in self._config_versions and config_key in self.configs:
+            return self._bump_config_version(config_key)
+        return self._config_versions.get(config_key)
     
     def get_config(self, config_key: str) -> Dict[str, Any]:
         """Get entire configuration by key"""
@@ -107,6 +124,16 @@ class ConfigManager:
         """Get domain model with competencies and skills"""
         return self.configs.get('domain_model', {})
     
+    def get_domain_model_index(self) -> DomainModelIndex:
+        """Get the shared domain model index, rebuilt only when the domain model changes"""
+        version = self.get_config_version('domain_model')
+        if self._domain_model_index is None or self._domain_model_index.version != version:
+            self._domain_model_index = DomainModelIndex(self.get_domain_model(), version=version)
+            self.logger.log_system_event('config_manager', 'domain_model_indexed',
+                                         f"Built domain model index {version[:8]}",
+                                         **self._domain_model_index.get_stats())
+        return self._domain_model_index
+    
     def get_competencies(self) -> Dict[str, Any]:
         """Get competencies from domain model"""
         domain_model = self.get_domain_model()
@@ -132,6 +159,7 @@ class ConfigManager:
         try:
             # Deep update
             self._deep_update(self.configs[config_key], updates)
+            self._bump_config_version(config_key)
             
             # Save to file
             self.save_config(config_key)
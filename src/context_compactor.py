@@ -0,0 +1,181 @@
+"""
+Context Compactor for Evaluator v16
+Trims phase contexts down to what the LLM actually needs before prompt assembly:
+the target skill and its domain-model neighbourhood, the rubric and the learner
+response. Reports estimated token counts before and after compaction.
+"""
+
+import json
+from dataclasses import dataclass, asdict, is_dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+
+# Rough chars-per-token ratio for English/JSON text across the supported providers
+CHARS_PER_TOKEN = 4
+
+# ActivitySpec fields that are worth sending to the model
+ACTIVITY_SPEC_FIELDS = [
+    'activity_id', 'activity_type', 'title', 'description', 'target_skill',
+    'target_evidence_volume', 'cognitive_level', 'depth_level', 'content'
+]
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate the prompt tokens a context value renders to"""
+    if isinstance(value, str):
+        text = value
+    elif isinstance(value, (dict, list)):
+        try:
+            text = json.dumps(value, indent=2, ensure_ascii=False, default=str)
+        except (TypeError, ValueError):
+            text = str(value)
+    else:
+        text = str(value)
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class CompactionReport:
+    """Before/after size of a compacted phase context"""
+    phase: str
+    tokens_before: int
+    tokens_after: int
+    compacted_keys: List[str] = field(default_factory=list)
+    transcript: Optional[Dict[str, Any]] = None  # TranscriptCompactionReport for RP conversations
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    @property
+    def reduction_ratio(self) -> float:
+        if self.tokens_before <= 0:
+            return 0.0
+        return self.tokens_saved / self.tokens_before
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result['tokens_saved'] = self.tokens_saved
+        result['reduction_ratio'] = round(self.reduction_ratio, 4)
+        return result
+
+
+class ContextCompactor:
+    """Reduces phase contexts to the target skill subgraph, rubric and response"""
+
+    def __init__(self, config_manager):
+        self.config = config_manager
+        self._transcript_compactor = None
+        self._transcript_settings_version = None
+
+    def compact(self, context: Dict[str, Any], phase: str) -> Tuple[Dict[str, Any], CompactionReport]:
+        """
+        Compact a phase context produced by the pipeline and prompt builder.
+
+        Args:
+            context: Context dict about to be passed to PromptBuilder.build_prompt
+            phase: Prompt phase name (combined, intelligent_feedback, ...)
+
+        Returns:
+            Tuple of (compacted context, CompactionReport)
+        """
+        tokens_before = self._context_tokens(context)
+        compacted = dict(context)
+        compacted_keys = []
+
+        activity_spec = context.get('activity_spec')
+        target_skill = self._get_target_skill(context, activity_spec)
+
+        if activity_spec is not None:
+            compacted['activity_spec'] = self._compact_activity_spec(
+                activity_spec, keep_rubric='rubric_details' not in context)
+            compacted_keys.append('activity_spec')
+
+        transcript_report = None
+        if isinstance(context.get('activity_transcript'), dict):
+            transcript = self._compact_transcript(context['activity_transcript'])
+            transcript, transcript_report = self._get_transcript_compactor().compact_transcript(transcript)
+            compacted['activity_transcript'] = transcript
+            compacted_keys.append('activity_transcript')
+
+        if 'domain_model' in context and target_skill:
+            compacted['domain_model'] = self._domain_subgraph(target_skill)
+            compacted_keys.append('domain_model')
+
+        report = CompactionReport(
+            phase=phase,
+            tokens_before=tokens_before,
+            tokens_after=self._context_tokens(compacted),
+            compacted_keys=compacted_keys,
+            transcript=transcript_report.to_dict() if transcript_report else None
+        )
+        return compacted, report
+
+    def _get_transcript_compactor(self):
+        """Conversation compactor configured from llm_settings.json transcript_compaction"""
+        from transcript_compactor import RolePlayTranscriptCompactor
+        version = self.config.get_config_version('llm_settings') if self.config else None
+        if self._transcript_compactor is None or version != self._transcript_settings_version:
+            settings = (self.config.get_config('llm_settings') if self.config else {}).get('transcript_compaction', {})
+            self._transcript_compactor = RolePlayTranscriptCompactor(settings)
+            self._transcript_settings_version = version
+        return self._transcript_compactor
+
+    def _context_tokens(self, context: Dict[str, Any]) -> int:
+        return sum(estimate_tokens(value) for value in context.values())
+
+    def _get_target_skill(self, context: Dict[str, Any], activity_spec: Any) -> Optional[str]:
+        skill_context = context.get('target_skill_context') or {}
+        if isinstance(skill_context, dict) and skill_context.get('skill_id'):
+            return skill_context['skill_id']
+        if isinstance(activity_spec, dict):
+            return activity_spec.get('target_skill')
+        return getattr(activity_spec, 'target_skill', None)
+
+    def _compact_activity_spec(self, activity_spec: Any, keep_rubric: bool) -> Dict[str, Any]:
+        if is_dataclass(activity_spec):
+            spec = {name: getattr(activity_spec, name, None) for name in ACTIVITY_SPEC_FIELDS + ['rubric']}
+        elif isinstance(activity_spec, dict):
+            spec = {name: activity_spec.get(name) for name in ACTIVITY_SPEC_FIELDS + ['rubric']}
+        else:
+            return activity_spec
+        if not keep_rubric:
+            spec.pop('rubric', None)
+        return {key: value for key, value in spec.items() if value not in (None, '', {}, [])}
+
+    def _compact_transcript(self, transcript: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep the learner response; reduce the embedded generation output to what the learner saw"""
+        compacted = dict(transcript)
+        generation_output = transcript.get('activity_generation_output')
+        if isinstance(generation_output, dict):
+            compacted['activity_generation_output'] = {
+                'activity_type': generation_output.get('activity_type'),
+                'components': [
+                    {
+                        'component_id': component.get('component_id'),
+                        'component_type': component.get('component_type'),
+                        'student_facing_content': component.get('student_facing_content', {})
+                    }
+                    for component in generation_output.get('components', [])
+                    if isinstance(component, dict)
+                ],
+                'activity_level_subskill_targeting': generation_output.get('activity_level_subskill_targeting', [])
+            }
+        return compacted
+
+    def _domain_subgraph(self, skill_id: str) -> Dict[str, Any]:
+        """Target skill, its competency, subskills, dependencies and prerequisite skills"""
+        domain_index = self.config.get_domain_model_index()
+        skill = domain_index.get_skill(skill_id)
+        if not skill:
+            return {}
+        return {
+            'competency': domain_index.get_competency_for_skill(skill_id) or {},
+            'skill': skill,
+            'subskills': domain_index.get_subskills_for_skill(skill_id),
+            'subskill_dependencies': domain_index.get_subskill_dependencies(skill_id),
+            'prerequisite_skills': [
+                domain_index.get_skill(prereq_id)
+                for prereq_id in domain_index.get_skill_prerequisites(skill_id)
+            ]
+        }
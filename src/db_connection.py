@@ -0,0 +1,157 @@
+"""
+SQLite Connection Manager for Evaluator v16
+Keeps one persistent connection per thread (and process) for a database file
+instead of opening a new connection for every query. Write connections use WAL
+journaling with synchronous=NORMAL so readers don't block the writer and commits
+don't fsync the main database; page cache, memory-mapped I/O and the prepared
+statement cache are configurable. Managers are shared per database file, so
+LearnerManager, the scoring code and the maintenance scripts reuse the same
+connections.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from src.logger import get_logger
+
+
+DEFAULT_SQLITE_SETTINGS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size_kb': 16384,
+    'mmap_size_mb': 64,
+    'statement_cache_size': 256,
+    'busy_timeout_seconds': 30.0
+}
+
+_managers: Dict[Tuple[str, bool], 'SQLiteConnectionManager'] = {}
+_managers_lock = threading.Lock()
+
+
+class SQLiteConnectionManager:
+    """Thread-local persistent connections to one SQLite database file"""
+
+    def __init__(self, db_path: str, read_only: bool = False, settings: Optional[Dict[str, Any]] = None):
+        self.db_path = db_path
+        self.read_only = read_only
+        self.settings = {**DEFAULT_SQLITE_SETTINGS, **(settings or {})}
+        self.logger = get_logger()
+        self._local = threading.local()
+        self._connections: Dict[int, sqlite3.Connection] = {}  # thread ident -> connection
+        self._connections_lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """
+        The calling thread's connection.
+
+        Nested uses on the same thread share the connection; when the outermost
+        use exits, an uncommitted transaction is rolled back, as closing a
+        per-query connection used to do.
+        """
+        conn = self._thread_connection()
+        self._local.depth = getattr(self._local, 'depth', 0) + 1
+        try:
+            yield conn
+        finally:
+            self._local.depth -= 1
+            if self._local.depth == 0 and conn.in_transaction:
+                conn.rollback()
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        # Connections don't survive a fork
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = self._open()
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        self._local.depth = 0
+        with self._connections_lock:
+            # Close connections left behind by threads that have finished
+            alive = {thread.ident for thread in threading.enumerate()}
+            for ident in [ident for ident in self._connections if ident not in alive]:
+                self._connections.pop(ident).close()
+            # A new thread may reuse a finished thread's ident
+            previous = self._connections.get(threading.get_ident())
+            if previous is not None:
+                previous.close()
+            self._connections[threading.get_ident()] = conn
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        settings = self.settings
+        timeout = float(settings['busy_timeout_seconds'])
+        cached_statements = int(settings['statement_cache_size'])
+        # Only the owning thread uses a connection; other threads may close it
+        if self.read_only:
+            conn = sqlite3.connect(f'{Path(self.db_path).resolve().as_uri()}?mode=ro', uri=True, timeout=timeout,
+                                   cached_statements=cached_statements, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=timeout,
+                                   cached_statements=cached_statements, check_same_thread=False)
+            # Journal mode is stored in the database file, so only writers set it
+            if settings.get('journal_mode'):
+                journal_mode = conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']}").fetchone()[0]
+                if journal_mode.lower() != settings['journal_mode'].lower():
+                    self.logger.log_system_event('db_connection', 'journal_mode_unavailable',
+                                                 f"Requested journal mode {settings['journal_mode']}, "
+                                                 f"database uses {journal_mode}", level='WARNING')
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        if settings.get('synchronous'):
+            conn.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+        if settings.get('cache_size_kb'):
+            # Negative cache_size is in KiB rather than pages
+            conn.execute(f"PRAGMA cache_size = {-int(settings['cache_size_kb'])}")
+        if settings.get('mmap_size_mb') is not None:
+            conn.execute(f"PRAGMA mmap_size = {int(settings['mmap_size_mb']) * 1024 * 1024}")
+        return conn
+
+    def close(self) -> None:
+        """Close the calling thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            with self._connections_lock:
+                if self._connections.get(threading.get_ident()) is conn:
+                    del self._connections[threading.get_ident()]
+            conn.close()
+
+    def close_all(self) -> None:
+        """Close every thread's connection (their threads reopen on next use)"""
+        with self._connections_lock:
+            connections = list(self._connections.values())
+            self._connections = {}
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+
+def get_connection_manager(db_path: str, read_only: bool = False,
+                           settings: Optional[Dict[str, Any]] = None) -> SQLiteConnectionManager:
+    """
+    Shared connection manager for a database file.
+
+    Every caller in the process gets the same manager for the same file and
+    mode; settings only apply when the manager is first created.
+    """
+    key = (os.path.abspath(db_path), read_only)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = SQLiteConnectionManager(db_path, read_only, settings)
+            _managers[key] = manager
+        return manager
+
+
+def close_connection_managers() -> None:
+    """Close all shared connections, e.g. before replacing the database file"""
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close_all()
@@ -0,0 +1,189 @@
+"""
+Domain Model Index for Evaluator v16
+Hash-indexed, read-only view over the list-based domain model so that skill,
+subskill and competency lookups are constant time during evaluation.
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Any, Optional
+
+
+class DomainModelIndex:
+    """Constant-time lookups over competencies, skills, subskills and mappings"""
+
+    def __init__(self, domain_model: Dict[str, Any], version: Optional[str] = None):
+        """
+        Build all indexes in a single pass over the domain model.
+
+        Args:
+            domain_model: Domain model dict as loaded from domain_model.json
+            version: Identifier of the config version this index was built from
+        """
+        domain_model = domain_model or {}
+        self.version = version or self.compute_version(domain_model)
+
+        self.competencies_by_id: Dict[str, Dict[str, Any]] = {}
+        self.skills_by_id: Dict[str, Dict[str, Any]] = {}
+        self.subskills_by_id: Dict[str, Dict[str, Any]] = {}
+        self.skills_by_competency: Dict[str, List[str]] = {}
+        self.subskills_by_skill: Dict[str, List[str]] = {}
+        self.skill_by_subskill: Dict[str, str] = {}
+        self.subskill_prerequisites: Dict[str, List[Dict[str, Any]]] = {}
+        self.subskill_dependents: Dict[str, List[Dict[str, Any]]] = {}
+        self.skill_prerequisites: Dict[str, List[str]] = {}
+
+        for competency in self._as_list(domain_model.get('competencies')):
+            competency_id = competency.get('id')
+            if competency_id:
+                self.competencies_by_id[competency_id] = competency
+                self.skills_by_competency.setdefault(competency_id, [])
+
+        for skill in self._as_list(domain_model.get('skills')):
+            skill_id = skill.get('id')
+            if not skill_id:
+                continue
+            self.skills_by_id[skill_id] = skill
+            self.subskills_by_skill.setdefault(skill_id, [])
+            competency_id = skill.get('competency')
+            if competency_id:
+                self.skills_by_competency.setdefault(competency_id, []).append(skill_id)
+
+        for subskill in self._as_list(domain_model.get('subskills')):
+            subskill_id = subskill.get('id')
+            if not subskill_id:
+                continue
+            self.subskills_by_id[subskill_id] = subskill
+            self._add_mapping(subskill.get('skillId'), subskill_id)
+
+        for mapping in self._as_list(domain_model.get('skillMappings')):
+            self._add_mapping(mapping.get('skillId'), mapping.get('subskillId'))
+
+        for dependency in self._as_list(domain_model.get('subskillDependencies')):
+            prerequisite_id = dependency.get('prerequisiteSubskillId')
+            dependent_id = dependency.get('dependentSubskillId')
+            if not prerequisite_id or not dependent_id:
+                continue
+            self.subskill_prerequisites.setdefault(dependent_id, []).append(dependency)
+            self.subskill_dependents.setdefault(prerequisite_id, []).append(dependency)
+
+            # Roll subskill dependencies up to cross-skill prerequisites
+            dependent_skill = self.get_skill_id_for_subskill(dependent_id)
+            prerequisite_skill = self.get_skill_id_for_subskill(prerequisite_id)
+            if dependent_skill and prerequisite_skill and dependent_skill != prerequisite_skill:
+                prerequisites = self.skill_prerequisites.setdefault(dependent_skill, [])
+                if prerequisite_skill not in prerequisites:
+                    prerequisites.append(prerequisite_skill)
+
+    @staticmethod
+    def compute_version(domain_model: Dict[str, Any]) -> str:
+        """Stable content hash used to detect domain model changes"""
+        payload = json.dumps(domain_model or {}, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _as_list(value: Any) -> List[Dict[str, Any]]:
+        """Accept both list-based and legacy id-keyed dict sections"""
+        if isinstance(value, list):
+            return [item for item in value if isinstance(item, dict)]
+        if isinstance(value, dict):
+            items = []
+            for item_id, item in value.items():
+                if isinstance(item, dict):
+                    items.append({'id': item_id, **item})
+            return items
+        return []
+
+    def _add_mapping(self, skill_id: Optional[str], subskill_id: Optional[str]):
+        if not skill_id or not subskill_id:
+            return
+        subskills = self.subskills_by_skill.setdefault(skill_id, [])
+        if subskill_id not in subskills:
+            subskills.append(subskill_id)
+        self.skill_by_subskill.setdefault(subskill_id, skill_id)
+
+    def get_skill(self, skill_id: str) -> Optional[Dict[str, Any]]:
+        """Get raw skill entry by id"""
+        return self.skills_by_id.get(skill_id)
+
+    def get_skill_name(self, skill_id: str, default: Optional[str] = None) -> str:
+        """Get human-readable skill name, falling back to the id"""
+        skill = self.skills_by_id.get(skill_id)
+        if skill:
+            return skill.get('name', default or skill_id)
+        return default or skill_id
+
+    def get_subskill(self, subskill_id: str) -> Optional[Dict[str, Any]]:
+        """Get raw subskill entry by id"""
+        return self.subskills_by_id.get(subskill_id)
+
+    def get_subskills_for_skill(self, skill_id: str) -> List[Dict[str, Any]]:
+        """Get subskill entries mapped to a skill, in domain model order"""
+        return [self.subskills_by_id[subskill_id]
+                for subskill_id in self.subskills_by_skill.get(skill_id, [])
+                if subskill_id in self.subskills_by_id]
+
+    def get_skill_id_for_subskill(self, subskill_id: str) -> Optional[str]:
+        """Get the parent skill id of a subskill"""
+        return self.skill_by_subskill.get(subskill_id)
+
+    def get_competency(self, competency_id: str) -> Optional[Dict[str, Any]]:
+        """Get raw competency entry by id"""
+        return self.competencies_by_id.get(competency_id)
+
+    def get_competency_for_skill(self, skill_id: str) -> Optional[Dict[str, Any]]:
+        """Get the competency a skill belongs to"""
+        skill = self.skills_by_id.get(skill_id)
+        if not skill:
+            return None
+        return self.competencies_by_id.get(skill.get('competency'))
+
+    def get_skills_for_competency(self, competency_id: str) -> List[Dict[str, Any]]:
+        """Get skill entries belonging to a competency"""
+        return [self.skills_by_id[skill_id] for skill_id in self.skills_by_competency.get(competency_id, [])]
+
+    def get_skill_prerequisites(self, skill_id: str) -> List[str]:
+        """Get ids of skills whose subskills are prerequisites of this skill's subskills"""
+        return list(self.skill_prerequisites.get(skill_id, []))
+
+    def get_subskill_dependencies(self, skill_id: str) -> List[Dict[str, Any]]:
+        """Get subskill dependency edges whose dependent subskill belongs to this skill"""
+        dependencies = []
+        for subskill_id in self.subskills_by_skill.get(skill_id, []):
+            dependencies.extend(self.subskill_prerequisites.get(subskill_id, []))
+        return dependencies
+
+    def get_skill_context(self, skill_id: str) -> Optional[Dict[str, Any]]:
+        """Get skill context in the shape used by the evaluation pipeline"""
+        skill = self.skills_by_id.get(skill_id)
+        if not skill:
+            return None
+        competency = self.get_competency_for_skill(skill_id) or {}
+        return {
+            'skill_id': skill_id,
+            'skill_name': skill.get('name', 'Unknown Skill'),
+            'skill_description': skill.get('description', ''),
+            'cognitive_level': skill.get('cogLevel', skill.get('cognitive_level', '')),
+            'depth_level': skill.get('depth', skill.get('depth_level', '')),
+            'competency_id': skill.get('competency', skill.get('competency_id', '')),
+            'competency_name': competency.get('name', ''),
+            'subskills': [
+                {
+                    'subskill_id': subskill.get('id'),
+                    'description': subskill.get('description', ''),
+                    'depth_level': subskill.get('depth', ''),
+                    'cognitive_level': subskill.get('cogLevel', '')
+                }
+                for subskill in self.get_subskills_for_skill(skill_id)
+            ],
+            'prerequisites': self.get_skill_prerequisites(skill_id)
+        }
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get index sizes"""
+        return {
+            'competencies': len(self.competencies_by_id),
+            'skills': len(self.skills_by_id),
+            'subskills': len(self.subskills_by_id),
+            'subskill_dependencies': sum(len(deps) for deps in self.subskill_prerequisites.values())
+        }
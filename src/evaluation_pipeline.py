@@ -9,18 +9,27 @@ import time
 import re
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable, Iterator, Iterable
 from dataclasses import dataclass, asdict
 import asyncio
 from enum import Enum
 import traceback
+import threading
+import queue
 
 from config_manager import ConfigManager
 from llm_client import LLMClient
 from prompt_builder import PromptBuilder, PromptConfiguration
 from scoring_engine import ScoringEngine, SkillScore
-from learner_manager import LearnerManager, ActivityRecord
+from learner_manager import LearnerManager, ActivityRecord, ActivitySummary
 from activity_manager import ActivityManager, ActivitySpec
+from context_compactor import ContextCompactor, estimate_tokens
+from autoscoring import SelectedResponseScorer, BranchingScenarioScorer, AutoscoreResult
+from model_router import ModelRouter, RoutingDecision
+from pipeline_profiler import PipelineProfiler, NullProfiler, ProfileAggregator
+from pipeline_events import (PipelineEvent, PhaseStarted, PhaseCompleted, ScoringUpdated,
+                             PhaseFieldCompleted, FeedbackDelta, EvaluationCompleted)
+from streaming_json_parser import IncrementalJSONParser, PHASE_EMIT_PATTERNS, TruncatedResponseError, parse_json_response
 from logger import get_logger
 
 
@@ -60,6 +69,8 @@ class EvaluationResult:
     total_execution_time_ms: int
     total_cost_estimate: float
     error_summary: Optional[str] = None
+    profile: Optional[Dict[str, Any]] = None
+    context_compaction: Optional[Dict[str, Any]] = None
 
 
 class EvaluationPipeline:
@@ -81,17 +92,41 @@ class EvaluationPipeline:
         self.logger = get_logger()
         self.rubric_required_types = {'CR', 'COD', 'RP'}
         self.autoscored_types = {'SR', 'BR'}
+        # Answer-key graders for autoscored types; the LLM is only used for feedback if enabled
+        self.local_scorers = {
+            'SR': SelectedResponseScorer(),
+            'BR': BranchingScenarioScorer(getattr(activity_manager, 'get_branching_graph', lambda activity_id: None))
+        }
+        self.autoscored_llm_feedback = False
         self.max_retries = 3
+        self.history_context_limit = 50  # most recent activities loaded as learner history context
         self.phase_timeout_seconds = 300  # 5 minutes per phase
         
         # Add caching for expensive operations
         self._domain_model_cache = None
+        self._domain_index_version = None
         self._leveling_framework_cache = None
         self._skill_context_cache = {}
         self._prerequisite_cache = {}
         self._historical_data_cache = {}  # Cache historical data by learner_id
         self._temporal_context_cache = {}  # Cache temporal context by learner_id
         
+        # Trim phase contexts to the target skill subgraph, rubric and response before prompting
+        self.compact_contexts = True
+        self.context_compactor = ContextCompactor(config_manager)
+        self._compaction_stats = {}
+        
+        # Per-phase model tier routing (llm_settings.json model_tiering)
+        self.model_router = ModelRouter(config_manager)
+        
+        # Opt-in stage profiler (per thread, so concurrent evaluations don't mix spans)
+        self.profiling_enabled = False
+        self._profiling_state = threading.local()
+        self._profile_aggregator = ProfileAggregator()
+        
+        # Event listener for the evaluation running on this thread (see evaluate_activity_iter)
+        self._event_state = threading.local()
+        
         # Pass learner_manager to scoring engine for activity history
         if hasattr(self.scoring_engine, 'learner_manager'):
             self.scoring_engine.learner_manager = self.learner_manager
@@ -101,8 +136,105 @@ class EvaluationPipeline:
 
     def evaluate_activity(self, activity_id: str, learner_id: str, 
                          activity_transcript: Dict[str, Any],
-                         evaluation_mode: str = 'full') -> EvaluationResult:
-        """Evaluate an activity using the AI-powered pipeline"""
+                         evaluation_mode: str = 'full',
+                         profile: Optional[bool] = None,
+                         on_event: Optional[Callable[[PipelineEvent], None]] = None) -> EvaluationResult:
+        """
+        Evaluate an activity using the AI-powered pipeline.
+        
+        When profiling is enabled (per call via ``profile`` or pipeline-wide via
+        ``profiling_enabled``) the returned result carries stage-level timing spans.
+        ``on_event`` receives typed PipelineEvents as phases start and finish.
+        """
+        profiling = self.profiling_enabled if profile is None else profile
+        profiler = PipelineProfiler() if profiling else NullProfiler()
+        previous_db_profiler = getattr(self.learner_manager, 'profiler', None)
+        try:
+            self._event_state.listener = on_event
+            self._event_state.ids = (activity_id, learner_id)
+            self._event_state.compaction = {}
+            self._profiling_state.profiler = profiler
+            if profiling and hasattr(self.learner_manager, 'profiler'):
+                self.learner_manager.profiler = profiler
+            
+            result = self._evaluate_activity(activity_id, learner_id, activity_transcript, evaluation_mode)
+            
+            if profiling:
+                result.profile = profiler.to_dict()
+                self._profile_aggregator.add(result.profile)
+            if self._event_state.compaction:
+                result.context_compaction = self._event_state.compaction
+            
+            self._emit(EvaluationCompleted(activity_id, learner_id, result=result))
+            return result
+        finally:
+            # The thread may run other evaluations later; none inherit this one's listener
+            self._profiling_state.profiler = None
+            if profiling and hasattr(self.learner_manager, 'profiler'):
+                self.learner_manager.profiler = previous_db_profiler
+            self._event_state.listener = None
+            self._event_state.ids = (None, None)
+            self._event_state.compaction = None
+
+    def evaluate_activity_iter(self, activity_id: str, learner_id: str,
+                               activity_transcript: Dict[str, Any],
+                               evaluation_mode: str = 'full',
+                               profile: Optional[bool] = None) -> Iterator[PipelineEvent]:
+        """
+        Run an evaluation and yield PipelineEvents as they happen.
+        
+        The pipeline runs on a background thread; the last event yielded is
+        EvaluationCompleted carrying the final EvaluationResult.
+        """
+        events = queue.Queue()
+        done = object()
+        failure = []
+        
+        def run():
+            try:
+                self.evaluate_activity(activity_id, learner_id, activity_transcript,
+                                       evaluation_mode, profile=profile, on_event=events.put)
+            except Exception as e:
+                failure.append(e)
+            finally:
+                events.put(done)
+        
+        worker = threading.Thread(target=run, name=f'evaluation-{learner_id}-{activity_id}', daemon=True)
+        worker.start()
+        while True:
+            event = events.get()
+            if event is done:
+                break
+            yield event
+        worker.join()
+        if failure:
+            raise failure[0]
+
+    def _emit(self, event: PipelineEvent) -> None:
+        """Deliver an event to the listener of the evaluation running on this thread"""
+        listener = getattr(self._event_state, 'listener', None)
+        if listener is None:
+            return
+        try:
+            listener(event)
+        except Exception as e:
+            self.logger.log_error('evaluation_pipeline', f'Pipeline event listener failed: {str(e)}', str(e))
+
+    def _record_phase(self, pipeline_phases: List[PhaseResult], phase_result: PhaseResult,
+                      activity_id: str, learner_id: str) -> None:
+        """Append a finished phase and announce it"""
+        pipeline_phases.append(phase_result)
+        self._emit(PhaseCompleted(activity_id, learner_id, phase=phase_result.phase, phase_result=phase_result))
+
+    def _span(self, name: str, category: str = 'python'):
+        """Profiling span for the evaluation running on this thread (no-op when disabled)"""
+        profiler = getattr(self._profiling_state, 'profiler', None) or NullProfiler()
+        return profiler.span(name, category)
+
+    def _evaluate_activity(self, activity_id: str, learner_id: str,
+                          activity_transcript: Dict[str, Any],
+                          evaluation_mode: str = 'full') -> EvaluationResult:
+        """Pipeline body behind evaluate_activity"""
         start_time = datetime.now()
         
         # Validate inputs
@@ -113,19 +245,23 @@ class EvaluationPipeline:
         
         # Get activity and learner data
         try:
-            activity = self.activity_manager.get_activity(activity_id)
+            with self._span('load.activity'):
+                activity = self.activity_manager.get_activity(activity_id)
             if not activity:
                 return self._create_failed_result(activity_id, learner_id,
                                                datetime.now().isoformat(),
                                                f"Activity not found: {activity_id}")
             
-            learner = self.learner_manager.get_learner(learner_id)
+            with self._span('load.learner', 'sqlite'):
+                learner = self.learner_manager.get_learner(learner_id)
             if not learner:
                 return self._create_failed_result(activity_id, learner_id,
                                                datetime.now().isoformat(),
                                                f"Learner not found: {learner_id}")
             
-            learner_activities = self.learner_manager.get_learner_activities(learner_id) or []
+            with self._span('load.history', 'sqlite'):
+                learner_activities = self.learner_manager.get_learner_activity_summaries(
+                    learner_id, limit=self.history_context_limit) or []
         except Exception as e:
             return self._create_failed_result(activity_id, learner_id,
                                            datetime.now().isoformat(),
@@ -148,10 +284,16 @@ class EvaluationPipeline:
             # Phase 1: Summative Evaluation (Rubric + Validity Analysis)
             combined_results = None
             
+            local_scorer = self._get_local_scorer(activity, activity_transcript)
+            self._emit(PhaseStarted(activity_id, learner_id, phase='combined_evaluation'))
             with self.logger.phase_context('combined_evaluation', activity_id, learner_id):
-                combined_context = self._prepare_phase_specific_context(activity, learner, activity_transcript, learner_activities, 'combined', learner_id)
-                phase_result = self._run_combined_evaluation(activity, combined_context)
-                pipeline_phases.append(phase_result)
+                if local_scorer:
+                    phase_result = self._run_autoscored_evaluation(activity, activity_transcript, local_scorer)
+                else:
+                    with self._span('combined.context'):
+                        combined_context = self._prepare_phase_specific_context(activity, learner, activity_transcript, learner_activities, 'combined', learner_id)
+                    phase_result = self._run_combined_evaluation(activity, combined_context)
+                self._record_phase(pipeline_phases, phase_result, activity_id, learner_id)
                 total_cost += phase_result.cost_estimate or 0.0
                 if phase_result.success:
                     combined_results = phase_result.result
@@ -169,6 +311,11 @@ class EvaluationPipeline:
                     previous_results['phase_1_combined_evaluation'] = combined_results
                     previous_results['phase_1a_rubric_evaluation'] = rubric_results
                     previous_results['phase_1b_validity_analysis'] = validity_results
+                elif phase_result.result and phase_result.result.get('partial'):
+                    # Truncated response: leave scoring nothing to store rather than defaults
+                    overall_success = False
+                    error_summary = f"Combined evaluation failed: {phase_result.error}"
+                    rubric_results = validity_results = None
                 else:
                     overall_success = False
                     error_summary = f"Combined evaluation failed: {phase_result.error}"
@@ -178,101 +325,130 @@ class EvaluationPipeline:
                     previous_results['rubric'] = rubric_results
                     previous_results['validity'] = validity_results
 
-            # Phase 2: Scoring
-            scoring_results = None
-            with self.logger.phase_context('scoring', activity_id, learner_id):
-                try:
-                    phase_result = self._run_scoring_phase(activity, rubric_results, validity_results, learner_activities, learner_id)
-                    pipeline_phases.append(phase_result)
-                    total_cost += phase_result.cost_estimate or 0.0
-                    if phase_result.success:
-                        scoring_results = phase_result.result
-                        self.logger.log_system_event('evaluation_pipeline', 'scoring_complete', 'Scoring phase completed successfully.')
-                    else:
+            # Writes from scoring through the evaluation record are staged and committed
+            # in one transaction when the block exits; an exception discards them all
+            with self.learner_manager.unit_of_work() as writes:
+                # Phase 2: Scoring
+                scoring_results = None
+                self._emit(PhaseStarted(activity_id, learner_id, phase='scoring'))
+                with self.logger.phase_context('scoring', activity_id, learner_id):
+                    try:
+                        if rubric_results is None:
+                            phase_result = PhaseResult(
+                                phase='scoring',
+                                success=False,
+                                result=None,
+                                error='Skipped: combined evaluation response was truncated',
+                                execution_time_ms=0,
+                                tokens_used=0,
+                                cost_estimate=0.0
+                            )
+                        else:
+                            with self._span('scoring.phase'):
+                                phase_result = self._run_scoring_phase(activity, rubric_results, validity_results, learner_activities, learner_id)
+                        self._record_phase(pipeline_phases, phase_result, activity_id, learner_id)
+                        total_cost += phase_result.cost_estimate or 0.0
+                        if phase_result.success:
+                            scoring_results = phase_result.result
+                            self._emit(ScoringUpdated(activity_id, learner_id,
+                                                      skill_scores=scoring_results.get('skill_scores', {}),
+                                                      activity_score=scoring_results.get('activity_score')))
+                            self.logger.log_system_event('evaluation_pipeline', 'scoring_complete', 'Scoring phase completed successfully.')
+                        else:
+                            overall_success = False
+                            error_summary = f"Scoring failed: {phase_result.error}"
+                    except Exception as e:
+                        self.logger.log_error('scoring_phase_exception', f'Scoring phase exception: {str(e)}', 'evaluation_pipeline')
                         overall_success = False
-                        error_summary = f"Scoring failed: {phase_result.error}"
-                except Exception as e:
-                    self.logger.log_error('scoring_phase_exception', f'Scoring phase exception: {str(e)}', 'evaluation_pipeline')
-                    overall_success = False
-                    error_summary = f"Scoring exception: {str(e)}"
+                        error_summary = f"Scoring exception: {str(e)}"
 
-            # Phase 3: Intelligent Feedback (Combined Diagnostic + Feedback)
-            intelligent_feedback_results = None
-            with self.logger.phase_context('intelligent_feedback', activity_id, learner_id):
-                try:
-                    # Prepare context that combines diagnostic and feedback requirements
-                    intelligent_context = self._prepare_phase_specific_context(activity, learner, activity_transcript, learner_activities, 'intelligent_feedback', learner_id)
-                    intelligent_context = self._prepare_phase_specific_context_with_results(intelligent_context, 'intelligent_feedback', previous_results)
-                    intelligent_context['performance_context'] = self._determine_performance_context(scoring_results) if scoring_results else {}
-                    phase_result = self._run_intelligent_feedback(activity, intelligent_context)
-                    pipeline_phases.append(phase_result)
-                    total_cost += phase_result.cost_estimate or 0.0
-                    if phase_result.success:
-                        intelligent_feedback_results = phase_result.result
-                        previous_results['intelligent_feedback'] = intelligent_feedback_results
-                    else:
-                        overall_success = False
-                        error_summary = f"Intelligent feedback failed: {phase_result.error}"
-                except Exception as e:
-                    self.logger.log_error('intelligent_feedback_phase_exception', f'Intelligent feedback phase exception: {str(e)}', 'evaluation_pipeline')
-                    intelligent_feedback_results = None
+                # Phase 3: Intelligent Feedback (Combined Diagnostic + Feedback)
+                intelligent_feedback_results = None
+                self._emit(PhaseStarted(activity_id, learner_id, phase='intelligent_feedback'))
+                with self.logger.phase_context('intelligent_feedback', activity_id, learner_id):
+                    try:
+                        if local_scorer and combined_results and not self.autoscored_llm_feedback:
+                            phase_result = self._run_autoscored_feedback(activity, combined_results, local_scorer)
+                        else:
+                            # Prepare context that combines diagnostic and feedback requirements
+                            with self._span('intelligent_feedback.context'):
+                                intelligent_context = self._prepare_phase_specific_context(activity, learner, activity_transcript, learner_activities, 'intelligent_feedback', learner_id)
+                                intelligent_context = self._prepare_phase_specific_context_with_results(intelligent_context, 'intelligent_feedback', previous_results)
+                                intelligent_context['performance_context'] = self._determine_performance_context(scoring_results) if scoring_results else {}
+                            phase_result = self._run_intelligent_feedback(activity, intelligent_context)
+                        self._record_phase(pipeline_phases, phase_result, activity_id, learner_id)
+                        total_cost += phase_result.cost_estimate or 0.0
+                        if phase_result.success:
+                            intelligent_feedback_results = phase_result.result
+                            previous_results['intelligent_feedback'] = intelligent_feedback_results
+                        else:
+                            overall_success = False
+                            error_summary = f"Intelligent feedback failed: {phase_result.error}"
+                    except Exception as e:
+                        self.logger.log_error('intelligent_feedback_phase_exception', f'Intelligent feedback phase exception: {str(e)}', 'evaluation_pipeline')
+                        intelligent_feedback_results = None
+                        phase_result = PhaseResult(
+                            phase='intelligent_feedback',
+                            success=False,
+                            error=str(e),
+                            result=None,
+                            execution_time_ms=0,
+                            tokens_used=0,
+                            cost_estimate=0.0
+                        )
+                        self._record_phase(pipeline_phases, phase_result, activity_id, learner_id)
+
+                # Phase 4: Trend Analysis - DISABLED
+                trend_results = None
+                self._emit(PhaseStarted(activity_id, learner_id, phase='trend_analysis'))
+                with self.logger.phase_context('trend_analysis', activity_id, learner_id):
+                    # TREND ANALYSIS DISABLED - Hardcoded disabled result
+                    # This eliminates LLM costs and processing time while maintaining pipeline structure
+                    trend_start_time = datetime.now()
+                
+                    disabled_result = {
+                        'trend_analysis': {
+                            'performance_trajectory': 'stable',
+                            'trend_analysis': 'Trend Analysis Disabled - This feature has been disabled to reduce costs and processing time.',
+                            'growth_patterns': [],
+                            'learning_velocity': {
+                                'current_velocity': 'stable',
+                                'velocity_trend': 'no_change',
+                                'velocity_factors': ['feature_disabled']
+                            },
+                            'improvement_areas': ['feature_disabled'],
+                            'strength_areas': ['feature_disabled'],
+                            'recommendations': ['Trend analysis has been disabled to reduce costs and processing time.']
+                        }
+                    }
+                    execution_time_ms = int((datetime.now() - trend_start_time).total_seconds() * 1000)
+                    self.logger.log_system_event('evaluation_pipeline', 'trend_analysis_disabled', 
+                                               f'Trend analysis disabled - returning disabled message in {execution_time_ms/1000:.2f}s')
                     phase_result = PhaseResult(
-                        phase='intelligent_feedback',
-                        success=False,
-                        error=str(e),
-                        result=None,
-                        execution_time_ms=0,
+                        phase='trend_analysis',
+                        success=True,
+                        result=disabled_result,
+                        execution_time_ms=execution_time_ms,
                         tokens_used=0,
-                        cost_estimate=0.0
+                        cost_estimate=0.0,
+                        error=None
                     )
-                    pipeline_phases.append(phase_result)
-
-            # Phase 4: Trend Analysis - DISABLED
-            trend_results = None
-            with self.logger.phase_context('trend_analysis', activity_id, learner_id):
-                # TREND ANALYSIS DISABLED - Hardcoded disabled result
-                # This eliminates LLM costs and processing time while maintaining pipeline structure
-                trend_start_time = datetime.now()
-                
-                disabled_result = {
-                    'trend_analysis': {
-                        'performance_trajectory': 'stable',
-                        'trend_analysis': 'Trend Analysis Disabled - This feature has been disabled to reduce costs and processing time.',
-                        'growth_patterns': [],
-                        'learning_velocity': {
-                            'current_velocity': 'stable',
-                            'velocity_trend': 'no_change',
-                            'velocity_factors': ['feature_disabled']
-                        },
-                        'improvement_areas': ['feature_disabled'],
-                        'strength_areas': ['feature_disabled'],
-                        'recommendations': ['Trend analysis has been disabled to reduce costs and processing time.']
-                    }
+                    self._record_phase(pipeline_phases, phase_result, activity_id, learner_id)
+                    trend_results = phase_result.result
+                    previous_results['trend'] = trend_results
+
+                # Save evaluation record
+                evaluation_results = {
+                    'overall_success': overall_success,
+                    'error_summary': error_summary,
+                    'total_cost': total_cost,
+                    'pipeline_phases': [phase.__dict__ for phase in pipeline_phases]
                 }
-                execution_time_ms = int((datetime.now() - trend_start_time).total_seconds() * 1000)
-                self.logger.log_system_event('evaluation_pipeline', 'trend_analysis_disabled', 
-                                           f'Trend analysis disabled - returning disabled message in {execution_time_ms/1000:.2f}s')
-                phase_result = PhaseResult(
-                    phase='trend_analysis',
-                    success=True,
-                    result=disabled_result,
-                    execution_time_ms=execution_time_ms,
-                    tokens_used=0,
-                    cost_estimate=0.0,
-                    error=None
-                )
-                pipeline_phases.append(phase_result)
-                trend_results = phase_result.result
-                previous_results['trend'] = trend_results
-
-            # Save evaluation record
-            evaluation_results = {
-                'overall_success': overall_success,
-                'error_summary': error_summary,
-                'total_cost': total_cost,
-                'pipeline_phases': [phase.__dict__ for phase in pipeline_phases]
-            }
-            self._save_evaluation_record(activity_id, learner_id, activity_transcript, evaluation_results)
+                with self._span('save.evaluation_record', 'sqlite'):
+                    self._save_evaluation_record(activity_id, learner_id, activity_transcript, evaluation_results)
+            if not writes.committed:
+                overall_success = False
+                error_summary = error_summary or "Failed to save evaluation results"
             
             # Clear historical cache for this learner since new data was added
             self._clear_historical_cache(learner_id)
@@ -318,18 +494,38 @@ class EvaluationPipeline:
         start_time = datetime.now()
         try:
             # Prepare context for combined evaluation
-            enhanced_context = self.prompt_builder.prepare_context_data(context, 'combined')
-            prompt_config = self.prompt_builder.build_prompt('combined', activity.activity_type, enhanced_context)
-            response = self.llm_client.call_llm_with_fallback(
-                system_prompt=prompt_config.system_prompt,
-                user_prompt=prompt_config.user_prompt,
-                phase='combined_evaluation',
-                expected_schema=prompt_config.output_schema
-            )
+            with self._span('combined.prompt_context'):
+                enhanced_context = self.prompt_builder.prepare_context_data(context, 'combined')
+            with self._span('combined.compact'):
+                enhanced_context = self._compact_phase_context(enhanced_context, 'combined')
+            with self._span('combined.prompt_build'):
+                prompt_config = self.prompt_builder.build_prompt('combined', activity.activity_type, enhanced_context)
+            routing = self._route_model_tier('combined_evaluation', activity, context)
+            with self._span('combined.llm_call', 'network'):
+                response = self.llm_client.call_llm_with_fallback(
+                    system_prompt=prompt_config.system_prompt,
+                    user_prompt=prompt_config.user_prompt,
+                    phase='combined_evaluation',
+                    expected_schema=prompt_config.output_schema,
+                    **self._routing_kwargs(routing)
+                )
+            self._record_routing_outcome(routing, response)
             if response.success:
                 # Parse JSON response using optimized parser
                 try:
-                    parsed_content = self._parse_llm_response(response.content)
+                    with self._span('combined.parse'):
+                        parsed_content = self._parse_llm_response(response.content, phase='combined')
+                except TruncatedResponseError as e:
+                    # Scores missing from a cut-off response must not be defaulted and stored
+                    return PhaseResult(
+                        phase='combined_evaluation',
+                        success=False,
+                        result={'partial': True, 'partial_result': e.partial},
+                        error=f"LLM response truncated: {e}",
+                        execution_time_ms=int((datetime.now() - start_time).total_seconds() * 1000),
+                        tokens_used=response.tokens_used,
+                        cost_estimate=response.cost_estimate
+                    )
                 except Exception as e:
                     parsed_content = {
                         'aspect_scores': [],
@@ -345,7 +541,8 @@ class EvaluationPipeline:
                         'key_observations': ['Combined evaluation parsing failed']
                     }
                 
-                result = self._validate_combined_result(parsed_content)
+                with self._span('combined.validate'):
+                    result = self._validate_combined_result(parsed_content)
                 # Add metadata with token information to the result
                 if hasattr(response, 'metadata') and response.metadata:
                     result['metadata'] = response.metadata
@@ -429,7 +626,8 @@ class EvaluationPipeline:
             # Create learner history structure
             learner_history = {
                 'learner_id': learner_id,
-                'activities': [record.__dict__ for record in learner_activities]
+                'activities': [record.to_dict() if hasattr(record, 'to_dict') else record.__dict__
+                               for record in learner_activities]
             }
             
             # Run scoring using the scoring engine
@@ -437,11 +635,13 @@ class EvaluationPipeline:
             if not hasattr(self.scoring_engine, 'learner_manager') or self.scoring_engine.learner_manager is None:
                 self.scoring_engine.learner_manager = self.learner_manager
             
-            scoring_result = self.scoring_engine.score_activity(learner_history, evaluation_data)
+            with self._span('scoring.score_activity'):
+                scoring_result = self.scoring_engine.score_activity(learner_history, evaluation_data)
             
             # Update learner progress in database
             try:
-                self.scoring_engine.update_learner_progress(learner_history, scoring_result, self.learner_manager)
+                with self._span('scoring.update_progress'):
+                    self.scoring_engine.update_learner_progress(learner_history, scoring_result, self.learner_manager)
             except Exception as e:
                 self.logger.log_error('evaluation_pipeline', f'Failed to update learner progress: {str(e)}', str(e))
             
@@ -453,7 +653,9 @@ class EvaluationPipeline:
                 'adjusted_evidence_volume': activity.target_evidence_volume * evaluation_data['validity_modifier'],
                 'final_score': evaluation_data['overall_score'],
                 'aspect_scores': evaluation_data['aspect_scores'],
-                'scoring_rationale': f"Activity scored with {len(scoring_result.skill_scores)} skills evaluated"
+                'scoring_rationale': f"Activity scored with {len(scoring_result.skill_scores)} skills evaluated",
+                'skill_scores': {skill_id: asdict(skill_score)
+                                 for skill_id, skill_score in scoring_result.skill_scores.items()}
             }
             
             execution_time = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -496,18 +698,32 @@ class EvaluationPipeline:
         start_time = datetime.now()
         try:
             # Prepare context for intelligent feedback (combines diagnostic + feedback context)
-            enhanced_context = self.prompt_builder.prepare_context_data(context, 'intelligent_feedback')
-            prompt_config = self.prompt_builder.build_prompt('intelligent_feedback', activity.activity_type, enhanced_context)
-            response = self.llm_client.call_llm_with_fallback(
-                system_prompt=prompt_config.system_prompt,
-                user_prompt=prompt_config.user_prompt,
-                phase='intelligent_feedback',
-                expected_schema=prompt_config.output_schema
-            )
+            with self._span('intelligent_feedback.prompt_context'):
+                enhanced_context = self.prompt_builder.prepare_context_data(context, 'intelligent_feedback')
+            with self._span('intelligent_feedback.compact'):
+                enhanced_context = self._compact_phase_context(enhanced_context, 'intelligent_feedback')
+            with self._span('intelligent_feedback.prompt_build'):
+                prompt_config = self.prompt_builder.build_prompt('intelligent_feedback', activity.activity_type, enhanced_context)
+            routing = self._route_model_tier('intelligent_feedback', activity, context)
+            with self._span('intelligent_feedback.llm_call', 'network'):
+                response = self.llm_client.call_llm_with_fallback(
+                    system_prompt=prompt_config.system_prompt,
+                    user_prompt=prompt_config.user_prompt,
+                    phase='intelligent_feedback',
+                    expected_schema=prompt_config.output_schema,
+                    **self._routing_kwargs(routing)
+                )
+            self._record_routing_outcome(routing, response)
             if response.success:
+                partial = False
                 # Parse JSON response using optimized parser
                 try:
-                    parsed_content = self._parse_llm_response(response.content)
+                    with self._span('intelligent_feedback.parse'):
+                        parsed_content = self._parse_llm_response(response.content, phase='intelligent_feedback')
+                except TruncatedResponseError as e:
+                    # Keep whatever feedback arrived but flag it as incomplete
+                    parsed_content = e.partial if isinstance(e.partial, dict) else {}
+                    partial = True
                 except Exception as e:
                     # Return a default result with both diagnostic and feedback components
                     parsed_content = {
@@ -532,7 +748,10 @@ class EvaluationPipeline:
                         }
                     }
                 
-                result = self._validate_intelligent_feedback_result(parsed_content)
+                with self._span('intelligent_feedback.validate'):
+                    result = self._validate_intelligent_feedback_result(parsed_content)
+                if partial:
+                    result['partial'] = True
                 # Add metadata with token information to the result
                 if hasattr(response, 'metadata') and response.metadata:
                     result['metadata'] = response.metadata
@@ -606,24 +825,103 @@ class EvaluationPipeline:
                 execution_time_ms=int((datetime.now() - start_time).total_seconds() * 1000)
             )
 
+    def _route_model_tier(self, phase: str, activity: ActivitySpec, context: Dict[str, Any]) -> Optional[RoutingDecision]:
+        """
+        Pick the model tier for an LLM phase; None when tiering is disabled.
+
+        Routes on the size of the learner's responses in the uncompacted context, so
+        activity boilerplate and compaction don't move a submission between tiers.
+        """
+        try:
+            activity_id, learner_id = getattr(self._event_state, 'ids', (None, None))
+            return self.model_router.route(phase, activity,
+                                           transcript_tokens=self._learner_response_tokens(context.get('activity_transcript')),
+                                           activity_id=activity_id, learner_id=learner_id)
+        except Exception as e:
+            self.logger.log_error('model_routing_error', f'Model tier routing failed: {str(e)}', 'evaluation_pipeline')
+            return None
+
+    def _learner_response_tokens(self, activity_transcript: Any) -> int:
+        """Estimated tokens of the learner's component responses (the whole conversation for RP)"""
+        engagement = activity_transcript.get('student_engagement') if isinstance(activity_transcript, dict) else None
+        if not isinstance(engagement, dict):
+            return estimate_tokens(activity_transcript or '')
+        responses = engagement.get('component_responses') or []
+        return sum(estimate_tokens(response.get('response_content', ''))
+                   for response in responses if isinstance(response, dict))
+
+    def _routing_kwargs(self, routing: Optional[RoutingDecision]) -> Dict[str, Any]:
+        return {'provider_overrides': routing.provider_overrides} if routing else {}
+
+    def _record_routing_outcome(self, routing: Optional[RoutingDecision], response) -> None:
+        if routing is None:
+            return
+        activity_id, learner_id = getattr(self._event_state, 'ids', (None, None))
+        self.model_router.record_outcome(routing, response, activity_id=activity_id, learner_id=learner_id)
+        if getattr(response, 'metadata', None) is None:
+            response.metadata = {}
+        response.metadata['model_tier'] = routing.tier
+
+    def _compact_phase_context(self, context: Dict[str, Any], phase: str) -> Dict[str, Any]:
+        """Compact a prompt context and record the estimated token savings for the phase"""
+        if not self.compact_contexts:
+            return context
+        try:
+            compacted, report = self.context_compactor.compact(context, phase)
+        except Exception as e:
+            self.logger.log_error('evaluation_pipeline', f'Context compaction failed for {phase}: {str(e)}', str(e))
+            return context
+        
+        stats = self._compaction_stats.setdefault(phase, {
+            'calls': 0, 'tokens_before': 0, 'tokens_after': 0, 'transcript_tokens_saved': 0
+        })
+        stats['calls'] += 1
+        stats['tokens_before'] += report.tokens_before
+        stats['tokens_after'] += report.tokens_after
+        if report.transcript:
+            stats['transcript_tokens_saved'] += report.transcript['tokens_saved']
+        
+        # Per-evaluation savings, attached to the EvaluationResult
+        evaluation_compaction = getattr(self._event_state, 'compaction', None)
+        if evaluation_compaction is not None:
+            evaluation_compaction[phase] = report.to_dict()
+        
+        self.logger.log_system_event('evaluation_pipeline', 'context_compacted',
+                                    f'{phase} context compacted: {report.tokens_before} -> {report.tokens_after} tokens',
+                                    **report.to_dict())
+        return compacted
+
+    def get_context_compaction_stats(self) -> Dict[str, Any]:
+        """Per-phase totals of estimated prompt context tokens before and after compaction"""
+        summary = {}
+        for phase, stats in self._compaction_stats.items():
+            before = stats['tokens_before']
+            after = stats['tokens_after']
+            summary[phase] = {
+                **stats,
+                'avg_tokens_before': before / stats['calls'] if stats['calls'] else 0,
+                'avg_tokens_after': after / stats['calls'] if stats['calls'] else 0,
+                'reduction_ratio': (before - after) / before if before else 0.0
+            }
+        return summary
+
+    def _get_domain_index(self):
+        """Get the shared domain model index, dropping derived caches when the model changes"""
+        index = self.config.get_domain_model_index()
+        if index.version != self._domain_index_version:
+            self._domain_index_version = index.version
+            self._domain_model_cache = None
+            self._skill_context_cache = {}
+            self._prerequisite_cache = {}
+        return index
+
     def _get_skill_context(self, skill_id: str) -> Dict[str, Any]:
         """Get detailed context for a specific skill"""
         try:
-            domain_model = self.config.get_domain_model()
-            skills = domain_model.get('skills', {})
+            skill_context = self._get_domain_index().get_skill_context(skill_id)
             
-            if skill_id in skills:
-                skill_data = skills[skill_id]
-                return {
-                    'skill_id': skill_id,
-                    'skill_name': skill_data.get('name', 'Unknown Skill'),
-                    'skill_description': skill_data.get('description', ''),
-                    'cognitive_level': skill_data.get('cognitive_level', ''),
-                    'depth_level': skill_data.get('depth_level', ''),
-                    'competency_id': skill_data.get('competency_id', ''),
-                    'subskills': skill_data.get('subskills', []),
-                    'prerequisites': skill_data.get('prerequisites', [])
-                }
+            if skill_context:
+                return skill_context
             else:
                 return {
                     'skill_id': skill_id,
@@ -651,17 +949,15 @@ class EvaluationPipeline:
     def _get_prerequisite_relationships(self, skill_id: str) -> Dict[str, Any]:
         """Get prerequisite relationships for a skill"""
         try:
-            domain_model = self.config.get_domain_model()
-            skills = domain_model.get('skills', {})
+            domain_index = self._get_domain_index()
             
-            if skill_id in skills:
-                skill_data = skills[skill_id]
-                prerequisites = skill_data.get('prerequisites', [])
+            if domain_index.get_skill(skill_id):
+                prerequisites = domain_index.get_skill_prerequisites(skill_id)
                 
                 prerequisite_details = []
                 for prereq_id in prerequisites:
-                    if prereq_id in skills:
-                        prereq_data = skills[prereq_id]
+                    prereq_data = domain_index.get_skill(prereq_id)
+                    if prereq_data:
                         prerequisite_details.append({
                             'skill_id': prereq_id,
                             'skill_name': prereq_data.get('name', 'Unknown'),
@@ -918,7 +1214,7 @@ class EvaluationPipeline:
             'completion_time_minutes': activity_transcript.get('completion_time_minutes', 0)
         }
 
-    def _prepare_historical_data(self, learner_activities: List[ActivityRecord]) -> Dict[str, Any]:
+    def _prepare_historical_data(self, learner_activities: List[Union[ActivityRecord, ActivitySummary]]) -> Dict[str, Any]:
         """Prepare historical performance data for trend analysis. Defensive: always returns a list."""
         if learner_activities is None:
             self.logger.log_debug('evaluation_pipeline', 'No learner_activities provided to _prepare_historical_data; defaulting to empty list.')
@@ -949,7 +1245,17 @@ class EvaluationPipeline:
             'performance_patterns': []
         }
         for activity in sorted_activities:
-            if activity.scored and 'scoring' in activity.evaluation_result and activity.evaluation_result['scoring'] is not None:
+            projected_scores = getattr(activity, 'skill_scores', None)
+            if projected_scores:
+                # Projection already carries per-skill scores; avoid decoding blobs
+                for skill_id, skill_score in projected_scores.items():
+                    historical_data['score_trend'].append({
+                        'timestamp': activity.timestamp,
+                        'skill_id': skill_id,
+                        'cumulative_score': skill_score.get('cumulative_score') or 0.0,
+                        'activity_id': activity.activity_id
+                    })
+            elif activity.scored and 'scoring' in activity.evaluation_result and activity.evaluation_result['scoring'] is not None:
                 scoring_data = activity.evaluation_result['scoring']
                 if 'skill_scores' in scoring_data and scoring_data['skill_scores'] is not None:
                     sks = scoring_data['skill_scores']
@@ -976,8 +1282,10 @@ class EvaluationPipeline:
                                 })
                         except Exception as e:
                             self.logger.log_error('historical_data', f'Failed to iterate skill_scores: {e}', str(sks))
-            activity_spec = activity.activity_transcript.get('activity_spec', {})
-            activity_type = activity_spec.get('activity_type', 'unknown')
+            activity_type = getattr(activity, 'activity_type', None)
+            if not activity_type:
+                activity_spec = activity.activity_transcript.get('activity_spec', {})
+                activity_type = activity_spec.get('activity_type', 'unknown')
             historical_data['activity_types'].append({
                 'timestamp': activity.timestamp,
                 'type': activity_type,
@@ -1024,8 +1332,59 @@ class EvaluationPipeline:
             'gate_status': overall_status
         }
 
-    def _extract_autoscored_result(self, activity: ActivitySpec) -> float:
-        return 0.75
+    def _get_local_scorer(self, activity: ActivitySpec, activity_transcript: Optional[Dict[str, Any]] = None):
+        """Local scorer for autoscored activities whose key/graph can grade this submission"""
+        if activity.activity_type not in self.autoscored_types:
+            return None
+        local_scorer = self.local_scorers.get(activity.activity_type)
+        if local_scorer is None:
+            return None
+        if getattr(local_scorer, 'domain_index', None) is None:
+            local_scorer.domain_index = self._get_domain_index()
+        return local_scorer if local_scorer.can_score(activity, activity_transcript) else None
+
+    def _run_autoscored_evaluation(self, activity: ActivitySpec, activity_transcript: Dict[str, Any],
+                                   local_scorer) -> PhaseResult:
+        """Grade an autoscored activity in-process in place of the combined LLM call"""
+        start_time = datetime.now()
+        try:
+            with self._span('combined.autoscore'):
+                autoscore = local_scorer.score(activity, activity_transcript)
+                result = local_scorer.build_combined_result(activity, autoscore)
+            return PhaseResult(
+                phase='combined_evaluation',
+                success=True,
+                result=result,
+                execution_time_ms=int((datetime.now() - start_time).total_seconds() * 1000),
+                tokens_used=0,
+                cost_estimate=0.0
+            )
+        except Exception as e:
+            self.logger.log_error('autoscore_error', f'Autoscoring failed: {str(e)}', 'evaluation_pipeline')
+            return PhaseResult(
+                phase='combined_evaluation',
+                success=False,
+                error=str(e),
+                execution_time_ms=int((datetime.now() - start_time).total_seconds() * 1000),
+                tokens_used=0,
+                cost_estimate=0.0
+            )
+
+    def _run_autoscored_feedback(self, activity: ActivitySpec, combined_results: Dict[str, Any],
+                                 local_scorer) -> PhaseResult:
+        """Templated feedback for autoscored activities (no LLM call)"""
+        start_time = datetime.now()
+        with self._span('intelligent_feedback.templated'):
+            autoscore = AutoscoreResult.from_dict(combined_results['autoscore'])
+            result = local_scorer.build_feedback(activity, autoscore)
+        return PhaseResult(
+            phase='intelligent_feedback',
+            success=True,
+            result=result,
+            execution_time_ms=int((datetime.now() - start_time).total_seconds() * 1000),
+            tokens_used=0,
+            cost_estimate=0.0
+        )
 
     def _update_learner_progress(self, learner_id: str, skill_scores: Dict[str, Any]) -> None:
         try:
@@ -1521,18 +1880,32 @@ class EvaluationPipeline:
                 'llm_statistics': llm_stats,
                 'activity_statistics': activity_stats,
                 'learner_statistics': learner_stats,
+                'context_compaction': self.get_context_compaction_stats(),
+                'profiling': self._profile_aggregator.summary(),
+                'model_tiering': self.model_router.get_stats(),
                 'pipeline_configuration': {
                     'rubric_required_types': list(self.rubric_required_types),
                     'autoscored_types': list(self.autoscored_types),
+                    'local_scorers': sorted(self.local_scorers),
+                    'autoscored_llm_feedback': self.autoscored_llm_feedback,
                     'max_retries': self.max_retries,
-                    'phase_timeout_seconds': self.phase_timeout_seconds
+                    'phase_timeout_seconds': self.phase_timeout_seconds,
+                    'compact_contexts': self.compact_contexts,
+                    'profiling_enabled': self.profiling_enabled
                 }
             }
         except Exception as e:
             self.logger.log_error('evaluation_pipeline', f'Failed to get pipeline statistics: {str(e)}', str(e))
             return {'error': str(e)}
         
-    def run_pipeline_test(self, test_mode: str = 'connectivity') -> Dict[str, Any]:
+    def run_pipeline_test(self, test_mode: str = 'connectivity', **benchmark_options) -> Dict[str, Any]:
+        """
+        Run a pipeline self-test.
+
+        Modes: 'connectivity', 'prompt_validation' and 'full_integration'. The latter
+        is an end-to-end throughput benchmark on a throwaway database; keyword
+        options are passed through to pipeline_benchmark.run_throughput_benchmark.
+        """
         test_results = {
             'test_mode': test_mode,
             'overall_success': True,
@@ -1581,11 +1954,12 @@ class EvaluationPipeline:
                             test_results['test_results'][test_key] = {'success': False, 'error': str(e)}
                             test_results['overall_success'] = False
             elif test_mode == 'full_integration':
-                test_results['test_results']['full_integration'] = {
-                    'success': False,
-                    'message': 'Full integration test not yet implemented'
-                }
-                test_results['overall_success'] = False
+                from pipeline_benchmark import run_throughput_benchmark
+                benchmark = run_throughput_benchmark(self.config, **benchmark_options)
+                benchmark['success'] = benchmark['evaluations'] > 0 and benchmark['failed'] == 0
+                test_results['test_results']['full_integration'] = benchmark
+                if not benchmark['success']:
+                    test_results['overall_success'] = False
         except Exception as e:
             test_results['errors'].append(str(e))
             test_results['overall_success'] = False
@@ -1683,7 +2057,7 @@ class EvaluationPipeline:
             self.logger.log_error('evaluation_pipeline', f'Failed to create evaluation summary: {str(e)}', str(e))
         return summary
 
-    def _parse_llm_response(self, response_content: Any) -> Dict[str, Any]:
+    def _parse_llm_response(self, response_content: Any, phase: Optional[str] = None) -> Dict[str, Any]:
         """Optimized JSON response parsing with better error handling"""
         try:
             if isinstance(response_content, str):
@@ -1692,28 +2066,52 @@ class EvaluationPipeline:
                 if not content:
                     raise ValueError("Empty response content")
                 
+                # Stream fields to listeners as they close while parsing
+                if phase in PHASE_EMIT_PATTERNS and getattr(self._event_state, 'listener', None):
+                    return self._parse_streamed_response([content], phase)
+                
                 # Try to parse as JSON
                 try:
                     return json.loads(content)
                 except json.JSONDecodeError:
-                    # Try to extract JSON from markdown blocks
-                    if content.startswith('```json') and content.endswith('```'):
-                        json_content = content[7:-3].strip()
-                        return json.loads(json_content)
-                    elif content.startswith('```') and content.endswith('```'):
-                        json_content = content[3:-3].strip()
-                        return json.loads(json_content)
-                    else:
-                        raise ValueError(f"Invalid JSON format: {content[:100]}...")
+                    # Single tolerant pass: markdown fences, leading prose, trailing commas
+                    return parse_json_response(content, strict=True)
             elif isinstance(response_content, dict):
                 return response_content
             else:
                 raise ValueError(f"Unexpected response type: {type(response_content)}")
-                
+
+        except TruncatedResponseError as e:
+            partial_fields = sorted(e.partial) if isinstance(e.partial, dict) else []
+            self.logger.log_system_event('evaluation_pipeline', 'llm_response_truncated',
+                                         f'LLM response for {phase} was truncated; kept fields: {partial_fields}',
+                                         level='WARNING', phase=phase, response_chars=len(response_content))
+            raise
         except Exception as e:
             self.logger.log_error('json_parse_error', f'Failed to parse LLM response: {e}. Content preview: {str(response_content)[:200]}', 'evaluation_pipeline')
             raise
 
+    def _parse_streamed_response(self, chunks: Iterable[str], phase: str) -> Dict[str, Any]:
+        """
+        Parse a (possibly streamed) LLM response incrementally, emitting each
+        configured field for the phase as soon as it is complete.
+        """
+        parser = IncrementalJSONParser(PHASE_EMIT_PATTERNS.get(phase, []))
+        for chunk in chunks:
+            for field_path, value in parser.feed(chunk):
+                self._emit_field(phase, field_path, value)
+        document = parser.close()
+        if parser.repaired:
+            raise TruncatedResponseError('Response was truncated before the JSON document closed', document)
+        return document
+
+    def _emit_field(self, phase: str, field_path: str, value: Any) -> None:
+        activity_id, learner_id = getattr(self._event_state, 'ids', (None, None))
+        if phase == 'intelligent_feedback':
+            self._emit(FeedbackDelta(activity_id, learner_id, field_path=field_path, value=value))
+        else:
+            self._emit(PhaseFieldCompleted(activity_id, learner_id, phase=phase, field_path=field_path, value=value))
+
     def _prepare_phase_specific_context(self, activity: ActivitySpec, learner, activity_transcript: Dict[str, Any], 
                                        learner_activities: List[ActivityRecord], phase: str, learner_id: str = None) -> Dict[str, Any]:
         """Prepare context data specific to each phase, avoiding redundant data loading"""
@@ -1837,6 +2235,7 @@ class EvaluationPipeline:
 
     def _get_cached_domain_model(self) -> Dict[str, Any]:
         """Get domain model with caching"""
+        self._get_domain_index()
         if self._domain_model_cache is None:
             self._domain_model_cache = self.config.get_domain_model()
         return self._domain_model_cache
@@ -1849,19 +2248,27 @@ class EvaluationPipeline:
 
     def _get_cached_skill_context(self, skill_id: str) -> Dict[str, Any]:
         """Get skill context with caching"""
+        self._get_domain_index()
         if skill_id not in self._skill_context_cache:
             self._skill_context_cache[skill_id] = self._get_skill_context(skill_id)
         return self._skill_context_cache[skill_id]
 
     def _get_cached_prerequisite_relationships(self, skill_id: str) -> Dict[str, Any]:
         """Get prerequisite relationships with caching"""
+        self._get_domain_index()
         if skill_id not in self._prerequisite_cache:
             self._prerequisite_cache[skill_id] = self._get_prerequisite_relationships(skill_id)
         return self._prerequisite_cache[skill_id]
 
+    def _history_cache_key(self, learner_id: str, learner_activities: List[ActivityRecord]) -> str:
+        # The history is capped at history_context_limit, so its length alone stops
+        # changing; the newest record tells a new evaluation apart
+        newest = learner_activities[0] if learner_activities else None
+        return f"{learner_id}_{len(learner_activities)}_{getattr(newest, 'record_id', None)}"
+
     def _get_cached_historical_data(self, learner_id: str, learner_activities: List[ActivityRecord]) -> Dict[str, Any]:
         """Get historical data with caching and summarization"""
-        cache_key = f"{learner_id}_{len(learner_activities)}"
+        cache_key = self._history_cache_key(learner_id, learner_activities)
         
         if cache_key not in self._historical_data_cache:
             # Process and cache the historical data
@@ -1874,7 +2281,7 @@ class EvaluationPipeline:
 
     def _get_cached_temporal_context(self, learner_id: str, learner_activities: List[ActivityRecord]) -> Dict[str, Any]:
         """Get temporal context with caching"""
-        cache_key = f"{learner_id}_{len(learner_activities)}"
+        cache_key = self._history_cache_key(learner_id, learner_activities)
         
         if cache_key not in self._temporal_context_cache:
             self._temporal_context_cache[cache_key] = self._get_temporal_context(learner_activities)
@@ -0,0 +1,387 @@
+"""
+Evaluation Worker Pool for Evaluator v16
+Learner-sharded multi-process executor for EvaluationPipeline.
+
+Each learner is hashed to a home worker process so a learner's evaluations run
+in submission order (scoring depends on the learner's history), while different
+learners run in parallel on every core. A central dispatcher keeps at most one
+evaluation per learner in flight; an idle worker whose own shard is empty steals
+the next ready learner from the busiest shard instead of sitting idle. A crashed
+worker is restarted for the rest of its shard; the shard of a worker that cannot
+build a pipeline is taken over by the others, with or without work stealing.
+"""
+
+import os
+import zlib
+import queue
+import threading
+import traceback
+import multiprocessing
+from collections import deque, OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Callable
+
+from src.logger import get_logger
+
+
+@dataclass
+class EvaluationTask:
+    """Single queued evaluation request"""
+    task_id: int
+    activity_id: str
+    learner_id: str
+    activity_transcript: Dict[str, Any]
+    evaluation_mode: str = 'full'
+    future: Future = field(default=None, repr=False, compare=False)
+
+
+def build_default_pipeline():
+    """Build a full backend in the current process, mirroring the app's init_backend"""
+    from config_manager import ConfigManager
+    from llm_client import LLMClient
+    from prompt_builder import PromptBuilder
+    from scoring_engine import ScoringEngine
+    from learner_manager import LearnerManager
+    from activity_manager import ActivityManager
+    from evaluation_pipeline import EvaluationPipeline
+
+    config = ConfigManager()
+    learner_manager = LearnerManager(config)
+    return EvaluationPipeline(
+        config, LLMClient(config), PromptBuilder(config),
+        ScoringEngine(config, learner_manager), learner_manager, ActivityManager(config)
+    )
+
+
+def _result_to_dict(result) -> Dict[str, Any]:
+    """Plain-dict form of an EvaluationResult so it pickles independently of import paths"""
+    from dataclasses import asdict, is_dataclass
+    if is_dataclass(result):
+        return asdict(result)
+    return dict(result)
+
+
+def _worker_main(worker_index: int, inbox, outbox, pipeline_factory: Callable):
+    """Worker process loop: build one pipeline, then evaluate tasks until a None sentinel"""
+    try:
+        pipeline = pipeline_factory()
+    except Exception:
+        outbox.put(('init_failed', worker_index, None, traceback.format_exc()))
+        return
+    outbox.put(('ready', worker_index, None, None))
+
+    while True:
+        message = inbox.get()
+        if message is None:
+            break
+        task_id, activity_id, learner_id, activity_transcript, evaluation_mode = message
+        try:
+            result = pipeline.evaluate_activity(activity_id, learner_id, activity_transcript, evaluation_mode)
+            outbox.put(('done', worker_index, task_id, _result_to_dict(result)))
+        except Exception:
+            outbox.put(('error', worker_index, task_id, traceback.format_exc()))
+
+    outbox.put(('stopped', worker_index, None, None))
+
+
+class LearnerShardedEvaluationPool:
+    """
+    Process-pool executor for evaluations, sharded by learner_id.
+
+    Usage:
+        with LearnerShardedEvaluationPool(num_workers=4) as pool:
+            future = pool.submit(activity_id, learner_id, transcript)
+            result = future.result()  # EvaluationResult
+    """
+
+    def __init__(self, num_workers: Optional[int] = None,
+                 pipeline_factory: Callable = build_default_pipeline,
+                 work_stealing: bool = True, start_method: str = 'spawn'):
+        """
+        Start worker processes and the dispatcher thread.
+
+        Args:
+            num_workers: Number of worker processes (defaults to CPU count)
+            pipeline_factory: Picklable module-level callable returning an EvaluationPipeline
+            work_stealing: Let idle workers take ready learners from other shards
+            start_method: multiprocessing start method
+        """
+        self.logger = get_logger()
+        self.num_workers = max(1, num_workers or os.cpu_count() or 1)
+        self.pipeline_factory = pipeline_factory
+        self.work_stealing = work_stealing
+
+        self._ctx = multiprocessing.get_context(start_method)
+        self._outbox = self._ctx.Queue()
+        self._inboxes = []
+        self._workers = []
+
+        self._lock = threading.Lock()
+        self._next_task_id = 0
+        # Per-shard ordered map of learner_id -> deque of pending tasks
+        self._shards: List["OrderedDict[str, deque]"] = [OrderedDict() for _ in range(self.num_workers)]
+        self._in_flight_learners: Dict[str, int] = {}
+        self._in_flight_tasks: Dict[int, EvaluationTask] = {}
+        self._worker_task: List[Optional[int]] = [None] * self.num_workers
+        self._worker_ready = [False] * self.num_workers
+        self._worker_failed = [False] * self.num_workers
+        self._accepting = True
+        self._drain = True
+        self._stopped = threading.Event()
+
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'cancelled': 0,
+            'stolen': 0,
+            'per_worker': [{'dispatched': 0, 'stolen': 0} for _ in range(self.num_workers)]
+        }
+
+        for worker_index in range(self.num_workers):
+            self._start_worker(worker_index)
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='evaluation-pool-dispatcher', daemon=True)
+        self._dispatcher.start()
+
+        self.logger.log_system_event('evaluation_worker_pool', 'started',
+                                    f'Learner-sharded pool started with {self.num_workers} workers',
+                                    work_stealing=work_stealing)
+
+    def _start_worker(self, worker_index: int):
+        inbox = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_index, inbox, self._outbox, self.pipeline_factory),
+            name=f'evaluation-worker-{worker_index}',
+            daemon=True
+        )
+        process.start()
+        if worker_index < len(self._workers):
+            self._inboxes[worker_index] = inbox
+            self._workers[worker_index] = process
+        else:
+            self._inboxes.append(inbox)
+            self._workers.append(process)
+
+    def shard_for(self, learner_id: str) -> int:
+        """Stable home shard of a learner (independent of PYTHONHASHSEED)"""
+        return zlib.crc32(learner_id.encode('utf-8')) % self.num_workers
+
+    def submit(self, activity_id: str, learner_id: str, activity_transcript: Dict[str, Any],
+               evaluation_mode: str = 'full') -> Future:
+        """Queue an evaluation; evaluations for the same learner run in submission order"""
+        future = Future()
+        with self._lock:
+            if not self._accepting:
+                raise RuntimeError('Cannot submit evaluations after shutdown')
+            self._next_task_id += 1
+            task = EvaluationTask(self._next_task_id, activity_id, learner_id,
+                                  activity_transcript, evaluation_mode, future)
+            shard = self._shards[self.shard_for(learner_id)]
+            shard.setdefault(learner_id, deque()).append(task)
+            self._stats['submitted'] += 1
+            self._dispatch_locked()
+        return future
+
+    def _dispatch_locked(self):
+        """Hand ready work to idle workers; caller holds the lock"""
+        for worker_index in range(self.num_workers):
+            if self._worker_task[worker_index] is not None or not self._worker_ready[worker_index]:
+                continue
+            task = self._take_ready_task(self._shards[worker_index])
+            stolen = False
+            if task is None:
+                # Without stealing, idle workers still adopt the shards of workers
+                # that could not be (re)started, or those evaluations would never run
+                victims = sorted((i for i in range(self.num_workers) if i != worker_index
+                                  and (self.work_stealing or self._worker_failed[i])),
+                                 key=self._pending_in_shard, reverse=True)
+                for victim in victims:
+                    task = self._take_ready_task(self._shards[victim])
+                    if task is not None:
+                        stolen = True
+                        break
+            if task is None:
+                continue
+            if not task.future.set_running_or_notify_cancel():
+                self._stats['cancelled'] += 1
+                self._release_learner(task)
+                continue
+            self._worker_task[worker_index] = task.task_id
+            self._in_flight_tasks[task.task_id] = task
+            self._inboxes[worker_index].put((task.task_id, task.activity_id, task.learner_id,
+                                             task.activity_transcript, task.evaluation_mode))
+            self._stats['per_worker'][worker_index]['dispatched'] += 1
+            if stolen:
+                self._stats['stolen'] += 1
+                self._stats['per_worker'][worker_index]['stolen'] += 1
+
+    def _take_ready_task(self, shard: "OrderedDict[str, deque]") -> Optional[EvaluationTask]:
+        """Oldest-learner-first pick of a learner with no evaluation in flight"""
+        for learner_id, tasks in shard.items():
+            if learner_id in self._in_flight_learners:
+                continue
+            task = tasks.popleft()
+            if tasks:
+                shard.move_to_end(learner_id)
+            else:
+                del shard[learner_id]
+            self._in_flight_learners[learner_id] = task.task_id
+            return task
+        return None
+
+    def _release_learner(self, task: EvaluationTask):
+        if self._in_flight_learners.get(task.learner_id) == task.task_id:
+            del self._in_flight_learners[task.learner_id]
+
+    def _pending_in_shard(self, shard_index: int) -> int:
+        return sum(len(tasks) for tasks in self._shards[shard_index].values())
+
+    def _pending_total(self) -> int:
+        return sum(self._pending_in_shard(i) for i in range(self.num_workers))
+
+    def _dispatch_loop(self):
+        while True:
+            with self._lock:
+                if not self._accepting and not self._in_flight_tasks and \
+                        (self._pending_total() == 0 or not self._drain):
+                    break
+            try:
+                message = self._outbox.get(timeout=0.2)
+            except queue.Empty:
+                message = None
+            if message is not None:
+                kind, worker_index, task_id, payload = message
+                with self._lock:
+                    if kind == 'ready':
+                        self._worker_ready[worker_index] = True
+                    elif kind == 'init_failed':
+                        self._worker_failed[worker_index] = True
+                        self.logger.log_error('evaluation_worker_pool',
+                                              f'Worker {worker_index} failed to build pipeline', payload)
+                    elif kind in ('done', 'error'):
+                        self._complete_task(worker_index, task_id, kind, payload)
+            # Every pass, so a busy outbox can't hide a crashed worker
+            self._check_workers()
+            with self._lock:
+                if all(self._worker_failed):
+                    # Nothing will ever run the queue
+                    self._resolve_queued_locked(RuntimeError('No evaluation worker could build a pipeline'))
+                self._dispatch_locked()
+
+        with self._lock:
+            # Only reachable with an empty queue unless shutdown stopped draining
+            self._resolve_queued_locked(RuntimeError('Evaluation pool shut down before the evaluation ran'))
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for process in self._workers:
+            process.join(timeout=30)
+        self._stopped.set()
+
+    def _resolve_queued_locked(self, error: Exception):
+        """Cancel or fail every queued (not yet running) evaluation; caller holds the lock"""
+        for shard in self._shards:
+            for tasks in shard.values():
+                for task in tasks:
+                    if task.future.set_running_or_notify_cancel():
+                        task.future.set_exception(error)
+                        self._stats['failed'] += 1
+                    else:
+                        self._stats['cancelled'] += 1
+            shard.clear()
+
+    def _complete_task(self, worker_index: int, task_id: int, kind: str, payload: Any):
+        self._worker_task[worker_index] = None
+        task = self._in_flight_tasks.pop(task_id, None)
+        if task is None:
+            return
+        self._release_learner(task)
+        if kind == 'done':
+            self._stats['completed'] += 1
+            task.future.set_result(self._rebuild_result(payload))
+        else:
+            self._stats['failed'] += 1
+            task.future.set_exception(RuntimeError(f'Evaluation failed in worker {worker_index}:\n{payload}'))
+
+    def _check_workers(self):
+        """Fail the in-flight task of a crashed worker and restart it for the rest of its shard"""
+        with self._lock:
+            for worker_index, process in enumerate(self._workers):
+                if process.is_alive() or self._worker_failed[worker_index]:
+                    continue
+                self.logger.log_error('evaluation_worker_pool',
+                                      f'Worker {worker_index} exited with code {process.exitcode}; restarting',
+                                      'evaluation_worker_pool')
+                task = self._in_flight_tasks.pop(self._worker_task[worker_index], None)
+                if task is not None:
+                    self._release_learner(task)
+                    self._stats['failed'] += 1
+                    task.future.set_exception(RuntimeError(f'Worker {worker_index} died during evaluation'))
+                self._worker_task[worker_index] = None
+                self._worker_ready[worker_index] = False
+                self._start_worker(worker_index)
+
+    @staticmethod
+    def _rebuild_result(payload: Dict[str, Any]):
+        from src.evaluation_pipeline import EvaluationResult, PhaseResult
+        data = dict(payload)
+        data['pipeline_phases'] = [PhaseResult(**phase) for phase in data.get('pipeline_phases', [])]
+        return EvaluationResult(**data)
+
+    def shutdown(self, wait: bool = True, drain: bool = True):
+        """
+        Stop accepting work and stop the workers.
+
+        Args:
+            wait: Block until workers have exited
+            drain: Finish every queued evaluation first; otherwise cancel queued
+                   (not yet running) evaluations and only finish in-flight ones
+        """
+        with self._lock:
+            self._accepting = False
+            self._drain = drain
+            if not drain:
+                for shard in self._shards:
+                    for tasks in shard.values():
+                        for task in tasks:
+                            if task.future.cancel():
+                                self._stats['cancelled'] += 1
+                    shard.clear()
+        if wait:
+            self._stopped.wait()
+        self.logger.log_system_event('evaluation_worker_pool', 'shutdown',
+                                    f'Pool shut down (drain={drain})', **self.get_stats(include_workers=False))
+
+    def get_stats(self, include_workers: bool = True) -> Dict[str, Any]:
+        """Throughput, stealing and queue depth counters"""
+        with self._lock:
+            stats = {
+                'num_workers': self.num_workers,
+                'submitted': self._stats['submitted'],
+                'completed': self._stats['completed'],
+                'failed': self._stats['failed'],
+                'cancelled': self._stats['cancelled'],
+                'stolen': self._stats['stolen'],
+                'in_flight': len(self._in_flight_tasks),
+                'pending': self._pending_total()
+            }
+            if include_workers:
+                stats['workers'] = [
+                    {
+                        **self._stats['per_worker'][i],
+                        'pending': self._pending_in_shard(i),
+                        'busy': self._worker_task[i] is not None,
+                        'alive': self._workers[i].is_alive()
+                    }
+                    for i in range(self.num_workers)
+                ]
+            return stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(wait=True, drain=exc_type is None)
+        return False
@@ -0,0 +1,145 @@
+"""
+Learner JSON Mirror Writer for Evaluator v16
+Keeps data/learners/<learner_id>_history.json in step with the database without
+rebuilding it after every write: LearnerManager marks learners dirty and a
+background thread rewrites each dirty learner's mirror at most once per flush
+interval, however many writes happened in between. Pending mirrors are flushed
+on close and at interpreter exit.
+"""
+
+import atexit
+import os
+import threading
+import time
+import weakref
+from typing import Callable, Dict, Any, List, Optional, Set
+
+from src.logger import get_logger
+
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 2.0
+
+_writers: 'weakref.WeakSet[JSONMirrorWriter]' = weakref.WeakSet()
+
+
+class JSONMirrorWriter:
+    """Coalesces learner JSON mirror rewrites onto one background thread"""
+
+    def __init__(self, write_mirror: Callable[[str], bool],
+                 flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS):
+        """
+        Args:
+            write_mirror: Rewrites one learner's mirror, returning True on success
+            flush_interval_seconds: Delay between a learner first being marked dirty
+                and its mirror being written; 0 writes synchronously on every mark
+        """
+        self.write_mirror = write_mirror
+        self.flush_interval_seconds = max(0.0, float(flush_interval_seconds))
+        self.logger = get_logger()
+        self._dirty: Set[str] = set()
+        self._dirty_since: Optional[float] = None
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()  # the thread and flush() never write concurrently
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._closed = False
+        self._stats = {'marked': 0, 'written': 0, 'failed': 0, 'flushes': 0}
+        _writers.add(self)
+
+    @property
+    def pending(self) -> List[str]:
+        """Learners whose mirror is waiting to be written"""
+        with self._condition:
+            return sorted(self._dirty)
+
+    def mark_dirty(self, learner_id: str) -> None:
+        """Schedule a rewrite of the learner's mirror"""
+        if self.flush_interval_seconds == 0 or self._closed:
+            with self._condition:
+                self._stats['marked'] += 1
+            self._write([learner_id])
+            return
+        with self._condition:
+            self._stats['marked'] += 1
+            self._dirty.add(learner_id)
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+            self._ensure_thread()
+            self._condition.notify()
+
+    def flush(self) -> int:
+        """Write every pending mirror now; returns the number written"""
+        with self._condition:
+            learner_ids = self._take_dirty()
+        return self._write(learner_ids)
+
+    def close(self) -> None:
+        """Flush pending mirrors and stop the background thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            thread = self._thread if self._pid == os.getpid() else None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=max(5.0, self.flush_interval_seconds * 2))
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return dict(self._stats, pending=len(self._dirty),
+                        flush_interval_seconds=self.flush_interval_seconds)
+
+    def _ensure_thread(self) -> None:
+        # Caller holds the condition. Threads don't survive a fork, so a child
+        # process starts its own.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='learner-json-mirror', daemon=True)
+        self._thread.start()
+
+    def _take_dirty(self) -> List[str]:
+        # Caller holds the condition
+        learner_ids = sorted(self._dirty)
+        self._dirty.clear()
+        self._dirty_since = None
+        return learner_ids
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._dirty:
+                    # Idle writers hold no thread; the next mark starts one
+                    self._thread = None
+                    return
+                remaining = self._dirty_since + self.flush_interval_seconds - time.monotonic()
+                if remaining > 0 and not self._closed:
+                    # Let more writes for the same learners coalesce into this flush
+                    self._condition.wait(remaining)
+                    continue
+                learner_ids = self._take_dirty()
+            self._write(learner_ids)
+
+    def _write(self, learner_ids: List[str]) -> int:
+        if not learner_ids:
+            return 0
+        written = 0
+        with self._write_lock:
+            for learner_id in learner_ids:
+                try:
+                    if self.write_mirror(learner_id):
+                        written += 1
+                except Exception as e:
+                    self.logger.log_error('json_mirror', f'Failed to write learner JSON mirror: {str(e)}',
+                                          str(e), {'learner_id': learner_id})
+        with self._condition:
+            self._stats['flushes'] += 1
+            self._stats['written'] += written
+            self._stats['failed'] += len(learner_ids) - written
+        return written
+
+
+@atexit.register
+def flush_json_mirrors() -> None:
+    """Write every pending mirror of every writer, e.g. before the process exits"""
+    for writer in list(_writers):
+        writer.flush()
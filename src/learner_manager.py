@@ -12,16 +12,28 @@ import sqlite3
 import json
 import os
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple, Callable, Set
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 import logging
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
+import threading
 
 from src.config_manager import ConfigManager
+from src.blob_store import BlobStore, BLOB_REFERENCE_PREFIX
+from src.db_connection import get_connection_manager
+from src.json_mirror import JSONMirrorWriter, DEFAULT_FLUSH_INTERVAL_SECONDS
 from src.logger import get_logger
 
 
+# Columns that hold blob references or legacy plain JSON
+BLOB_REFERENCE_COLUMNS = tuple(
+    (table, column)
+    for table in ('activity_records', 'activity_history')
+    for column in ('evaluation_result', 'activity_transcript')
+)
+
+
 @dataclass
 class LearnerProfile:
     """Learner profile data structure"""
@@ -58,6 +70,62 @@ class ActivityRecord:
             self.timestamp = datetime.now(timezone.utc).isoformat()
 
 
+@dataclass
+class ActivitySummary:
+    """
+    Lightweight projection of an activity record.
+    
+    Carries ids, timestamps and per-skill scores from activity_history. The
+    evaluation_result and activity_transcript blobs are only fetched and
+    decoded when first accessed.
+    """
+    activity_id: str
+    learner_id: str
+    timestamp: str
+    scored: bool = False
+    record_id: Optional[int] = None
+    activity_type: Optional[str] = None
+    skill_scores: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    _blob_loader: Optional[Callable[[int], Tuple[Dict[str, Any], Dict[str, Any]]]] = field(
+        default=None, repr=False, compare=False)
+    _blobs: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = field(
+        default=None, repr=False, compare=False)
+
+    def _load_blobs(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        if self._blobs is None:
+            if self._blob_loader is None or self.record_id is None:
+                self._blobs = ({}, {})
+            else:
+                self._blobs = self._blob_loader(self.record_id)
+        return self._blobs
+
+    @property
+    def evaluation_result(self) -> Dict[str, Any]:
+        """Full evaluation result, decoded on first access"""
+        return self._load_blobs()[0]
+
+    @property
+    def activity_transcript(self) -> Dict[str, Any]:
+        """Full activity transcript, decoded on first access"""
+        return self._load_blobs()[1]
+
+    @property
+    def blobs_loaded(self) -> bool:
+        return self._blobs is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Projection fields only; never triggers blob loading"""
+        return {
+            'activity_id': self.activity_id,
+            'learner_id': self.learner_id,
+            'timestamp': self.timestamp,
+            'scored': self.scored,
+            'record_id': self.record_id,
+            'activity_type': self.activity_type,
+            'skill_scores': self.skill_scores
+        }
+
+
 @dataclass
 class SkillProgress:
     """Skill progress tracking data"""
@@ -80,30 +148,85 @@ class SkillProgress:
             self.last_updated = datetime.now(timezone.utc).isoformat()
 
 
+@dataclass
+class SkillScoringState:
+    """
+    Running sums behind a learner's cumulative score for one skill.
+    
+    Lets ScoringEngine fold in a new activity in constant time instead of
+    rescoring the whole activity history.
+    """
+    learner_id: str
+    skill_id: str
+    decay_factor: float
+    weighted_score_sum: float = 0.0  # Σ performance_score × decayed weight
+    decayed_weight: float = 0.0  # Σ adjusted evidence × evidence-based decay
+    total_adjusted_evidence: float = 0.0
+    total_target_evidence: float = 0.0  # SEM input
+    activity_count: int = 0  # SEM input
+    last_activity_id: Optional[str] = None
+    last_completion_timestamp: Optional[str] = None
+    last_updated: Optional[str] = None
+
+
+@dataclass
+class LearnerUnitOfWork:
+    """Writes staged by LearnerManager.unit_of_work, committed together when it exits"""
+    operations: List[Tuple[str, Any]] = field(default_factory=list)  # (kind, payload) in call order
+    sync_learner_ids: List[str] = field(default_factory=list)  # JSON mirrors to resync after the commit
+    committed: bool = False
+
+
 class LearnerManager:
     """
     Manages learner data persistence using SQLite database.
     Handles learner profiles, activity histories, and skill progress tracking.
     """
 
-    def __init__(self, config_manager: ConfigManager):
+    def __init__(self, config_manager: ConfigManager, read_only: bool = False,
+                 db_path: Optional[str] = None):
         """
         Initialize LearnerManager with database setup.
         
         Args:
             config_manager: Configuration manager instance
+            read_only: Open the existing database read-only and skip schema setup
+            db_path: Database file to use instead of DATABASE_PATH / the default
         """
         self.config = config_manager
         self.logger = get_logger()
+        self._profiler_state = threading.local()
+        self._unit_of_work_state = threading.local()
+        
+        # Get database path from the caller, environment or config
+        self.db_path = db_path or os.getenv('DATABASE_PATH', 'data/evaluator_v16.db')
+        
+        # Directory for the per-learner JSON history mirrors
+        self.json_mirror_dir = os.getenv('LEARNER_JSON_DIR', 'data/learners')
         
-        # Get database path from environment or config
-        self.db_path = os.getenv('DATABASE_PATH', 'data/evaluator_v16.db')
+        self.read_only = read_only
         
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        # Persistent per-thread connections shared with every other user of this database
+        app_state = config_manager.get_app_state() if hasattr(config_manager, 'get_app_state') else {}
+        self._connections = get_connection_manager(
+            self.db_path, read_only, app_state.get('data_persistence', {}).get('sqlite')
+        )
         
-        # Initialize database
-        self._initialize_database()
+        # Evaluation and transcript JSON is stored once per distinct document, compressed
+        self.blob_store = BlobStore(app_state.get('data_persistence', {}).get('blob_storage'))
+        
+        # JSON mirrors are rewritten in the background, coalescing bursts of writes
+        mirror_settings = app_state.get('data_persistence', {}).get('json_mirror', {})
+        self.json_mirror = JSONMirrorWriter(
+            self.sync_learner_history_to_json,
+            mirror_settings.get('flush_interval_seconds', DEFAULT_FLUSH_INTERVAL_SECONDS)
+        )
+        if not read_only:
+            # Ensure data directory exists
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            
+            # Initialize database
+            self._initialize_database()
         
         # Cache for frequently accessed data
         self._profile_cache = {}
@@ -191,6 +314,47 @@ class LearnerManager:
                     )
                 ''')
                 
+                # Incremental scoring state per learner/skill
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS skill_scoring_state (
+                        learner_id TEXT NOT NULL,
+                        skill_id TEXT NOT NULL,
+                        decay_factor REAL NOT NULL,
+                        weighted_score_sum REAL NOT NULL,
+                        decayed_weight REAL NOT NULL,
+                        total_adjusted_evidence REAL NOT NULL,
+                        total_target_evidence REAL NOT NULL,
+                        activity_count INTEGER NOT NULL,
+                        last_activity_id TEXT,
+                        last_completion_timestamp TEXT,
+                        last_updated TEXT NOT NULL,
+                        PRIMARY KEY (learner_id, skill_id),
+                        FOREIGN KEY (learner_id) REFERENCES learner_profiles (learner_id)
+                    )
+                ''')
+                
+                # Checkpoints for resumable bulk maintenance jobs
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS maintenance_checkpoints (
+                        job_id TEXT PRIMARY KEY,
+                        position TEXT NOT NULL,
+                        parameters TEXT NOT NULL,
+                        processed INTEGER NOT NULL DEFAULT 0,
+                        last_updated TEXT NOT NULL
+                    )
+                ''')
+                
+                # Content-addressed, compressed JSON documents; evaluation_result and
+                # activity_transcript columns hold 'blob:<hash>' references into it
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS blobs (
+                        hash TEXT PRIMARY KEY,
+                        codec TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        data BLOB NOT NULL
+                    )
+                ''')
+                
                 # Add the new column to existing tables if it doesn't exist
                 try:
                     cursor.execute('''
@@ -208,6 +372,13 @@ class LearnerManager:
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_history_learner_skill ON activity_history (learner_id, skill_id)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_history_timestamp ON activity_history (completion_timestamp)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_history_evidence_weight ON activity_history (learner_id, skill_id, cumulative_evidence_weight)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_history_recent ON activity_history (learner_id, skill_id, completion_timestamp)')
+                # Partial indexes over blob references, for checking whether a blob is still used
+                for table, column in BLOB_REFERENCE_COLUMNS:
+                    cursor.execute(f'''
+                        CREATE INDEX IF NOT EXISTS idx_{table}_{column}_blob ON {table} ({column})
+                        WHERE {column} LIKE '{BLOB_REFERENCE_PREFIX}%'
+                    ''')
                 
                 conn.commit()
                 
@@ -219,18 +390,112 @@ class LearnerManager:
                                 str(e), {'db_path': self.db_path})
             raise
 
+    @property
+    def profiler(self):
+        """Pipeline profiler recording connection spans for the current thread, if any"""
+        return getattr(self._profiler_state, 'profiler', None)
+
+    @profiler.setter
+    def profiler(self, profiler):
+        self._profiler_state.profiler = profiler
+
     @contextmanager
     def _get_db_connection(self):
-        """Context manager for database connections with proper cleanup"""
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
+        """
+        Context manager for the calling thread's persistent database connection.
+        Uncommitted changes are rolled back when the outermost use exits.
+        """
+        profiler = self.profiler
+        with profiler.span('db.connection', 'sqlite') if profiler else nullcontext():
+            with self._connections.connection() as conn:
+                yield conn
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Batch every write made on this thread into one atomic commit.
+
+        Inside the block add_activity_record, add_activity_history_record,
+        update_skill_progress and apply_scoring_updates stage their writes and
+        return True; on a clean exit everything is written in a single transaction
+        and each learner's JSON mirror is marked dirty once, and an exception
+        discards it all. No transaction is open while the block runs, so slow work such as LLM
+        calls can sit inside it, but reads only see committed data. Nested units
+        join the outermost one.
+
+        Yields:
+            LearnerUnitOfWork: check `committed` after the block
+        """
+        unit = self._staged_writes()
+        if unit is not None:
+            yield unit
+            return
+
+        unit = LearnerUnitOfWork()
+        self._unit_of_work_state.unit = unit
         try:
-            yield conn
-        except Exception as e:
-            conn.rollback()
+            yield unit
+        except BaseException:
+            if unit.operations:
+                self.logger.log_system_event('learner_manager', 'unit_of_work_discarded',
+                                           f'Discarded {len(unit.operations)} staged writes')
             raise
         finally:
-            conn.close()
+            self._unit_of_work_state.unit = None
+        self._commit_unit_of_work(unit)
+
+    def _staged_writes(self) -> Optional[LearnerUnitOfWork]:
+        """The calling thread's open unit of work, if any"""
+        return getattr(self._unit_of_work_state, 'unit', None)
+
+    def _stage(self, unit: LearnerUnitOfWork, kind: str, payload: Any, sync_learner_id: Optional[str] = None) -> None:
+        unit.operations.append((kind, payload))
+        if sync_learner_id is not None and sync_learner_id not in unit.sync_learner_ids:
+            unit.sync_learner_ids.append(sync_learner_id)
+
+    def _commit_unit_of_work(self, unit: LearnerUnitOfWork) -> bool:
+        if not unit.operations:
+            unit.committed = True
+            return True
+
+        record_ids = []
+        try:
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                for kind, payload in unit.operations:
+                    if kind == 'activity_record':
+                        record_ids.append((payload, self._write_activity_record(cursor, payload)))
+                    elif kind == 'activity_history':
+                        self._write_activity_history_record(cursor, payload)
+                    elif kind == 'scoring_state':
+                        self._write_skill_scoring_state(cursor, payload)
+                    elif kind == 'drop_scoring_state':
+                        self._delete_skill_scoring_state(cursor, *payload)
+                    elif kind == 'skill_progress':
+                        self._write_skill_progress(cursor, payload)
+                    else:
+                        raise ValueError(f'Unknown staged write: {kind}')
+                conn.commit()
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to commit unit of work: {str(e)}',
+                                str(e), {'learner_ids': unit.sync_learner_ids, 'writes': len(unit.operations)})
+            return False
+
+        for record, record_id in record_ids:
+            record.record_id = record_id
+        unit.committed = True
+
+        writes: Dict[str, int] = {}
+        for kind, _ in unit.operations:
+            writes[kind] = writes.get(kind, 0) + 1
+        self.logger.log_system_event('learner_manager', 'unit_of_work_committed',
+                                   f'Committed {len(unit.operations)} staged writes in one transaction',
+                                   learner_ids=unit.sync_learner_ids, writes=writes)
+
+        for learner_id in unit.sync_learner_ids:
+            # Auto-sync to JSON file
+            self.json_mirror.mark_dirty(learner_id)
+        return True
 
     def create_learner(self, profile: LearnerProfile) -> bool:
         """
@@ -399,25 +664,17 @@ class LearnerManager:
             record: ActivityRecord instance
             
         Returns:
-            bool: True if added successfully
+            bool: True if added (or staged in an open unit of work, which sets
+            record_id when it commits)
         """
+        unit = self._staged_writes()
+        if unit is not None:
+            self._stage(unit, 'activity_record', record, record.learner_id)
+            return True
+        
         try:
             with self._get_db_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT INTO activity_records 
-                    (activity_id, learner_id, timestamp, evaluation_result, 
-                     activity_transcript, scored)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    record.activity_id, record.learner_id, record.timestamp,
-                    json.dumps(record.evaluation_result, ensure_ascii=False),
-                    json.dumps(record.activity_transcript, ensure_ascii=False),
-                    1 if record.scored else 0
-                ))
-                
-                record.record_id = cursor.lastrowid
+                record.record_id = self._write_activity_record(conn.cursor(), record)
                 conn.commit()
                 
             self.logger.log_system_event('learner_manager', 'activity_record_added',
@@ -425,12 +682,7 @@ class LearnerManager:
                                        {'activity_id': record.activity_id})
             
             # Auto-sync to JSON file
-            try:
-                json_path = f'data/learners/{record.learner_id}_history.json'
-                self.sync_learner_history_to_json(record.learner_id, json_path)
-            except Exception as e:
-                self.logger.log_error('learner_manager', f'Failed to auto-sync JSON after activity record: {str(e)}',
-                                    str(e), {'learner_id': record.learner_id, 'activity_id': record.activity_id})
+            self.json_mirror.mark_dirty(record.learner_id)
             
             return True
             
@@ -440,6 +692,20 @@ class LearnerManager:
                                         'activity_id': record.activity_id})
             return False
 
+    def _write_activity_record(self, cursor, record: ActivityRecord) -> int:
+        cursor.execute('''
+            INSERT INTO activity_records 
+            (activity_id, learner_id, timestamp, evaluation_result, 
+             activity_transcript, scored)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            record.activity_id, record.learner_id, record.timestamp,
+            self.blob_store.put_json(cursor, record.evaluation_result),
+            self.blob_store.put_json(cursor, record.activity_transcript),
+            1 if record.scored else 0
+        ))
+        return cursor.lastrowid
+
     def get_learner_activities(self, learner_id: str, limit: Optional[int] = None) -> List[ActivityRecord]:
         """
         Get activity records for a learner, ordered by most recent first.
@@ -477,8 +743,8 @@ class LearnerManager:
                         activity_id=row['activity_id'],
                         learner_id=row['learner_id'],
                         timestamp=row['timestamp'],
-                        evaluation_result=json.loads(row['evaluation_result']),
-                        activity_transcript=json.loads(row['activity_transcript']),
+                        evaluation_result=self.blob_store.get_json(cursor, row['evaluation_result']),
+                        activity_transcript=self.blob_store.get_json(cursor, row['activity_transcript']),
                         scored=bool(row['scored']),
                         record_id=row['id']
                     )
@@ -491,38 +757,124 @@ class LearnerManager:
                                 str(e), {'learner_id': learner_id})
             return []
 
-    def update_skill_progress(self, progress: SkillProgress) -> bool:
+    def get_learner_activity_summaries(self, learner_id: str, limit: Optional[int] = None) -> List[ActivitySummary]:
         """
-        Update or insert skill progress record.
+        Get lightweight activity projections for a learner, most recent first.
+        
+        Only ids, timestamps, scored flags and per-skill scores are read; the
+        evaluation_result and activity_transcript blobs are decoded lazily.
         
         Args:
-            progress: SkillProgress instance
+            learner_id: Learner identifier
+            limit: Maximum number of records to return
             
         Returns:
-            bool: True if updated successfully
+            List of ActivitySummary instances
         """
         try:
-            progress.last_updated = datetime.now(timezone.utc).isoformat()
-            
             with self._get_db_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    INSERT OR REPLACE INTO skill_progress 
-                    (skill_id, learner_id, skill_name, cumulative_score, 
-                     total_adjusted_evidence, activity_count, gate_1_status, 
-                     gate_2_status, overall_status, confidence_interval_lower,
-                     confidence_interval_upper, standard_error, last_updated)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    progress.skill_id, progress.learner_id, progress.skill_name,
-                    progress.cumulative_score, progress.total_adjusted_evidence,
-                    progress.activity_count, progress.gate_1_status,
-                    progress.gate_2_status, progress.overall_status,
-                    progress.confidence_interval_lower, progress.confidence_interval_upper,
-                    progress.standard_error, progress.last_updated
+                query = '''
+                    SELECT id, activity_id, learner_id, timestamp, scored
+                    FROM activity_records 
+                    WHERE learner_id = ? 
+                    ORDER BY timestamp DESC
+                '''
+                params = [learner_id]
+                
+                if limit:
+                    query += ' LIMIT ?'
+                    params.append(limit)
+                
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+                
+                history_query = '''
+                    SELECT activity_id, skill_id, activity_type, performance_score,
+                           adjusted_evidence_volume, cumulative_performance, cumulative_evidence
+                    FROM activity_history
+                    WHERE learner_id = ?
+                '''
+                history_params = [learner_id]
+                if limit:
+                    # Only the skill rows of the activities returned above
+                    activity_ids = sorted({row['activity_id'] for row in rows})
+                    history_query += f" AND activity_id IN ({', '.join('?' * len(activity_ids))})"
+                    history_params.extend(activity_ids)
+                
+                skill_rows: Dict[str, List[sqlite3.Row]] = {}
+                if rows:
+                    cursor.execute(history_query, history_params)
+                    for skill_row in cursor.fetchall():
+                        skill_rows.setdefault(skill_row['activity_id'], []).append(skill_row)
+            
+            summaries = []
+            for row in rows:
+                history_rows = skill_rows.get(row['activity_id'], [])
+                summaries.append(ActivitySummary(
+                    activity_id=row['activity_id'],
+                    learner_id=row['learner_id'],
+                    timestamp=row['timestamp'],
+                    scored=bool(row['scored']),
+                    record_id=row['id'],
+                    activity_type=history_rows[0]['activity_type'] if history_rows else None,
+                    skill_scores={
+                        skill_row['skill_id']: {
+                            'performance_score': skill_row['performance_score'],
+                            'adjusted_evidence': skill_row['adjusted_evidence_volume'],
+                            'cumulative_score': skill_row['cumulative_performance'],
+                            'cumulative_evidence': skill_row['cumulative_evidence']
+                        }
+                        for skill_row in history_rows
+                    },
+                    _blob_loader=self._load_activity_blobs
                 ))
+            
+            return summaries
                 
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to get learner activity summaries: {str(e)}',
+                                str(e), learner_id=learner_id)
+            return []
+
+    def _load_activity_blobs(self, record_id: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Fetch and decode the JSON blobs of a single activity record"""
+        try:
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT evaluation_result, activity_transcript
+                    FROM activity_records WHERE id = ?
+                ''', (record_id,))
+                row = cursor.fetchone()
+                if not row:
+                    return {}, {}
+                return (self.blob_store.get_json(cursor, row['evaluation_result']),
+                        self.blob_store.get_json(cursor, row['activity_transcript']))
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to load activity blobs for record {record_id}: {str(e)}',
+                                str(e))
+            return {}, {}
+
+    def update_skill_progress(self, progress: SkillProgress) -> bool:
+        """
+        Update or insert skill progress record.
+        
+        Args:
+            progress: SkillProgress instance
+            
+        Returns:
+            bool: True if updated (or staged in an open unit of work)
+        """
+        unit = self._staged_writes()
+        if unit is not None:
+            self._stage(unit, 'skill_progress', progress, progress.learner_id)
+            return True
+        
+        try:
+            with self._get_db_connection() as conn:
+                self._write_skill_progress(conn.cursor(), progress)
                 conn.commit()
                 
             self.logger.log_system_event('learner_manager', 'skill_progress_updated',
@@ -530,12 +882,7 @@ class LearnerManager:
                                        {'skill_id': progress.skill_id})
             
             # Auto-sync to JSON file
-            try:
-                json_path = f'data/learners/{progress.learner_id}_history.json'
-                self.sync_learner_history_to_json(progress.learner_id, json_path)
-            except Exception as e:
-                self.logger.log_error('learner_manager', f'Failed to auto-sync JSON after skill progress update: {str(e)}',
-                                    str(e), {'learner_id': progress.learner_id, 'skill_id': progress.skill_id})
+            self.json_mirror.mark_dirty(progress.learner_id)
             
             return True
             
@@ -545,6 +892,24 @@ class LearnerManager:
                                         'skill_id': progress.skill_id})
             return False
 
+    def _write_skill_progress(self, cursor, progress: SkillProgress) -> None:
+        progress.last_updated = datetime.now(timezone.utc).isoformat()
+        cursor.execute('''
+            INSERT OR REPLACE INTO skill_progress 
+            (skill_id, learner_id, skill_name, cumulative_score, 
+             total_adjusted_evidence, activity_count, gate_1_status, 
+             gate_2_status, overall_status, confidence_interval_lower,
+             confidence_interval_upper, standard_error, last_updated)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            progress.skill_id, progress.learner_id, progress.skill_name,
+            progress.cumulative_score, progress.total_adjusted_evidence,
+            progress.activity_count, progress.gate_1_status,
+            progress.gate_2_status, progress.overall_status,
+            progress.confidence_interval_lower, progress.confidence_interval_upper,
+            progress.standard_error, progress.last_updated
+        ))
+
     def get_skill_progress(self, learner_id: str) -> Dict[str, SkillProgress]:
         """
         Get all skill progress records for a learner.
@@ -710,6 +1075,10 @@ class LearnerManager:
         """
         Sync learner data from database to JSON file format.
         
+        Writes synchronously; LearnerManager's own writes go through
+        json_mirror.mark_dirty instead. Only the columns the mirror shows are
+        read, and the file is replaced atomically.
+        
         Args:
             learner_id: Learner identifier
             json_path: Path for JSON file (defaults to data/learners/{learner_id}_history.json)
@@ -718,51 +1087,65 @@ class LearnerManager:
             bool: True if sync successful
         """
         try:
-            # Get learner profile
-            profile = self.get_learner(learner_id)
-            if not profile:
-                self.logger.log_error('learner_manager', f'Learner not found: {learner_id}',
-                                    'not_found', {'learner_id': learner_id})
-                return False
-            
-            # Get all activities from database
-            activities = self.get_learner_activities(learner_id)
-            
-            # Get skill progress from database
-            skill_progress = self.get_skill_progress(learner_id)
-            
-            # Build activity list for JSON format
-            activity_list = []
-            for activity in activities:
-                activity_list.append(activity.activity_id)
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                
+                # Get learner profile
+                cursor.execute('''
+                    SELECT name, email, enrollment_date, status, background, experience_level,
+                           created, last_updated
+                    FROM learner_profiles WHERE learner_id = ?
+                ''', (learner_id,))
+                profile = cursor.fetchone()
+                if not profile:
+                    self.logger.log_error('learner_manager', f'Learner not found: {learner_id}',
+                                        'not_found', {'learner_id': learner_id})
+                    return False
+                
+                # Activity ids only; the evaluation and transcript blobs aren't mirrored
+                cursor.execute('''
+                    SELECT activity_id FROM activity_records 
+                    WHERE learner_id = ? 
+                    ORDER BY timestamp DESC
+                ''', (learner_id,))
+                activity_list = [row['activity_id'] for row in cursor.fetchall()]
+                
+                cursor.execute('''
+                    SELECT skill_id, skill_name, cumulative_score, total_adjusted_evidence,
+                           activity_count, gate_1_status, gate_2_status, overall_status, last_updated
+                    FROM skill_progress 
+                    WHERE learner_id = ? 
+                    ORDER BY last_updated DESC
+                ''', (learner_id,))
+                progress_rows = cursor.fetchall()
             
             # Build skill progress for JSON format
             skill_progress_json = {}
-            for skill_id, progress in skill_progress.items():
-                skill_progress_json[skill_id] = {
-                    'skill_name': progress.skill_name,
-                    'cumulative_score': progress.cumulative_score,
-                    'total_adjusted_evidence': progress.total_adjusted_evidence,
-                    'activity_count': progress.activity_count,
-                    'gate_1_status': progress.gate_1_status,
-                    'gate_2_status': progress.gate_2_status,
-                    'overall_status': progress.overall_status,
-                    'last_activity_date': progress.last_updated,
+            for progress in progress_rows:
+                skill_progress_json[progress['skill_id']] = {
+                    'skill_name': progress['skill_name'],
+                    'cumulative_score': progress['cumulative_score'],
+                    'total_adjusted_evidence': progress['total_adjusted_evidence'],
+                    'activity_count': progress['activity_count'],
+                    'gate_1_status': progress['gate_1_status'],
+                    'gate_2_status': progress['gate_2_status'],
+                    'overall_status': progress['overall_status'],
+                    'last_activity_date': progress['last_updated'],
                     'activities': []  # Will be populated from activity records
                 }
             
             # Build complete learner history JSON
             learner_history = {
                 'learner_id': learner_id,
-                'created': profile.created,
-                'last_updated': profile.last_updated,
+                'created': profile['created'],
+                'last_updated': profile['last_updated'],
                 'profile': {
-                    'name': profile.name,
-                    'email': profile.email,
-                    'enrollment_date': profile.enrollment_date,
-                    'status': profile.status,
-                    'background': profile.background,
-                    'experience_level': profile.experience_level
+                    'name': profile['name'],
+                    'email': profile['email'],
+                    'enrollment_date': profile['enrollment_date'],
+                    'status': profile['status'],
+                    'background': profile['background'],
+                    'experience_level': profile['experience_level']
                 },
                 'activities': activity_list,
                 'skill_progress': skill_progress_json,
@@ -770,20 +1153,27 @@ class LearnerManager:
                 'metadata': {
                     'total_activities': len(activity_list),
                     'total_time_minutes': 0,  # Could be calculated from activity records
-                    'last_activity_date': profile.last_updated
+                    'last_activity_date': profile['last_updated']
                 }
             }
             
             # Determine JSON file path
             if json_path is None:
-                json_path = f'data/learners/{learner_id}_history.json'
+                json_path = os.path.join(self.json_mirror_dir, f'{learner_id}_history.json')
             
             # Ensure directory exists
-            os.makedirs(os.path.dirname(json_path), exist_ok=True)
+            os.makedirs(os.path.dirname(json_path) or '.', exist_ok=True)
             
-            # Write JSON file
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(learner_history, f, indent=2, ensure_ascii=False)
+            # Write a temporary file and rename it over the mirror, so readers
+            # never see a partially written file
+            temp_path = f'{json_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(learner_history, f, indent=2, ensure_ascii=False)
+                os.replace(temp_path, json_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
             
             self.logger.log_system_event('learner_manager', 'learner_history_synced',
                                        f'Learner history synced to JSON for {learner_id}',
@@ -816,6 +1206,9 @@ class LearnerManager:
                 cursor.execute('SELECT COUNT(*) FROM skill_progress')
                 skill_progress_count = cursor.fetchone()[0]
                 
+                cursor.execute('SELECT COUNT(*), TOTAL(size), TOTAL(LENGTH(data)) FROM blobs')
+                blob_count, blob_bytes, blob_stored_bytes = cursor.fetchone()
+                
                 # Get database file size
                 db_size = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
                 
@@ -823,6 +1216,9 @@ class LearnerManager:
                     'total_learners': learner_count,
                     'total_activity_records': activity_count,
                     'total_skill_progress_records': skill_progress_count,
+                    'total_blobs': blob_count,
+                    'blob_bytes': int(blob_bytes),
+                    'blob_stored_bytes': int(blob_stored_bytes),
                     'database_size_bytes': db_size,
                     'database_path': self.db_path,
                     'cache_entries': len(self._profile_cache)
@@ -839,36 +1235,44 @@ class LearnerManager:
                                    cumulative_evidence_weight: float, decay_factor: float,
                                    decay_adjusted_evidence_volume: float,
                                    cumulative_performance: float, cumulative_evidence: float,
-                                   evaluation_result: Dict, activity_transcript: Dict) -> bool:
+                                   evaluation_result: Dict, activity_transcript: Dict,
+                                   scoring_state: Optional[SkillScoringState] = None) -> bool:
         """
         Add new row to activity history table with decay-adjusted evidence.
         
         Args:
             All the parameters for the activity history record
+            scoring_state: Optional updated scoring state, written in the same transaction
             
         Returns:
-            bool: True if added successfully
+            bool: True if added (or staged in an open unit of work)
         """
+        record = {
+            'learner_id': learner_id, 'activity_id': activity_id, 'skill_id': skill_id,
+            'completion_timestamp': completion_timestamp, 'activity_type': activity_type,
+            'activity_title': activity_title, 'performance_score': performance_score,
+            'target_evidence_volume': target_evidence_volume, 'validity_modifier': validity_modifier,
+            'adjusted_evidence_volume': adjusted_evidence_volume,
+            'cumulative_evidence_weight': cumulative_evidence_weight, 'decay_factor': decay_factor,
+            'decay_adjusted_evidence_volume': decay_adjusted_evidence_volume,
+            'cumulative_performance': cumulative_performance, 'cumulative_evidence': cumulative_evidence,
+            'evaluation_result': evaluation_result, 'activity_transcript': activity_transcript
+        }
+        unit = self._staged_writes()
+        if unit is not None:
+            self._stage(unit, 'activity_history', record)
+            if scoring_state is not None:
+                self._stage(unit, 'scoring_state', scoring_state)
+            return True
+        
         try:
             with self._get_db_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    INSERT OR REPLACE INTO activity_history 
-                    (learner_id, activity_id, skill_id, completion_timestamp, activity_type,
-                     activity_title, performance_score, target_evidence_volume, validity_modifier,
-                     adjusted_evidence_volume, cumulative_evidence_weight, decay_factor,
-                     decay_adjusted_evidence_volume, cumulative_performance, cumulative_evidence, 
-                     evaluation_result, activity_transcript)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    learner_id, activity_id, skill_id, completion_timestamp, activity_type,
-                    activity_title, performance_score, target_evidence_volume, validity_modifier,
-                    adjusted_evidence_volume, cumulative_evidence_weight, decay_factor,
-                    decay_adjusted_evidence_volume, cumulative_performance, cumulative_evidence,
-                    json.dumps(evaluation_result, ensure_ascii=False),
-                    json.dumps(activity_transcript, ensure_ascii=False)
-                ))
+                self._write_activity_history_record(cursor, record)
+                
+                if scoring_state is not None:
+                    self._write_skill_scoring_state(cursor, scoring_state)
                 
                 conn.commit()
                 
@@ -882,6 +1286,208 @@ class LearnerManager:
                                 str(e), {'learner_id': learner_id, 'activity_id': activity_id, 'skill_id': skill_id})
             return False
 
+    def _write_activity_history_record(self, cursor, record: Dict[str, Any]) -> None:
+        cursor.execute('''
+            INSERT OR REPLACE INTO activity_history 
+            (learner_id, activity_id, skill_id, completion_timestamp, activity_type,
+             activity_title, performance_score, target_evidence_volume, validity_modifier,
+             adjusted_evidence_volume, cumulative_evidence_weight, decay_factor,
+             decay_adjusted_evidence_volume, cumulative_performance, cumulative_evidence, 
+             evaluation_result, activity_transcript)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            record['learner_id'], record['activity_id'], record['skill_id'], record['completion_timestamp'],
+            record['activity_type'], record['activity_title'], record['performance_score'],
+            record['target_evidence_volume'], record['validity_modifier'], record['adjusted_evidence_volume'],
+            record['cumulative_evidence_weight'], record['decay_factor'], record['decay_adjusted_evidence_volume'],
+            record['cumulative_performance'], record['cumulative_evidence'],
+            self.blob_store.put_json(cursor, record['evaluation_result']),
+            self.blob_store.put_json(cursor, record['activity_transcript'])
+        ))
+
+    def apply_scoring_updates(self, learner_id: str, history_records: List[Dict[str, Any]],
+                              scoring_states: List[SkillScoringState],
+                              skill_progress: List[SkillProgress],
+                              stale_skill_ids: Optional[List[str]] = None) -> bool:
+        """
+        Persist everything one scored activity produces in a single transaction:
+        its activity history rows, the updated scoring state and skill progress for
+        every targeted skill. The JSON mirror is synced once afterwards.
+        
+        Args:
+            learner_id: Learner identifier
+            history_records: activity_history rows (keyword fields of add_activity_history_record)
+            scoring_states: Updated SkillScoringState per skill
+            skill_progress: SkillProgress per skill
+            stale_skill_ids: Skills whose scoring state no longer matches the history
+                and is dropped (rebuilt on the next full scoring or by rebuild_scoring_state.py)
+            
+        Returns:
+            bool: True if committed (or staged in an open unit of work)
+        """
+        unit = self._staged_writes()
+        if unit is not None:
+            for record in history_records:
+                self._stage(unit, 'activity_history', record)
+            for state in scoring_states:
+                self._stage(unit, 'scoring_state', state)
+            for skill_id in stale_skill_ids or []:
+                self._stage(unit, 'drop_scoring_state', (learner_id, skill_id))
+            for progress in skill_progress:
+                self._stage(unit, 'skill_progress', progress, learner_id)
+            return True
+        
+        try:
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                for record in history_records:
+                    self._write_activity_history_record(cursor, record)
+                for state in scoring_states:
+                    self._write_skill_scoring_state(cursor, state)
+                for skill_id in stale_skill_ids or []:
+                    self._delete_skill_scoring_state(cursor, learner_id, skill_id)
+                for progress in skill_progress:
+                    self._write_skill_progress(cursor, progress)
+                conn.commit()
+                
+            self.logger.log_system_event('learner_manager', 'scoring_updates_applied',
+                                       f'Scoring updates applied for learner {learner_id}',
+                                       {'activity_ids': sorted({record['activity_id'] for record in history_records}),
+                                        'skill_ids': [progress.skill_id for progress in skill_progress]})
+            
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to apply scoring updates: {str(e)}',
+                                str(e), {'learner_id': learner_id})
+            return False
+        
+        if skill_progress:
+            # Auto-sync to JSON file
+            self.json_mirror.mark_dirty(learner_id)
+        return True
+
+    def migrate_json_to_blobs(self, chunk_size: int = 500,
+                              progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Move evaluation_result and activity_transcript JSON still stored inline in
+        activity_records and activity_history into the blobs table, leaving
+        references behind.
+        
+        Each chunk of rows is converted in its own transaction. Converted rows
+        are skipped, so an interrupted run simply continues when run again.
+        The freed pages are only returned to the filesystem by a VACUUM.
+        
+        Args:
+            chunk_size: Rows converted per transaction
+            progress_callback: Called with the running report after every chunk
+            
+        Returns:
+            Report with rows converted and inline/blob byte counts, or None on failure
+        """
+        report = {'activity_records': 0, 'activity_history': 0, 'inline_bytes': 0, 'blobs_created': 0}
+        try:
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT COUNT(*) FROM blobs')
+                blobs_before = cursor.fetchone()[0]
+                for table in ('activity_records', 'activity_history'):
+                    after_id = 0
+                    while True:
+                        cursor.execute(f'''
+                            SELECT id, evaluation_result, activity_transcript FROM {table}
+                            WHERE id > ? AND (
+                                (evaluation_result IS NOT NULL AND evaluation_result NOT LIKE '{BLOB_REFERENCE_PREFIX}%') OR
+                                (activity_transcript IS NOT NULL AND activity_transcript NOT LIKE '{BLOB_REFERENCE_PREFIX}%'))
+                            ORDER BY id LIMIT ?
+                        ''', (after_id, chunk_size))
+                        rows = cursor.fetchall()
+                        if not rows:
+                            break
+                        updates = []
+                        for row in rows:
+                            values = []
+                            for column in ('evaluation_result', 'activity_transcript'):
+                                stored = row[column]
+                                if stored is None or stored.startswith(BLOB_REFERENCE_PREFIX):
+                                    values.append(stored)
+                                else:
+                                    report['inline_bytes'] += len(stored.encode('utf-8'))
+                                    values.append(self.blob_store.put_text(cursor, stored))
+                            updates.append((*values, row['id']))
+                        cursor.executemany(f'''
+                            UPDATE {table} SET evaluation_result = ?, activity_transcript = ? WHERE id = ?
+                        ''', updates)
+                        conn.commit()
+                        after_id = rows[-1]['id']
+                        report[table] += len(rows)
+                        if progress_callback:
+                            progress_callback(dict(report))
+                
+                cursor.execute('SELECT COUNT(*), TOTAL(LENGTH(data)) FROM blobs')
+                blob_count, blob_stored_bytes = cursor.fetchone()
+            report['blobs_created'] = blob_count - blobs_before
+            report['blob_stored_bytes'] = int(blob_stored_bytes)
+            
+            self.logger.log_system_event('learner_manager', 'blob_migration_complete',
+                                       f"Moved JSON of {report['activity_records']} activity records and "
+                                       f"{report['activity_history']} activity history rows into blobs",
+                                       **report)
+            return report
+            
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to migrate JSON to blobs: {str(e)}', str(e), report)
+            return None
+
+    def prune_unreferenced_blobs(self) -> int:
+        """
+        Delete blobs no activity record or activity history row references.
+        
+        Returns:
+            Number of blobs deleted, or -1 on failure
+        """
+        try:
+            with self._get_db_connection() as conn:
+                deleted = self._delete_unreferenced_blobs(conn.cursor())
+                conn.commit()
+            return deleted
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to prune blobs: {str(e)}', str(e))
+            return -1
+
+    def _delete_unreferenced_blobs(self, cursor, hashes: Optional[Set[str]] = None) -> int:
+        """Delete the given blobs, or every blob, that nothing references any more"""
+        if hashes is None:
+            references = ' UNION '.join(
+                f"SELECT SUBSTR({column}, {len(BLOB_REFERENCE_PREFIX) + 1}) FROM {table} "
+                f"WHERE {column} LIKE '{BLOB_REFERENCE_PREFIX}%'"
+                for table, column in BLOB_REFERENCE_COLUMNS
+            )
+            cursor.execute(f'DELETE FROM blobs WHERE hash NOT IN ({references})')
+            return cursor.rowcount
+        
+        # One partial index lookup per column for each candidate
+        still_referenced = ' OR '.join(
+            f"EXISTS (SELECT 1 FROM {table} WHERE {column} = :reference "
+            f"AND {column} LIKE '{BLOB_REFERENCE_PREFIX}%')"
+            for table, column in BLOB_REFERENCE_COLUMNS
+        )
+        deleted = 0
+        for content_hash in sorted(hashes):
+            cursor.execute(f'DELETE FROM blobs WHERE hash = :hash AND NOT ({still_referenced})',
+                           {'hash': content_hash, 'reference': BLOB_REFERENCE_PREFIX + content_hash})
+            deleted += cursor.rowcount
+        return deleted
+
+    def _learner_blob_hashes(self, cursor, learner_id: str) -> Set[str]:
+        """Hashes of the blobs a learner's activity records and history reference"""
+        hashes = set()
+        for table, column in BLOB_REFERENCE_COLUMNS:
+            cursor.execute(f"""
+                SELECT DISTINCT SUBSTR({column}, {len(BLOB_REFERENCE_PREFIX) + 1}) FROM {table}
+                WHERE learner_id = ? AND {column} LIKE '{BLOB_REFERENCE_PREFIX}%'
+            """, (learner_id,))
+            hashes.update(row[0] for row in cursor.fetchall())
+        return hashes
+
     def reset_learner_history(self, learner_id: str) -> bool:
         """
         Reset all learner history data including activity history, skill progress, and activity records.
@@ -899,6 +1505,9 @@ class LearnerManager:
                 # Temporarily disable foreign key constraints
                 cursor.execute('PRAGMA foreign_keys = OFF')
                 
+                # Blobs the rows below reference, checked for other references afterwards
+                blob_hashes = self._learner_blob_hashes(cursor, learner_id)
+                
                 # Delete all activity history records
                 cursor.execute('DELETE FROM activity_history WHERE learner_id = ?', (learner_id,))
                 activity_history_deleted = cursor.rowcount
@@ -907,10 +1516,16 @@ class LearnerManager:
                 cursor.execute('DELETE FROM skill_progress WHERE learner_id = ?', (learner_id,))
                 skill_progress_deleted = cursor.rowcount
                 
+                # Delete incremental scoring state
+                cursor.execute('DELETE FROM skill_scoring_state WHERE learner_id = ?', (learner_id,))
+                
                 # Delete all activity records
                 cursor.execute('DELETE FROM activity_records WHERE learner_id = ?', (learner_id,))
                 activity_records_deleted = cursor.rowcount
                 
+                # Drop JSON blobs only those rows referenced
+                self._delete_unreferenced_blobs(cursor, blob_hashes)
+                
                 # Re-enable foreign key constraints
                 cursor.execute('PRAGMA foreign_keys = ON')
                 
@@ -970,6 +1585,486 @@ class LearnerManager:
                                 str(e), {'learner_id': learner_id, 'skill_id': skill_id})
             return []
 
+    def has_activity_history_record(self, learner_id: str, activity_id: str, skill_id: str) -> bool:
+        """
+        Check whether an activity already has a history row for a skill.
+        
+        Args:
+            learner_id: Learner identifier
+            activity_id: Activity identifier
+            skill_id: Skill identifier
+            
+        Returns:
+            bool: True if a row exists
+        """
+        try:
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT 1 FROM activity_history 
+                    WHERE learner_id = ? AND activity_id = ? AND skill_id = ?
+                ''', (learner_id, activity_id, skill_id))
+                return cursor.fetchone() is not None
+                
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to check activity history: {str(e)}',
+                                str(e), {'learner_id': learner_id, 'activity_id': activity_id, 'skill_id': skill_id})
+            return False
+
+    def get_activity_history_skill_pairs(self, learner_id: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Get the distinct (learner_id, skill_id) pairs that have activity history.
+        
+        Args:
+            learner_id: Optional learner to restrict to
+            
+        Returns:
+            List of (learner_id, skill_id) tuples
+        """
+        try:
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                query = 'SELECT DISTINCT learner_id, skill_id FROM activity_history'
+                params = ()
+                if learner_id:
+                    query += ' WHERE learner_id = ?'
+                    params = (learner_id,)
+                cursor.execute(query + ' ORDER BY learner_id, skill_id', params)
+                return [(row['learner_id'], row['skill_id']) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to get activity history skill pairs: {str(e)}',
+                                str(e), {'learner_id': learner_id})
+            return []
+
+    def get_activity_history_for_scoring(self, learner_ids: Optional[List[str]] = None,
+                                         skill_ids: Optional[List[str]] = None) -> List[sqlite3.Row]:
+        """
+        Get the scoring columns of activity history for many learners in one query.
+        
+        Args:
+            learner_ids: Optional learners to restrict to. If None, covers all learners.
+            skill_ids: Optional skills to restrict to
+            
+        Returns:
+            Rows grouped by learner and skill, each group in chronological order
+        """
+        try:
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                query = '''
+                    SELECT learner_id, skill_id, performance_score,
+                           target_evidence_volume, validity_modifier
+                    FROM activity_history
+                '''
+                conditions = []
+                params: List[str] = []
+                if learner_ids:
+                    conditions.append(f"learner_id IN ({', '.join('?' for _ in learner_ids)})")
+                    params.extend(learner_ids)
+                if skill_ids:
+                    conditions.append(f"skill_id IN ({', '.join('?' for _ in skill_ids)})")
+                    params.extend(skill_ids)
+                if conditions:
+                    query += ' WHERE ' + ' AND '.join(conditions)
+                query += ' ORDER BY learner_id, skill_id, completion_timestamp ASC'
+                cursor.execute(query, params)
+                return cursor.fetchall()
+                
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to get activity history for scoring: {str(e)}',
+                                str(e), {'learner_count': len(learner_ids) if learner_ids else None})
+            return []
+
+    def count_activity_history_groups(self, learner_id: Optional[str] = None,
+                                      learner_ids: Optional[List[str]] = None) -> int:
+        """
+        Count distinct (learner_id, skill_id) pairs in activity history.
+        
+        Args:
+            learner_id: Optional learner to restrict to
+            learner_ids: Optional learners to restrict to
+            
+        Returns:
+            int: Number of learner/skill pairs
+        """
+        try:
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                where, params = self._activity_history_group_filter(
+                    [learner_id] if learner_id else learner_ids
+                )
+                cursor.execute('SELECT COUNT(*) AS count FROM (SELECT DISTINCT learner_id, skill_id '
+                               f'FROM activity_history{where})', params)
+                return cursor.fetchone()['count']
+                
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to count activity history groups: {str(e)}',
+                                str(e), {'learner_id': learner_id, 'learner_ids': learner_ids})
+            return 0
+
+    def get_activity_history_evidence_chunk(self, after: Optional[Tuple[str, str]] = None,
+                                            group_limit: int = 200,
+                                            learner_id: Optional[str] = None) -> List[sqlite3.Row]:
+        """
+        Get the evidence columns of the next chunk of learner/skill groups.
+        
+        Groups are taken in (learner_id, skill_id) order starting after the given
+        key, so callers can page through the whole table with constant memory.
+        
+        Args:
+            after: (learner_id, skill_id) of the last group already processed
+            group_limit: Maximum number of learner/skill groups in the chunk
+            learner_id: Optional learner to restrict to
+            
+        Returns:
+            Rows (id, learner_id, skill_id, adjusted_evidence_volume) grouped by
+            learner and skill, each group ordered most recent first
+        """
+        try:
+            return self._get_activity_history_group_chunk(
+                'id, learner_id, skill_id, adjusted_evidence_volume',
+                'completion_timestamp DESC, id DESC',
+                after, group_limit, [learner_id] if learner_id else None
+            )
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to get activity history chunk: {str(e)}',
+                                str(e), {'after': after, 'learner_id': learner_id})
+            raise
+
+    def get_activity_history_scoring_chunk(self, after: Optional[Tuple[str, str]] = None,
+                                           group_limit: int = 200,
+                                           learner_ids: Optional[List[str]] = None,
+                                           with_evaluations: bool = False) -> List[Any]:
+        """
+        Get the scoring and derived columns of the next chunk of learner/skill groups.
+        
+        Paged like get_activity_history_evidence_chunk, but each group is ordered
+        oldest first so it can be recomputed with a single prefix scan.
+        
+        Args:
+            after: (learner_id, skill_id) of the last group already processed
+            group_limit: Maximum number of learner/skill groups in the chunk
+            learner_ids: Optional learners to restrict to
+            with_evaluations: Also return, as evaluation_result, the decoded pipeline
+                evaluation of each row's latest activity record (None if there is none)
+            
+        Returns:
+            Rows grouped by learner and skill, each group in chronological order
+            (dicts when with_evaluations is set)
+        """
+        try:
+            rows = self._get_activity_history_group_chunk(
+                '''id, learner_id, skill_id, activity_id, completion_timestamp, performance_score,
+                   target_evidence_volume, validity_modifier, adjusted_evidence_volume,
+                   cumulative_evidence_weight, decay_factor, decay_adjusted_evidence_volume,
+                   cumulative_performance, cumulative_evidence''',
+                'completion_timestamp ASC, id ASC',
+                after, group_limit, learner_ids
+            )
+            if not with_evaluations or not rows:
+                return rows
+            
+            chunk_learners = sorted({row['learner_id'] for row in rows})
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT learner_id, activity_id, evaluation_result FROM activity_records
+                    WHERE learner_id IN ({', '.join('?' for _ in chunk_learners)})
+                    ORDER BY id ASC
+                ''', chunk_learners)
+                # Later records of a repeated activity replace earlier ones
+                stored = {(record['learner_id'], record['activity_id']): record['evaluation_result']
+                          for record in cursor.fetchall()}
+                evaluations = {}
+                for row in rows:
+                    key = (row['learner_id'], row['activity_id'])
+                    if key not in evaluations:
+                        evaluations[key] = self.blob_store.get_json(cursor, stored.get(key))
+            return [{**dict(row), 'evaluation_result': evaluations[(row['learner_id'], row['activity_id'])]}
+                    for row in rows]
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to get activity history chunk: {str(e)}',
+                                str(e), {'after': after, 'learner_ids': learner_ids})
+            raise
+
+    def _activity_history_group_filter(self, learner_ids: Optional[List[str]] = None,
+                                       after: Optional[Tuple[str, str]] = None) -> Tuple[str, List[Any]]:
+        """WHERE clause and parameters restricting activity history to learners and groups after a key"""
+        conditions = []
+        params: List[Any] = []
+        if learner_ids:
+            conditions.append(f"learner_id IN ({', '.join('?' for _ in learner_ids)})")
+            params.extend(learner_ids)
+        if after:
+            conditions.append('(learner_id, skill_id) > (?, ?)')
+            params.extend(after)
+        where = (' WHERE ' + ' AND '.join(conditions)) if conditions else ''
+        return where, params
+
+    def _get_activity_history_group_chunk(self, columns: str, group_order: str,
+                                          after: Optional[Tuple[str, str]], group_limit: int,
+                                          learner_ids: Optional[List[str]]) -> List[sqlite3.Row]:
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            where, params = self._activity_history_group_filter(learner_ids, after)
+            
+            # Last group key in this chunk
+            cursor.execute(f'''
+                SELECT learner_id, skill_id FROM (
+                    SELECT DISTINCT learner_id, skill_id FROM activity_history{where}
+                    ORDER BY learner_id, skill_id LIMIT ?
+                ) ORDER BY learner_id DESC, skill_id DESC LIMIT 1
+            ''', params + [group_limit])
+            last_key = cursor.fetchone()
+            if last_key is None:
+                return []
+            
+            upper = ' AND ' if where else ' WHERE '
+            cursor.execute(f'''
+                SELECT {columns}
+                FROM activity_history{where}{upper}(learner_id, skill_id) <= (?, ?)
+                ORDER BY learner_id, skill_id, {group_order}
+            ''', params + [last_key['learner_id'], last_key['skill_id']])
+            return cursor.fetchall()
+
+    def bulk_update_decay_adjusted_evidence(self, updates: List[Tuple[float, int]],
+                                            checkpoint: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Write decay-adjusted evidence for many activity history rows in one transaction.
+        
+        Args:
+            updates: (new_decay_adjusted_evidence, activity_history id) pairs
+            checkpoint: Optional maintenance checkpoint (job_id, position, parameters,
+                processed) committed atomically with the updates
+            
+        Returns:
+            int: Number of rows updated
+        """
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                UPDATE activity_history 
+                SET decay_adjusted_evidence_volume = ?1, cumulative_evidence_weight = ?1
+                WHERE id = ?2
+            ''', updates)
+            updated = cursor.rowcount
+            if checkpoint is not None:
+                self._write_maintenance_checkpoint(cursor, **checkpoint)
+            conn.commit()
+        return updated
+
+    def bulk_update_activity_history_derived(self, updates: List[Dict[str, Any]],
+                                             scoring_states: Optional[List[SkillScoringState]] = None,
+                                             checkpoint: Optional[Dict[str, Any]] = None,
+                                             rescored: bool = False) -> int:
+        """
+        Write recomputed derived columns for many activity history rows in one transaction.
+        
+        Args:
+            updates: Dicts with the activity_history id and new cumulative_performance,
+                cumulative_evidence, decay_adjusted_evidence_volume and decay_factor
+            scoring_states: Optional rebuilt SkillScoringState per group, written alongside
+            checkpoint: Optional maintenance checkpoint (job_id, position, parameters,
+                processed) committed atomically with the updates
+            rescored: The updates also carry performance_score, target_evidence_volume,
+                validity_modifier and adjusted_evidence_volume
+            
+        Returns:
+            int: Number of rows updated
+        """
+        scored_columns = '''performance_score = :performance_score,
+                    target_evidence_volume = :target_evidence_volume,
+                    validity_modifier = :validity_modifier,
+                    adjusted_evidence_volume = :adjusted_evidence_volume,
+                    ''' if rescored else ''
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(f'''
+                UPDATE activity_history 
+                SET {scored_columns}cumulative_performance = :cumulative_performance,
+                    cumulative_evidence = :cumulative_evidence,
+                    decay_adjusted_evidence_volume = :decay_adjusted_evidence_volume,
+                    cumulative_evidence_weight = :decay_adjusted_evidence_volume,
+                    decay_factor = :decay_factor
+                WHERE id = :id
+            ''', updates)
+            updated = cursor.rowcount
+            for state in scoring_states or []:
+                self._write_skill_scoring_state(cursor, state)
+            if checkpoint is not None:
+                self._write_maintenance_checkpoint(cursor, **checkpoint)
+            conn.commit()
+        return updated
+
+    def get_maintenance_checkpoint(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the saved position of a resumable maintenance job.
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            Dict with position, parameters and processed count, or None if not started
+        """
+        try:
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT * FROM maintenance_checkpoints WHERE job_id = ?', (job_id,))
+                row = cursor.fetchone()
+            if not row:
+                return None
+            return {
+                'job_id': row['job_id'],
+                'position': json.loads(row['position']),
+                'parameters': json.loads(row['parameters']),
+                'processed': row['processed'],
+                'last_updated': row['last_updated']
+            }
+            
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to get maintenance checkpoint: {str(e)}',
+                                str(e), {'job_id': job_id})
+            return None
+
+    def clear_maintenance_checkpoint(self, job_id: str) -> bool:
+        """
+        Remove the checkpoint of a finished maintenance job.
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            bool: True if removed successfully
+        """
+        try:
+            with self._get_db_connection() as conn:
+                conn.execute('DELETE FROM maintenance_checkpoints WHERE job_id = ?', (job_id,))
+                conn.commit()
+            return True
+            
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to clear maintenance checkpoint: {str(e)}',
+                                str(e), {'job_id': job_id})
+            return False
+
+    def _write_maintenance_checkpoint(self, cursor, job_id: str, position: Any,
+                                      parameters: Dict[str, Any], processed: int) -> None:
+        cursor.execute('''
+            INSERT OR REPLACE INTO maintenance_checkpoints 
+            (job_id, position, parameters, processed, last_updated)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (job_id, json.dumps(position), json.dumps(parameters, sort_keys=True), processed,
+              datetime.now(timezone.utc).isoformat()))
+
+    def get_skill_scoring_context(self, learner_id: str, activity_id: str,
+                                  skill_ids: List[str]) -> Dict[str, Any]:
+        """
+        Everything ScoringEngine needs to decide on incremental scoring for an
+        activity's skills, read over one connection.
+        
+        Args:
+            learner_id: Learner identifier
+            activity_id: Activity being scored
+            skill_ids: Skills the activity targets
+            
+        Returns:
+            Dict with 'states' (skill_id -> SkillScoringState), 'recorded_skills'
+            (skills this activity already has history rows for) and
+            'skills_with_history'
+        """
+        context = {'states': {}, 'recorded_skills': set(), 'skills_with_history': set()}
+        if not skill_ids:
+            return context
+        placeholders = ', '.join('?' for _ in skill_ids)
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT * FROM skill_scoring_state 
+                WHERE learner_id = ? AND skill_id IN ({placeholders})
+            ''', [learner_id, *skill_ids])
+            context['states'] = {row['skill_id']: SkillScoringState(**dict(row)) for row in cursor.fetchall()}
+            
+            cursor.execute(f'''
+                SELECT skill_id FROM activity_history 
+                WHERE learner_id = ? AND activity_id = ? AND skill_id IN ({placeholders})
+            ''', [learner_id, activity_id, *skill_ids])
+            context['recorded_skills'] = {row['skill_id'] for row in cursor.fetchall()}
+            
+            cursor.execute(f'''
+                SELECT DISTINCT skill_id FROM activity_history 
+                WHERE learner_id = ? AND skill_id IN ({placeholders})
+            ''', [learner_id, *skill_ids])
+            context['skills_with_history'] = {row['skill_id'] for row in cursor.fetchall()}
+        return context
+
+    def get_skill_scoring_state(self, learner_id: str, skill_id: str) -> Optional[SkillScoringState]:
+        """
+        Get the persisted incremental scoring state for a learner/skill.
+        
+        Args:
+            learner_id: Learner identifier
+            skill_id: Skill identifier
+            
+        Returns:
+            SkillScoringState if one has been stored, None otherwise
+        """
+        try:
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT * FROM skill_scoring_state 
+                    WHERE learner_id = ? AND skill_id = ?
+                ''', (learner_id, skill_id))
+                row = cursor.fetchone()
+                return SkillScoringState(**dict(row)) if row else None
+                
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to get skill scoring state: {str(e)}',
+                                str(e), {'learner_id': learner_id, 'skill_id': skill_id})
+            return None
+
+    def save_skill_scoring_state(self, state: SkillScoringState) -> bool:
+        """
+        Insert or replace the incremental scoring state for a learner/skill.
+        
+        Args:
+            state: SkillScoringState instance
+            
+        Returns:
+            bool: True if saved successfully
+        """
+        try:
+            with self._get_db_connection() as conn:
+                self._write_skill_scoring_state(conn.cursor(), state)
+                conn.commit()
+            return True
+            
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to save skill scoring state: {str(e)}',
+                                str(e), {'learner_id': state.learner_id, 'skill_id': state.skill_id})
+            return False
+
+    def _write_skill_scoring_state(self, cursor, state: SkillScoringState) -> None:
+        state.last_updated = datetime.now(timezone.utc).isoformat()
+        cursor.execute('''
+            INSERT OR REPLACE INTO skill_scoring_state 
+            (learner_id, skill_id, decay_factor, weighted_score_sum, decayed_weight,
+             total_adjusted_evidence, total_target_evidence, activity_count,
+             last_activity_id, last_completion_timestamp, last_updated)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            state.learner_id, state.skill_id, state.decay_factor, state.weighted_score_sum,
+            state.decayed_weight, state.total_adjusted_evidence, state.total_target_evidence,
+            state.activity_count, state.last_activity_id, state.last_completion_timestamp,
+            state.last_updated
+        ))
+
+    def _delete_skill_scoring_state(self, cursor, learner_id: str, skill_id: str) -> None:
+        cursor.execute('''
+            DELETE FROM skill_scoring_state WHERE learner_id = ? AND skill_id = ?
+        ''', (learner_id, skill_id))
+
     def get_activity_history_chronological(self, learner_id: str, skill_id: str) -> List[Dict]:
         """
         Get complete activity history for a learner/skill combination in chronological order.
@@ -1010,6 +2105,85 @@ class LearnerManager:
                                 str(e), {'learner_id': learner_id, 'skill_id': skill_id})
             return []
 
+    def get_activity_history_version(self, learner_id: str, skill_id: str) -> Optional[Tuple]:
+        """
+        Cheap fingerprint of a learner/skill's activity history, for caching
+        values derived from it.
+        
+        Computed from an aggregate over the (learner_id, skill_id) index range, so
+        it changes whenever a row is inserted, replaced or deleted, or its raw
+        scores are edited, including by other processes.
+        
+        Args:
+            learner_id: Learner identifier
+            skill_id: Skill identifier
+            
+        Returns:
+            Tuple fingerprint, or None if it couldn't be read
+        """
+        try:
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT COUNT(*), MAX(id), MAX(completion_timestamp), TOTAL(performance_score),
+                           TOTAL(target_evidence_volume), TOTAL(validity_modifier), TOTAL(adjusted_evidence_volume)
+                    FROM activity_history 
+                    WHERE learner_id = ? AND skill_id = ?
+                ''', (learner_id, skill_id))
+                return tuple(cursor.fetchone())
+                
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to get activity history version: {str(e)}',
+                                str(e), {'learner_id': learner_id, 'skill_id': skill_id})
+            return None
+
+    def get_recent_activity_history(self, learner_id: str, skill_id: str, limit: int) -> List[Dict]:
+        """
+        Get the most recent activity history records for a learner/skill combination.
+        
+        Reads at most `limit` rows through the (learner_id, skill_id, completion_timestamp)
+        index, so the cost doesn't grow with the learner's tenure.
+        
+        Args:
+            learner_id: Learner identifier
+            skill_id: Skill identifier
+            limit: Maximum number of records to return
+            
+        Returns:
+            List of up to `limit` activity history records ordered by oldest first (chronological)
+        """
+        try:
+            with self._get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT 
+                        activity_id,
+                        activity_title,
+                        completion_timestamp,
+                        performance_score,
+                        target_evidence_volume,
+                        validity_modifier,
+                        adjusted_evidence_volume,
+                        cumulative_evidence_weight,
+                        decay_factor,
+                        decay_adjusted_evidence_volume,
+                        cumulative_performance,
+                        cumulative_evidence
+                    FROM activity_history 
+                    WHERE learner_id = ? AND skill_id = ?
+                    ORDER BY completion_timestamp DESC
+                    LIMIT ?
+                ''', (learner_id, skill_id, limit))
+                
+                records = [dict(row) for row in cursor.fetchall()]
+                records.reverse()
+                return records
+                
+        except Exception as e:
+            self.logger.log_error('learner_manager', f'Failed to get recent activity history: {str(e)}',
+                                str(e), {'learner_id': learner_id, 'skill_id': skill_id})
+            return []
+
     def get_activity_position(self, learner_id: str, skill_id: str) -> int:
         """
         Get the position for the next activity (0-based).
@@ -53,11 +53,21 @@ class LLMClient:
         self.openai_client = None
         self.genai_client = None
         
-        # Cost tracking (rates per 1K tokens - updated July 2025)
+        # Cost tracking (rates per 1K tokens by model - updated July 2025); model
+        # tiers mix models of one provider, so costs are priced per model
         self.cost_rates = {
-            'anthropic': {'input': 0.003, 'output': 0.015},  # Claude Sonnet 4
-            'openai': {'input': 0.00015, 'output': 0.0006},  # GPT-4.1-mini (83% cost reduction)
-            'google': {'input': 0.00015, 'output': 0.0006}   # Gemini 2.5 Flash
+            'claude-opus-4': {'input': 0.015, 'output': 0.075},
+            'claude-sonnet-4': {'input': 0.003, 'output': 0.015},
+            'claude-3-5-sonnet': {'input': 0.003, 'output': 0.015},
+            'claude-3-5-haiku': {'input': 0.0008, 'output': 0.004},
+            'gpt-4.1': {'input': 0.002, 'output': 0.008},
+            'gpt-4.1-mini': {'input': 0.0004, 'output': 0.0016},
+            'gpt-4.1-nano': {'input': 0.0001, 'output': 0.0004},
+            'gpt-4o': {'input': 0.0025, 'output': 0.01},
+            'gpt-4-turbo': {'input': 0.01, 'output': 0.03},
+            'gemini-2.5-pro': {'input': 0.00125, 'output': 0.01},
+            'gemini-2.5-flash': {'input': 0.0003, 'output': 0.0025},
+            'gemini-2.5-flash-lite': {'input': 0.0001, 'output': 0.0004}
         }
         
         self._initialize_clients()
@@ -128,8 +138,14 @@ class LLMClient:
             self.logger.log_error('llm_client', f"LLM call failed: {provider} - {e}", str(e))
             raise
     
-    def call_llm_with_fallback(self, system_prompt: str = None, user_prompt: str = None, prompt: str = None, phase: str = None, **kwargs) -> LLMResponse:
-        """Call LLM with automatic fallback to alternative providers"""
+    def call_llm_with_fallback(self, system_prompt: str = None, user_prompt: str = None, prompt: str = None, phase: str = None,
+                               provider_overrides: Optional[Dict[str, Dict[str, Any]]] = None, **kwargs) -> LLMResponse:
+        """
+        Call LLM with automatic fallback to alternative providers.
+        
+        provider_overrides maps provider name -> config overrides (e.g. the model tier
+        chosen by ModelRouter) applied on top of the provider/phase configuration.
+        """
         # Handle different prompt formats more efficiently
         if prompt is None:
             if system_prompt and user_prompt:
@@ -167,6 +183,8 @@ class LLMClient:
                     config = self._get_default_config(provider)
                 
                 config.update(kwargs)
+                if provider_overrides and provider in provider_overrides:
+                    config.update(provider_overrides[provider])
                 
                 # Use optimized call method that handles messages directly
                 response = self._call_llm_with_messages(provider, messages, **config)
@@ -241,7 +259,7 @@ class LLMClient:
             
             tokens_used = response.usage.input_tokens + response.usage.output_tokens
             
-            cost = self._calculate_cost('anthropic', 
+            cost = self._calculate_cost('anthropic', config.get('default_model', 'claude-3-5-sonnet-20241022'),
                                        response.usage.input_tokens, 
                                        response.usage.output_tokens)
             
@@ -280,7 +298,7 @@ class LLMClient:
             
             tokens_used = response.usage.total_tokens
             
-            cost = self._calculate_cost('openai',
+            cost = self._calculate_cost('openai', config.get('default_model', 'gpt-4.1-mini'),
                                        response.usage.prompt_tokens,
                                        response.usage.completion_tokens)
             
@@ -338,7 +356,7 @@ class LLMClient:
             # Note: Gemini API doesn't always provide token counts
             tokens_used = getattr(response.usage_metadata, 'total_token_count', None) if hasattr(response, 'usage_metadata') else None
             
-            cost = self._calculate_cost('google', 
+            cost = self._calculate_cost('google', config.get('default_model', 'gemini-2.5-flash'),
                                        tokens_used or 1000,  # Rough estimate if not provided
                                        tokens_used or 500)
             
@@ -398,7 +416,7 @@ class LLMClient:
             
             tokens_used = response.usage.input_tokens + response.usage.output_tokens
             
-            cost = self._calculate_cost('anthropic', 
+            cost = self._calculate_cost('anthropic', config.get('default_model', 'claude-3-5-sonnet-20241022'),
                                        response.usage.input_tokens, 
                                        response.usage.output_tokens)
             
@@ -442,7 +460,7 @@ class LLMClient:
             
             tokens_used = response.usage.total_tokens
             
-            cost = self._calculate_cost('openai',
+            cost = self._calculate_cost('openai', config.get('default_model', 'gpt-4-turbo'),
                                        response.usage.prompt_tokens,
                                        response.usage.completion_tokens)
             
@@ -503,7 +521,7 @@ class LLMClient:
             # Note: Gemini API doesn't always provide token counts
             tokens_used = getattr(response.usage_metadata, 'total_token_count', None) if hasattr(response, 'usage_metadata') else None
             
-            cost = self._calculate_cost('google', 
+            cost = self._calculate_cost('google', config.get('default_model', 'gemini-2.5-flash'),
                                        tokens_used or 1000,  # Rough estimate if not provided
                                        tokens_used or 500)
             
@@ -529,17 +547,32 @@ class LLMClient:
             return self.genai_client is not None
         return False
     
-    def _calculate_cost(self, provider: str, input_tokens: int, output_tokens: int) -> float:
+    def _calculate_cost(self, provider: str, model: str, input_tokens: int, output_tokens: int) -> float:
         """Calculate estimated cost for API call"""
-        if provider not in self.cost_rates:
+        rates = self._cost_rates_for_model(model)
+        if rates is None:
+            # Unknown model: price it as the provider's default model
+            rates = self._cost_rates_for_model(self._get_default_config(provider).get('default_model'))
+        if rates is None:
             return 0.0
         
-        rates = self.cost_rates[provider]
         input_cost = (input_tokens / 1000) * rates['input']
         output_cost = (output_tokens / 1000) * rates['output']
         
         return input_cost + output_cost
     
+    def _cost_rates_for_model(self, model: Optional[str]) -> Optional[Dict[str, float]]:
+        """Rates for a model name, matching dated versions such as claude-sonnet-4-20250514"""
+        if not model:
+            return None
+        if model in self.cost_rates:
+            return self.cost_rates[model]
+        # Longest prefix first, so gpt-4.1-mini-2025-04-14 isn't priced as gpt-4.1
+        for known_model in sorted(self.cost_rates, key=len, reverse=True):
+            if model.startswith(known_model + '-'):
+                return self.cost_rates[known_model]
+        return None
+    
     def _get_default_config(self, provider: str) -> Dict[str, Any]:
         """Get default configuration for provider"""
         defaults = {
@@ -73,8 +73,11 @@ class EvaluatorLogger:
         console_handler.setFormatter(console_formatter)
         root_logger.addHandler(console_handler)
 
+        root_logger.addHandler(self._create_file_handler(self.system_log_file))
+    
+    def _create_file_handler(self, path: Path) -> RotatingFileHandler:
         file_handler = RotatingFileHandler(
-            self.system_log_file,
+            path,
             maxBytes=10*1024*1024,
             backupCount=5,
             encoding='utf-8'
@@ -84,7 +87,44 @@ class EvaluatorLogger:
             '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
         )
         file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
+        return file_handler
+    
+    @contextmanager
+    def redirected(self, log_dir: str):
+        """
+        Write this logger's evaluation, error and system logs under log_dir for
+        the duration, e.g. to keep a benchmark's synthetic traffic out of data/logs.
+        Applies process-wide: system.log is the root logging handler.
+        """
+        previous_files = (self.log_dir, self.evaluation_log_file, self.system_log_file, self.error_log_file)
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.evaluation_log_file = self.log_dir / "evaluations.jsonl"
+        self.system_log_file = self.log_dir / "system.log"
+        self.error_log_file = self.log_dir / "errors.jsonl"
+        self._initialize_log_files()
+        
+        root_logger = logging.getLogger()
+        previous_path = os.path.abspath(previous_files[2])
+        new_path = os.path.abspath(self.system_log_file)
+        file_handlers = [handler for handler in root_logger.handlers
+                         if isinstance(handler, RotatingFileHandler)]
+        replaced = [handler for handler in file_handlers if handler.baseFilename == previous_path]
+        added = None
+        for handler in replaced:
+            root_logger.removeHandler(handler)
+        if not any(handler.baseFilename == new_path for handler in file_handlers):
+            added = self._create_file_handler(self.system_log_file)
+            root_logger.addHandler(added)
+        try:
+            yield self
+        finally:
+            if added is not None:
+                root_logger.removeHandler(added)
+                added.close()
+            for handler in replaced:
+                root_logger.addHandler(handler)
+            self.log_dir, self.evaluation_log_file, self.system_log_file, self.error_log_file = previous_files
     
     def _initialize_log_files(self):
         if not self.evaluation_log_file.exists():
@@ -0,0 +1,162 @@
+"""
+Model Router for Evaluator v16
+Phase-level model tiering: picks a model tier for each LLM phase from the
+activity type, cognitive/depth level and transcript size using the
+model_tiering policy in llm_settings.json, logs every decision and tracks
+latency and cost per tier.
+"""
+
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Any, Optional
+
+from logger import get_logger
+
+
+@dataclass
+class RoutingDecision:
+    """Tier chosen for one LLM call"""
+    phase: str
+    tier: str
+    rule: str
+    activity_type: Optional[str] = None
+    cognitive_level: Optional[str] = None
+    depth_level: Optional[str] = None
+    transcript_tokens: int = 0
+    provider_overrides: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ModelRouter:
+    """Routes pipeline phases to model tiers declared in llm_settings.json"""
+
+    def __init__(self, config_manager):
+        self.config = config_manager
+        self.logger = get_logger()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _policy(self) -> Dict[str, Any]:
+        llm_settings = self.config.get_config('llm_settings') if self.config else {}
+        return (llm_settings or {}).get('model_tiering', {})
+
+    @property
+    def enabled(self) -> bool:
+        policy = self._policy()
+        return bool(policy.get('enabled')) and bool(policy.get('tiers'))
+
+    def route(self, phase: str, activity=None, transcript_tokens: int = 0,
+              activity_id: Optional[str] = None, learner_id: Optional[str] = None) -> Optional[RoutingDecision]:
+        """
+        Pick the model tier for a phase.
+
+        Rules are evaluated in order and the first match wins; a rule matches when
+        every condition it declares (phases, activity_types, cognitive_levels,
+        depth_levels, min/max_transcript_tokens) holds.
+
+        Returns:
+            RoutingDecision, or None when tiering is disabled
+        """
+        policy = self._policy()
+        tiers = policy.get('tiers', {})
+        if not policy.get('enabled') or not tiers:
+            return None
+
+        activity_type = getattr(activity, 'activity_type', None)
+        cognitive_level = getattr(activity, 'cognitive_level', None)
+        depth_level = getattr(activity, 'depth_level', None)
+
+        tier = policy.get('default_tier', next(iter(tiers)))
+        rule_name = 'default'
+        for index, rule in enumerate(policy.get('rules', [])):
+            if self._matches(rule, phase, activity_type, cognitive_level, depth_level, transcript_tokens):
+                tier = rule.get('tier', tier)
+                rule_name = rule.get('name', f'rule_{index + 1}')
+                break
+
+        if tier not in tiers:
+            self.logger.log_system_event('model_router', 'unknown_tier',
+                                         f"Tier '{tier}' not declared; using default", level="WARNING")
+            tier = policy.get('default_tier', next(iter(tiers)))
+
+        decision = RoutingDecision(
+            phase=phase,
+            tier=tier,
+            rule=rule_name,
+            activity_type=activity_type,
+            cognitive_level=cognitive_level,
+            depth_level=depth_level,
+            transcript_tokens=transcript_tokens,
+            provider_overrides={provider: dict(overrides) for provider, overrides in tiers[tier].items()
+                                if isinstance(overrides, dict)}
+        )
+        self.logger.log_system_event('model_router', 'routing_decision',
+                                     f'{phase} routed to {tier} tier ({rule_name})',
+                                     activity_id=activity_id, learner_id=learner_id,
+                                     **{key: value for key, value in decision.to_dict().items()
+                                        if key not in ('phase', 'provider_overrides')})
+        return decision
+
+    def _matches(self, rule: Dict[str, Any], phase: str, activity_type: Optional[str],
+                 cognitive_level: Optional[str], depth_level: Optional[str], transcript_tokens: int) -> bool:
+        for key, value in (('phases', phase), ('activity_types', activity_type),
+                           ('cognitive_levels', cognitive_level), ('depth_levels', depth_level)):
+            allowed = rule.get(key)
+            if allowed and value not in allowed:
+                return False
+        if transcript_tokens < rule.get('min_transcript_tokens', 0):
+            return False
+        max_tokens = rule.get('max_transcript_tokens')
+        if max_tokens is not None and transcript_tokens > max_tokens:
+            return False
+        return True
+
+    def record_outcome(self, decision: Optional[RoutingDecision], response,
+                       activity_id: Optional[str] = None, learner_id: Optional[str] = None) -> None:
+        """Log the call outcome against its tier and accumulate per-tier latency and cost"""
+        if decision is None or response is None:
+            return
+        latency = getattr(response, 'response_time', None)
+        cost = getattr(response, 'cost_estimate', None)
+        tokens = getattr(response, 'tokens_used', None)
+        success = bool(getattr(response, 'success', False))
+        self.logger.log_llm_call(
+            getattr(response, 'provider', 'unknown'), decision.phase, success,
+            duration_seconds=latency, tokens_used=tokens, cost_estimate=cost,
+            error_message=getattr(response, 'error', None),
+            learner_id=learner_id or 'unknown', activity_id=activity_id or 'unknown',
+            tier=decision.tier, rule=decision.rule, model=getattr(response, 'model', None),
+            activity_type=decision.activity_type, transcript_tokens=decision.transcript_tokens
+        )
+        with self._lock:
+            stats = self._stats.setdefault(f'{decision.phase}:{decision.tier}', {
+                'phase': decision.phase, 'tier': decision.tier, 'calls': 0, 'failures': 0,
+                'total_latency_s': 0.0, 'total_cost': 0.0, 'total_tokens': 0, 'models': {}
+            })
+            stats['calls'] += 1
+            stats['failures'] += 0 if success else 1
+            stats['total_latency_s'] += latency or 0.0
+            stats['total_cost'] += cost or 0.0
+            stats['total_tokens'] += tokens or 0
+            model = getattr(response, 'model', None) or 'unknown'
+            stats['models'][model] = stats['models'].get(model, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per phase/tier call counts with average latency, cost and tokens"""
+        with self._lock:
+            return {
+                key: {
+                    **stats,
+                    'models': dict(stats['models']),
+                    'avg_latency_s': round(stats['total_latency_s'] / stats['calls'], 4) if stats['calls'] else 0.0,
+                    'avg_cost': round(stats['total_cost'] / stats['calls'], 6) if stats['calls'] else 0.0,
+                    'avg_tokens': round(stats['total_tokens'] / stats['calls'], 1) if stats['calls'] else 0.0
+                }
+                for key, stats in self._stats.items()
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {}
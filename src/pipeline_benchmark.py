@@ -0,0 +1,429 @@
+"""
+Pipeline Benchmark for Evaluator v16
+End-to-end throughput harness: drives synthetic learners through the activity
+library at a chosen concurrency against a mock or recorded LLM backend on a
+throwaway database, and reports throughput, per-phase latency percentiles, DB
+time and peak memory as JSON for run-to-run comparison.
+
+Run from the repository root (paths such as data/activities are relative to it):
+
+    python src/pipeline_benchmark.py --learners 20 --concurrency 8 --output report.json
+
+The JSON report is written to stdout (and --output); logs go to stderr.
+"""
+
+import os
+import sys
+import json
+import contextlib
+import time
+import random
+import shutil
+import tempfile
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+if __name__ == '__main__':
+    # As a script only src/ is on the path; modules such as learner_manager also
+    # import through the src package, which needs the repository root
+    _src_dir = os.path.dirname(os.path.abspath(__file__))
+    for _path in (_src_dir, os.path.dirname(_src_dir)):
+        if _path not in sys.path:
+            sys.path.insert(0, _path)
+
+from config_manager import ConfigManager
+from llm_client import LLMResponse
+from prompt_builder import PromptBuilder
+from scoring_engine import ScoringEngine
+from learner_manager import LearnerManager, LearnerProfile
+from activity_manager import ActivityManager
+from evaluation_pipeline import EvaluationPipeline
+from logger import get_logger
+from src.logger import get_logger as get_package_logger
+
+
+class MockLLMClient:
+    """
+    Stand-in for LLMClient that answers every phase with well-formed JSON.
+
+    With a recording file ({"<phase>": ["<response content>", ...]}) responses are
+    replayed round-robin per phase instead of synthesized.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 recorded_responses_path: Optional[str] = None, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recorded: Dict[str, List[str]] = {}
+        self._replay_position: Dict[str, int] = {}
+        self.calls = 0
+        if recorded_responses_path:
+            with open(recorded_responses_path, 'r', encoding='utf-8') as f:
+                self._recorded = json.load(f)
+
+    def call_llm_with_fallback(self, system_prompt: str = None, user_prompt: str = None,
+                               prompt: str = None, phase: str = None, **kwargs) -> LLMResponse:
+        with self._lock:
+            self.calls += 1
+            delay_ms = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            score = round(self._random.uniform(0.4, 0.95), 3)
+            content = self._next_recorded(phase)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        if content is None:
+            content = json.dumps(self._synthesize(phase, score))
+        return LLMResponse(
+            content=content,
+            provider='mock',
+            model='mock',
+            tokens_used=len(content) // 4,
+            cost_estimate=0.0,
+            response_time=delay_ms / 1000
+        )
+
+    def get_available_providers(self) -> List[str]:
+        return ['mock']
+
+    def get_provider_status(self) -> Dict[str, Dict[str, Any]]:
+        return {'mock': {'available': True, 'configured': True, 'api_key_set': False, 'last_test': None}}
+
+    def test_connection(self, provider: str) -> Dict[str, Any]:
+        return {'success': True, 'provider': provider}
+
+    def _next_recorded(self, phase: str) -> Optional[str]:
+        responses = self._recorded.get(phase)
+        if not responses:
+            return None
+        position = self._replay_position.get(phase, 0)
+        self._replay_position[phase] = position + 1
+        content = responses[position % len(responses)]
+        return content if isinstance(content, str) else json.dumps(content)
+
+    def _synthesize(self, phase: str, score: float) -> Dict[str, Any]:
+        if phase == 'combined_evaluation':
+            return {
+                'aspect_scores': [{
+                    'aspect_id': 'benchmark_aspect',
+                    'aspect_name': 'Benchmark Aspect',
+                    'score': score,
+                    'rationale': 'Synthetic benchmark score'
+                }],
+                'overall_score': score,
+                'rationale': 'Synthetic benchmark evaluation',
+                'validity_modifier': 1.0,
+                'validity_analysis': 'No assistance used',
+                'validity_reason': 'Independent work'
+            }
+        return {
+            'intelligent_feedback': {
+                'backend_intelligence': {
+                    'overview': 'Synthetic benchmark diagnostic',
+                    'strengths': ['Clear structure'],
+                    'weaknesses': ['Limited depth'],
+                    'subskill_ratings': []
+                },
+                'learner_feedback': {
+                    'overall': 'Synthetic benchmark feedback',
+                    'strengths': ['Clear structure'],
+                    'opportunities': ['Add supporting detail']
+                }
+            }
+        }
+
+
+def _percentiles(values: List[float]) -> Dict[str, Any]:
+    """Nearest-rank p50/p95/p99 plus mean and max"""
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+
+    def rank(percentile: float) -> float:
+        index = max(0, min(len(ordered) - 1, int(round(percentile / 100 * len(ordered) + 0.5)) - 1))
+        return round(ordered[index], 3)
+
+    return {
+        'count': len(ordered),
+        'mean': round(sum(ordered) / len(ordered), 3),
+        'p50': rank(50),
+        'p95': rank(95),
+        'p99': rank(99),
+        'max': round(ordered[-1], 3)
+    }
+
+
+def _evaluator_loggers() -> List[Any]:
+    """The logger singletons in use: pipeline modules import logger, the src package src.logger"""
+    loggers = []
+    for evaluator_logger in (get_logger(), get_package_logger()):
+        if all(evaluator_logger is not known for known in loggers):
+            loggers.append(evaluator_logger)
+    return loggers
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def build_synthetic_transcript(activity, learner_index: int, seed: int = 0) -> Dict[str, Any]:
+    """Learner transcript in the shape the Streamlit app submits"""
+    rng = random.Random(f'{seed}:{learner_index}:{activity.activity_id}')
+    now = datetime.now(timezone.utc).isoformat()
+    words = ['users', 'search', 'files', 'support', 'workflow', 'problem', 'need', 'impact',
+             'frustrated', 'requirements', 'stakeholder', 'clarify', 'priority', 'evidence']
+    response = ' '.join(rng.choice(words) for _ in range(rng.randint(40, 120))).capitalize() + '.'
+    return {
+        'activity_generation_output': getattr(activity, 'activity_generation_output', None) or {
+            'activity_id': activity.activity_id,
+            'activity_type': activity.activity_type,
+            'target_skill': activity.target_skill
+        },
+        'student_engagement': {
+            'start_timestamp': now,
+            'submit_timestamp': now,
+            'completion_status': 'completed',
+            'component_responses': [{
+                'component_id': 'main_response',
+                'response_content': response,
+                'response_type': 'text',
+                'metadata': {'activity_type': activity.activity_type, 'target_skill': activity.target_skill}
+            }],
+            'assistance_log': []
+        }
+    }
+
+
+def run_throughput_benchmark(config_manager, num_learners: int = 10, concurrency: int = 4,
+                             evaluations_per_learner: Optional[int] = None,
+                             activity_ids: Optional[List[str]] = None,
+                             llm_latency_ms: float = 0.0, llm_jitter_ms: float = 0.0,
+                             recorded_responses_path: Optional[str] = None,
+                             llm_client=None, work_dir: Optional[str] = None,
+                             keep_database: bool = False, track_memory: bool = True,
+                             seed: int = 0) -> Dict[str, Any]:
+    """
+    Run synthetic learners through the full pipeline and report performance.
+
+    Each learner works through the activities in order (one evaluation at a time
+    per learner, like the app); learners run concurrently on `concurrency` threads.
+
+    Args:
+        config_manager: Configuration manager instance
+        num_learners: Number of synthetic learners to create
+        concurrency: Number of learners evaluated in parallel
+        evaluations_per_learner: Evaluations per learner (defaults to one per activity)
+        activity_ids: Restrict to these activities (defaults to all of data/activities)
+        llm_latency_ms: Simulated latency per mock LLM call
+        llm_jitter_ms: Extra uniform random latency per mock LLM call
+        recorded_responses_path: Replay recorded LLM responses instead of synthesizing
+        llm_client: Use this client instead of the mock backend
+        work_dir: Directory for the throwaway database (defaults to a temp dir)
+        keep_database: Keep the throwaway database, JSON mirrors and logs afterwards
+        track_memory: Trace Python allocations to report peak heap usage
+        seed: Seed for synthetic responses and scores
+
+    Returns:
+        JSON-serializable benchmark report
+    """
+    owns_work_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix='evaluator_benchmark_')
+    db_path = os.path.join(work_dir, 'benchmark.db')
+    log_dir = os.path.join(work_dir, 'logs')
+
+    # Synthetic evaluations log under the work dir, not into data/logs where
+    # get_evaluation_stats and the UI would count them
+    log_redirects = contextlib.ExitStack()
+    for evaluator_logger in _evaluator_loggers():
+        log_redirects.enter_context(evaluator_logger.redirected(log_dir))
+    try:
+        learner_manager = LearnerManager(config_manager, db_path=db_path)
+        learner_manager.json_mirror_dir = os.path.join(work_dir, 'learners')
+
+        activity_manager = ActivityManager(config_manager)
+        activities = activity_manager.load_activities()
+        if activity_ids:
+            activities = {activity_id: activities[activity_id] for activity_id in activity_ids if activity_id in activities}
+        activity_list = [activities[activity_id] for activity_id in sorted(activities)]
+        if not activity_list:
+            raise ValueError('No activities available for benchmark')
+
+        llm_client = llm_client or MockLLMClient(llm_latency_ms, llm_jitter_ms, recorded_responses_path, seed)
+        pipeline = EvaluationPipeline(config_manager, llm_client, PromptBuilder(config_manager),
+                                      ScoringEngine(config_manager, learner_manager),
+                                      learner_manager, activity_manager)
+        pipeline.profiling_enabled = True
+
+        evaluations_per_learner = evaluations_per_learner or len(activity_list)
+        learner_ids = []
+        for index in range(num_learners):
+            learner_id = f'bench_learner_{index + 1:04d}'
+            learner_manager.create_learner(LearnerProfile(
+                learner_id=learner_id,
+                name=f'Benchmark Learner {index + 1}',
+                email=f'{learner_id}@benchmark.local',
+                enrollment_date=datetime.now(timezone.utc).isoformat()
+            ))
+            learner_ids.append(learner_id)
+
+        lock = threading.Lock()
+        samples = {'total_ms': [], 'sqlite_ms': [], 'network_ms': [], 'phases': {}}
+        outcome = {'succeeded': 0, 'failed': 0, 'errors': []}
+
+        def run_learner(learner_index: int, learner_id: str):
+            for step in range(evaluations_per_learner):
+                activity = activity_list[step % len(activity_list)]
+                transcript = build_synthetic_transcript(activity, learner_index, seed)
+                started = time.perf_counter()
+                try:
+                    result = pipeline.evaluate_activity(activity.activity_id, learner_id, transcript)
+                except Exception as e:
+                    with lock:
+                        outcome['failed'] += 1
+                        outcome['errors'].append(f'{learner_id}/{activity.activity_id}: {e}')
+                    continue
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                with lock:
+                    outcome['succeeded' if result.overall_success else 'failed'] += 1
+                    if not result.overall_success and result.error_summary:
+                        outcome['errors'].append(f'{learner_id}/{activity.activity_id}: {result.error_summary}')
+                    samples['total_ms'].append(elapsed_ms)
+                    by_category = (result.profile or {}).get('by_category', {})
+                    samples['sqlite_ms'].append(by_category.get('sqlite', 0.0))
+                    samples['network_ms'].append(by_category.get('network', 0.0))
+                    for phase in result.pipeline_phases:
+                        if phase.execution_time_ms is not None:
+                            samples['phases'].setdefault(phase.phase, []).append(float(phase.execution_time_ms))
+
+        if track_memory:
+            tracemalloc.start()
+        wall_started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                futures = [executor.submit(run_learner, index, learner_id)
+                           for index, learner_id in enumerate(learner_ids)]
+                for future in futures:
+                    future.result()
+            wall_seconds = time.perf_counter() - wall_started
+        finally:
+            peak_heap_mb = None
+            if track_memory:
+                peak_heap_mb = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+                tracemalloc.stop()
+
+        evaluations = outcome['succeeded'] + outcome['failed']
+        report = {
+            'benchmark': 'full_integration',
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'parameters': {
+                'num_learners': num_learners,
+                'concurrency': concurrency,
+                'evaluations_per_learner': evaluations_per_learner,
+                'activities': [activity.activity_id for activity in activity_list],
+                'llm_backend': type(llm_client).__name__,
+                'llm_latency_ms': llm_latency_ms,
+                'llm_jitter_ms': llm_jitter_ms,
+                'recorded_responses': recorded_responses_path,
+                'seed': seed
+            },
+            'evaluations': evaluations,
+            'succeeded': outcome['succeeded'],
+            'failed': outcome['failed'],
+            'errors': outcome['errors'][:20],
+            'wall_seconds': round(wall_seconds, 3),
+            'evaluations_per_second': round(evaluations / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+            'latency_ms': _percentiles(samples['total_ms']),
+            'phase_latency_ms': {phase: _percentiles(values) for phase, values in samples['phases'].items()},
+            'db_time_ms': {
+                'total': round(sum(samples['sqlite_ms']), 3),
+                'per_evaluation': _percentiles(samples['sqlite_ms'])
+            },
+            'llm_time_ms': {
+                'total': round(sum(samples['network_ms']), 3),
+                'per_evaluation': _percentiles(samples['network_ms'])
+            },
+            'model_tiering': pipeline.model_router.get_stats(),
+            'memory': {
+                'peak_python_heap_mb': peak_heap_mb,
+                'peak_rss_mb': _peak_rss_mb()
+            },
+            'database': db_path if keep_database else None,
+            'logs': log_dir if keep_database else None
+        }
+
+        # Pending JSON mirrors would otherwise be written after the cleanup below
+        learner_manager.json_mirror.close()
+        # Closing the last connection checkpoints the WAL and removes its -wal/-shm files
+        learner_manager._connections.close_all()
+    finally:
+        log_redirects.close()
+
+    if not keep_database:
+        if owns_work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        else:
+            for path in (db_path, f'{db_path}-wal', f'{db_path}-shm', learner_manager.json_mirror_dir, log_dir):
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                elif os.path.exists(path):
+                    os.remove(path)
+    return report
+
+
+if __name__ == '__main__':
+    import argparse
+    import logging
+
+    parser = argparse.ArgumentParser(
+        description='End-to-end evaluation pipeline throughput benchmark',
+        epilog='Run from the repository root: python src/pipeline_benchmark.py [options]'
+    )
+    parser.add_argument('--learners', type=int, default=10)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--evaluations-per-learner', type=int, default=None)
+    parser.add_argument('--activity', action='append', dest='activity_ids')
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--recorded', dest='recorded_responses_path')
+    parser.add_argument('--keep-database', action='store_true')
+    parser.add_argument('--no-memory', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    # stdout carries only the JSON report: console logging (including handlers
+    # set up later, which bind the redirected sys.stdout) and prints go to stderr
+    report_stream = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, logging.StreamHandler) and handler.stream is report_stream:
+                handler.setStream(sys.stderr)
+        benchmark_report = run_throughput_benchmark(
+            ConfigManager(),
+            num_learners=args.learners,
+            concurrency=args.concurrency,
+            evaluations_per_learner=args.evaluations_per_learner,
+            activity_ids=args.activity_ids,
+            llm_latency_ms=args.latency_ms,
+            llm_jitter_ms=args.jitter_ms,
+            recorded_responses_path=args.recorded_responses_path,
+            keep_database=args.keep_database,
+            track_memory=not args.no_memory,
+            seed=args.seed
+        )
+    output = json.dumps(benchmark_report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
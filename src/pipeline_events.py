@@ -0,0 +1,81 @@
+"""
+Pipeline Events for Evaluator v16
+Typed events emitted by EvaluationPipeline while an evaluation is running, so
+callers can render partial results before the whole pipeline finishes.
+"""
+
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class PipelineEvent:
+    """Base class for all pipeline events"""
+    activity_id: str
+    learner_id: str
+    timestamp: str = field(default_factory=_now, init=False)
+
+    @property
+    def event_type(self) -> str:
+        return EVENT_TYPES.get(type(self), 'event')
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['event_type'] = self.event_type
+        return data
+
+
+@dataclass
+class PhaseStarted(PipelineEvent):
+    """A pipeline phase is about to run"""
+    phase: str = ''
+
+
+@dataclass
+class PhaseCompleted(PipelineEvent):
+    """A pipeline phase finished; carries its PhaseResult"""
+    phase: str = ''
+    phase_result: Any = None
+
+
+@dataclass
+class ScoringUpdated(PipelineEvent):
+    """Skill scores were recalculated and persisted"""
+    skill_scores: Dict[str, Any] = field(default_factory=dict)
+    activity_score: Optional[float] = None
+
+
+@dataclass
+class PhaseFieldCompleted(PipelineEvent):
+    """A field of a phase's LLM output closed while the response was being parsed"""
+    phase: str = ''
+    field_path: str = ''
+    value: Any = None
+
+
+@dataclass
+class FeedbackDelta(PipelineEvent):
+    """A completed piece of the intelligent feedback output"""
+    field_path: str = ''
+    value: Any = None
+
+
+@dataclass
+class EvaluationCompleted(PipelineEvent):
+    """The evaluation finished; carries the final EvaluationResult"""
+    result: Any = None
+
+
+EVENT_TYPES = {
+    PhaseStarted: 'phase_started',
+    PhaseCompleted: 'phase_completed',
+    ScoringUpdated: 'scoring_updated',
+    PhaseFieldCompleted: 'phase_field_completed',
+    FeedbackDelta: 'feedback_delta',
+    EvaluationCompleted: 'completed'
+}
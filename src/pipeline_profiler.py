@@ -0,0 +1,148 @@
+"""
+Pipeline Profiler for Evaluator v16
+Opt-in, per-evaluation span recorder that breaks pipeline time down by stage and
+attributes it to the network (LLM calls), SQLite or Python.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional
+
+
+CATEGORIES = ('network', 'sqlite', 'python')
+
+
+@dataclass
+class ProfileSpan:
+    """Single timed stage of an evaluation"""
+    name: str
+    category: str
+    start_ms: float
+    duration_ms: float
+    self_ms: float
+    depth: int
+    parent: Optional[str] = None
+
+
+class PipelineProfiler:
+    """Records nested timing spans for one evaluation"""
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._stack: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.spans: List[ProfileSpan] = []
+
+    @contextmanager
+    def span(self, name: str, category: str = 'python'):
+        """Time a stage; nested spans are subtracted from the parent's self time"""
+        frame = {'name': name, 'start': time.perf_counter(), 'children_ms': 0.0}
+        parent = self._stack[-1] if self._stack else None
+        self._stack.append(frame)
+        try:
+            yield self
+        finally:
+            end = time.perf_counter()
+            self._stack.pop()
+            duration_ms = (end - frame['start']) * 1000
+            if parent is not None:
+                parent['children_ms'] += duration_ms
+            with self._lock:
+                self.spans.append(ProfileSpan(
+                    name=name,
+                    category=category if category in CATEGORIES else 'python',
+                    start_ms=round((frame['start'] - self._origin) * 1000, 3),
+                    duration_ms=round(duration_ms, 3),
+                    self_ms=round(max(duration_ms - frame['children_ms'], 0.0), 3),
+                    depth=len(self._stack),
+                    parent=parent['name'] if parent else None
+                ))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Spans in start order plus totals by category"""
+        total_ms = (time.perf_counter() - self._origin) * 1000
+        by_category = {category: 0.0 for category in CATEGORIES}
+        for span in self.spans:
+            by_category[span.category] += span.self_ms
+        # Time outside any span is pipeline glue code
+        top_level_ms = sum(span.duration_ms for span in self.spans if span.depth == 0)
+        by_category['python'] += max(total_ms - top_level_ms, 0.0)
+        return {
+            'total_ms': round(total_ms, 3),
+            'by_category': {category: round(value, 3) for category, value in by_category.items()},
+            'spans': [asdict(span) for span in sorted(self.spans, key=lambda s: s.start_ms)]
+        }
+
+
+class NullProfiler:
+    """Drop-in profiler used when profiling is disabled"""
+
+    spans: List[ProfileSpan] = []
+
+    @contextmanager
+    def span(self, name: str, category: str = 'python'):
+        yield self
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return None
+
+
+class ProfileAggregator:
+    """Accumulates evaluation profiles for pipeline statistics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.evaluations = 0
+            self.total_ms = 0.0
+            self.by_category = {category: 0.0 for category in CATEGORIES}
+            self.by_span: Dict[str, Dict[str, float]] = {}
+
+    def add(self, profile: Optional[Dict[str, Any]]):
+        if not profile:
+            return
+        with self._lock:
+            self.evaluations += 1
+            self.total_ms += profile.get('total_ms', 0.0)
+            for category, value in profile.get('by_category', {}).items():
+                self.by_category[category] = self.by_category.get(category, 0.0) + value
+            for span in profile.get('spans', []):
+                stats = self.by_span.setdefault(span['name'], {
+                    'count': 0, 'total_ms': 0.0, 'self_ms': 0.0, 'max_ms': 0.0, 'category': span['category']
+                })
+                stats['count'] += 1
+                stats['total_ms'] += span['duration_ms']
+                stats['self_ms'] += span['self_ms']
+                stats['max_ms'] = max(stats['max_ms'], span['duration_ms'])
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            if not self.evaluations:
+                return {'evaluations': 0}
+            return {
+                'evaluations': self.evaluations,
+                'avg_total_ms': round(self.total_ms / self.evaluations, 3),
+                'category_share': {
+                    category: round(value / self.total_ms, 4) if self.total_ms else 0.0
+                    for category, value in self.by_category.items()
+                },
+                'avg_category_ms': {
+                    category: round(value / self.evaluations, 3)
+                    for category, value in self.by_category.items()
+                },
+                'stages': {
+                    name: {
+                        **stats,
+                        'avg_ms': round(stats['total_ms'] / stats['count'], 3),
+                        'total_ms': round(stats['total_ms'], 3),
+                        'self_ms': round(stats['self_ms'], 3),
+                        'max_ms': round(stats['max_ms'], 3)
+                    }
+                    for name, stats in sorted(self.by_span.items(), key=lambda item: -item[1]['total_ms'])
+                }
+            }
@@ -992,6 +992,9 @@ Return ONLY a JSON object with this exact structure:
         
         for var_name, var_value in context_data.items():
             placeholder = f"{{{var_name}}}"
+            if placeholder not in result:
+                # Skip serializing context the template never renders
+                continue
             
             # Convert value to string if needed
             if isinstance(var_value, (dict, list)):
@@ -1217,17 +1220,16 @@ Return ONLY a JSON object with this exact structure:
         """Extract prerequisite relationships for diagnostic analysis"""
         skill_id = skill_context.get('skill_id', '')
         
-        # Get prerequisite info from domain model
+        # Get prerequisite info from the shared domain model index
         prerequisites = {}
+        domain_index = self.config.get_domain_model_index()
+        skill = domain_index.get_skill(skill_id)
         
-        if 'skills' in self.domain_model:
-            for skill in self.domain_model['skills']:
-                if skill.get('skill_id') == skill_id:
-                    prerequisites = {
-                        'direct_prerequisites': skill.get('prerequisite_skills', []),
-                        'subskill_dependencies': skill.get('subskill_dependencies', []),
-                        'competency_context': skill.get('parent_competency', '')
-                    }
-                    break
+        if skill:
+            prerequisites = {
+                'direct_prerequisites': domain_index.get_skill_prerequisites(skill_id),
+                'subskill_dependencies': domain_index.get_subskill_dependencies(skill_id),
+                'competency_context': skill.get('competency', '')
+            }
         
         return prerequisites
\ No newline at end of file
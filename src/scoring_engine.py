@@ -4,10 +4,20 @@ Implements position-based decay Bayesian scoring with dual-gate system.
 """
 
 import math
+import time
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, replace
 from src.logger import get_logger
+from src.domain_model_index import DomainModelIndex
+from src.learner_manager import SkillScoringState, SkillProgress
+
+# activity_history columns derived from the raw scores (see recompute_activity_history)
+DERIVED_HISTORY_COLUMNS = ('cumulative_performance', 'cumulative_evidence',
+                           'decay_adjusted_evidence_volume', 'decay_factor')
+SCORED_HISTORY_COLUMNS = ('performance_score', 'target_evidence_volume',
+                          'validity_modifier', 'adjusted_evidence_volume')
+TIMESERIES_CACHE_SIZE = 256
 
 @dataclass
 class SkillScore:
@@ -34,6 +44,16 @@ class ScoringResult:
     total_skills_evaluated: int
     skills_mastered: int
     overall_progress: float
+    progress_persisted: bool = False  # skill_progress already written with the activity history
+
+@dataclass
+class ScoringUnitOfWork:
+    """Everything scoring one activity writes, persisted in a single transaction"""
+    learner_id: str
+    history_records: List[Dict[str, Any]] = field(default_factory=list)
+    scoring_states: List[SkillScoringState] = field(default_factory=list)
+    skill_progress: List[SkillProgress] = field(default_factory=list)
+    stale_scoring_states: List[str] = field(default_factory=list)  # skill_ids whose state is dropped
 
 class ScoringEngine:
     """Dual-gate scoring engine with position-based decay"""
@@ -50,17 +70,36 @@ class ScoringEngine:
         else:
             self.scoring_config = self._get_default_scoring_config()
             self.domain_model = {}
+        self._local_domain_index = None
+        self._timeseries_cache: Dict[Tuple[str, str], Tuple[Any, List[Dict[str, Any]]]] = {}
         
         # Extract key parameters
         scoring_params = self.scoring_config.get('scoring_parameters', {})
         self.decay_factor = scoring_params.get('decay_factor', 0.9)
         self.prior_mean = scoring_params.get('prior_mean', 0.0)
+        self.max_activities_for_scoring = scoring_params.get('max_activities_for_scoring')
+        self.minimum_activities_for_reliability = scoring_params.get('minimum_activities_for_reliability', 1)
+        self.carry_forward_older_evidence = scoring_params.get('carry_forward_older_evidence', False)
         
         # Thresholds
         gate_thresholds = self.scoring_config.get('gate_thresholds', {})
         self.performance_thresholds = gate_thresholds.get('performance', {})
         self.evidence_thresholds = gate_thresholds.get('evidence', {})
     
+    @property
+    def scoring_window(self) -> Optional[int]:
+        """
+        Number of most recent activities scored per skill, or None for the full history.
+        
+        max_activities_for_scoring bounds the window (never below
+        minimum_activities_for_reliability). With carry_forward_older_evidence,
+        older activities stay folded into the persisted decayed running sums, so
+        scores cover the full history without reading it and no window applies.
+        """
+        if not self.max_activities_for_scoring or self.carry_forward_older_evidence:
+            return None
+        return max(int(self.max_activities_for_scoring), int(self.minimum_activities_for_reliability or 1))
+    
     def score_activity(self, learner_history: Dict, new_evaluation: Dict) -> ScoringResult:
         """Score a new activity against learner's history"""
         learner_id = learner_history.get('learner_id')
@@ -71,20 +110,37 @@ class ScoringEngine:
         # Get skills targeted by this activity
         targeted_skills = self._extract_targeted_skills(new_evaluation)
         
-        # Score each skill
+        # Score each skill, staging all writes in one unit of work
         skill_scores = {}
+        unit_of_work = ScoringUnitOfWork(learner_id=learner_id)
+        scoring_context = self._load_scoring_context(learner_id, new_evaluation, targeted_skills)
+        window = self.scoring_window
         for skill_id in targeted_skills:
             try:
+                # Fold the new activity into the persisted running sums when possible
+                scoring_state = self._next_scoring_state(learner_id, skill_id, new_evaluation, scoring_context)
+                
+                # A scoring window reads only the most recent activities; otherwise
+                # read this skill's history exactly once, and only without a state
+                history_records = None
+                if window:
+                    history_records = self._fetch_skill_history(learner_id, skill_id, window)
+                elif scoring_state is None:
+                    history_records = self._fetch_skill_history(learner_id, skill_id)
+                
                 skill_score = self._score_individual_skill(
                     learner_history, 
                     skill_id, 
-                    new_evaluation
+                    new_evaluation,
+                    None if window else scoring_state,
+                    history_records
                 )
                 skill_scores[skill_id] = skill_score
                 
-                # Add to activity history table
-                self._add_activity_history_record(
-                    learner_id, skill_id, new_evaluation, skill_score
+                # Stage the activity history row, scoring state and skill progress
+                self._stage_skill_updates(
+                    unit_of_work, skill_id, new_evaluation, skill_score, scoring_state, history_records,
+                    windowed=bool(window)
                 )
                 
             except Exception as e:
@@ -98,6 +154,9 @@ class ScoringEngine:
         skills_mastered = sum(1 for score in skill_scores.values() if score.overall_status == 'mastered')
         overall_progress = skills_mastered / total_skills if total_skills > 0 else 0.0
         
+        # Persist every skill's writes in one transaction
+        progress_persisted = self._commit_unit_of_work(unit_of_work)
+        
         result = ScoringResult(
             activity_id=activity_id,
             learner_id=learner_id,
@@ -105,7 +164,8 @@ class ScoringEngine:
             timestamp=datetime.utcnow().isoformat(),
             total_skills_evaluated=total_skills,
             skills_mastered=skills_mastered,
-            overall_progress=overall_progress
+            overall_progress=overall_progress,
+            progress_persisted=progress_persisted
         )
         
         self.logger.log_system_event('scoring_engine', 'scoring_complete', f"Scoring complete: {skills_mastered}/{total_skills} skills mastered")
@@ -113,15 +173,21 @@ class ScoringEngine:
         return result
     
     def _score_individual_skill(self, learner_history: Dict, skill_id: str, 
-                               new_evaluation: Dict) -> SkillScore:
+                               new_evaluation: Dict,
+                               scoring_state: Optional[SkillScoringState] = None,
+                               history_records: Optional[List[Dict]] = None) -> SkillScore:
         """Score individual skill using position-based decay Bayesian model"""
         
         # Get skill name from domain model
         skill_name = self._get_skill_name(skill_id)
         
+        # Incremental path: the state already includes the new activity
+        if scoring_state is not None:
+            return self._skill_score_from_state(skill_name, scoring_state)
+        
         # Get historical activities for this skill
         historical_activities = self._get_historical_activities_for_skill(
-            learner_history, skill_id
+            learner_history, skill_id, history_records
         )
         
         # Extract skill evaluation data from new activity
@@ -131,6 +197,11 @@ class ScoringEngine:
         all_activities = historical_activities + [new_skill_data]
         all_activities.sort(key=lambda x: x['timestamp'])  # Ensure chronological order
         
+        # Keep only the most recent activities when a scoring window is configured
+        window = self.scoring_window
+        if window:
+            all_activities = all_activities[-window:]
+        
         # Calculate cumulative score using position-based decay
         cumulative_score = self._calculate_cumulative_score(all_activities)
         
@@ -171,33 +242,20 @@ class ScoringEngine:
         
         weighted_sum = 0.0
         total_weight = 0.0
+        # Evidence accumulated since the current activity, kept as a running sum
+        evidence_accumulated_since = 0.0
         
         # Process activities from most recent to oldest
-        for i, activity in enumerate(activities):
+        for activity in activities:
             # Calculate adjusted evidence for this activity
             target_evidence = activity.get('target_evidence', 0.0)
             validity_modifier = activity.get('validity_modifier', 1.0)
             adjusted_evidence = target_evidence * validity_modifier
             
-            # Calculate decay based on evidence accumulated SINCE this activity was completed
-            # For the most recent activity (i=0), no evidence has accumulated since it was completed
-            # For older activities, decay increases based on evidence accumulated since they were completed
-            if i == 0:
-                # Most recent activity: no decay
-                evidence_based_decay = 1.0
-            else:
-                # Older activities: calculate evidence accumulated since this activity was completed
-                evidence_accumulated_since = 0.0
-                for j in range(i):
-                    # Sum evidence from all activities that came after this one
-                    older_activity = activities[j]
-                    older_target_evidence = older_activity.get('target_evidence', 0.0)
-                    older_validity_modifier = older_activity.get('validity_modifier', 1.0)
-                    older_adjusted_evidence = older_target_evidence * older_validity_modifier
-                    evidence_accumulated_since += older_adjusted_evidence
-                
-                # Apply decay based on evidence accumulated since this activity was completed
-                evidence_based_decay = self.decay_factor ** evidence_accumulated_since
+            # Decay based on evidence accumulated SINCE this activity was completed;
+            # the most recent activity has nothing accumulated and is not decayed
+            evidence_based_decay = self.decay_factor ** evidence_accumulated_since
+            evidence_accumulated_since += adjusted_evidence
             
             # Weight for this activity: adjusted_evidence * evidence_based_decay
             weight = adjusted_evidence * evidence_based_decay
@@ -280,6 +338,13 @@ class ScoringEngine:
         n_activities = len(activities)
         total_evidence = sum(a.get('target_evidence', 0) for a in activities)
         
+        return self._standard_error_from_totals(n_activities, total_evidence)
+    
+    def _standard_error_from_totals(self, n_activities: int, total_evidence: float) -> float:
+        """SEM from activity count and total target evidence"""
+        if n_activities < 2:
+            return 0.15  # Default SEM for single activity
+        
         # Base SEM that decreases with sample size and evidence
         base_sem = 0.20
         activity_factor = 1 / math.sqrt(n_activities)
@@ -465,29 +530,28 @@ class ScoringEngine:
         return skill_data
     
     def _get_historical_activities_for_skill(self, learner_history: Dict, 
-                                           skill_id: str) -> List[Dict]:
+                                           skill_id: str,
+                                           history_records: Optional[List[Dict]] = None) -> List[Dict]:
         """Get historical activities that evaluated this skill"""
         historical_activities = []
         learner_id = learner_history.get('learner_id')
         
-        # Try to get from database first if learner_manager is available
-        if hasattr(self, 'learner_manager') and self.learner_manager and learner_id:
-            try:
-                db_records = self.learner_manager.get_activity_history_for_learner_skill(learner_id, skill_id)
-                for record in db_records:
-                    historical_activities.append({
-                        'activity_id': record['activity_id'],
-                        'performance_score': record['performance_score'],
-                        'target_evidence': record['target_evidence_volume'],
-                        'validity_modifier': record['validity_modifier'],
-                        'adjusted_evidence': record['adjusted_evidence_volume'],
-                        'timestamp': record['completion_timestamp'],
-                        'cumulative_evidence_weight': record['cumulative_evidence_weight'],
-                        'decay_factor': record['decay_factor']
-                    })
-                return historical_activities
-            except Exception as e:
-                self.logger.log_error('scoring_engine', f"Failed to get historical activities from database: {str(e)}", str(e))
+        # Use already fetched activity history, else try the database if learner_manager is available
+        if history_records is None and hasattr(self, 'learner_manager') and self.learner_manager and learner_id:
+            history_records = self._fetch_skill_history(learner_id, skill_id)
+        if history_records is not None:
+            for record in history_records:
+                historical_activities.append({
+                    'activity_id': record['activity_id'],
+                    'performance_score': record['performance_score'],
+                    'target_evidence': record['target_evidence_volume'],
+                    'validity_modifier': record['validity_modifier'],
+                    'adjusted_evidence': record['adjusted_evidence_volume'],
+                    'timestamp': record['completion_timestamp'],
+                    'cumulative_evidence_weight': record['cumulative_evidence_weight'],
+                    'decay_factor': record['decay_factor']
+                })
+            return historical_activities
         
         # Fallback to learner_history dictionary
         activities = learner_history.get('activities', [])
@@ -506,20 +570,33 @@ class ScoringEngine:
         
         return historical_activities
     
+    def _fetch_skill_history(self, learner_id: str, skill_id: str,
+                             limit: Optional[int] = None) -> Optional[List[Dict]]:
+        """
+        Activity history for a learner/skill in chronological order (only the most
+        recent `limit` activities if given), or None without a database
+        """
+        if not (hasattr(self, 'learner_manager') and self.learner_manager and learner_id):
+            return None
+        try:
+            if limit:
+                return self.learner_manager.get_recent_activity_history(learner_id, skill_id, limit)
+            return self.learner_manager.get_activity_history_chronological(learner_id, skill_id)
+        except Exception as e:
+            self.logger.log_error('scoring_engine', f"Failed to get historical activities from database: {str(e)}", str(e))
+            return None
+    
     def _get_skill_name(self, skill_id: str) -> str:
         """Get human-readable skill name from domain model"""
-        competencies = self.domain_model.get('competencies', {})
-        
-        # Defensive: ensure competencies is a dictionary
-        if not isinstance(competencies, dict):
-            competencies = {}
-        
-        for competency_id, competency_data in competencies.items():
-            skills = competency_data.get('skills', {})
-            if skill_id in skills:
-                return skills[skill_id].get('name', skill_id)
-        
-        return skill_id  # Fallback to ID if name not found
+        return self._get_domain_index().get_skill_name(skill_id)
+    
+    def _get_domain_index(self) -> DomainModelIndex:
+        """Get the shared domain model index (built locally when running without config)"""
+        if self.config_manager and hasattr(self.config_manager, 'get_domain_model_index'):
+            return self.config_manager.get_domain_model_index()
+        if self._local_domain_index is None:
+            self._local_domain_index = DomainModelIndex(self.domain_model)
+        return self._local_domain_index
     
     def update_learner_progress(self, learner_history: Dict, 
                                scoring_result: ScoringResult, 
@@ -558,25 +635,10 @@ class ScoringEngine:
                 'last_updated': skill_score.last_updated
             }
             
-            # Update database if learner_manager is provided
-            if learner_manager:
+            # Update database if learner_manager is provided (score_activity may already have)
+            if learner_manager and not getattr(scoring_result, 'progress_persisted', False):
                 try:
-                    from learner_manager import SkillProgress
-                    progress = SkillProgress(
-                        skill_id=skill_id,
-                        learner_id=scoring_result.learner_id,
-                        skill_name=skill_score.skill_name,
-                        cumulative_score=skill_score.cumulative_score,
-                        total_adjusted_evidence=skill_score.total_adjusted_evidence,
-                        activity_count=skill_score.activity_count,
-                        gate_1_status=skill_score.gate_1_status,
-                        gate_2_status=skill_score.gate_2_status,
-                        overall_status=skill_score.overall_status,
-                        confidence_interval_lower=skill_score.confidence_interval[0] if skill_score.confidence_interval else None,
-                        confidence_interval_upper=skill_score.confidence_interval[1] if skill_score.confidence_interval else None,
-                        standard_error=skill_score.standard_error,
-                        last_updated=skill_score.last_updated
-                    )
+                    progress = self._skill_progress_from_score(scoring_result.learner_id, skill_id, skill_score)
                     learner_manager.update_skill_progress(progress)
                 except Exception as e:
                     self.logger.log_error('scoring_engine', f"Failed to update skill progress in database for skill {skill_id}: {str(e)}", str(e))
@@ -651,125 +713,285 @@ class ScoringEngine:
             }
         }
 
-    def _add_activity_history_record(self, learner_id: str, skill_id: str, 
-                                    evaluation: Dict, skill_score: SkillScore):
-        """Add new row to activity history table with evidence-based decay"""
-        try:
-            # Extract data from evaluation
-            skill_data = self._extract_skill_evaluation(evaluation, skill_id)
-            
-            # Get activity metadata
-            activity_id = evaluation.get('activity_id', 'unknown')
-            completion_timestamp = evaluation.get('timestamp', datetime.utcnow().isoformat())
-            activity_type = evaluation.get('activity_type', 'Unknown')
-            activity_title = evaluation.get('activity_title', 'Unknown Activity')
-            
-            # Calculate adjusted evidence
-            adjusted_evidence = skill_data['target_evidence'] * skill_data['validity_modifier']
-            
-            # Get cumulative evidence weight from previous activities (BEFORE adding current activity)
-            # This ensures we don't include the current activity in the cumulative calculation
-            cumulative_evidence_weight = self._get_cumulative_evidence_weight(learner_id, skill_id)
-            
-            # Store the actual decay factor from settings (not the calculated decay)
-            # The decay factor for this activity is the current setting value
-            current_decay_factor = self.decay_factor
-            
-            # Calculate evidence-based decay for this specific activity
-            # For the CURRENT activity (most recent), it should have the LEAST decay
-            # The decay is based on how much evidence has accumulated since this activity was completed
-            # Since this is the current activity, no evidence has accumulated since it was completed, so decay = 1.0
-            evidence_based_decay = 1.0  # Current activity has no decay
-            
-            # Calculate decay-adjusted evidence volume for this activity
-            decay_adjusted_evidence = adjusted_evidence * evidence_based_decay
-            
-            # For cumulative performance, we need to calculate it based on all activities up to this point
-            # including the current activity
-            all_activities_up_to_now = self._get_historical_activities_for_skill(
-                {'learner_id': learner_id, 'activities': []}, skill_id
+    def _stage_skill_updates(self, unit_of_work: ScoringUnitOfWork, skill_id: str, evaluation: Dict,
+                             skill_score: SkillScore, scoring_state: Optional[SkillScoringState] = None,
+                             history_records: Optional[List[Dict]] = None, windowed: bool = False):
+        """
+        Stage the new activity history row (with evidence-based decay), scoring state and skill progress.
+        
+        With windowed scoring, history_records holds only the recent window: the
+        state is still advanced when possible, and dropped otherwise instead of
+        being rebuilt from the full history.
+        """
+        if not (hasattr(self, 'learner_manager') and self.learner_manager):
+            return
+        learner_id = unit_of_work.learner_id
+        
+        # Extract data from evaluation
+        skill_data = self._extract_skill_evaluation(evaluation, skill_id)
+        
+        # Get activity metadata
+        activity_id = evaluation.get('activity_id', 'unknown')
+        completion_timestamp = evaluation.get('timestamp', datetime.utcnow().isoformat())
+        
+        # Calculate adjusted evidence
+        adjusted_evidence = skill_data['target_evidence'] * skill_data['validity_modifier']
+        
+        # For the CURRENT activity (most recent) no evidence has accumulated since it was
+        # completed, so its evidence-based decay is 1.0
+        evidence_based_decay = 1.0
+        decay_adjusted_evidence = adjusted_evidence * evidence_based_decay
+        
+        record = {
+            'learner_id': learner_id,
+            'activity_id': activity_id,
+            'skill_id': skill_id,
+            'completion_timestamp': completion_timestamp,
+            'activity_type': evaluation.get('activity_type', 'Unknown'),
+            'activity_title': evaluation.get('activity_title', 'Unknown Activity'),
+            'performance_score': skill_data['performance_score'],
+            'target_evidence_volume': skill_data['target_evidence'],
+            'validity_modifier': skill_data['validity_modifier'],
+            'adjusted_evidence_volume': adjusted_evidence,
+            'cumulative_evidence_weight': decay_adjusted_evidence,  # Store decay-adjusted evidence as evidence weight
+            'decay_factor': self.decay_factor,  # Store the actual decay factor from settings
+            'decay_adjusted_evidence_volume': decay_adjusted_evidence,
+            'evaluation_result': evaluation,
+            'activity_transcript': evaluation.get('activity_transcript', {})
+        }
+        
+        if scoring_state is not None or windowed:
+            # The incremental state or the window already includes the current activity
+            record['cumulative_performance'] = skill_score.cumulative_score
+            record['cumulative_evidence'] = skill_score.total_adjusted_evidence
+        else:
+            # Derive everything from the single history read
+            history_records = history_records or []
+            previous_activities = [{
+                'target_evidence': previous['target_evidence_volume'],
+                'validity_modifier': previous['validity_modifier'],
+                'performance_score': previous['performance_score']
+            } for previous in history_records]
+            record['cumulative_performance'] = self._calculate_cumulative_score(
+                previous_activities + [skill_data]
             )
+            record['cumulative_evidence'] = sum(
+                previous.get('adjusted_evidence_volume', 0.0) for previous in history_records
+            ) + adjusted_evidence
             
-            # Get activities in chronological order for cumulative calculation
-            if hasattr(self, 'learner_manager') and self.learner_manager:
-                chronological_activities = self.learner_manager.get_activity_history_chronological(learner_id, skill_id)
-                # Convert to the format expected by _calculate_cumulative_score
-                all_activities_up_to_now = []
-                for record in chronological_activities:
-                    all_activities_up_to_now.append({
-                        'target_evidence': record['target_evidence_volume'],
-                        'validity_modifier': record['validity_modifier'],
-                        'performance_score': record['performance_score'],
-                        'cumulative_evidence_weight': record['cumulative_evidence_weight'],
-                        'timestamp': record['completion_timestamp']
-                    })
-            
-            # Add current activity to the list for cumulative calculation
-            current_activity_data = {
-                'target_evidence': skill_data['target_evidence'],
-                'validity_modifier': skill_data['validity_modifier'],
-                'performance_score': skill_data['performance_score'],
-                'cumulative_evidence_weight': cumulative_evidence_weight,
-                'timestamp': completion_timestamp
-            }
-            all_activities_up_to_now.append(current_activity_data)
-            
-            # Calculate cumulative performance at this point in time
-            cumulative_performance_at_time = self._calculate_cumulative_score(all_activities_up_to_now)
-            
-            # Add to database if learner_manager is available
-            if hasattr(self, 'learner_manager') and self.learner_manager:
-                # For the first activity, cumulative evidence should equal adjusted evidence
-                # For subsequent activities, it should be the sum of all previous adjusted evidence
-                # If cumulative_evidence_weight is 0, this is the first activity
-                if cumulative_evidence_weight == 0.0:
-                    cumulative_evidence = adjusted_evidence
-                else:
-                    cumulative_evidence = cumulative_evidence_weight + adjusted_evidence
-                
-                self.learner_manager.add_activity_history_record(
-                    learner_id=learner_id,
-                    activity_id=activity_id,
-                    skill_id=skill_id,
-                    completion_timestamp=completion_timestamp,
-                    activity_type=activity_type,
-                    activity_title=activity_title,
-                    performance_score=skill_data['performance_score'],
-                    target_evidence_volume=skill_data['target_evidence'],
-                    validity_modifier=skill_data['validity_modifier'],
-                    adjusted_evidence_volume=adjusted_evidence,
-                    cumulative_evidence_weight=decay_adjusted_evidence,  # Store decay-adjusted evidence as evidence weight
-                    decay_factor=current_decay_factor,  # Store the actual decay factor from settings
-                    decay_adjusted_evidence_volume=decay_adjusted_evidence,
-                    cumulative_performance=cumulative_performance_at_time,  # Cumulative at this point in time
-                    cumulative_evidence=cumulative_evidence,
-                    evaluation_result=evaluation,
-                    activity_transcript=evaluation.get('activity_transcript', {})
-                )
-            
-        except Exception as e:
-            self.logger.log_error('scoring_engine', f"Failed to add activity history record: {str(e)}", str(e))
+            # Rebuild the state as the history will read after this write, so the
+            # next activity for this skill is incremental
+            history_after = [previous for previous in history_records if previous['activity_id'] != activity_id]
+            history_after.append(record)
+            history_after.sort(key=lambda previous: previous['completion_timestamp'])
+            scoring_state = self.build_skill_scoring_state(learner_id, skill_id, history_after)
+        
+        unit_of_work.history_records.append(record)
+        if scoring_state is not None:
+            unit_of_work.scoring_states.append(scoring_state)
+        else:
+            unit_of_work.stale_scoring_states.append(skill_id)
+        unit_of_work.skill_progress.append(self._skill_progress_from_score(learner_id, skill_id, skill_score))
+    
+    def _commit_unit_of_work(self, unit_of_work: ScoringUnitOfWork) -> bool:
+        """Write a scoring unit of work in one transaction; True if skill progress was persisted"""
+        if not unit_of_work.history_records or not (hasattr(self, 'learner_manager') and self.learner_manager):
+            return False
+        return self.learner_manager.apply_scoring_updates(
+            unit_of_work.learner_id,
+            unit_of_work.history_records,
+            unit_of_work.scoring_states,
+            unit_of_work.skill_progress,
+            unit_of_work.stale_scoring_states
+        )
+    
+    def _skill_progress_from_score(self, learner_id: str, skill_id: str, skill_score: SkillScore) -> SkillProgress:
+        return SkillProgress(
+            skill_id=skill_id,
+            learner_id=learner_id,
+            skill_name=skill_score.skill_name,
+            cumulative_score=skill_score.cumulative_score,
+            total_adjusted_evidence=skill_score.total_adjusted_evidence,
+            activity_count=skill_score.activity_count,
+            gate_1_status=skill_score.gate_1_status,
+            gate_2_status=skill_score.gate_2_status,
+            overall_status=skill_score.overall_status,
+            confidence_interval_lower=skill_score.confidence_interval[0] if skill_score.confidence_interval else None,
+            confidence_interval_upper=skill_score.confidence_interval[1] if skill_score.confidence_interval else None,
+            standard_error=skill_score.standard_error,
+            last_updated=skill_score.last_updated
+        )
 
-    def _get_cumulative_evidence_weight(self, learner_id: str, skill_id: str) -> float:
-        """Get cumulative evidence weight for evidence-based decay calculation"""
+    def _load_scoring_context(self, learner_id: str, evaluation: Dict,
+                              skill_ids: List[str]) -> Optional[Dict[str, Any]]:
+        """Stored scoring states and history flags for the targeted skills, in one read"""
+        if not (hasattr(self, 'learner_manager') and self.learner_manager and learner_id):
+            return None
         try:
-            if hasattr(self, 'learner_manager') and self.learner_manager:
-                # Get all previous activities for this skill (excluding current activity)
-                # For the first activity, this should return 0.0
-                activities = self.learner_manager.get_activity_history_for_learner_skill(learner_id, skill_id)
-                
-                # Calculate cumulative evidence weight from previous activities only
-                # This should be the sum of all activities that were completed BEFORE the current activity
-                cumulative_weight = 0.0
-                for activity in activities:
-                    adjusted_evidence = activity.get('adjusted_evidence_volume', 0.0)
-                    cumulative_weight += adjusted_evidence
-                
-                return cumulative_weight
-            return 0.0
+            return self.learner_manager.get_skill_scoring_context(
+                learner_id, evaluation.get('activity_id', 'unknown'), skill_ids
+            )
         except Exception as e:
-            self.logger.log_error('scoring_engine', f"Failed to get cumulative evidence weight: {str(e)}", str(e))
-            return 0.0
+            self.logger.log_error('scoring_engine', f"Failed to load scoring state: {str(e)}", str(e))
+            return None
+    
+    def _next_scoring_state(self, learner_id: str, skill_id: str, evaluation: Dict,
+                            context: Optional[Dict[str, Any]] = None) -> Optional[SkillScoringState]:
+        """
+        Persisted scoring state with the new activity folded in.
+        
+        Returns None when the state can't be advanced incrementally (no learner
+        manager, no stored state for an existing history, a changed decay factor,
+        a re-evaluated or out-of-order activity); the caller then rescores from
+        the full history.
+        """
+        if context is None:
+            context = self._load_scoring_context(learner_id, evaluation, [skill_id])
+        if context is None:
+            return None
+        
+        state = context['states'].get(skill_id)
+        if state is None:
+            if skill_id in context['skills_with_history']:
+                return None
+            state = SkillScoringState(learner_id=learner_id, skill_id=skill_id,
+                                      decay_factor=self.decay_factor)
+        if state.decay_factor != self.decay_factor:
+            return None
+        if skill_id in context['recorded_skills']:
+            return None
+        
+        skill_data = self._extract_skill_evaluation(evaluation, skill_id)
+        if state.last_completion_timestamp and skill_data['timestamp'] < state.last_completion_timestamp:
+            return None
+        
+        skill_data['activity_id'] = evaluation.get('activity_id', 'unknown')
+        return self._advance_scoring_state(state, skill_data)
+    
+    def _advance_scoring_state(self, state: SkillScoringState, activity: Dict) -> SkillScoringState:
+        """
+        Fold one activity into the running sums in constant time.
+        
+        Matches _calculate_cumulative_score over the chronological history: the
+        new activity is weighted by adjusted_evidence * decay_factor ** (evidence
+        accumulated before it).
+        """
+        target_evidence = activity.get('target_evidence', 0.0)
+        adjusted_evidence = target_evidence * activity.get('validity_modifier', 1.0)
+        weight = adjusted_evidence * self.decay_factor ** state.total_adjusted_evidence
+        return replace(
+            state,
+            weighted_score_sum=state.weighted_score_sum + activity.get('performance_score', 0.0) * weight,
+            decayed_weight=state.decayed_weight + weight,
+            total_adjusted_evidence=state.total_adjusted_evidence + adjusted_evidence,
+            total_target_evidence=state.total_target_evidence + target_evidence,
+            activity_count=state.activity_count + 1,
+            last_activity_id=activity.get('activity_id', state.last_activity_id),
+            last_completion_timestamp=activity.get('timestamp', state.last_completion_timestamp)
+        )
+    
+    def _skill_score_from_state(self, skill_name: str, state: SkillScoringState) -> SkillScore:
+        """Build a SkillScore from running sums"""
+        if state.decayed_weight == 0:
+            cumulative_score = self.prior_mean
+        else:
+            cumulative_score = state.weighted_score_sum / state.decayed_weight
+        total_evidence = state.total_adjusted_evidence
+        
+        gate_1_status = self._determine_performance_gate_status(cumulative_score)
+        gate_2_status = self._determine_evidence_gate_status(total_evidence)
+        overall_status = self._determine_overall_status(gate_1_status, gate_2_status)
+        
+        standard_error = self._standard_error_from_totals(state.activity_count, state.total_target_evidence)
+        confidence_interval = self._calculate_confidence_interval(cumulative_score, standard_error)
+        
+        return SkillScore(
+            skill_id=state.skill_id,
+            skill_name=skill_name,
+            cumulative_score=cumulative_score,
+            total_adjusted_evidence=total_evidence,
+            activity_count=state.activity_count,
+            gate_1_status=gate_1_status,
+            gate_2_status=gate_2_status,
+            overall_status=overall_status,
+            standard_error=standard_error,
+            confidence_interval=confidence_interval,
+            last_updated=datetime.utcnow().isoformat()
+        )
+    
+    def build_skill_scoring_state(self, learner_id: str, skill_id: str,
+                                  chronological_records: List[Dict]) -> SkillScoringState:
+        """Fold activity history records (oldest first) into a fresh scoring state"""
+        state = SkillScoringState(learner_id=learner_id, skill_id=skill_id, decay_factor=self.decay_factor)
+        for record in chronological_records:
+            state = self._advance_scoring_state(state, {
+                'activity_id': record['activity_id'],
+                'performance_score': record['performance_score'],
+                'target_evidence': record['target_evidence_volume'],
+                'validity_modifier': record['validity_modifier'],
+                'timestamp': record['completion_timestamp']
+            })
+        return state
+    
+    def rebuild_skill_scoring_state(self, learner_id: str = None, skill_id: str = None,
+                                    verify_only: bool = False) -> Dict[str, Any]:
+        """
+        Rebuild persisted scoring state from activity history.
+        
+        Args:
+            learner_id: Optional learner to restrict to. If None, covers all learners.
+            skill_id: Optional skill to restrict to
+            verify_only: Compare stored state against the rebuilt one without writing
+            
+        Returns:
+            Dict with counts of states checked and rebuilt, and any mismatches found
+        """
+        report = {'checked': 0, 'rebuilt': 0, 'mismatches': []}
+        if not hasattr(self, 'learner_manager') or not self.learner_manager:
+            self.logger.log_error('scoring_engine', 'Learner manager not available for scoring state rebuild', 'missing_learner_manager')
+            return report
+        
+        if learner_id and skill_id:
+            pairs = [(learner_id, skill_id)]
+        else:
+            pairs = [pair for pair in self.learner_manager.get_activity_history_skill_pairs(learner_id)
+                     if skill_id is None or pair[1] == skill_id]
+        
+        for pair_learner_id, pair_skill_id in pairs:
+            records = self.learner_manager.get_activity_history_chronological(pair_learner_id, pair_skill_id)
+            rebuilt = self.build_skill_scoring_state(pair_learner_id, pair_skill_id, records)
+            stored = self.learner_manager.get_skill_scoring_state(pair_learner_id, pair_skill_id)
+            report['checked'] += 1
+            
+            differences = self._scoring_state_differences(stored, rebuilt)
+            if differences:
+                report['mismatches'].append({
+                    'learner_id': pair_learner_id,
+                    'skill_id': pair_skill_id,
+                    'differences': differences
+                })
+            if not verify_only and (differences or stored is None):
+                if self.learner_manager.save_skill_scoring_state(rebuilt):
+                    report['rebuilt'] += 1
+        
+        self.logger.log_system_event('scoring_engine', 'scoring_state_rebuild',
+                                   f"Checked {report['checked']} scoring states, "
+                                   f"{len(report['mismatches'])} mismatched, {report['rebuilt']} rebuilt",
+                                   verify_only=verify_only)
+        return report
+    
+    def _scoring_state_differences(self, stored: Optional[SkillScoringState],
+                                   rebuilt: SkillScoringState) -> Dict[str, Tuple[Any, Any]]:
+        """Fields where a stored state disagrees with one rebuilt from history"""
+        if stored is None:
+            return {'state': (None, 'missing')}
+        differences = {}
+        for name in ('decay_factor', 'weighted_score_sum', 'decayed_weight', 'total_adjusted_evidence',
+                     'total_target_evidence', 'activity_count'):
+            stored_value, rebuilt_value = getattr(stored, name), getattr(rebuilt, name)
+            if not math.isclose(stored_value, rebuilt_value, rel_tol=1e-9, abs_tol=1e-9):
+                differences[name] = (stored_value, rebuilt_value)
+        return differences
 
     def update_configuration(self, config_manager=None):
         """Update the scoring engine configuration dynamically"""
@@ -777,11 +999,15 @@ class ScoringEngine:
             self.config_manager = config_manager
             self.scoring_config = config_manager.get_scoring_config()
             self.domain_model = config_manager.get_domain_model()
+            self._local_domain_index = None
         
         # Extract key parameters
         scoring_params = self.scoring_config.get('scoring_parameters', {})
         self.decay_factor = scoring_params.get('decay_factor', 0.9)
         self.prior_mean = scoring_params.get('prior_mean', 0.0)
+        self.max_activities_for_scoring = scoring_params.get('max_activities_for_scoring')
+        self.minimum_activities_for_reliability = scoring_params.get('minimum_activities_for_reliability', 1)
+        self.carry_forward_older_evidence = scoring_params.get('carry_forward_older_evidence', False)
         
         # Thresholds
         gate_thresholds = self.scoring_config.get('gate_thresholds', {})
@@ -791,85 +1017,365 @@ class ScoringEngine:
         self.logger.log_system_event('scoring_engine', 'configuration_updated', 
                                    f'Updated decay_factor to {self.decay_factor}')
 
-    def recalculate_all_activities_with_new_decay(self, learner_id: str = None):
+    def recalculate_all_activities_with_new_decay(self, learner_id: str = None, chunk_size: int = 200,
+                                                  progress_callback=None, resume: bool = True):
         """
         Recalculate all existing activities with the current decay factor.
         This applies the new decay factor retroactively to all activities.
         
         Args:
             learner_id: Optional specific learner ID. If None, recalculates for all learners.
+            chunk_size: Learner/skill groups per batched transaction
+            progress_callback: Optional callable(report) invoked after each committed chunk
+            resume: Continue an interrupted run with the same decay factor from its checkpoint
+        """
+        report = self.bulk_recalculate_decay(learner_id, chunk_size, progress_callback, resume)
+        return report is not None
+    
+    def bulk_recalculate_decay(self, learner_id: str = None, chunk_size: int = 200,
+                               progress_callback=None, resume: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Stream activity history in chunks of learner/skill groups, recompute the
+        evidence-based decay of every row with one newest-first pass per group and
+        write each chunk back with executemany in a single transaction.
+        
+        The position of the last committed group is checkpointed in the same
+        transaction, so an interrupted run resumes where it stopped.
+        
+        Returns:
+            Dict with groups/rows processed and timing, or None on failure
         """
         try:
             if not hasattr(self, 'learner_manager') or not self.learner_manager:
                 self.logger.log_error('scoring_engine', 'Learner manager not available for recalculation', 'missing_learner_manager')
-                return False
-            
-            # Get all learners if specific learner not provided
-            if learner_id:
-                learners = [self.learner_manager.get_learner(learner_id)]
-                if not learners[0]:
-                    self.logger.log_error('scoring_engine', f'Learner not found: {learner_id}', 'learner_not_found')
-                    return False
+                return None
+            
+            if learner_id and not self.learner_manager.get_learner(learner_id):
+                self.logger.log_error('scoring_engine', f'Learner not found: {learner_id}', 'learner_not_found')
+                return None
+            
+            job_id = f"decay_recalculation:{learner_id or '*'}"
+            parameters = {'decay_factor': self.decay_factor, 'learner_id': learner_id}
+            checkpoint = self.learner_manager.get_maintenance_checkpoint(job_id) if resume else None
+            if checkpoint and checkpoint['parameters'] == parameters:
+                after = tuple(checkpoint['position'])
+                groups_done = checkpoint['processed']
             else:
-                learners = self.learner_manager.list_learners()
+                after = None
+                groups_done = 0
             
-            total_updated = 0
+            started = time.perf_counter()
+            report = {
+                'decay_factor': self.decay_factor,
+                'total_groups': self.learner_manager.count_activity_history_groups(learner_id),
+                'groups_processed': groups_done,
+                'rows_updated': 0,
+                'chunks': 0,
+                'resumed_from': list(after) if after else None
+            }
             
-            for learner in learners:
-                if not learner:
-                    continue
-                    
-                # Get all skills for this learner
-                skill_progress = self.learner_manager.get_skill_progress(learner.learner_id)
+            while True:
+                rows = self.learner_manager.get_activity_history_evidence_chunk(after, chunk_size, learner_id)
+                if not rows:
+                    break
                 
-                for skill_id in skill_progress.keys():
-                    # Get all activities for this skill in chronological order
-                    activities = self.learner_manager.get_activity_history_chronological(learner.learner_id, skill_id)
-                    
-                    if not activities:
+                updates = []
+                group_count = 0
+                group_start = 0
+                # Rows come grouped by learner/skill, each group most recent first
+                for index in range(1, len(rows) + 1):
+                    if index < len(rows) and (rows[index]['learner_id'], rows[index]['skill_id']) == \
+                            (rows[group_start]['learner_id'], rows[group_start]['skill_id']):
                         continue
-                    
-                    # Recalculate each activity with the new decay factor
-                    # activities is in chronological order (oldest first), so we need to process in reverse
-                    for i, activity in enumerate(activities):
-                        # Calculate evidence accumulated since this activity was completed
-                        evidence_accumulated_since = 0.0
-                        
-                        # Sum evidence from all activities that came AFTER this one (more recent activities)
-                        # Since activities is chronological (oldest first), more recent activities have higher indices
-                        for j in range(i + 1, len(activities)):
-                            more_recent_activity = activities[j]
-                            evidence_accumulated_since += more_recent_activity['adjusted_evidence_volume']
-                        
-                        # Calculate new decay-adjusted evidence
-                        if i == len(activities) - 1:  # Most recent activity (last in chronological list)
-                            evidence_based_decay = 1.0
-                        else:
-                            evidence_based_decay = self.decay_factor ** evidence_accumulated_since
-                        
-                        new_decay_adjusted_evidence = activity['adjusted_evidence_volume'] * evidence_based_decay
-                        
-                        # Update the database record
-                        success = self.learner_manager.update_activity_decay_adjusted_evidence(
-                            learner.learner_id,
-                            activity['activity_id'],
-                            skill_id,
-                            new_decay_adjusted_evidence,
-                            evidence_based_decay
-                        )
-                        
-                        if success:
-                            total_updated += 1
+                    group = rows[group_start:index]
+                    evidence = [row['adjusted_evidence_volume'] for row in group]
+                    for row, evidence_based_decay in zip(group, evidence_decay_factors(evidence, self.decay_factor)):
+                        updates.append((row['adjusted_evidence_volume'] * evidence_based_decay, row['id']))
+                    group_count += 1
+                    group_start = index
+                
+                after = (rows[-1]['learner_id'], rows[-1]['skill_id'])
+                groups_done += group_count
+                report['rows_updated'] += self.learner_manager.bulk_update_decay_adjusted_evidence(
+                    updates,
+                    checkpoint={'job_id': job_id, 'position': list(after),
+                                'parameters': parameters, 'processed': groups_done}
+                )
+                report['groups_processed'] = groups_done
+                report['chunks'] += 1
+                
+                if progress_callback:
+                    progress_callback(dict(report))
+            
+            self.learner_manager.clear_maintenance_checkpoint(job_id)
+            report['duration_seconds'] = round(time.perf_counter() - started, 3)
             
             self.logger.log_system_event('scoring_engine', 'retroactive_decay_recalculation',
-                                       f'Recalculated decay for {total_updated} activities with decay factor {self.decay_factor}')
-            return True
+                                       f"Recalculated decay for {report['rows_updated']} activities with decay factor {self.decay_factor}",
+                                       **{key: value for key, value in report.items() if key != 'decay_factor'})
+            return report
             
         except Exception as e:
             self.logger.log_error('scoring_engine', f'Failed to recalculate activities with new decay: {str(e)}', str(e))
-            return False
+            return None
+
+    def recompute_activity_history(self, learner_ids: Optional[List[str]] = None, chunk_size: int = 200,
+                                   dry_run: bool = False, progress_callback=None, resume: bool = True,
+                                   max_differences: int = 100, rescore: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Recompute the derived activity_history columns (cumulative_performance,
+        cumulative_evidence, decay-adjusted evidence and decay_factor) and the
+        scoring state of every learner/skill group from its raw scores.
+        
+        With rescore the raw scores themselves (performance_score, target evidence,
+        validity_modifier and adjusted evidence) are first re-extracted from the
+        pipeline evaluation stored in each activity's record.
+        
+        Each group is recomputed with one chronological prefix scan (windowed
+        like score_activity when a scoring window is configured). Groups are
+        streamed in chunks; each chunk's changed rows, rebuilt scoring states and
+        checkpoint are committed in one transaction, so an interrupted run with the
+        same parameters resumes after the last committed chunk.
+        
+        Args:
+            learner_ids: Optional learners to restrict to. If None, covers all learners.
+            chunk_size: Learner/skill groups per transaction
+            dry_run: Report the differences without writing anything
+            progress_callback: Optional callable(report) invoked after each chunk
+            resume: Continue an interrupted run from its checkpoint
+            max_differences: Maximum number of row differences kept in the report
+            rescore: Re-extract the raw scores from the stored activity records first
+            
+        Returns:
+            Dict with groups/rows processed, rows changed and sample differences,
+            or None on failure
+        """
+        try:
+            if not hasattr(self, 'learner_manager') or not self.learner_manager:
+                self.logger.log_error('scoring_engine', 'Learner manager not available for history recomputation', 'missing_learner_manager')
+                return None
+            
+            learner_ids = sorted(set(learner_ids)) if learner_ids else None
+            job_id = f"history_recompute:{','.join(learner_ids) if learner_ids else '*'}"
+            parameters = {'decay_factor': self.decay_factor, 'scoring_window': self.scoring_window,
+                          'learner_ids': learner_ids, 'rescore': rescore}
+            checkpoint = self.learner_manager.get_maintenance_checkpoint(job_id) if resume and not dry_run else None
+            if checkpoint and checkpoint['parameters'] == parameters:
+                after = tuple(checkpoint['position'])
+                groups_done = checkpoint['processed']
+            else:
+                after = None
+                groups_done = 0
+            
+            started = time.perf_counter()
+            report = {
+                'dry_run': dry_run,
+                'rescore': rescore,
+                'decay_factor': self.decay_factor,
+                'scoring_window': self.scoring_window,
+                'total_groups': self.learner_manager.count_activity_history_groups(learner_ids=learner_ids),
+                'groups_processed': groups_done,
+                'rows_scanned': 0,
+                'rows_changed': 0,
+                'rows_updated': 0,
+                'chunks': 0,
+                'resumed_from': list(after) if after else None,
+                'differences': []
+            }
+            
+            columns = SCORED_HISTORY_COLUMNS + DERIVED_HISTORY_COLUMNS if rescore else DERIVED_HISTORY_COLUMNS
+            while True:
+                rows = self.learner_manager.get_activity_history_scoring_chunk(after, chunk_size, learner_ids,
+                                                                               with_evaluations=rescore)
+                if not rows:
+                    break
+                
+                updates = []
+                states = []
+                group_count = 0
+                group_start = 0
+                # Rows come grouped by learner/skill, each group oldest first
+                for index in range(1, len(rows) + 1):
+                    if index < len(rows) and (rows[index]['learner_id'], rows[index]['skill_id']) == \
+                            (rows[group_start]['learner_id'], rows[group_start]['skill_id']):
+                        continue
+                    group = rows[group_start:index]
+                    scored = [self._rescored_history_row(row) for row in group] if rescore else group
+                    state, recomputed = self._history_prefix_scan(group[0]['learner_id'], group[0]['skill_id'], scored)
+                    states.append(state)
+                    for row, scored_row, values in zip(group, scored, recomputed):
+                        if rescore:
+                            values.update({name: scored_row[name] for name in SCORED_HISTORY_COLUMNS})
+                        differences = {
+                            name: (row[name], values[name]) for name in columns
+                            if row[name] is None or not math.isclose(row[name], values[name], rel_tol=1e-9, abs_tol=1e-9)
+                        }
+                        if not differences:
+                            continue
+                        update = {name: values[name] for name in columns}
+                        update['id'] = row['id']
+                        updates.append(update)
+                        if len(report['differences']) < max_differences:
+                            report['differences'].append({
+                                'learner_id': row['learner_id'],
+                                'skill_id': row['skill_id'],
+                                'activity_id': row['activity_id'],
+                                'differences': differences
+                            })
+                    group_count += 1
+                    group_start = index
+                
+                after = (rows[-1]['learner_id'], rows[-1]['skill_id'])
+                groups_done += group_count
+                report['rows_scanned'] += len(rows)
+                report['rows_changed'] += len(updates)
+                if not dry_run:
+                    report['rows_updated'] += self.learner_manager.bulk_update_activity_history_derived(
+                        updates, states,
+                        checkpoint={'job_id': job_id, 'position': list(after),
+                                    'parameters': parameters, 'processed': groups_done},
+                        rescored=rescore
+                    )
+                report['groups_processed'] = groups_done
+                report['chunks'] += 1
+                
+                if progress_callback:
+                    progress_callback(dict(report))
+            
+            if not dry_run:
+                self.learner_manager.clear_maintenance_checkpoint(job_id)
+            report['duration_seconds'] = round(time.perf_counter() - started, 3)
+            
+            self.logger.log_system_event('scoring_engine', 'activity_history_recomputed',
+                                       f"Recomputed {report['rows_scanned']} activities, {report['rows_changed']} changed"
+                                       + (' (dry run)' if dry_run else ''),
+                                       **{key: value for key, value in report.items() if key != 'differences'})
+            return report
+            
+        except Exception as e:
+            self.logger.log_error('scoring_engine', f'Failed to recompute activity history: {str(e)}', str(e))
+            return None
+    
+    def _rescored_history_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Activity history row with its raw scores re-extracted from its activity record's evaluation"""
+        rescored = dict(row)
+        evaluation = row.get('evaluation_result')
+        if not isinstance(evaluation, dict):
+            return rescored
+        skill_data = self._extract_skill_evaluation(evaluation, row['skill_id'])
+        # The extraction reports 0.0 when the evaluation doesn't carry a value
+        # (older evaluations have no target_evidence_volume); keep the stored one then
+        performance_score = skill_data['performance_score'] or row['performance_score']
+        target_evidence = skill_data['target_evidence'] or row['target_evidence_volume']
+        validity_modifier = float(skill_data['validity_modifier'])
+        rescored.update({
+            'performance_score': performance_score,
+            'target_evidence_volume': target_evidence,
+            'validity_modifier': validity_modifier,
+            'adjusted_evidence_volume': target_evidence * validity_modifier
+        })
+        return rescored
+    
+    def _history_prefix_scan(self, learner_id: str, skill_id: str,
+                             group: List[Any]) -> Tuple[SkillScoringState, List[Dict[str, float]]]:
+        """
+        Prefix scan over one learner/skill's activity history records (oldest first).
+        
+        Returns the full-history scoring state and, per record, the derived column
+        values score_activity would have written at that point in the history
+        plus the record's evidence-based decay relative to the newest activity.
+        """
+        window = self.scoring_window
+        state = SkillScoringState(learner_id=learner_id, skill_id=skill_id, decay_factor=self.decay_factor)
+        activities = []
+        values = []
+        for row in group:
+            activity = {
+                'activity_id': row['activity_id'],
+                'performance_score': row['performance_score'],
+                'target_evidence': row['target_evidence_volume'],
+                'validity_modifier': row['validity_modifier'],
+                'timestamp': row['completion_timestamp']
+            }
+            state = self._advance_scoring_state(state, activity)
+            if window:
+                activities.append(activity)
+                recent = activities[-window:]
+                cumulative_performance = self._calculate_cumulative_score(recent)
+                cumulative_evidence = self._calculate_total_evidence(recent)
+            else:
+                cumulative_performance = (state.weighted_score_sum / state.decayed_weight
+                                          if state.decayed_weight else self.prior_mean)
+                cumulative_evidence = state.total_adjusted_evidence
+            values.append({
+                'cumulative_performance': cumulative_performance,
+                'cumulative_evidence': cumulative_evidence,
+                'decay_factor': self.decay_factor
+            })
+        
+        # Decay-adjusted evidence is relative to the newest activity
+        evidence = [row['adjusted_evidence_volume'] for row in reversed(group)]
+        decay_factors = evidence_decay_factors(evidence, self.decay_factor)
+        for row, row_values, evidence_based_decay in zip(reversed(group), reversed(values), decay_factors):
+            row_values['evidence_based_decay'] = evidence_based_decay
+            row_values['decay_adjusted_evidence_volume'] = (row['adjusted_evidence_volume'] or 0.0) * evidence_based_decay
+        return state, values
+    
+    def get_skill_timeseries(self, learner_id: str, skill_id: str) -> List[Dict[str, Any]]:
+        """
+        Activity history of a learner/skill with its derived values, oldest first.
+        
+        Each record carries its evidence_based_decay and decay_adjusted_evidence_volume
+        (relative to the newest activity) and the cumulative_performance and
+        cumulative_evidence as of that activity, all from one prefix scan. Results
+        are cached by the history's data version, decay factor and scoring window;
+        treat them as read-only.
+        
+        Args:
+            learner_id: Learner identifier
+            skill_id: Skill identifier
+            
+        Returns:
+            List of activity history records with derived values
+        """
+        if not hasattr(self, 'learner_manager') or not self.learner_manager:
+            return []
+        version = self.learner_manager.get_activity_history_version(learner_id, skill_id)
+        cache_key = (learner_id, skill_id)
+        cache_version = (version, self.decay_factor, self.scoring_window)
+        cached = self._timeseries_cache.get(cache_key)
+        if version is not None and cached and cached[0] == cache_version:
+            return cached[1]
+        
+        records = self.learner_manager.get_activity_history_chronological(learner_id, skill_id)
+        timeseries = []
+        if records:
+            _, values = self._history_prefix_scan(learner_id, skill_id, records)
+            timeseries = [dict(record, **derived) for record, derived in zip(records, values)]
+        
+        if version is not None:
+            self._timeseries_cache.pop(cache_key, None)
+            if len(self._timeseries_cache) >= TIMESERIES_CACHE_SIZE:
+                self._timeseries_cache.pop(next(iter(self._timeseries_cache)))
+            self._timeseries_cache[cache_key] = (cache_version, timeseries)
+        return timeseries
 
 # Utility functions
+def evidence_decay_factors(adjusted_evidence: List[Optional[float]], decay_factor: float) -> List[float]:
+    """
+    Evidence-based decay factor for each activity, most recent first.
+
+    Each activity decays by decay_factor ** (evidence accumulated since it was
+    completed), computed in one pass with a running sum; missing evidence
+    counts as zero.
+    """
+    factors = []
+    evidence_accumulated_since = 0.0
+    for evidence in adjusted_evidence:
+        factors.append(decay_factor ** evidence_accumulated_since)
+        evidence_accumulated_since += evidence or 0.0
+    return factors
+
 def create_scoring_engine(config_manager=None) -> ScoringEngine:
     """Factory function to create scoring engine"""
     return ScoringEngine(config_manager)
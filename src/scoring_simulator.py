@@ -0,0 +1,172 @@
+"""
+Scoring Simulator for Evaluator v16
+Read-only what-if analysis for tuning scoring_config.json: loads activity_history
+once, evaluates a grid of decay factors and gate thresholds in memory with
+vectorized math, and reports how mastery status distributions would shift
+against the current configuration. Never writes to the database.
+"""
+
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Any, Optional, Tuple
+
+from src.logger import get_logger
+from src.cohort_scoring import (CohortScoringEngine, CohortArrays, STATUS_LEVELS, OVERALL_STATUSES,
+                                gate_levels, overall_levels, np)
+
+
+@dataclass
+class SimulationScenario:
+    """Status distribution under one decay factor / threshold combination"""
+    decay_factor: float
+    performance_threshold: float
+    evidence_threshold: float
+    status_counts: Dict[str, int]
+    gate_1_counts: Dict[str, int]
+    gate_2_counts: Dict[str, int]
+    mean_score: float
+    shifts: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ScoringSimulator:
+    """What-if simulator over the scoring model; holds the cohort arrays in memory"""
+
+    def __init__(self, scoring_engine, learner_manager=None):
+        if np is None:
+            raise RuntimeError('NumPy is required for the scoring simulator')
+        self.scoring_engine = scoring_engine
+        self.cohort = CohortScoringEngine(scoring_engine, learner_manager)
+        self.logger = get_logger()
+        self.arrays: Optional[CohortArrays] = None
+
+    def load(self, learner_ids: Optional[List[str]] = None,
+             skill_ids: Optional[List[str]] = None) -> CohortArrays:
+        """Read activity history once into segment arrays, windowed like ScoringEngine"""
+        rows = self.cohort.learner_manager.get_activity_history_for_scoring(learner_ids, skill_ids)
+        self.arrays = self.cohort.build_arrays(rows, self.scoring_engine.scoring_window)
+        return self.arrays
+
+    def threshold_ladder(self, performance_threshold: float,
+                         evidence_threshold: float) -> Tuple[Tuple[float, float, float], Tuple[float, float, float]]:
+        """
+        Gate 1 and gate 2 (passed, approaching, developing) cut-offs for a pair of
+        pass thresholds. Performance keeps the current distances below the pass
+        threshold; evidence keeps the current ratios to it.
+        """
+        performance = self.scoring_engine.performance_thresholds
+        at_level = performance.get('at_level', 0.75)
+        approaching = performance.get('approaching', 0.65)
+        developing = performance.get('developing', 0.50)
+        if performance_threshold == at_level:
+            gate_1 = (at_level, approaching, developing)
+        else:
+            gate_1 = (performance_threshold,
+                      performance_threshold - (at_level - approaching),
+                      performance_threshold - (at_level - developing))
+
+        evidence = self.scoring_engine.evidence_thresholds
+        sufficient = evidence.get('sufficient', 30.0)
+        evidence_approaching = evidence.get('approaching', 20.0)
+        evidence_developing = evidence.get('developing', 10.0)
+        if evidence_threshold == sufficient or not sufficient:
+            gate_2 = (sufficient, evidence_approaching, evidence_developing)
+        else:
+            gate_2 = (evidence_threshold,
+                      evidence_threshold * evidence_approaching / sufficient,
+                      evidence_threshold * evidence_developing / sufficient)
+        return gate_1, gate_2
+
+    def simulate(self, decay_factors: Optional[List[float]] = None,
+                 performance_thresholds: Optional[List[float]] = None,
+                 evidence_thresholds: Optional[List[float]] = None) -> Dict[str, Any]:
+        """
+        Evaluate every combination of decay factor and pass thresholds.
+
+        Args:
+            decay_factors: Decay factors to try (default: the current one)
+            performance_thresholds: Gate 1 pass thresholds to try (default: current)
+            evidence_thresholds: Gate 2 pass thresholds to try (default: current)
+
+        Returns:
+            Dict with cohort size, the baseline scenario under the current
+            configuration and one scenario per grid point with shifts against it
+        """
+        started = time.perf_counter()
+        arrays = self.arrays if self.arrays is not None else self.load()
+        engine = self.scoring_engine
+        current_performance = engine.performance_thresholds.get('at_level', 0.75)
+        current_evidence = engine.evidence_thresholds.get('sufficient', 30.0)
+        decay_factors = decay_factors or [engine.decay_factor]
+        performance_thresholds = performance_thresholds or [current_performance]
+        evidence_thresholds = evidence_thresholds or [current_evidence]
+
+        report: Dict[str, Any] = {
+            'cohort': {
+                'learners': len({learner_id for learner_id, _ in arrays.keys}),
+                'skill_pairs': len(arrays.keys),
+                'activities': arrays.activity_count
+            },
+            'baseline': None,
+            'scenarios': []
+        }
+        if not arrays.keys:
+            report['duration_seconds'] = round(time.perf_counter() - started, 4)
+            return report
+
+        # Evidence gates don't depend on the decay factor
+        total_evidence = self.cohort.evidence_totals(arrays)
+        gate_2_by_threshold = {}
+        for threshold in set(evidence_thresholds) | {current_evidence}:
+            gate_2_by_threshold[threshold] = gate_levels(total_evidence, *self.threshold_ladder(current_performance, threshold)[1])
+        scores_by_decay = {}
+        for decay_factor in set(decay_factors) | {engine.decay_factor}:
+            scores_by_decay[decay_factor] = self.cohort.cumulative_scores(arrays, decay_factor)
+
+        baseline, baseline_levels = self._scenario(engine.decay_factor, current_performance, current_evidence,
+                                                   scores_by_decay, gate_2_by_threshold)
+        report['baseline'] = baseline.to_dict()
+
+        for decay_factor in decay_factors:
+            for performance_threshold in performance_thresholds:
+                for evidence_threshold in evidence_thresholds:
+                    scenario, levels = self._scenario(decay_factor, performance_threshold, evidence_threshold,
+                                                      scores_by_decay, gate_2_by_threshold)
+                    scenario.shifts = {
+                        'changed': int(np.count_nonzero(levels != baseline_levels)),
+                        'promoted': int(np.count_nonzero(levels > baseline_levels)),
+                        'demoted': int(np.count_nonzero(levels < baseline_levels)),
+                        'newly_mastered': int(np.count_nonzero((levels == 3) & (baseline_levels != 3))),
+                        'lost_mastery': int(np.count_nonzero((levels != 3) & (baseline_levels == 3)))
+                    }
+                    report['scenarios'].append(scenario.to_dict())
+
+        report['duration_seconds'] = round(time.perf_counter() - started, 4)
+        self.logger.log_system_event('scoring_simulator', 'simulation_complete',
+                                     f"Simulated {len(report['scenarios'])} scenarios over "
+                                     f"{len(arrays.keys)} learner/skill pairs",
+                                     duration_seconds=report['duration_seconds'])
+        return report
+
+    def _scenario(self, decay_factor: float, performance_threshold: float, evidence_threshold: float,
+                  scores_by_decay: Dict[float, Any], gate_2_by_threshold: Dict[float, Any]):
+        scores = scores_by_decay[decay_factor]
+        gate_1 = gate_levels(scores, *self.threshold_ladder(performance_threshold, evidence_threshold)[0])
+        gate_2 = gate_2_by_threshold[evidence_threshold]
+        levels = overall_levels(gate_1, gate_2)
+        scenario = SimulationScenario(
+            decay_factor=decay_factor,
+            performance_threshold=performance_threshold,
+            evidence_threshold=evidence_threshold,
+            status_counts=self._counts(levels, OVERALL_STATUSES),
+            gate_1_counts=self._counts(gate_1, STATUS_LEVELS),
+            gate_2_counts=self._counts(gate_2, STATUS_LEVELS),
+            mean_score=round(float(scores.mean()), 6)
+        )
+        return scenario, levels
+
+    def _counts(self, levels, names: List[str]) -> Dict[str, int]:
+        counts = np.bincount(levels, minlength=len(names))
+        return {name: int(counts[index]) for index, name in enumerate(names)}
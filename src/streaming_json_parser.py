@@ -0,0 +1,287 @@
+"""
+Streaming JSON Parser for Evaluator v16
+Tolerant, incremental parser for LLM JSON output. Consumes the response in
+chunks, reports fields as soon as they close and recovers from markdown fences,
+leading prose and trailing commas in a single pass.
+"""
+
+import json
+import re
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+PathSegment = Union[str, int]
+
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+_SCALAR_END = set(',}] \t\r\n')
+
+# Fields worth surfacing early for each streamed phase
+PHASE_EMIT_PATTERNS = {
+    'combined': ['aspect_scores.*', 'overall_score', 'validity_modifier', 'validity_analysis',
+                 'validity_reason', 'rationale', 'key_observations'],
+    'intelligent_feedback': ['intelligent_feedback.*', 'intelligent_feedback.*.*']
+}
+
+
+def format_path(path: Tuple[PathSegment, ...]) -> str:
+    """Render ('aspect_scores', 0, 'score') as 'aspect_scores[0].score'"""
+    text = ''
+    for segment in path:
+        if isinstance(segment, int):
+            text += f'[{segment}]'
+        else:
+            text += f'.{segment}' if text else segment
+    return text
+
+
+def loads_tolerant(text: str) -> Any:
+    """json.loads that also accepts trailing commas"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(_TRAILING_COMMA.sub(r'\1', text))
+
+
+class TruncatedResponseError(ValueError):
+    """Raised when a response only parses after cutting it back to its last complete value"""
+
+    def __init__(self, message: str, partial: Any):
+        super().__init__(message)
+        self.partial = partial
+
+
+class IncrementalJSONParser:
+    """
+    Incremental JSON parser emitting completed values at matching paths.
+
+    Patterns are dotted paths where '*' matches any key or array index, e.g.
+    'aspect_scores.*' matches every element of the top-level aspect_scores array.
+    """
+
+    def __init__(self, emit_patterns: Optional[List[str]] = None):
+        if emit_patterns is None:
+            emit_patterns = ['*']
+        self.emit_patterns = [tuple(pattern.split('.')) for pattern in emit_patterns]
+        self._buffer = ''
+        self._pos = 0
+        self._root_start = None
+        self._stack: List[Dict[str, Any]] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._string_is_key = False
+        self._scalar_start = None
+        self._last_safe = None  # (buffer position, closing suffix) of the last complete prefix
+        self.document: Any = None
+        self.complete = False
+        self.repaired = False  # set by close() when the input had to be cut back
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next chunk of streamed text.
+
+        Returns:
+            List of (field_path, value) pairs for values completed by this chunk
+        """
+        self._buffer += chunk
+        completed = []
+        buffer = self._buffer
+        length = len(buffer)
+
+        while self._pos < length and not self.complete:
+            char = buffer[self._pos]
+
+            if self._root_start is None:
+                # Skip prose and markdown fences until the document opens
+                if char in '{[':
+                    self._root_start = self._pos
+                    self._open_container(char)
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    text = buffer[self._string_start:self._pos + 1]
+                    if self._string_is_key:
+                        frame = self._stack[-1]
+                        frame['key'] = json.loads(text)
+                        frame['state'] = 'colon'
+                    else:
+                        self._value_completed(self._string_start, self._pos + 1, completed)
+                self._pos += 1
+                continue
+
+            if self._scalar_start is not None:
+                if char not in _SCALAR_END:
+                    self._pos += 1
+                    continue
+                start = self._scalar_start
+                self._scalar_start = None
+                self._value_completed(start, self._pos, completed)
+                if self.complete:
+                    break
+                # Re-examine the delimiter in the parent's state
+
+            frame = self._stack[-1]
+            state = frame['state']
+
+            if char in ' \t\r\n':
+                pass
+            elif state in ('key', 'key_or_end'):
+                if char == '"':
+                    self._begin_string(is_key=True)
+                elif char == '}':
+                    # Also accepts a trailing comma before the closing brace
+                    self._close_container(completed)
+            elif state == 'colon':
+                if char == ':':
+                    frame['state'] = 'value'
+            elif state in ('value', 'value_or_end'):
+                if char == ']' and frame['kind'] == '[':
+                    self._close_container(completed)
+                else:
+                    self._begin_value(char)
+            elif state == 'comma_or_end':
+                if char == ',':
+                    frame['state'] = 'key' if frame['kind'] == '{' else 'value'
+                elif char in '}]':
+                    self._close_container(completed)
+
+            self._pos += 1
+
+        return completed
+
+    def close(self) -> Any:
+        """
+        Finish parsing and return the document.
+
+        A truncated stream is repaired by cutting back to the last complete value
+        and closing the open containers; ``repaired`` is set when that happens.
+        """
+        if self._scalar_start is not None and not self.complete:
+            start = self._scalar_start
+            self._scalar_start = None
+            if self._is_complete_scalar(self._buffer[start:]):
+                self._value_completed(start, len(self._buffer), [])
+            else:
+                # A literal or number cut off mid-token such as tru or 0. is
+                # dropped along with its key
+                self.repaired = True
+        if self.complete:
+            return self.document
+        if self._root_start is None:
+            raise ValueError('No JSON document found in response')
+        if self._last_safe is None:
+            raise ValueError('JSON document ended before any value completed')
+        position, suffix = self._last_safe
+        self.repaired = True
+        self.document = loads_tolerant(self._buffer[self._root_start:position].rstrip().rstrip(',') + suffix)
+        return self.document
+
+    @staticmethod
+    def _is_complete_scalar(text: str) -> bool:
+        try:
+            json.loads(text)
+        except json.JSONDecodeError:
+            return False
+        return True
+
+    def _current_path(self) -> Tuple[PathSegment, ...]:
+        path = []
+        for frame in self._stack[1:]:
+            path.append(frame['path_segment'])
+        return tuple(path)
+
+    def _child_segment(self) -> PathSegment:
+        frame = self._stack[-1]
+        if frame['kind'] == '{':
+            return frame['key']
+        frame['index'] += 1
+        return frame['index']
+
+    def _begin_string(self, is_key: bool):
+        self._in_string = True
+        self._escape = False
+        self._string_start = self._pos
+        self._string_is_key = is_key
+
+    def _begin_value(self, char: str):
+        segment = self._child_segment()
+        if char in '{[':
+            self._open_container(char, segment)
+            return
+        self._stack[-1]['pending_segment'] = segment
+        if char == '"':
+            self._begin_string(is_key=False)
+        else:
+            self._scalar_start = self._pos
+
+    def _open_container(self, char: str, segment: Optional[PathSegment] = None):
+        self._stack.append({
+            'kind': char,
+            'state': 'key_or_end' if char == '{' else 'value_or_end',
+            'key': None,
+            'index': -1,
+            'start': self._pos,
+            'path_segment': segment
+        })
+        self._mark_safe(self._pos + 1)
+
+    def _close_container(self, completed: List[Tuple[str, Any]]):
+        frame = self._stack.pop()
+        end = self._pos + 1
+        if not self._stack:
+            self.document = loads_tolerant(self._buffer[frame['start']:end])
+            self.complete = True
+            return
+        path = self._current_path() + (frame['path_segment'],)
+        self._stack[-1]['state'] = 'comma_or_end'
+        self._maybe_emit(path, frame['start'], end, completed)
+        self._mark_safe(end)
+
+    def _value_completed(self, start: int, end: int, completed: List[Tuple[str, Any]]):
+        frame = self._stack[-1]
+        path = self._current_path() + (frame.pop('pending_segment', None),)
+        frame['state'] = 'comma_or_end'
+        self._maybe_emit(path, start, end, completed)
+        self._mark_safe(end)
+
+    def _maybe_emit(self, path: Tuple[PathSegment, ...], start: int, end: int,
+                    completed: List[Tuple[str, Any]]):
+        if not self._matches(path):
+            return
+        try:
+            completed.append((format_path(path), loads_tolerant(self._buffer[start:end])))
+        except (json.JSONDecodeError, ValueError):
+            pass
+
+    def _matches(self, path: Tuple[PathSegment, ...]) -> bool:
+        for pattern in self.emit_patterns:
+            if len(pattern) != len(path):
+                continue
+            if all(part == '*' or part == str(segment) for part, segment in zip(pattern, path)):
+                return True
+        return False
+
+    def _mark_safe(self, position: int):
+        suffix = ''.join('}' if frame['kind'] == '{' else ']' for frame in reversed(self._stack))
+        self._last_safe = (position, suffix)
+
+
+def parse_json_response(content: str, strict: bool = False) -> Any:
+    """
+    Single-pass tolerant parse of a complete LLM response.
+
+    With strict=True a truncated response raises TruncatedResponseError carrying
+    the repaired partial document instead of returning it.
+    """
+    parser = IncrementalJSONParser(emit_patterns=[])
+    parser.feed(content)
+    document = parser.close()
+    if strict and parser.repaired:
+        raise TruncatedResponseError('Response was truncated before the JSON document closed', document)
+    return document
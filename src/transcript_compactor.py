@@ -0,0 +1,240 @@
+"""
+Transcript Compactor for Evaluator v16
+Preprocesses role-play conversations before they are placed in evaluation
+prompts: normalizes speaker turns, strips timestamps and UI metadata, removes
+repeated content and, over a token budget, summarizes older turns while keeping
+evidence-bearing learner utterances verbatim.
+"""
+
+import json
+import re
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Tuple
+
+from context_compactor import estimate_tokens
+
+
+LEARNER_SPEAKERS = {'learner', 'user', 'student', 'human'}
+CHARACTER_SPEAKERS = {'ai_character', 'assistant', 'character', 'ai', 'bot', 'stakeholder', 'model'}
+
+# Engagement keys that only matter to the UI
+ENGAGEMENT_METADATA_KEYS = ('start_timestamp', 'submit_timestamp', 'completion_status')
+
+_WHITESPACE = re.compile(r'\s+')
+
+DEFAULT_SETTINGS = {
+    'enabled': True,
+    'token_budget': 1500,
+    'keep_recent_turns': 6,
+    'min_evidence_words': 6,
+    'summary_chars_per_turn': 120,
+    'summary_stretch_turns': 10,  # older turns merged into each digest line
+    'dedup_window_turns': 4  # how far back a repeated character turn is looked for
+}
+
+
+@dataclass
+class ConversationTurn:
+    """Normalized conversation turn"""
+    index: int
+    speaker: str  # 'Learner' or 'Character'
+    text: str
+    evidence: bool = False
+
+    def render(self) -> str:
+        return f'{self.speaker}: {self.text}'
+
+
+@dataclass
+class TranscriptCompactionReport:
+    """What the compactor did to one conversation"""
+    turns_before: int
+    turns_after: int
+    duplicates_removed: int
+    summarized_turns: int
+    evidence_turns_kept: int
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result['tokens_saved'] = self.tokens_saved
+        return result
+
+
+class RolePlayTranscriptCompactor:
+    """Normalizes and budgets role-play conversations for prompts"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_SETTINGS, **(settings or {})}
+
+    def compact_transcript(self, transcript: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[TranscriptCompactionReport]]:
+        """
+        Compact the conversation inside an activity transcript.
+
+        Returns:
+            Tuple of (transcript copy with the compacted conversation, report);
+            the report is None when no conversation was found
+        """
+        if not self.settings.get('enabled', True) or not isinstance(transcript, dict):
+            return transcript, None
+        engagement = transcript.get('student_engagement')
+        if not isinstance(engagement, dict):
+            return transcript, None
+
+        responses = engagement.get('component_responses') or []
+        for position, response in enumerate(responses):
+            if not isinstance(response, dict):
+                continue
+            messages = self._parse_conversation(response.get('response_content'))
+            if messages is None:
+                continue
+            tokens_before = estimate_tokens(response.get('response_content'))
+            lines, report = self.compact_conversation(messages)
+            report.tokens_before = tokens_before
+            report.tokens_after = estimate_tokens(lines)
+
+            compacted_response = {key: value for key, value in response.items() if key != 'metadata'}
+            compacted_response['response_content'] = lines
+            compacted_responses = list(responses)
+            compacted_responses[position] = compacted_response
+
+            compacted_engagement = {key: value for key, value in engagement.items()
+                                    if key not in ENGAGEMENT_METADATA_KEYS}
+            compacted_engagement['component_responses'] = compacted_responses
+            compacted = dict(transcript)
+            compacted['student_engagement'] = compacted_engagement
+            return compacted, report
+        return transcript, None
+
+    def compact_conversation(self, messages: List[Any]) -> Tuple[List[str], TranscriptCompactionReport]:
+        """Normalize, deduplicate and budget a list of raw messages into 'Speaker: text' lines"""
+        turns = self._normalize(messages)
+        turns_before = len(messages)
+        turns, duplicates_removed = self._deduplicate(turns)
+
+        summarized = 0
+        if estimate_tokens([turn.render() for turn in turns]) > self.settings['token_budget']:
+            lines, summarized = self._summarize_older_turns(turns)
+        else:
+            lines = [turn.render() for turn in turns]
+
+        report = TranscriptCompactionReport(
+            turns_before=turns_before,
+            turns_after=len(lines),
+            duplicates_removed=duplicates_removed,
+            summarized_turns=summarized,
+            evidence_turns_kept=sum(1 for turn in turns if turn.evidence),
+            tokens_before=estimate_tokens(messages),
+            tokens_after=estimate_tokens(lines)
+        )
+        return lines, report
+
+    def _parse_conversation(self, content: Any) -> Optional[List[Any]]:
+        """Conversation message list from a response, or None if it isn't one"""
+        if isinstance(content, str):
+            stripped = content.strip()
+            if not stripped.startswith(('[', '{')):
+                return None
+            try:
+                content = json.loads(stripped)
+            except (json.JSONDecodeError, ValueError):
+                return None
+        if isinstance(content, dict):
+            for key in ('conversation', 'messages', 'turns', 'conversation_history'):
+                if isinstance(content.get(key), list):
+                    content = content[key]
+                    break
+            else:
+                return None
+        if not isinstance(content, list) or not content:
+            return None
+        if not all(isinstance(message, dict) and self._message_text(message) is not None for message in content):
+            return None
+        return content
+
+    def _message_text(self, message: Dict[str, Any]) -> Optional[str]:
+        for key in ('message', 'content', 'text'):
+            if isinstance(message.get(key), str):
+                return message[key]
+        return None
+
+    def _normalize(self, messages: List[Dict[str, Any]]) -> List[ConversationTurn]:
+        turns = []
+        min_words = self.settings['min_evidence_words']
+        for message in messages:
+            text = _WHITESPACE.sub(' ', self._message_text(message) or '').strip()
+            if not text:
+                continue
+            raw_speaker = str(message.get('speaker') or message.get('role') or '').lower()
+            if raw_speaker in LEARNER_SPEAKERS:
+                speaker = 'Learner'
+            elif raw_speaker in CHARACTER_SPEAKERS or not raw_speaker:
+                speaker = 'Character'
+            else:
+                speaker = raw_speaker.replace('_', ' ').title()
+            evidence = speaker == 'Learner' and (len(text.split()) >= min_words or '?' in text)
+            turns.append(ConversationTurn(index=len(turns), speaker=speaker, text=text, evidence=evidence))
+        return turns
+
+    def _deduplicate(self, turns: List[ConversationTurn]) -> Tuple[List[ConversationTurn], int]:
+        """
+        Drop repeated submissions and character turns that repeat one of the last
+        few turns. A character turn right before an evidence-bearing learner turn
+        is always kept: it is what the learner was answering.
+        """
+        window = self.settings['dedup_window_turns']
+        kept = []
+        removed = 0
+        for position, turn in enumerate(turns):
+            if kept and kept[-1].speaker == turn.speaker and kept[-1].text == turn.text:
+                removed += 1
+                continue
+            if turn.speaker != 'Learner' and window > 0:
+                next_turn = turns[position + 1] if position + 1 < len(turns) else None
+                prompts_evidence = next_turn is not None and next_turn.evidence
+                key = turn.text.lower()
+                if not prompts_evidence and any(earlier.speaker != 'Learner' and earlier.text.lower() == key
+                                                for earlier in kept[-window:]):
+                    removed += 1
+                    continue
+            kept.append(turn)
+        return kept, removed
+
+    def _summarize_older_turns(self, turns: List[ConversationTurn]) -> Tuple[List[str], int]:
+        """
+        Replace turns before the recent window with an extractive digest.
+
+        Older turns are taken in stretches of summary_stretch_turns. The other
+        turns of a stretch merge into one digest line holding the start of each
+        turn, followed by the stretch's evidence-bearing learner turns verbatim
+        and in order, so an alternating conversation costs one digest line per
+        stretch rather than one per character turn.
+        """
+        keep_recent = self.settings['keep_recent_turns']
+        stretch_size = max(int(self.settings['summary_stretch_turns']), 1)
+        limit = self.settings['summary_chars_per_turn']
+        cutoff = max(len(turns) - keep_recent, 0)
+        lines = []
+        summarized = 0
+
+        for start in range(0, cutoff, stretch_size):
+            stretch = turns[start:min(start + stretch_size, cutoff)]
+            points = []
+            for turn in stretch:
+                if turn.evidence:
+                    continue
+                text = turn.text
+                if len(text) > limit:
+                    text = text[:limit].rsplit(' ', 1)[0] + '...'
+                points.append(f'{turn.speaker.lower()}: {text}')
+            if points:
+                lines.append(f'[Summary of turns {stretch[0].index + 1}-{stretch[-1].index + 1}] ' + ' | '.join(points))
+                summarized += len(points)
+            lines.extend(turn.render() for turn in stretch if turn.evidence)
+        lines.extend(turn.render() for turn in turns[cutoff:])
+        return lines, summarized
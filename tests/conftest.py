@@ -0,0 +1,117 @@
+"""
+Shared test setup: import paths for both the src package and the pipeline's
+bare module imports, and a throwaway data directory so test runs never write
+to data/ (database, learner JSON mirrors and logs).
+"""
+
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (os.path.join(ROOT, 'src'), ROOT):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+# Config and activity paths are relative to the repository root
+os.chdir(ROOT)
+
+TEST_DATA_DIR = tempfile.mkdtemp(prefix='evaluator_tests_')
+os.environ['DATABASE_PATH'] = os.path.join(TEST_DATA_DIR, 'evaluator_v16.db')
+os.environ['LEARNER_JSON_DIR'] = os.path.join(TEST_DATA_DIR, 'learners')
+
+
+@pytest.fixture(scope='session', autouse=True)
+def isolated_logs():
+    """Send both logger singletons' files to the throwaway directory"""
+    from logger import get_logger
+    from src.logger import get_logger as get_package_logger
+
+    loggers = []
+    for evaluator_logger in (get_logger(), get_package_logger()):
+        if all(evaluator_logger is not known for known in loggers):
+            loggers.append(evaluator_logger)
+    with contextlib.ExitStack() as redirects:
+        for evaluator_logger in loggers:
+            redirects.enter_context(evaluator_logger.redirected(os.path.join(TEST_DATA_DIR, 'logs')))
+        yield
+    shutil.rmtree(TEST_DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def config_manager():
+    from config_manager import ConfigManager
+    return ConfigManager()
+
+
+@pytest.fixture
+def learner_manager(config_manager, tmp_path):
+    """LearnerManager on a per-test database"""
+    from learner_manager import LearnerManager
+
+    manager = LearnerManager(config_manager, db_path=str(tmp_path / 'test.db'))
+    manager.json_mirror_dir = str(tmp_path / 'learners')
+    yield manager
+    manager.json_mirror.close()
+    manager._connections.close_all()
+
+
+@pytest.fixture
+def make_pipeline(config_manager, learner_manager):
+    """Build an EvaluationPipeline around the given LLM client (mock by default)"""
+    from activity_manager import ActivityManager
+    from evaluation_pipeline import EvaluationPipeline
+    from pipeline_benchmark import MockLLMClient
+    from prompt_builder import PromptBuilder
+    from scoring_engine import ScoringEngine
+
+    def build(llm_client=None):
+        return EvaluationPipeline(config_manager, llm_client or MockLLMClient(),
+                                  PromptBuilder(config_manager),
+                                  ScoringEngine(config_manager, learner_manager),
+                                  learner_manager, ActivityManager(config_manager))
+    return build
+
+
+@pytest.fixture
+def score_activities(learner_manager):
+    """
+    Score activities through a ScoringEngine the way the pipeline does.
+
+    Each activity is a dict with skill_id, score and day, and optionally
+    validity, evidence and activity_id; learners are created on first use.
+    Returns the ScoringResults in order.
+    """
+    from datetime import datetime, timedelta, timezone
+    from learner_manager import LearnerProfile
+
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def score(engine, learner_id, activities):
+        if learner_manager.get_learner(learner_id) is None:
+            learner_manager.create_learner(LearnerProfile(
+                learner_id=learner_id, name=learner_id, email=f'{learner_id}@test.local',
+                enrollment_date=start.isoformat()))
+        history = {'learner_id': learner_id, 'activities': []}
+        results = []
+        for position, activity in enumerate(activities):
+            evaluation = {
+                'activity_id': activity.get('activity_id', f'activity_{position:03d}'),
+                'learner_id': learner_id,
+                'target_skill': activity['skill_id'],
+                'timestamp': (start + timedelta(days=activity['day'])).isoformat(),
+                'evaluation_results': {'phase_1_combined_evaluation': {
+                    'overall_score': activity['score'],
+                    'validity_modifier': activity.get('validity', 1.0),
+                    'target_evidence_volume': activity.get('evidence', 2.0)
+                }}
+            }
+            result = engine.score_activity(history, evaluation)
+            engine.update_learner_progress(history, result, learner_manager)
+            results.append(result)
+        return results
+    return score
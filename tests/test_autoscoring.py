@@ -0,0 +1,167 @@
+"""In-process grading of SR answer keys and BR decision paths on the data/activities fixtures"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from autoscoring import BranchingScenarioScorer, SelectedResponseScorer
+from learner_manager import LearnerProfile
+
+SR_ACTIVITY = 'user_need_identification_quiz_sr'
+BR_ACTIVITY = 'requirements_prioritization_dilemma_br'
+
+
+def _submission(response_content, assistance_log=()):
+    """Transcript in the shape the app submits, with the response JSON-encoded"""
+    if not isinstance(response_content, str):
+        response_content = json.dumps(response_content)
+    return {'activity_transcript': {'student_engagement': {
+        'component_responses': [{'component_id': 'main_response', 'response_content': response_content,
+                                  'response_type': 'text'}],
+        'assistance_log': list(assistance_log)
+    }}}
+
+
+@pytest.fixture
+def activity_manager(config_manager):
+    from activity_manager import ActivityManager
+    return ActivityManager(config_manager)
+
+
+@pytest.fixture
+def sr_activity(activity_manager):
+    return activity_manager.get_activity(SR_ACTIVITY)
+
+
+@pytest.fixture
+def br_activity(activity_manager):
+    return activity_manager.get_activity(BR_ACTIVITY)
+
+
+@pytest.fixture
+def br_scorer(activity_manager):
+    return BranchingScenarioScorer(activity_manager.get_branching_graph)
+
+
+def test_sr_answer_key_comes_from_components(sr_activity):
+    questions = SelectedResponseScorer().get_answer_key(sr_activity)
+    assert [(question.question_id, question.correct_answer) for question in questions] == [
+        ('q1_contradiction_identification', 'b'), ('q2_motivation_inference', 'b'),
+        ('q3_requirements_parsing', 'a'), ('q4_needs_organization', 'b'), ('q5_clarification_questions', 'a')]
+
+
+@pytest.mark.parametrize('selections, score', [
+    (['b', 'b', 'a', 'b', 'a'], 1.0),
+    (['b', 'a', 'a', 'b', 'a'], 0.8),
+    ([{'option_id': 'b'}, 'B) anything', 'a.', None, 'c'], 0.6),
+    ({'q1_contradiction_identification': 'b', 'q3_requirements_parsing': 'd'}, 0.2)
+])
+def test_sr_weighted_score(sr_activity, selections, score):
+    scorer = SelectedResponseScorer()
+    transcript = _submission({'component_responses': selections, 'total_questions': 5})
+
+    assert scorer.can_score(sr_activity, transcript)
+    result = scorer.score(sr_activity, transcript)
+    assert result.performance_score == score
+    assert result.validity_modifier == 1.0
+
+
+def test_sr_accepts_option_text(sr_activity):
+    scorer = SelectedResponseScorer()
+    options = [question.options for question in scorer.get_answer_key(sr_activity)]
+    texts = [next(option['text'] for option in question_options if option['option_id'] == answer)
+             for question_options, answer in zip(options, 'bbaba')]
+
+    result = scorer.score(sr_activity, _submission({'component_responses': texts}))
+
+    assert result.performance_score == 1.0 and result.correct_count == 5
+
+
+def test_sr_assistance_lowers_validity(sr_activity):
+    result = SelectedResponseScorer().score(sr_activity, _submission(
+        ['b', 'b', 'a', 'b', 'a'], assistance_log=[{'assistance_type': 'clarification'}, {'type': 'hint'}]))
+    assert result.validity_modifier == 0.5
+
+
+@pytest.mark.parametrize('response_content', [
+    'I would pick b for the first one because the contradiction needs investigating',
+    {'component_responses': [None, None, None, None, None]},
+    {'component_responses': ['b', 'e', 'a', 'b', 'a']},
+    {'component_responses': ['Investigate the root cause first']},
+    {'unexpected': 'shape'}
+])
+def test_sr_malformed_submission_is_not_autoscored(sr_activity, response_content):
+    assert not SelectedResponseScorer().can_score(sr_activity, _submission(response_content))
+
+
+def test_br_best_path(br_scorer, br_activity):
+    transcript = _submission({'decisions_made': ['impact_framing', 'transparent_rationale', 'reframe_problem']})
+
+    assert br_scorer.can_score(br_activity, transcript)
+    result = br_scorer.score(br_activity, transcript)
+
+    assert result.performance_score == 1.0
+    assert result.details['matched_path_id'] == 'strategic_approach_path'
+    assert result.details['completed']
+    assert result.correct_count == 3
+
+
+def test_br_mixed_path_by_option_text(br_scorer, br_activity, activity_manager):
+    graph = activity_manager.get_branching_graph(BR_ACTIVITY)
+    chosen = [('problem_framing_approach', 'impact_framing'), ('stakeholder_communication', 'future_roadmap'),
+              ('problem_refinement', 'scope_reduction')]
+    texts = [graph.nodes[decision_id].options[option_id].option_text for decision_id, option_id in chosen]
+
+    result = br_scorer.score(br_activity, _submission({'path_taken': texts}))
+
+    # (1.0 * 1.0 + 0.75 * 0.75 + 0.75 * 0.75) / (1.0 + 0.75 + 0.75)
+    assert result.performance_score == 0.85
+    assert result.details['matched_path_id'] == 'mixed_approach_path'
+    assert result.details['path_taken'] == [f'{decision_id}:{option_id}' for decision_id, option_id in chosen]
+
+
+def test_br_unfinished_path_scores_unreached_decisions_zero(br_scorer, br_activity):
+    result = br_scorer.score(br_activity, _submission({'decisions_made': [
+        {'decision_id': 'problem_framing_approach', 'option_id': 'impact_framing'}]}))
+
+    assert result.performance_score == 0.4
+    assert not result.details['completed'] and result.details['matched_path_id'] is None
+    assert [grade.selected_option for grade in result.question_grades] == ['impact_framing', None, None]
+
+
+@pytest.mark.parametrize('response_content', [
+    'I chose the balanced approach',
+    {'current_node': 'start', 'decisions': [{'decision': 'Option B - Balanced approach'}]},
+    {'decisions_made': []}
+])
+def test_br_submission_off_the_graph_is_not_autoscored(br_scorer, br_activity, response_content):
+    assert not br_scorer.can_score(br_activity, _submission(response_content))
+
+
+def _evaluate(make_pipeline, learner_manager, activity_id, transcript):
+    pipeline = make_pipeline()
+    learner_manager.create_learner(LearnerProfile(
+        learner_id='autoscore_learner', name='Autoscore Learner', email='autoscore@test.local',
+        enrollment_date=datetime.now(timezone.utc).isoformat()))
+    result = pipeline.evaluate_activity(activity_id, 'autoscore_learner', transcript['activity_transcript'])
+    return {phase.phase: phase for phase in result.pipeline_phases}, result
+
+
+def test_pipeline_autoscores_well_formed_sr(make_pipeline, learner_manager):
+    phases, result = _evaluate(make_pipeline, learner_manager, SR_ACTIVITY,
+                               _submission({'component_responses': ['b', 'a', 'a', 'b', 'a']}))
+
+    assert result.overall_success, result.error_summary
+    assert phases['combined_evaluation'].result['autoscored']
+    assert phases['combined_evaluation'].tokens_used in (0, None)
+    assert phases['scoring'].result['activity_score'] == 0.8
+
+
+def test_pipeline_sends_malformed_sr_to_the_llm(make_pipeline, learner_manager):
+    phases, result = _evaluate(make_pipeline, learner_manager, SR_ACTIVITY,
+                               _submission('I would investigate what users need before building anything'))
+
+    assert result.overall_success, result.error_summary
+    assert not phases['combined_evaluation'].result.get('autoscored')
+    assert phases['combined_evaluation'].tokens_used
@@ -0,0 +1,143 @@
+"""Content-addressed JSON blobs against the inline JSON columns they replaced"""
+
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import blob_store
+import migrate_blobs
+from blob_store import BlobStore, is_blob_reference
+from learner_manager import ActivityRecord, LearnerProfile
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _documents(index):
+    evaluation = {'overall_score': index / 10, 'rationale': f'Clear framing of the problem — attempt {index}. ' * 20,
+                  'aspect_scores': [{'aspect': 'clarity', 'score': index % 4}]}
+    transcript = {'student_engagement': {'component_responses': [
+        {'component_id': 'main_response', 'response_content': 'Ich würde zuerst die Nutzer befragen. ' * 30}]}}
+    return evaluation, transcript
+
+
+def _write_records(learner_manager, learner_id, count=4, unique=None):
+    learner_manager.create_learner(LearnerProfile(
+        learner_id=learner_id, name=learner_id, email=f'{learner_id}@test.local', enrollment_date=START.isoformat()))
+    for index in range(count):
+        evaluation, transcript = _documents(index)
+        if unique is not None:
+            evaluation = dict(evaluation, learner_note=unique)
+        learner_manager.add_activity_record(ActivityRecord(
+            activity_id=f'activity_{index}', learner_id=learner_id,
+            timestamp=(START + timedelta(days=index)).isoformat(),
+            evaluation_result=evaluation, activity_transcript=transcript, scored=True))
+
+
+def _write_inline_records(learner_manager, learner_id, monkeypatch, **kwargs):
+    """Records as LearnerManager wrote them before blobs: JSON text in the columns"""
+    with monkeypatch.context() as patch:
+        patch.setattr(learner_manager.blob_store, 'put_json',
+                      lambda cursor, value: json.dumps(value, ensure_ascii=False))
+        _write_records(learner_manager, learner_id, **kwargs)
+
+
+def _reads(learner_manager, learner_id):
+    activities = [(record.activity_id, record.timestamp, record.evaluation_result, record.activity_transcript,
+                   record.scored) for record in learner_manager.get_learner_activities(learner_id)]
+    summaries = [(summary.activity_id, summary.evaluation_result, summary.activity_transcript)
+                 for summary in learner_manager.get_learner_activity_summaries(learner_id)]
+    return activities, summaries
+
+
+def _stored(learner_manager, learner_id=None):
+    with learner_manager._get_db_connection() as conn:
+        rows = conn.execute('SELECT evaluation_result, activity_transcript FROM activity_records'
+                            + (' WHERE learner_id = ?' if learner_id else ''),
+                            (learner_id,) if learner_id else ()).fetchall()
+        blobs = {row['hash']: (row['codec'], row['size']) for row in conn.execute('SELECT * FROM blobs')}
+    return [value for row in rows for value in row], blobs
+
+
+@pytest.mark.parametrize('codec', ['zlib', 'none', 'zstd'])
+def test_documents_round_trip_once_per_content(learner_manager, codec):
+    if codec == 'zstd' and blob_store.zstandard is None:
+        pytest.skip('zstandard is not installed')
+    store = BlobStore({'codec': codec})
+    evaluation, _ = _documents(1)
+    text = json.dumps(evaluation, ensure_ascii=False)
+
+    with learner_manager._get_db_connection() as conn:
+        cursor = conn.cursor()
+        reference = store.put_json(cursor, evaluation)
+        assert store.put_text(cursor, text) == reference
+        empty = store.put_json(cursor, {})
+        conn.commit()
+        blobs = {row['hash']: (row['codec'], row['size'], len(row['data']))
+                 for row in conn.execute('SELECT hash, codec, size, data FROM blobs')}
+
+        assert store.get_text(cursor, reference) == text
+        assert store.get_json(cursor, reference) == evaluation
+        # Legacy inline JSON reads as before
+        assert store.get_json(cursor, text) == evaluation and store.get_json(cursor, None) is None
+
+    assert len(blobs) == 2
+    stored_codec, size, stored_size = blobs[reference[len('blob:'):]]
+    assert stored_codec == codec and size == len(text.encode('utf-8'))
+    if codec != 'none':
+        assert stored_size < size / 3
+    # Documents that don't shrink are kept as they are
+    assert blobs[empty[len('blob:'):]][0] == 'none'
+
+
+def test_blob_reads_match_inline_json(learner_manager, monkeypatch):
+    _write_inline_records(learner_manager, 'inline_learner', monkeypatch)
+    _write_records(learner_manager, 'blob_learner')
+
+    inline_columns, _ = _stored(learner_manager, 'inline_learner')
+    blob_columns, blobs = _stored(learner_manager, 'blob_learner')
+    assert not any(is_blob_reference(value) for value in inline_columns)
+    assert all(is_blob_reference(value) for value in blob_columns)
+    # Four evaluations and one transcript repeated four times
+    assert len(blobs) == 5
+    assert _reads(learner_manager, 'blob_learner') == _reads(learner_manager, 'inline_learner')
+
+
+def test_migration_converts_inline_rows_once(learner_manager, monkeypatch, capsys):
+    _write_inline_records(learner_manager, 'inline_learner', monkeypatch)
+    before = _reads(learner_manager, 'inline_learner')
+
+    report = learner_manager.migrate_json_to_blobs(chunk_size=3)
+
+    assert report['activity_records'] == 4 and report['blobs_created'] == 5
+    assert report['inline_bytes'] > 2 * report['blob_stored_bytes']
+    columns, _ = _stored(learner_manager)
+    assert all(is_blob_reference(value) for value in columns)
+    assert _reads(learner_manager, 'inline_learner') == before
+
+    # A rerun through the CLI finds nothing left to convert
+    monkeypatch.setenv('DATABASE_PATH', learner_manager.db_path)
+    monkeypatch.setattr(sys, 'argv', ['migrate_blobs.py', '--vacuum'])
+    assert migrate_blobs.main() == 0
+    assert 'Converted 0 activity records and 0 activity history rows' in capsys.readouterr().out
+    assert _reads(learner_manager, 'inline_learner') == before
+
+
+def test_reset_drops_only_blobs_nobody_else_references(learner_manager):
+    _write_records(learner_manager, 'first', unique='first only')
+    _write_records(learner_manager, 'second', count=2)
+    _, blobs = _stored(learner_manager)
+    # first: four evaluations and the transcript; second: two more evaluations, same transcript
+    assert len(blobs) == 7
+
+    assert learner_manager.reset_learner_history('first')
+
+    _, remaining = _stored(learner_manager)
+    assert len(remaining) == 3
+    assert [record[2] for record in _reads(learner_manager, 'second')[0]] == [
+        _documents(index)[0] for index in (1, 0)]
+
+    assert learner_manager.reset_learner_history('second')
+    assert _stored(learner_manager) == ([], {})
+    assert learner_manager.prune_unreferenced_blobs() == 0
@@ -0,0 +1,125 @@
+"""BR decision graphs: compiling authored scenarios and stepping a learner through them"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from autoscoring import BranchingScenarioScorer
+from branching_scenario import compile_branching_graph
+
+BR_ACTIVITY = 'requirements_prioritization_dilemma_br'
+
+
+@pytest.fixture
+def activity_manager(config_manager):
+    from activity_manager import ActivityManager
+    return ActivityManager(config_manager)
+
+
+@pytest.fixture
+def graph(activity_manager):
+    return activity_manager.get_branching_graph(BR_ACTIVITY)
+
+
+def _activity(content=None, generation_output=None):
+    return SimpleNamespace(activity_id='synthetic_br', content=content or {},
+                           activity_generation_output=generation_output or {})
+
+
+def test_fixture_compiles_in_authored_order(graph, activity_manager):
+    assert graph.start_decision_id == 'problem_framing_approach'
+    assert list(graph.nodes) == ['problem_framing_approach', 'stakeholder_communication', 'problem_refinement']
+    assert graph.transitions[('problem_framing_approach', 'solution_framing')] == 'stakeholder_communication'
+    assert graph.transitions[('problem_refinement', 'maintain_original')] is None
+    # Quality of an option is that of the best authored path using it
+    qualities = {option_id: option.quality for option_id, option in graph.nodes['problem_framing_approach'].options.items()}
+    assert qualities == {'impact_framing': 1.0, 'segment_framing': 0.5, 'solution_framing': 0.0}
+    assert [path['quality'] for path in graph.paths] == [1.0, 0.75, 0.5]
+    # Compiled once, at load time
+    assert activity_manager.get_branching_graph(BR_ACTIVITY) is graph
+    assert activity_manager.get_branching_graph('user_need_identification_quiz_sr') is None
+
+
+def test_advance_walks_the_graph_to_completion(graph):
+    state = graph.initial_state()
+    assert state['current_node'] == 'problem_framing_approach' and not state['completed']
+
+    first = graph.advance(state, 'impact_framing')
+    assert (first.next_decision_id, first.completed) == ('stakeholder_communication', False)
+    assert state['scenario_state'] == first.next_context_update
+    second = graph.advance(state, graph.nodes['stakeholder_communication'].options['future_roadmap'].option_text)
+    assert second.option_id == 'future_roadmap' and second.quality == 0.75
+    last = graph.advance(state, {'option_id': 'scope_reduction'})
+
+    assert last.completed and last.next_decision_id is None
+    assert state['completed'] and state['current_node'] is None
+    assert state['path_taken'] == ['problem_framing_approach:impact_framing',
+                                   'stakeholder_communication:future_roadmap',
+                                   'problem_refinement:scope_reduction']
+    assert graph.advance(state, 'reframe_problem') is None
+
+
+def test_invalid_option_leaves_state_unchanged(graph):
+    state = graph.initial_state()
+    before = json.loads(json.dumps(state))
+
+    assert graph.advance(state, 'Option B - Balanced approach') is None
+    assert graph.advance(state, 'transparent_rationale') is None
+    assert state == before
+    with pytest.raises(ValueError):
+        graph.step('problem_framing_approach', 'transparent_rationale')
+
+
+def test_submitted_state_is_scored_along_the_path_taken(graph, activity_manager):
+    state = graph.initial_state()
+    for option_id in ('impact_framing', 'transparent_rationale', 'reframe_problem'):
+        graph.advance(state, option_id)
+    transcript = {'student_engagement': {'component_responses': [
+        {'component_id': 'main_response', 'response_content': json.dumps(state)}]}}
+
+    activity = activity_manager.get_activity(BR_ACTIVITY)
+    scorer = BranchingScenarioScorer(activity_manager.get_branching_graph)
+    assert scorer.can_score(activity, transcript)
+    result = scorer.score(activity, transcript)
+
+    assert result.performance_score == 1.0
+    assert result.details['matched_path_id'] == 'strategic_approach_path'
+
+
+def test_explicit_next_decision_and_quality():
+    activity = _activity({
+        'initial_scenario': 'Two teams want the same sprint.',
+        'decision_points': [
+            {'decision_id': 'open', 'decision_weight': 2, 'options': [
+                {'option_id': 'listen', 'option_text': 'Hear both teams out', 'quality': 0.9},
+                {'option_id': 'decide', 'option_text': 'Decide now', 'next_decision_id': 'escalation', 'quality': 0.2}]},
+            {'decision_id': 'follow_up', 'options': [{'option_id': 'summarize', 'option_text': 'Summarize', 'quality': 1}]},
+            {'decision_id': 'escalation', 'options': [{'option_id': 'escalate', 'option_text': 'Escalate', 'quality': 0.4}]}
+        ]
+    })
+    graph = compile_branching_graph(activity)
+
+    assert graph.transitions[('open', 'listen')] == 'follow_up'
+    assert graph.transitions[('open', 'decide')] == 'escalation'
+    assert graph.transitions[('follow_up', 'summarize')] == 'escalation'
+    assert graph.nodes['open'].best_option_id == 'listen'
+
+    state = graph.initial_state()
+    assert state['scenario_state'] == 'Two teams want the same sprint.'
+    graph.advance(state, 'Decide now')
+    graph.advance(state, 'escalate')
+    assert state['completed']
+    # (0.2 * 2 + 0.4 * 1) / (2 + 1 + 1); follow_up was never reached
+    assert graph.score_path([('open', 'decide'), ('escalation', 'escalate')]).score == 0.2
+
+
+def test_decisions_from_generation_output_and_empty_scenarios():
+    generation_output = {'components': [{'branching_decisions': [
+        {'options': [{'option_id': 'a', 'option_text': 'A'}]}]}]}
+    graph = compile_branching_graph(_activity(generation_output=generation_output))
+    assert graph.start_decision_id == 'decision_1'
+    # Options on no authored path score zero
+    assert graph.nodes['decision_1'].options['a'].quality == 0.0
+
+    assert compile_branching_graph(_activity({'initial_scenario': 'No decisions'})) is None
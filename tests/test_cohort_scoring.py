@@ -0,0 +1,86 @@
+"""Cohort scoring: vectorized and scalar paths against per-learner ScoringEngine scores"""
+
+import math
+import random
+
+import pytest
+
+import cohort_scoring
+from cohort_scoring import CohortScoringEngine
+from scoring_engine import ScoringEngine
+
+SKILLS = ('S001', 'S002', 'S003')
+SCORE_FIELDS = ('cumulative_score', 'total_adjusted_evidence', 'activity_count', 'standard_error',
+                'confidence_interval', 'gate_1_status', 'gate_2_status', 'overall_status')
+
+
+def _assert_same_score(actual, expected, context):
+    for name in SCORE_FIELDS:
+        expected_value, actual_value = getattr(expected, name), getattr(actual, name)
+        if isinstance(expected_value, tuple):
+            assert all(math.isclose(a, e, rel_tol=1e-9, abs_tol=1e-12)
+                       for a, e in zip(actual_value, expected_value)), (context, name)
+        elif isinstance(expected_value, float):
+            assert math.isclose(actual_value, expected_value, rel_tol=1e-9, abs_tol=1e-12), (context, name)
+        else:
+            assert actual_value == expected_value, (context, name)
+
+
+@pytest.fixture
+def engine(config_manager, learner_manager):
+    return ScoringEngine(config_manager, learner_manager)
+
+
+def _score_cohort_one_by_one(engine, score_activities):
+    """Eight learners with up to 30 activities each; returns the latest SkillScore per (learner, skill)"""
+    rng = random.Random(7)
+    latest = {}
+    for number in range(8):
+        learner_id = f'learner_{number}'
+        activities = [{'skill_id': rng.choice(SKILLS), 'score': round(rng.random(), 3),
+                       'validity': rng.choice([1.0, 0.95, 0.8, 0.5]), 'evidence': round(rng.uniform(0.5, 4.0), 2),
+                       'day': day} for day in range(rng.randint(1, 30))]
+        for activity, result in zip(activities, score_activities(engine, learner_id, activities)):
+            latest[(learner_id, activity['skill_id'])] = result.skill_scores[activity['skill_id']]
+    return latest
+
+
+@pytest.fixture
+def cohort(engine, score_activities):
+    return _score_cohort_one_by_one(engine, score_activities)
+
+
+@pytest.mark.parametrize('window', [10, 5, None])
+def test_vectorized_scores_match_the_scoring_engine(engine, learner_manager, score_activities, window):
+    engine.max_activities_for_scoring = window
+    expected = _score_cohort_one_by_one(engine, score_activities)
+
+    results = CohortScoringEngine(engine, learner_manager).score_cohort()
+
+    assert results.keys() == expected.keys()
+    # Some histories are longer than the window
+    assert max(score.activity_count for score in results.values()) == (window or 15)
+    for key, score in results.items():
+        _assert_same_score(score, expected[key], key)
+
+
+def test_scalar_fallback_matches_vectorized(engine, learner_manager, cohort, monkeypatch):
+    scorer = CohortScoringEngine(engine, learner_manager)
+    vectorized = scorer.score_cohort()
+
+    monkeypatch.setattr(cohort_scoring, 'np', None)
+    assert not scorer.vectorized
+    scalar = scorer.score_cohort()
+
+    assert scalar.keys() == vectorized.keys()
+    for key, score in scalar.items():
+        _assert_same_score(vectorized[key], score, key)
+
+
+def test_cohort_can_be_restricted(engine, learner_manager, cohort):
+    scorer = CohortScoringEngine(engine, learner_manager)
+
+    results = scorer.score_cohort(learner_ids=['learner_1', 'learner_2'], skill_ids=['S002'])
+
+    assert set(results) == {key for key in cohort if key[0] in ('learner_1', 'learner_2') and key[1] == 'S002'}
+    assert scorer.score_cohort(learner_ids=['nobody']) == {}
@@ -0,0 +1,170 @@
+"""Persistent per-thread WAL connections against the per-query connections they replaced"""
+
+import math
+import random
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from db_connection import SQLiteConnectionManager, get_connection_manager
+from learner_manager import LearnerManager
+from scoring_engine import ScoringEngine
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SQLiteConnectionManager(str(tmp_path / 'connections.db'))
+    with manager.connection() as conn:
+        conn.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)')
+        conn.commit()
+    yield manager
+    manager.close_all()
+
+
+def _in_thread(function):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=function()))
+    thread.start()
+    thread.join()
+    return result['value']
+
+
+def test_one_persistent_wal_connection_per_thread(manager):
+    with manager.connection() as first:
+        with manager.connection() as nested:
+            assert nested is first
+        assert first.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        # synchronous=NORMAL
+        assert first.execute('PRAGMA synchronous').fetchone()[0] == 1
+    with manager.connection() as again:
+        assert again is first
+
+    def other_thread():
+        with manager.connection() as conn:
+            return id(conn)
+
+    assert _in_thread(other_thread) != id(first)
+
+
+def test_uncommitted_writes_roll_back_when_the_outermost_use_exits(manager):
+    with manager.connection() as conn:
+        conn.execute("INSERT INTO items (name) VALUES ('kept')")
+        conn.commit()
+        with manager.connection() as nested:
+            nested.execute("INSERT INTO items (name) VALUES ('discarded')")
+        # Still open inside the outer use
+        assert conn.in_transaction
+    with manager.connection() as conn:
+        assert [row['name'] for row in conn.execute('SELECT name FROM items')] == ['kept']
+
+
+def test_readers_see_committed_data_while_a_write_is_open(manager):
+    reader = SQLiteConnectionManager(manager.db_path, read_only=True)
+    try:
+        with manager.connection() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('committed')")
+            conn.commit()
+            conn.execute("INSERT INTO items (name) VALUES ('pending')")
+
+            def read():
+                with reader.connection() as read_conn:
+                    return [row['name'] for row in read_conn.execute('SELECT name FROM items')]
+
+            # WAL: the reader isn't blocked by the open write transaction
+            assert _in_thread(read) == ['committed']
+            conn.commit()
+        with reader.connection() as read_conn:
+            with pytest.raises(sqlite3.OperationalError):
+                read_conn.execute("INSERT INTO items (name) VALUES ('refused')")
+    finally:
+        reader.close_all()
+
+
+def test_connections_of_finished_threads_are_closed(manager):
+    def open_connection():
+        with manager.connection():
+            return threading.get_ident()
+
+    finished = _in_thread(open_connection)
+    assert finished in manager._connections
+    orphan = manager._connections[finished]
+
+    # The next connection opened on any thread closes it
+    manager.close()
+    open_connection()
+
+    assert finished not in manager._connections
+    with pytest.raises(sqlite3.ProgrammingError):
+        orphan.execute('SELECT 1')
+
+    # Also when the next thread reuses the finished thread's ident
+    previous = manager._connections[_in_thread(open_connection)]
+    _in_thread(open_connection)
+    with pytest.raises(sqlite3.ProgrammingError):
+        previous.execute('SELECT 1')
+
+
+def test_managers_are_shared_per_file_and_mode(config_manager, learner_manager):
+    other = LearnerManager(config_manager, db_path=learner_manager.db_path)
+
+    assert other._connections is learner_manager._connections
+    assert get_connection_manager(learner_manager.db_path, read_only=True) is not learner_manager._connections
+    with other._get_db_connection() as conn, learner_manager._get_db_connection() as same:
+        assert conn is same
+
+
+def _per_query_connection(learner_manager):
+    """LearnerManager._get_db_connection as it was: a fresh connection per use, closed afterwards"""
+    @contextmanager
+    def connection():
+        conn = sqlite3.connect(learner_manager.db_path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    return connection
+
+
+def _tables(learner_manager):
+    with learner_manager._get_db_connection() as conn:
+        history = [{key: row[key] for key in row.keys() if key != 'id'} for row in conn.execute(
+            'SELECT * FROM activity_history ORDER BY learner_id, skill_id, completion_timestamp')]
+        progress = [{key: row[key] for key in row.keys() if key != 'last_updated'} for row in conn.execute(
+            'SELECT * FROM skill_progress ORDER BY learner_id, skill_id')]
+        states = [{key: row[key] for key in row.keys() if key != 'last_updated'} for row in conn.execute(
+            'SELECT * FROM skill_scoring_state ORDER BY learner_id, skill_id')]
+    return history, progress, states
+
+
+def test_scoring_writes_the_same_rows_as_per_query_connections(config_manager, learner_manager, tmp_path,
+                                                               score_activities, monkeypatch):
+    reference = LearnerManager(config_manager, db_path=str(tmp_path / 'per_query.db'))
+    monkeypatch.setattr(reference, '_get_db_connection', _per_query_connection(reference))
+    reference.json_mirror_dir = str(tmp_path / 'reference_learners')
+
+    rng = random.Random(12)
+    activities = [{'skill_id': rng.choice(['S001', 'S002']), 'score': round(rng.random(), 3),
+                   'evidence': round(rng.uniform(0.5, 4.0), 2), 'day': day} for day in range(20)]
+    try:
+        for manager in (learner_manager, reference):
+            score_activities(ScoringEngine(config_manager, manager), 'learner', activities)
+        actual, expected = _tables(learner_manager), _tables(reference)
+    finally:
+        reference.json_mirror.close()
+        reference._connections.close_all()
+
+    for actual_rows, expected_rows in zip(actual, expected):
+        assert len(actual_rows) == len(expected_rows) > 0
+        for row, expected_row in zip(actual_rows, expected_rows):
+            assert row.keys() == expected_row.keys()
+            for column, value in expected_row.items():
+                if isinstance(value, float):
+                    assert math.isclose(row[column], value, rel_tol=1e-12), column
+                else:
+                    assert row[column] == value, column
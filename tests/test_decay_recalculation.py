@@ -0,0 +1,125 @@
+"""Batched retroactive decay recalculation against the per-row recalculation it replaced"""
+
+import math
+import random
+
+import pytest
+
+from scoring_engine import ScoringEngine, evidence_decay_factors
+
+SKILLS = ('S001', 'S002', 'S003')
+JOB_ID = 'decay_recalculation:*'
+
+
+def per_row_recalculate(engine, learner_manager):
+    """recalculate_all_activities_with_new_decay as it was: one UPDATE and commit per row"""
+    for learner in learner_manager.list_learners():
+        for skill_id in learner_manager.get_skill_progress(learner.learner_id):
+            activities = learner_manager.get_activity_history_chronological(learner.learner_id, skill_id)
+            decay_factors = evidence_decay_factors(
+                [activity['adjusted_evidence_volume'] for activity in reversed(activities)], engine.decay_factor)
+            for activity, evidence_based_decay in zip(reversed(activities), decay_factors):
+                learner_manager.update_activity_decay_adjusted_evidence(
+                    learner.learner_id, activity['activity_id'], skill_id,
+                    activity['adjusted_evidence_volume'] * evidence_based_decay, evidence_based_decay)
+
+
+def _decay_columns(learner_manager):
+    with learner_manager._get_db_connection() as conn:
+        rows = conn.execute('SELECT id, decay_adjusted_evidence_volume, cumulative_evidence_weight '
+                            'FROM activity_history ORDER BY id').fetchall()
+    return {row['id']: (row['decay_adjusted_evidence_volume'], row['cumulative_evidence_weight']) for row in rows}
+
+
+def _reset_decay_columns(learner_manager):
+    with learner_manager._get_db_connection() as conn:
+        conn.execute('UPDATE activity_history SET decay_adjusted_evidence_volume = -1, cumulative_evidence_weight = -1')
+        conn.commit()
+
+
+def _assert_columns_match(actual, expected):
+    assert actual.keys() == expected.keys()
+    for row_id, values in expected.items():
+        assert all(math.isclose(a, e, rel_tol=1e-12, abs_tol=1e-15) for a, e in zip(actual[row_id], values)), row_id
+
+
+def _interrupt_after(chunks):
+    """Progress callback that stops the run once the given number of chunks is committed"""
+    def callback(report):
+        if report['chunks'] == chunks:
+            raise KeyboardInterrupt
+    return callback
+
+
+@pytest.fixture
+def engine(config_manager, learner_manager, score_activities):
+    """An engine whose decay factor changed after ten learners were scored"""
+    engine = ScoringEngine(config_manager, learner_manager)
+    rng = random.Random(11)
+    for number in range(10):
+        score_activities(engine, f'learner_{number}', [
+            {'skill_id': rng.choice(SKILLS), 'score': round(rng.random(), 3),
+             'validity': rng.choice([1.0, 0.8, 0.5]), 'evidence': round(rng.uniform(0.5, 4.0), 2), 'day': day}
+            for day in range(rng.randint(1, 25))])
+    engine.decay_factor = 0.9
+    return engine
+
+
+@pytest.fixture
+def expected_columns(engine, learner_manager):
+    per_row_recalculate(engine, learner_manager)
+    expected = _decay_columns(learner_manager)
+    _reset_decay_columns(learner_manager)
+    return expected
+
+
+@pytest.mark.parametrize('chunk_size', [1, 4, 200])
+def test_batched_recalculation_matches_per_row(engine, learner_manager, expected_columns, chunk_size):
+    reports = []
+    report = engine.bulk_recalculate_decay(chunk_size=chunk_size, progress_callback=reports.append)
+
+    _assert_columns_match(_decay_columns(learner_manager), expected_columns)
+    assert report['rows_updated'] == len(expected_columns)
+    assert report['groups_processed'] == report['total_groups'] == learner_manager.count_activity_history_groups()
+    assert report['chunks'] == len(reports) == math.ceil(report['total_groups'] / chunk_size)
+    assert learner_manager.get_maintenance_checkpoint(JOB_ID) is None
+
+
+def test_interrupted_run_resumes_from_its_checkpoint(engine, learner_manager, expected_columns):
+    with pytest.raises(KeyboardInterrupt):
+        engine.bulk_recalculate_decay(chunk_size=3, progress_callback=_interrupt_after(2))
+    checkpoint = learner_manager.get_maintenance_checkpoint(JOB_ID)
+    assert checkpoint['processed'] == 6 and checkpoint['parameters']['decay_factor'] == 0.9
+
+    report = engine.bulk_recalculate_decay(chunk_size=3)
+
+    assert report['resumed_from'] == checkpoint['position']
+    assert report['groups_processed'] == report['total_groups']
+    _assert_columns_match(_decay_columns(learner_manager), expected_columns)
+    assert learner_manager.get_maintenance_checkpoint(JOB_ID) is None
+
+
+def test_checkpoint_of_another_decay_factor_is_not_resumed(engine, learner_manager, expected_columns):
+    engine.decay_factor = 0.5
+    with pytest.raises(KeyboardInterrupt):
+        engine.bulk_recalculate_decay(chunk_size=2, progress_callback=_interrupt_after(1))
+
+    engine.decay_factor = 0.9
+    report = engine.bulk_recalculate_decay(chunk_size=2)
+
+    assert report['resumed_from'] is None
+    _assert_columns_match(_decay_columns(learner_manager), expected_columns)
+
+
+def test_single_learner_leaves_the_others_alone(engine, learner_manager, expected_columns):
+    assert engine.recalculate_all_activities_with_new_decay('learner_3', chunk_size=2)
+
+    actual = _decay_columns(learner_manager)
+    with learner_manager._get_db_connection() as conn:
+        learner_rows = {row['id'] for row in conn.execute(
+            "SELECT id FROM activity_history WHERE learner_id = 'learner_3'")}
+    assert learner_rows
+    _assert_columns_match({row_id: actual[row_id] for row_id in learner_rows},
+                          {row_id: expected_columns[row_id] for row_id in learner_rows})
+    assert all(actual[row_id] == (-1, -1) for row_id in actual.keys() - learner_rows)
+    assert not engine.recalculate_all_activities_with_new_decay('nobody')
@@ -0,0 +1,106 @@
+"""Domain model index: parity with scans of config/domain_model.json and rebuilds on change"""
+
+import copy
+
+import pytest
+
+from domain_model_index import DomainModelIndex
+
+
+@pytest.fixture
+def domain_model(config_manager):
+    return config_manager.get_domain_model()
+
+
+def _scan_subskills(domain_model, skill_id):
+    """Subskill ids of a skill by scanning subskills and skillMappings, in domain model order"""
+    found = [subskill['id'] for subskill in domain_model['subskills'] if subskill.get('skillId') == skill_id]
+    for mapping in domain_model['skillMappings']:
+        if mapping['skillId'] == skill_id and mapping['subskillId'] not in found:
+            found.append(mapping['subskillId'])
+    return found
+
+
+def _scan_skill_of(domain_model, subskill_id):
+    for subskill in domain_model['subskills']:
+        if subskill['id'] == subskill_id:
+            return subskill.get('skillId')
+    for mapping in domain_model['skillMappings']:
+        if mapping['subskillId'] == subskill_id:
+            return mapping['skillId']
+    return None
+
+
+def test_lookups_match_scans_of_the_domain_model(domain_model):
+    index = DomainModelIndex(domain_model)
+
+    assert index.get_stats() == {
+        'competencies': len(domain_model['competencies']), 'skills': len(domain_model['skills']),
+        'subskills': len(domain_model['subskills']),
+        'subskill_dependencies': len(domain_model['subskillDependencies'])}
+    for skill in domain_model['skills']:
+        skill_id = skill['id']
+        assert index.get_skill(skill_id) is skill
+        assert index.get_skill_name(skill_id) == skill['name']
+        competency = next(c for c in domain_model['competencies'] if c['id'] == skill['competency'])
+        assert index.get_competency_for_skill(skill_id) is competency
+        assert [s['id'] for s in index.get_subskills_for_skill(skill_id)] == _scan_subskills(domain_model, skill_id)
+
+        own_subskills = set(_scan_subskills(domain_model, skill_id))
+        dependencies = [d for d in domain_model['subskillDependencies'] if d['dependentSubskillId'] in own_subskills]
+        assert sorted(map(id, index.get_subskill_dependencies(skill_id))) == sorted(map(id, dependencies))
+        prerequisites = {_scan_skill_of(domain_model, d['prerequisiteSubskillId']) for d in dependencies} - {skill_id}
+        assert set(index.get_skill_prerequisites(skill_id)) == prerequisites
+
+        context = index.get_skill_context(skill_id)
+        assert (context['skill_name'], context['competency_name']) == (skill['name'], competency['name'])
+        assert [s['subskill_id'] for s in context['subskills']] == _scan_subskills(domain_model, skill_id)
+    for competency in domain_model['competencies']:
+        assert [s['id'] for s in index.get_skills_for_competency(competency['id'])] == [
+            s['id'] for s in domain_model['skills'] if s['competency'] == competency['id']]
+
+    assert index.get_skill('S999') is None and index.get_skill_name('S999') == 'S999'
+    assert index.get_skill_context('S999') is None
+
+
+def test_legacy_dict_sections_are_indexed():
+    index = DomainModelIndex({
+        'competencies': {'C1': {'name': 'Discovery'}},
+        'skills': {'S1': {'name': 'Interview users', 'competency': 'C1'}},
+        'subskills': {'SS1': {'skillId': 'S1', 'description': 'Ask open questions'}}
+    })
+
+    assert index.get_skill_name('S1') == 'Interview users'
+    assert index.get_competency_for_skill('S1')['name'] == 'Discovery'
+    assert index.get_skill_id_for_subskill('SS1') == 'S1'
+
+
+def test_index_is_shared_and_rebuilt_only_when_the_model_changes(config_manager, monkeypatch):
+    index = config_manager.get_domain_model_index()
+    assert config_manager.get_domain_model_index() is index
+
+    skills = copy.deepcopy(config_manager.get_domain_model()['skills'])
+    skills[0]['name'] = 'Renamed skill'
+    monkeypatch.setattr(config_manager, 'save_config', lambda config_key: True)
+    assert config_manager.update_config('domain_model', {'skills': skills})
+
+    rebuilt = config_manager.get_domain_model_index()
+    assert rebuilt is not index and rebuilt.version != index.version
+    assert rebuilt.get_skill_name(skills[0]['id']) == 'Renamed skill'
+
+
+def test_pipeline_and_scoring_read_the_shared_index(make_pipeline, config_manager, monkeypatch):
+    pipeline = make_pipeline()
+    skill = config_manager.get_domain_model()['skills'][0]
+
+    assert pipeline._get_cached_skill_context(skill['id'])['skill_name'] == skill['name']
+    assert pipeline.scoring_engine._get_skill_name(skill['id']) == skill['name']
+
+    skills = copy.deepcopy(config_manager.get_domain_model()['skills'])
+    skills[0]['name'] = 'Renamed skill'
+    monkeypatch.setattr(config_manager, 'save_config', lambda config_key: True)
+    config_manager.update_config('domain_model', {'skills': skills})
+
+    # The pipeline's derived caches follow the index version
+    assert pipeline._get_cached_skill_context(skill['id'])['skill_name'] == 'Renamed skill'
+    assert pipeline.scoring_engine._get_skill_name(skill['id']) == 'Renamed skill'
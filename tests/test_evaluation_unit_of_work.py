@@ -0,0 +1,143 @@
+"""An evaluation's writes as one unit of work, against writing each as it happens"""
+
+import contextlib
+import math
+from datetime import datetime, timezone
+
+import pytest
+
+from activity_manager import ActivityManager
+from evaluation_pipeline import EvaluationPipeline
+from learner_manager import LearnerManager, LearnerProfile, LearnerUnitOfWork, SkillProgress
+from pipeline_benchmark import MockLLMClient, build_synthetic_transcript
+from prompt_builder import PromptBuilder
+from scoring_engine import ScoringEngine
+
+ACTIVITIES = ('user_requirements_clarification_cr', 'stakeholder_conflict_resolution_rp',
+              'problem_statement_crafting_cr', 'problem_framing_workshop_rp')
+HISTORY_COLUMNS = ('activity_id', 'skill_id', 'performance_score', 'target_evidence_volume', 'validity_modifier',
+                   'adjusted_evidence_volume', 'cumulative_performance', 'cumulative_evidence')
+
+
+def _create_learner(learner_manager, learner_id='learner'):
+    learner_manager.create_learner(LearnerProfile(
+        learner_id=learner_id, name=learner_id, email=f'{learner_id}@test.local',
+        enrollment_date=datetime.now(timezone.utc).isoformat()))
+
+
+def _progress(skill_id, score, learner_id='learner'):
+    return SkillProgress(skill_id=skill_id, learner_id=learner_id, skill_name=skill_id, cumulative_score=score,
+                         total_adjusted_evidence=1.0, activity_count=1, gate_1_status='developing',
+                         gate_2_status='needs_improvement', overall_status='needs_improvement',
+                         last_updated=datetime.now(timezone.utc).isoformat())
+
+
+def _tables(learner_manager):
+    with learner_manager._get_db_connection() as conn:
+        history = [tuple(row[column] for column in HISTORY_COLUMNS) for row in conn.execute(
+            'SELECT * FROM activity_history ORDER BY id')]
+        progress = {row['skill_id']: (row['cumulative_score'], row['total_adjusted_evidence'], row['activity_count'],
+                                      row['overall_status']) for row in conn.execute('SELECT * FROM skill_progress')}
+        records = [(row['activity_id'], row['learner_id'], row['scored']) for row in conn.execute(
+            'SELECT * FROM activity_records ORDER BY id')]
+        states = conn.execute('SELECT COUNT(*) FROM skill_scoring_state').fetchone()[0]
+    return history, progress, records, states
+
+
+def _evaluate_all(config_manager, learner_manager):
+    pipeline = EvaluationPipeline(config_manager, MockLLMClient(), PromptBuilder(config_manager),
+                                  ScoringEngine(config_manager, learner_manager), learner_manager,
+                                  ActivityManager(config_manager))
+    _create_learner(learner_manager)
+    activities = pipeline.activity_manager.load_activities()
+    results = []
+    for index, activity_id in enumerate(ACTIVITIES * 2):
+        results.append(pipeline.evaluate_activity(
+            activity_id, 'learner', build_synthetic_transcript(activities[activity_id], index)))
+    return results
+
+
+@contextlib.contextmanager
+def _write_through_unit_of_work():
+    """unit_of_work as the pipeline ran before it: every write commits as it is made"""
+    yield LearnerUnitOfWork(committed=True)
+
+
+def test_pipeline_writes_match_writing_as_it_goes(config_manager, learner_manager, tmp_path, monkeypatch):
+    reference = LearnerManager(config_manager, db_path=str(tmp_path / 'write_through.db'))
+    reference.json_mirror_dir = str(tmp_path / 'reference_learners')
+    monkeypatch.setattr(reference, 'unit_of_work', _write_through_unit_of_work)
+    try:
+        results = _evaluate_all(config_manager, learner_manager)
+        expected_results = _evaluate_all(config_manager, reference)
+        actual, expected = _tables(learner_manager), _tables(reference)
+    finally:
+        reference.json_mirror.close()
+        reference._connections.close_all()
+
+    assert [result.overall_success for result in results] == [result.overall_success for result in expected_results]
+    assert all(result.overall_success for result in results)
+    history, progress, records, states = actual
+    expected_history, expected_progress, expected_records, expected_states = expected
+    # Re-evaluations replace the activity's history rows
+    assert len(history) == len(expected_history) == len(ACTIVITIES)
+    for row, expected_row in zip(history, expected_history):
+        assert row[:2] == expected_row[:2]
+        assert all(math.isclose(a, e, rel_tol=1e-12, abs_tol=1e-15) for a, e in zip(row[2:], expected_row[2:])), row
+    assert progress.keys() == expected_progress.keys()
+    for skill_id, values in expected_progress.items():
+        assert math.isclose(progress[skill_id][0], values[0], rel_tol=1e-12) and progress[skill_id][1:] == values[1:]
+    assert records == expected_records and len(records) == len(ACTIVITIES) * 2
+    assert states == expected_states
+
+
+def test_staged_writes_commit_together_on_exit(learner_manager, monkeypatch):
+    _create_learner(learner_manager)
+    marks = []
+    monkeypatch.setattr(learner_manager.json_mirror, 'mark_dirty', marks.append)
+
+    with learner_manager.unit_of_work() as unit:
+        assert learner_manager.update_skill_progress(_progress('S001', 0.4))
+        with learner_manager.unit_of_work() as nested:
+            assert nested is unit
+            assert learner_manager.update_skill_progress(_progress('S002', 0.6))
+        # Reads inside the block only see committed data
+        assert learner_manager.get_skill_progress('learner') == {}
+        assert marks == [] and not unit.committed
+
+    assert unit.committed
+    assert {skill_id: progress.cumulative_score
+            for skill_id, progress in learner_manager.get_skill_progress('learner').items()} == {'S001': 0.4, 'S002': 0.6}
+    assert marks == ['learner']
+
+
+def test_exception_discards_everything(learner_manager):
+    _create_learner(learner_manager)
+
+    with pytest.raises(RuntimeError):
+        with learner_manager.unit_of_work() as unit:
+            learner_manager.update_skill_progress(_progress('S001', 0.4))
+            raise RuntimeError('feedback call failed')
+
+    assert not unit.committed
+    assert learner_manager.get_skill_progress('learner') == {}
+    # The next write outside a unit commits immediately again
+    assert learner_manager.update_skill_progress(_progress('S001', 0.5))
+    assert learner_manager.get_skill_progress('learner')['S001'].cumulative_score == 0.5
+
+
+def test_failed_commit_fails_the_evaluation_and_writes_nothing(make_pipeline, learner_manager, monkeypatch):
+    pipeline = make_pipeline()
+    _create_learner(learner_manager)
+    activity = pipeline.activity_manager.load_activities()[ACTIVITIES[0]]
+
+    def failing_write(cursor, record):
+        raise RuntimeError('disk I/O error')
+
+    # The evaluation record is the last write of the unit
+    monkeypatch.setattr(learner_manager, '_write_activity_record', failing_write)
+    result = pipeline.evaluate_activity(ACTIVITIES[0], 'learner', build_synthetic_transcript(activity, 0))
+
+    assert not result.overall_success
+    assert result.error_summary
+    assert _tables(learner_manager) == ([], {}, [], 0)
@@ -0,0 +1,174 @@
+"""Learner-sharded evaluation pool: per-learner ordering, stealing, worker failure and shutdown"""
+
+import functools
+import json
+import os
+import time
+
+import pytest
+
+from src.evaluation_pipeline import EvaluationResult, PhaseResult
+from src.evaluation_worker_pool import LearnerShardedEvaluationPool
+
+
+class FakePipeline:
+    """Records when each evaluation ran, and in which process"""
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+
+    def evaluate_activity(self, activity_id, learner_id, activity_transcript, evaluation_mode='full'):
+        crash_marker = activity_transcript.get('crash_marker')
+        if crash_marker and _claim(crash_marker):
+            # Let the queue feeder threads flush before the hard exit
+            time.sleep(0.5)
+            os._exit(3)
+        started = time.time()
+        time.sleep(activity_transcript.get('seconds', 0.02))
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'learner_id': learner_id, 'activity_id': activity_id, 'pid': os.getpid(),
+                                'started': started, 'finished': time.time()}) + '\n')
+        return {
+            'activity_id': activity_id, 'learner_id': learner_id, 'evaluation_timestamp': '',
+            'pipeline_phases': [{'phase': 'fake', 'success': True, 'result': {'pid': os.getpid()}}],
+            'final_skill_scores': {}, 'overall_success': True, 'total_execution_time_ms': 0,
+            'total_cost_estimate': 0.0
+        }
+
+
+def _claim(path):
+    """True for exactly one caller across processes"""
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL))
+        return True
+    except FileExistsError:
+        return False
+
+
+def build_fake_pipeline(log_path, fail_once_marker=None):
+    if fail_once_marker and _claim(fail_once_marker):
+        raise ValueError('pipeline could not be built')
+    return FakePipeline(log_path)
+
+
+def _read_log(log_path):
+    with open(log_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def _learners_on_shard(pool, shard, count):
+    learners = (f'learner_{index}' for index in range(1000))
+    return [learner_id for learner_id in learners if pool.shard_for(learner_id) == shard][:count]
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / 'evaluations.jsonl')
+
+
+def test_learner_evaluations_run_in_submission_order(log_path):
+    with LearnerShardedEvaluationPool(2, functools.partial(build_fake_pipeline, log_path)) as pool:
+        submitted = [(f'activity_{step}', f'learner_{index}') for step in range(4) for index in range(5)]
+        futures = [pool.submit(activity_id, learner_id, {}) for activity_id, learner_id in submitted]
+        results = [future.result(timeout=60) for future in futures]
+
+    assert all(isinstance(result, EvaluationResult) for result in results)
+    assert all(isinstance(phase, PhaseResult) for result in results for phase in result.pipeline_phases)
+    assert [(result.activity_id, result.learner_id) for result in results] == submitted
+
+    entries = _read_log(log_path)
+    for index in range(5):
+        runs = [entry for entry in entries if entry['learner_id'] == f'learner_{index}']
+        assert [entry['activity_id'] for entry in runs] == [f'activity_{step}' for step in range(4)]
+        # Never two evaluations of one learner at the same time
+        assert all(later['started'] >= earlier['finished'] for earlier, later in zip(runs, runs[1:]))
+
+
+@pytest.mark.parametrize('work_stealing', [True, False])
+def test_idle_worker_steals_from_busy_shard(log_path, work_stealing):
+    with LearnerShardedEvaluationPool(2, functools.partial(build_fake_pipeline, log_path),
+                                      work_stealing=work_stealing) as pool:
+        learners = _learners_on_shard(pool, 0, 4)
+        futures = [pool.submit(f'activity_{step}', learner_id, {'seconds': 0.1})
+                   for step in range(2) for learner_id in learners]
+        for future in futures:
+            future.result(timeout=60)
+        stats = pool.get_stats()
+
+    assert stats['completed'] == 8
+    if work_stealing:
+        assert stats['stolen'] == stats['workers'][1]['dispatched'] > 0
+        assert len({entry['pid'] for entry in _read_log(log_path)}) == 2
+    else:
+        assert stats['stolen'] == stats['workers'][1]['dispatched'] == 0
+        assert len({entry['pid'] for entry in _read_log(log_path)}) == 1
+
+
+def test_crashed_worker_fails_its_task_and_finishes_its_shard(log_path, tmp_path):
+    crash_marker = str(tmp_path / 'crashed')
+    with LearnerShardedEvaluationPool(2, functools.partial(build_fake_pipeline, log_path),
+                                      work_stealing=False) as pool:
+        learner_id = _learners_on_shard(pool, 0, 1)[0]
+        transcripts = [{}, {'crash_marker': crash_marker}, {}, {}]
+        futures = [pool.submit(f'activity_{step}', learner_id, transcript)
+                   for step, transcript in enumerate(transcripts)]
+
+        assert futures[0].result(timeout=60).activity_id == 'activity_0'
+        with pytest.raises(RuntimeError, match='died during evaluation'):
+            futures[1].result(timeout=60)
+        assert [future.result(timeout=60).activity_id for future in futures[2:]] == ['activity_2', 'activity_3']
+        stats = pool.get_stats()
+
+    assert (stats['completed'], stats['failed']) == (3, 1)
+    runs = _read_log(log_path)
+    assert [entry['activity_id'] for entry in runs] == ['activity_0', 'activity_2', 'activity_3']
+    # The restarted worker picked up the rest of the shard
+    assert runs[0]['pid'] != runs[1]['pid']
+
+
+@pytest.mark.parametrize('work_stealing', [True, False])
+def test_shard_of_worker_that_cannot_start_is_taken_over(log_path, tmp_path, work_stealing):
+    factory = functools.partial(build_fake_pipeline, log_path, fail_once_marker=str(tmp_path / 'init_failed'))
+    with LearnerShardedEvaluationPool(2, factory, work_stealing=work_stealing) as pool:
+        learners = _learners_on_shard(pool, 0, 2) + _learners_on_shard(pool, 1, 2)
+        futures = [pool.submit(f'activity_{step}', learner_id, {})
+                   for step in range(3) for learner_id in learners]
+        results = [future.result(timeout=60) for future in futures]
+        stats = pool.get_stats()
+
+    assert len(results) == stats['completed'] == 12
+    assert len({entry['pid'] for entry in _read_log(log_path)}) == 1
+
+
+def test_every_worker_failing_resolves_the_queue(tmp_path):
+    with LearnerShardedEvaluationPool(1, functools.partial(build_fake_pipeline, str(tmp_path / 'log'),
+                                                           str(tmp_path / 'init_failed'))) as pool:
+        future = pool.submit('activity_0', 'learner_0', {})
+        with pytest.raises(RuntimeError, match='could build a pipeline'):
+            future.result(timeout=60)
+
+
+def test_shutdown_without_drain_cancels_queued_evaluations(log_path):
+    pool = LearnerShardedEvaluationPool(1, functools.partial(build_fake_pipeline, log_path))
+    futures = [pool.submit(f'activity_{step}', 'learner_0', {'seconds': 0.3}) for step in range(4)]
+    deadline = time.monotonic() + 60
+    while not futures[0].running() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    pool.shutdown(drain=False)
+
+    assert futures[0].result(timeout=0).activity_id == 'activity_0'
+    assert all(future.cancelled() for future in futures[1:])
+    assert pool.get_stats(include_workers=False)['cancelled'] == 3
+    with pytest.raises(RuntimeError, match='after shutdown'):
+        pool.submit('activity_4', 'learner_0', {})
+
+
+def test_shutdown_with_drain_finishes_queued_evaluations(log_path):
+    pool = LearnerShardedEvaluationPool(2, functools.partial(build_fake_pipeline, log_path))
+    futures = [pool.submit(f'activity_{step}', f'learner_{step % 3}', {}) for step in range(9)]
+
+    pool.shutdown(drain=True)
+
+    assert all(future.done() and not future.cancelled() for future in futures)
+    assert len(_read_log(log_path)) == 9
@@ -0,0 +1,134 @@
+"""Debounced learner JSON mirrors: coalescing, flushing, and parity with the synchronous mirror"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from json_mirror import JSONMirrorWriter
+from learner_manager import ActivityRecord, LearnerProfile, SkillProgress
+
+
+class RecordingWriter:
+    def __init__(self, fail_for=()):
+        self.calls = []
+        self.fail_for = set(fail_for)
+        self.written = threading.Event()
+
+    def __call__(self, learner_id):
+        self.calls.append(learner_id)
+        self.written.set()
+        return learner_id not in self.fail_for
+
+
+def test_marks_within_the_interval_coalesce_into_one_write():
+    write = RecordingWriter()
+    writer = JSONMirrorWriter(write, flush_interval_seconds=0.2)
+    try:
+        for _ in range(10):
+            writer.mark_dirty('learner_a')
+        writer.mark_dirty('learner_b')
+        assert write.calls == [] and writer.pending == ['learner_a', 'learner_b']
+
+        assert write.written.wait(5)
+        deadline = time.monotonic() + 5
+        while writer.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sorted(write.calls) == ['learner_a', 'learner_b']
+        stats = writer.get_stats()
+        assert (stats['marked'], stats['written'], stats['pending']) == (11, 2, 0)
+    finally:
+        writer.close()
+
+
+def test_close_flushes_pending_mirrors_and_later_marks_write_synchronously():
+    write = RecordingWriter(fail_for={'broken'})
+    writer = JSONMirrorWriter(write, flush_interval_seconds=60)
+    writer.mark_dirty('learner_a')
+    writer.mark_dirty('broken')
+
+    writer.close()
+
+    assert sorted(write.calls) == ['broken', 'learner_a']
+    assert writer.get_stats()['failed'] == 1
+    writer.mark_dirty('learner_a')
+    assert write.calls[-1] == 'learner_a'
+
+
+def test_zero_interval_writes_on_every_mark():
+    write = RecordingWriter()
+    writer = JSONMirrorWriter(write, flush_interval_seconds=0)
+    writer.mark_dirty('learner_a')
+    writer.mark_dirty('learner_a')
+    assert write.calls == ['learner_a', 'learner_a']
+    assert writer._thread is None
+
+
+def synchronous_mirror(learner_manager, learner_id):
+    """sync_learner_history_to_json's document as it was built: through the object-level getters"""
+    profile = learner_manager.get_learner(learner_id)
+    activity_list = [activity.activity_id for activity in learner_manager.get_learner_activities(learner_id)]
+    return {
+        'learner_id': learner_id,
+        'created': profile.created,
+        'last_updated': profile.last_updated,
+        'profile': {
+            'name': profile.name, 'email': profile.email, 'enrollment_date': profile.enrollment_date,
+            'status': profile.status, 'background': profile.background,
+            'experience_level': profile.experience_level
+        },
+        'activities': activity_list,
+        'skill_progress': {skill_id: {
+            'skill_name': progress.skill_name, 'cumulative_score': progress.cumulative_score,
+            'total_adjusted_evidence': progress.total_adjusted_evidence, 'activity_count': progress.activity_count,
+            'gate_1_status': progress.gate_1_status, 'gate_2_status': progress.gate_2_status,
+            'overall_status': progress.overall_status, 'last_activity_date': progress.last_updated,
+            'activities': []
+        } for skill_id, progress in learner_manager.get_skill_progress(learner_id).items()},
+        'competency_progress': {},
+        'metadata': {'total_activities': len(activity_list), 'total_time_minutes': 0,
+                     'last_activity_date': profile.last_updated}
+    }
+
+
+@pytest.fixture
+def learner(learner_manager):
+    learner_manager.create_learner(LearnerProfile(
+        learner_id='learner', name='Mirror Learner', email='mirror@test.local',
+        enrollment_date='2025-01-01T00:00:00+00:00', background='Analyst', experience_level='intermediate'))
+    return 'learner'
+
+
+def test_learner_writes_are_mirrored_once_after_the_burst(learner_manager, learner, monkeypatch):
+    learner_manager.json_mirror.flush_interval_seconds = 60
+    syncs = []
+    sync = learner_manager.sync_learner_history_to_json
+
+    def counting_sync(learner_id):
+        syncs.append(learner_id)
+        return sync(learner_id)
+
+    monkeypatch.setattr(learner_manager.json_mirror, 'write_mirror', counting_sync)
+
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for day in range(5):
+        learner_manager.add_activity_record(ActivityRecord(
+            activity_id=f'activity_{day}', learner_id=learner, timestamp=(start + timedelta(days=day)).isoformat(),
+            evaluation_result={'score': day / 10}, activity_transcript={'turns': [f'turn {day}']}, scored=True))
+        learner_manager.update_skill_progress(SkillProgress(
+            skill_id=f'S00{day % 2 + 1}', learner_id=learner, skill_name='Skill', cumulative_score=day / 10,
+            total_adjusted_evidence=float(day), activity_count=day + 1, gate_1_status='developing',
+            gate_2_status='needs_improvement', overall_status='needs_improvement',
+            last_updated=(start + timedelta(days=day)).isoformat()))
+    mirror_path = os.path.join(learner_manager.json_mirror_dir, 'learner_history.json')
+    assert syncs == [] and not os.path.exists(mirror_path)
+
+    learner_manager.json_mirror.close()
+
+    assert syncs == [learner]
+    with open(mirror_path, encoding='utf-8') as f:
+        assert json.load(f) == synchronous_mirror(learner_manager, learner)
+    assert os.listdir(learner_manager.json_mirror_dir) == ['learner_history.json']
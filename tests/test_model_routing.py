@@ -0,0 +1,99 @@
+"""Model tier routing: policy rules and the transcript size the pipeline routes on"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from context_compactor import estimate_tokens
+from learner_manager import LearnerProfile
+from model_router import ModelRouter
+from pipeline_benchmark import build_synthetic_transcript
+
+
+def _transcript(activity, response_content):
+    transcript = build_synthetic_transcript(activity, 0)
+    transcript['student_engagement']['component_responses'][0]['response_content'] = response_content
+    return transcript
+
+
+def _conversation(turns, words_per_turn):
+    return json.dumps([
+        {'role': 'user' if index % 2 else 'assistant',
+         'content': ' '.join(f'point{index}_{word}' for word in range(words_per_turn)),
+         'timestamp': '2025-07-29T13:02:51Z'}
+        for index in range(turns)
+    ])
+
+
+@pytest.fixture
+def activities(config_manager):
+    from activity_manager import ActivityManager
+    return ActivityManager(config_manager).load_activities()
+
+
+def test_rules_pick_tiers_in_order(config_manager, activities):
+    router = ModelRouter(config_manager)
+    cr = activities['user_requirements_clarification_cr']
+    rp = activities['stakeholder_conflict_resolution_rp']
+    br = activities['requirements_prioritization_dilemma_br']
+
+    assert router.route('combined_evaluation', cr, transcript_tokens=200).tier == 'economy'
+    assert router.route('combined_evaluation', cr, transcript_tokens=1501).tier == 'standard'
+    assert router.route('combined_evaluation', rp, transcript_tokens=500).tier == 'standard'
+    decision = router.route('combined_evaluation', rp, transcript_tokens=4000)
+    assert (decision.tier, decision.rule) == ('premium', 'long_interactive_transcripts')
+    assert router.route('intelligent_feedback', br, transcript_tokens=5000).tier == 'economy'
+    assert decision.provider_overrides['anthropic']['default_model'] == 'claude-opus-4'
+
+
+def test_disabled_policy_does_not_route(config_manager, activities, monkeypatch):
+    settings = dict(config_manager.get_config('llm_settings'))
+    settings['model_tiering'] = {**settings['model_tiering'], 'enabled': False}
+    router = ModelRouter(config_manager)
+    monkeypatch.setattr(router, '_policy', lambda: settings['model_tiering'])
+    assert router.route('combined_evaluation', activities['user_requirements_clarification_cr']) is None
+
+
+def test_short_constructed_response_routes_to_economy(make_pipeline, activities):
+    pipeline = make_pipeline()
+    activity = activities['user_requirements_clarification_cr']
+    response = 'Users cannot find files quickly, so I would ask which searches fail most often. ' * 5
+    transcript = _transcript(activity, response)
+
+    decision = pipeline._route_model_tier('combined_evaluation', activity, {'activity_transcript': transcript})
+
+    # The activity_generation_output boilerplate alone is well over the 1500 token limit
+    assert estimate_tokens(transcript) > 1500
+    assert decision.transcript_tokens == estimate_tokens(response)
+    assert decision.tier == 'economy'
+
+
+def test_long_role_play_routes_on_size_before_compaction(make_pipeline, activities):
+    pipeline = make_pipeline()
+    activity = activities['stakeholder_conflict_resolution_rp']
+    conversation = _conversation(turns=40, words_per_turn=60)
+    transcript = _transcript(activity, conversation)
+
+    compacted, report = pipeline.context_compactor._get_transcript_compactor().compact_transcript(transcript)
+    assert report.tokens_before >= 4000
+    assert report.tokens_after < report.tokens_before
+
+    decision = pipeline._route_model_tier('combined_evaluation', activity, {'activity_transcript': transcript})
+    assert decision.transcript_tokens == report.tokens_before
+    assert decision.tier == 'premium'
+
+
+def test_evaluation_records_routed_tier(make_pipeline, learner_manager, activities):
+    pipeline = make_pipeline()
+    learner_manager.create_learner(LearnerProfile(
+        learner_id='routing_learner', name='Routing Learner', email='routing@test.local',
+        enrollment_date=datetime.now(timezone.utc).isoformat()))
+    activity = activities['user_requirements_clarification_cr']
+    transcript = _transcript(activity, 'I would start by asking which tasks take the longest today.')
+
+    result = pipeline.evaluate_activity(activity.activity_id, 'routing_learner', transcript)
+
+    assert result.overall_success, result.error_summary
+    stats = pipeline.model_router.get_stats()
+    assert stats['combined_evaluation:economy']['calls'] == 1
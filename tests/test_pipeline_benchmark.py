@@ -0,0 +1,44 @@
+"""Throughput benchmark: runs on its own database and keeps its logs out of the shared ones"""
+
+import json
+
+from logger import get_logger
+from src.logger import get_logger as get_package_logger
+from pipeline_benchmark import run_throughput_benchmark
+
+
+def _line_count(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for _ in f)
+
+
+def test_benchmark_logs_stay_in_work_dir(config_manager, tmp_path):
+    pipeline_logger, package_logger = get_logger(), get_package_logger()
+    shared_files = [pipeline_logger.evaluation_log_file, package_logger.evaluation_log_file]
+    lines_before = [_line_count(path) for path in shared_files]
+
+    report = run_throughput_benchmark(config_manager, num_learners=2, concurrency=2,
+                                      evaluations_per_learner=2, work_dir=str(tmp_path),
+                                      keep_database=True, track_memory=False)
+
+    assert report['evaluations'] == 4
+    assert report['failed'] == 0, report['errors']
+    # The shared logs saw none of the synthetic traffic and are active again
+    assert [_line_count(path) for path in shared_files] == lines_before
+    assert [pipeline_logger.evaluation_log_file, package_logger.evaluation_log_file] == shared_files
+    with open(tmp_path / 'logs' / 'evaluations.jsonl', 'r', encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    # phase entries swap learner_id/activity_id, so look at both
+    learners = {value for entry in entries for value in (entry['learner_id'], entry['activity_id'])
+                if value.startswith('bench_learner_')}
+    assert learners == {'bench_learner_0001', 'bench_learner_0002'}
+
+
+def test_benchmark_removes_its_work_files(config_manager, tmp_path):
+    report = run_throughput_benchmark(config_manager, num_learners=1, concurrency=1,
+                                      evaluations_per_learner=1, work_dir=str(tmp_path),
+                                      track_memory=False)
+
+    assert report['succeeded'] == 1
+    assert report['database'] is None and report['logs'] is None
+    assert list(tmp_path.iterdir()) == []
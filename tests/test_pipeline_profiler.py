@@ -0,0 +1,96 @@
+"""Stage profiler: span arithmetic and the profile an evaluation returns"""
+
+import time
+from datetime import datetime, timezone
+
+from learner_manager import LearnerProfile
+from pipeline_benchmark import MockLLMClient, build_synthetic_transcript
+from pipeline_profiler import NullProfiler, PipelineProfiler, ProfileAggregator
+
+ACTIVITY = 'user_requirements_clarification_cr'
+
+
+def test_nested_spans_split_self_time():
+    profiler = PipelineProfiler()
+    with profiler.span('outer'):
+        time.sleep(0.02)
+        with profiler.span('outer.call', 'network'):
+            time.sleep(0.03)
+        with profiler.span('outer.query', 'sqlite'):
+            time.sleep(0.01)
+    with profiler.span('other', 'bogus'):
+        pass
+
+    profile = profiler.to_dict()
+    spans = {span['name']: span for span in profile['spans']}
+    assert [span['name'] for span in profile['spans']] == ['outer', 'outer.call', 'outer.query', 'other']
+    assert (spans['outer.call']['depth'], spans['outer.call']['parent']) == (1, 'outer')
+    assert spans['other']['category'] == 'python'
+    outer = spans['outer']
+    children = spans['outer.call']['duration_ms'] + spans['outer.query']['duration_ms']
+    assert abs(outer['self_ms'] - (outer['duration_ms'] - children)) < 0.01
+    assert outer['self_ms'] >= 20 and spans['outer.call']['self_ms'] >= 30
+    assert profile['by_category']['network'] == spans['outer.call']['self_ms']
+    assert profile['by_category']['sqlite'] == spans['outer.query']['self_ms']
+    # Categories add up to the wall time, glue code included
+    assert abs(sum(profile['by_category'].values()) - profile['total_ms']) < 0.05
+
+
+def test_null_profiler_records_nothing():
+    profiler = NullProfiler()
+    with profiler.span('anything', 'network'):
+        pass
+    assert profiler.to_dict() is None and profiler.spans == []
+
+
+def test_aggregator_averages_profiles():
+    aggregator = ProfileAggregator()
+    assert aggregator.summary() == {'evaluations': 0}
+    for total in (10.0, 30.0):
+        aggregator.add({'total_ms': total, 'by_category': {'network': total / 2, 'sqlite': 0.0, 'python': total / 2},
+                        'spans': [{'name': 'combined.llm_call', 'category': 'network', 'duration_ms': total / 2,
+                                   'self_ms': total / 2}]})
+    aggregator.add(None)
+
+    summary = aggregator.summary()
+    assert summary['evaluations'] == 2 and summary['avg_total_ms'] == 20.0
+    assert summary['category_share']['network'] == 0.5
+    assert summary['stages']['combined.llm_call'] == {
+        'count': 2, 'total_ms': 20.0, 'self_ms': 20.0, 'max_ms': 15.0, 'category': 'network', 'avg_ms': 10.0}
+
+
+def _evaluate(pipeline, learner_manager, learner_id, profile):
+    learner_manager.create_learner(LearnerProfile(
+        learner_id=learner_id, name=learner_id, email=f'{learner_id}@test.local',
+        enrollment_date=datetime.now(timezone.utc).isoformat()))
+    activity = pipeline.activity_manager.load_activities()[ACTIVITY]
+    return pipeline.evaluate_activity(ACTIVITY, learner_id, build_synthetic_transcript(activity, 0), profile=profile)
+
+
+def test_profiled_evaluation_matches_unprofiled(make_pipeline, learner_manager):
+    # Same mock responses for both runs
+    plain = _evaluate(make_pipeline(MockLLMClient(latency_ms=20)), learner_manager, 'plain_learner', profile=False)
+    pipeline = make_pipeline(MockLLMClient(latency_ms=20))
+    profiled = _evaluate(pipeline, learner_manager, 'profiled_learner', profile=True)
+
+    assert plain.overall_success and profiled.overall_success
+    assert plain.profile is None
+    plain_phases = {phase.phase: phase for phase in plain.pipeline_phases}
+    profiled_phases = {phase.phase: phase for phase in profiled.pipeline_phases}
+    assert plain_phases.keys() == profiled_phases.keys()
+    assert plain_phases['combined_evaluation'].result == profiled_phases['combined_evaluation'].result
+    assert plain_phases['scoring'].result['activity_score'] == profiled_phases['scoring'].result['activity_score']
+
+    spans = {span['name'] for span in profiled.profile['spans']}
+    assert {'load.activity', 'load.learner', 'combined.llm_call', 'combined.parse', 'scoring.score_activity',
+            'intelligent_feedback.llm_call', 'save.evaluation_record', 'db.connection'} <= spans
+    by_category = profiled.profile['by_category']
+    # Two mock LLM calls of 20 ms each
+    assert by_category['network'] >= 40
+    assert by_category['sqlite'] > 0
+
+    stats = pipeline.get_pipeline_statistics()['profiling']
+    assert stats['evaluations'] == 1
+    assert stats['stages']['combined.llm_call']['count'] == 1
+    # The learner manager is detached again after the evaluation
+    assert learner_manager.profiler is None
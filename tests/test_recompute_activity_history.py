@@ -0,0 +1,227 @@
+"""Resumable recomputation of activity history (recalculate_cumulative.py)"""
+
+import math
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import recalculate_cumulative
+from learner_manager import ActivityRecord, LearnerProfile
+from scoring_engine import ScoringEngine
+
+LEARNERS = ('learner_a', 'learner_b')
+SKILLS = ('S001', 'S002', 'S003')
+STEPS = 9
+
+
+def _overall_score(learner_index, step):
+    return round(0.35 + 0.07 * ((step * 5 + learner_index) % 9), 2)
+
+
+def _validity_modifier(step):
+    return 0.8 if step % 4 == 0 else 1.0
+
+
+@pytest.fixture
+def scoring_engine(config_manager, learner_manager):
+    """Nine activities over three skills per learner, scored and recorded like the pipeline does"""
+    engine = ScoringEngine(config_manager, learner_manager)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for learner_index, learner_id in enumerate(LEARNERS):
+        learner_manager.create_learner(LearnerProfile(
+            learner_id=learner_id, name=learner_id, email=f'{learner_id}@test.local',
+            enrollment_date=start.isoformat()))
+        history = {'learner_id': learner_id, 'activities': []}
+        for step in range(STEPS):
+            timestamp = (start + timedelta(days=step)).isoformat()
+            overall_score = _overall_score(learner_index, step)
+            evaluation = {
+                'activity_id': f'activity_{step:02d}',
+                'learner_id': learner_id,
+                'target_skill': SKILLS[step % len(SKILLS)],
+                'aspect_scores': [],
+                'overall_score': overall_score,
+                'validity_modifier': _validity_modifier(step),
+                'target_evidence_volume': 1.5 + step % 3,
+                'activity_type': 'CR',
+                'activity_title': f'Activity {step}',
+                'timestamp': timestamp
+            }
+            result = engine.score_activity(history, evaluation)
+            engine.update_learner_progress(history, result, learner_manager)
+            learner_manager.add_activity_record(ActivityRecord(
+                activity_id=evaluation['activity_id'], learner_id=learner_id, timestamp=timestamp,
+                evaluation_result={'overall_success': True, 'pipeline_phases': [{
+                    'phase': 'combined_evaluation', 'success': True,
+                    'result': {'overall_score': overall_score, 'validity_modifier': _validity_modifier(step)}
+                }]},
+                activity_transcript={}, scored=True))
+    return engine
+
+
+def _history(learner_manager):
+    with learner_manager._get_db_connection() as conn:
+        rows = conn.execute('SELECT * FROM activity_history ORDER BY learner_id, skill_id, completion_timestamp')
+        return {(row['learner_id'], row['skill_id'], row['activity_id']): dict(row) for row in rows}
+
+
+def _execute(learner_manager, sql, params=()):
+    with learner_manager._get_db_connection() as conn:
+        conn.execute(sql, params)
+        conn.commit()
+
+
+def _recomputed_history(scoring_engine, learner_manager):
+    """History after a full rescore: the fixed point the tests corrupt and restore"""
+    assert scoring_engine.recompute_activity_history(rescore=True) is not None
+    return _history(learner_manager)
+
+
+def _assert_history_matches(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, row in expected.items():
+        for column in ('performance_score', 'target_evidence_volume', 'validity_modifier',
+                       'adjusted_evidence_volume', 'cumulative_performance', 'cumulative_evidence',
+                       'decay_adjusted_evidence_volume'):
+            assert math.isclose(actual[key][column], row[column], abs_tol=1e-9), (key, column)
+
+
+def _assert_prefix_recalculation(scoring_engine, rows):
+    """Each row's cumulative values equal the old per-prefix recalculation"""
+    for learner_id in LEARNERS:
+        for skill_id in SKILLS:
+            group = [row for row in rows if (row['learner_id'], row['skill_id']) == (learner_id, skill_id)]
+            activities = [{'performance_score': row['performance_score'],
+                           'target_evidence': row['target_evidence_volume'],
+                           'validity_modifier': row['validity_modifier']} for row in group]
+            for index, row in enumerate(group):
+                prefix = activities[:index + 1]
+                assert math.isclose(row['cumulative_performance'],
+                                    scoring_engine._calculate_cumulative_score(prefix), abs_tol=1e-9)
+                assert math.isclose(row['cumulative_evidence'],
+                                    scoring_engine._calculate_total_evidence(prefix), abs_tol=1e-9)
+
+
+def test_recompute_matches_prefix_recalculation(scoring_engine, learner_manager):
+    _recomputed_history(scoring_engine, learner_manager)
+    _execute(learner_manager, 'UPDATE activity_history SET cumulative_performance = 0, cumulative_evidence = 0')
+
+    report = scoring_engine.recompute_activity_history(chunk_size=2)
+
+    assert report['rows_updated'] == report['rows_scanned'] == len(LEARNERS) * STEPS
+    _assert_prefix_recalculation(scoring_engine, list(_history(learner_manager).values()))
+
+
+def test_dry_run_reports_differences_without_writing(scoring_engine, learner_manager):
+    expected = _recomputed_history(scoring_engine, learner_manager)
+    _execute(learner_manager, "UPDATE activity_history SET cumulative_performance = 0.01 "
+                              "WHERE learner_id = 'learner_b' AND skill_id = 'S002'")
+    corrupted = _history(learner_manager)
+
+    report = scoring_engine.recompute_activity_history(dry_run=True)
+
+    assert report['rows_changed'] == 3 and report['rows_updated'] == 0
+    assert {(d['learner_id'], d['skill_id'], d['activity_id']) for d in report['differences']} == {
+        ('learner_b', 'S002', 'activity_01'), ('learner_b', 'S002', 'activity_04'),
+        ('learner_b', 'S002', 'activity_07')}
+    for difference in report['differences']:
+        key = (difference['learner_id'], difference['skill_id'], difference['activity_id'])
+        assert list(difference['differences']) == ['cumulative_performance']
+        stored, recomputed = difference['differences']['cumulative_performance']
+        assert stored == 0.01
+        assert math.isclose(recomputed, expected[key]['cumulative_performance'], abs_tol=1e-9)
+    assert _history(learner_manager) == corrupted
+    assert learner_manager.get_maintenance_checkpoint('history_recompute:*') is None
+
+
+def test_resume_after_interrupt(scoring_engine, learner_manager):
+    expected = _recomputed_history(scoring_engine, learner_manager)
+    _execute(learner_manager, 'UPDATE activity_history SET cumulative_performance = 0, cumulative_evidence = 0')
+
+    def interrupt(report):
+        raise RuntimeError('interrupted')
+
+    assert scoring_engine.recompute_activity_history(chunk_size=2, progress_callback=interrupt) is None
+    checkpoint = learner_manager.get_maintenance_checkpoint('history_recompute:*')
+    assert checkpoint['position'] == ['learner_a', 'S002'] and checkpoint['processed'] == 2
+
+    chunks = []
+    report = scoring_engine.recompute_activity_history(chunk_size=2, progress_callback=chunks.append)
+
+    assert report['resumed_from'] == ['learner_a', 'S002']
+    # Only the four groups after the checkpoint were read again
+    assert report['rows_scanned'] == 4 * 3
+    assert [chunk['groups_processed'] for chunk in chunks] == [4, 6]
+    assert learner_manager.get_maintenance_checkpoint('history_recompute:*') is None
+    _assert_history_matches(_history(learner_manager), expected)
+
+
+def test_rescore_restores_scores_from_activity_records(scoring_engine, learner_manager):
+    before = _history(learner_manager)
+    report = scoring_engine.recompute_activity_history(['learner_a'], rescore=True)
+
+    assert report['rows_updated'] == STEPS
+    rows = _history(learner_manager)
+    for (learner_id, skill_id, activity_id), row in rows.items():
+        step = int(activity_id.split('_')[1])
+        if learner_id == 'learner_a':
+            assert row['performance_score'] == _overall_score(0, step)
+            assert row['validity_modifier'] == _validity_modifier(step)
+            assert row['target_evidence_volume'] == 1.5 + step % 3
+            assert math.isclose(row['adjusted_evidence_volume'],
+                                (1.5 + step % 3) * _validity_modifier(step), abs_tol=1e-9)
+        else:
+            assert row == before[(learner_id, skill_id, activity_id)]
+    _assert_prefix_recalculation(scoring_engine, [row for key, row in rows.items() if key[0] == 'learner_a'])
+
+    # Rescoring again finds nothing left to change
+    assert scoring_engine.recompute_activity_history(['learner_a'], rescore=True)['rows_changed'] == 0
+
+
+def test_cli_dry_run_prints_diff(scoring_engine, learner_manager, monkeypatch, capsys):
+    before = _history(learner_manager)
+    monkeypatch.setenv('DATABASE_PATH', learner_manager.db_path)
+    monkeypatch.setattr(sys, 'argv', ['recalculate_cumulative.py', '--learner', 'learner_b',
+                                      '--rescore', '--dry-run', '--show', '100'])
+
+    assert recalculate_cumulative.main() == 0
+
+    output = capsys.readouterr().out
+    assert 'learner_b / S001 / activity_03' in output
+    assert f'performance_score: stored=0.0 recomputed={_overall_score(1, 3)}' in output
+    assert '9 activities would change (dry run, nothing written)' in output
+    assert 'learner_a' not in output
+    assert _history(learner_manager) == before
+
+
+def test_cli_resumes_interrupted_run(scoring_engine, learner_manager, monkeypatch, capsys):
+    expected = _recomputed_history(scoring_engine, learner_manager)
+    _execute(learner_manager, 'UPDATE activity_history SET cumulative_performance = 0, cumulative_evidence = 0')
+    monkeypatch.setenv('DATABASE_PATH', learner_manager.db_path)
+    monkeypatch.setattr(sys, 'argv', ['recalculate_cumulative.py', '--chunk-size', '4'])
+
+    write_chunk = recalculate_cumulative.LearnerManager.bulk_update_activity_history_derived
+    calls = []
+
+    def fail_second_chunk(self, *args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError('disk went away')
+        return write_chunk(self, *args, **kwargs)
+
+    monkeypatch.setattr(recalculate_cumulative.LearnerManager, 'bulk_update_activity_history_derived',
+                        fail_second_chunk)
+    assert recalculate_cumulative.main() == 1
+    assert 'Recalculation failed' in capsys.readouterr().out
+
+    monkeypatch.setattr(recalculate_cumulative.LearnerManager, 'bulk_update_activity_history_derived',
+                        write_chunk)
+    assert recalculate_cumulative.main() == 0
+
+    output = capsys.readouterr().out
+    assert 'Resumed after learner_b / S001' in output
+    # The first chunk (four learner/skill groups) was already committed
+    assert 'Updated 6 activities' in output
+    _assert_history_matches(_history(learner_manager), expected)
+
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Property tests for the single-pass evidence decay in the scoring engine.
+
+Random histories are scored with ScoringEngine._calculate_cumulative_score and
+evidence_decay_factors and compared against the nested-loop implementation
+they replaced and docs/scoring_algorithm_reference.py.
+"""
+
+import sys
+import os
+import math
+import random
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'docs'))
+
+import pytest
+
+from src.config_manager import ConfigManager
+from src.scoring_engine import ScoringEngine, evidence_decay_factors
+from scoring_algorithm_reference import calculate_cumulative_score as reference_cumulative_score
+
+HISTORIES = 500
+REL_TOL = 1e-9
+
+
+def nested_loop_cumulative_score(activities, decay_factor, prior_mean):
+    """_calculate_cumulative_score as it was before the running sum"""
+    if not activities:
+        return prior_mean
+
+    weighted_sum = 0.0
+    total_weight = 0.0
+    for i, activity in enumerate(activities):
+        adjusted_evidence = activity.get('target_evidence', 0.0) * activity.get('validity_modifier', 1.0)
+        if i == 0:
+            evidence_based_decay = 1.0
+        else:
+            evidence_accumulated_since = 0.0
+            for j in range(i):
+                older_activity = activities[j]
+                evidence_accumulated_since += (older_activity.get('target_evidence', 0.0) *
+                                               older_activity.get('validity_modifier', 1.0))
+            evidence_based_decay = decay_factor ** evidence_accumulated_since
+        weight = adjusted_evidence * evidence_based_decay
+        weighted_sum += activity.get('performance_score', 0.0) * weight
+        total_weight += weight
+
+    if total_weight == 0:
+        return prior_mean
+    return weighted_sum / total_weight
+
+
+def nested_loop_decay_factors(chronological_evidence, decay_factor):
+    """recalculate_all_activities_with_new_decay's per-row sums, oldest first"""
+    factors = []
+    for i in range(len(chronological_evidence)):
+        evidence_accumulated_since = 0.0
+        for j in range(i + 1, len(chronological_evidence)):
+            evidence_accumulated_since += chronological_evidence[j]
+        if i == len(chronological_evidence) - 1:
+            factors.append(1.0)
+        else:
+            factors.append(decay_factor ** evidence_accumulated_since)
+    return factors
+
+
+def random_activity(rng):
+    activity = {'performance_score': rng.random()}
+    # Older records may lack either field; zero evidence and validity occur in practice
+    if rng.random() < 0.9:
+        activity['target_evidence'] = rng.choice([0.0, rng.uniform(0.0, 5.0)])
+    if rng.random() < 0.9:
+        activity['validity_modifier'] = rng.choice([0.0, 1.0, rng.random()])
+    return activity
+
+
+def random_history(rng, max_length=40):
+    return [random_activity(rng) for _ in range(rng.randint(0, max_length))]
+
+
+@pytest.fixture(scope='module')
+def scoring_engine():
+    return ScoringEngine(ConfigManager())
+
+
+@pytest.mark.parametrize('decay_factor', [0.9, 0.5, 0.99, 1.0])
+def test_cumulative_score_matches_nested_loop(scoring_engine, decay_factor, monkeypatch):
+    monkeypatch.setattr(scoring_engine, 'decay_factor', decay_factor)
+    rng = random.Random(f'cumulative-{decay_factor}')
+
+    for _ in range(HISTORIES):
+        activities = random_history(rng)
+        expected = nested_loop_cumulative_score(activities, decay_factor, scoring_engine.prior_mean)
+        actual = scoring_engine._calculate_cumulative_score(activities)
+        assert math.isclose(actual, expected, rel_tol=REL_TOL, abs_tol=1e-12), activities
+
+
+@pytest.mark.parametrize('decay_factor', [0.9, 0.5, 0.99])
+def test_cumulative_score_matches_reference(scoring_engine, decay_factor, monkeypatch):
+    # With one unit of adjusted evidence per activity, evidence-based decay is the
+    # reference's position-based decay up to a constant factor that cancels out
+    monkeypatch.setattr(scoring_engine, 'decay_factor', decay_factor)
+    rng = random.Random(f'reference-{decay_factor}')
+
+    for _ in range(HISTORIES):
+        scores = [rng.random() for _ in range(rng.randint(1, 40))]
+        activities = [{'performance_score': score, 'target_evidence': 1.0, 'validity_modifier': 1.0}
+                      for score in scores]
+        expected, _ = reference_cumulative_score(
+            [{'score': score, 'target_evidence': 1.0, 'validity_modifier': 1.0} for score in scores],
+            decay_factor
+        )
+        actual = scoring_engine._calculate_cumulative_score(activities)
+        assert math.isclose(actual, expected, rel_tol=REL_TOL, abs_tol=1e-12), scores
+
+
+@pytest.mark.parametrize('decay_factor', [0.9, 0.5, 0.99, 1.0])
+def test_decay_factors_match_nested_loop(decay_factor):
+    rng = random.Random(f'factors-{decay_factor}')
+
+    for _ in range(HISTORIES):
+        chronological = [rng.choice([0.0, rng.uniform(0.0, 5.0)]) for _ in range(rng.randint(0, 40))]
+        expected = nested_loop_decay_factors(chronological, decay_factor)
+        # evidence_decay_factors walks newest first
+        actual = list(reversed(evidence_decay_factors(list(reversed(chronological)), decay_factor)))
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            assert math.isclose(a, e, rel_tol=REL_TOL), chronological
+
+
+def test_decay_factors_treat_missing_evidence_as_zero():
+    assert evidence_decay_factors([2.0, None, 1.0], 0.5) == [1.0, 0.25, 0.25]
+    assert evidence_decay_factors([], 0.9) == []
@@ -0,0 +1,122 @@
+"""What-if simulator: scenarios against the scalar ScoringEngine under the same settings, read-only"""
+
+import copy
+import hashlib
+import random
+import sqlite3
+import sys
+
+import pytest
+
+import simulate_scoring
+from cohort_scoring import CohortScoringEngine, OVERALL_STATUSES, STATUS_LEVELS
+from learner_manager import LearnerManager
+from scoring_engine import ScoringEngine
+from scoring_simulator import ScoringSimulator
+
+SKILLS = ('S001', 'S002', 'S003', 'S004')
+
+
+@pytest.fixture
+def engine(config_manager, learner_manager, score_activities):
+    engine = ScoringEngine(config_manager, learner_manager)
+    rng = random.Random(5)
+    for number in range(25):
+        # Learners differ in ability so every status occurs
+        ability = rng.random()
+        score_activities(engine, f'learner_{number:02d}', [
+            {'skill_id': rng.choice(SKILLS), 'score': round(min(1.0, max(0.0, rng.gauss(ability, 0.15))), 3),
+             'validity': rng.choice([1.0, 0.9, 0.7]), 'evidence': round(rng.uniform(1.0, 6.0), 2), 'day': day}
+            for day in range(rng.randint(2, 30))])
+    return engine
+
+
+def scalar_statuses(engine, learner_manager, simulator, decay_factor, performance_threshold, evidence_threshold):
+    """Statuses per learner/skill from the scalar ScoringEngine path with the scenario's settings"""
+    gate_1, gate_2 = simulator.threshold_ladder(performance_threshold, evidence_threshold)
+    scenario_engine = copy.copy(engine)
+    scenario_engine.decay_factor = decay_factor
+    scenario_engine.performance_thresholds = dict(zip(('at_level', 'approaching', 'developing'), gate_1))
+    scenario_engine.evidence_thresholds = dict(zip(('sufficient', 'approaching', 'developing'), gate_2))
+    rows = learner_manager.get_activity_history_for_scoring()
+    return CohortScoringEngine(scenario_engine, learner_manager)._score_rows_scalar(rows, engine.scoring_window)
+
+
+def _counts(scores, attribute, names):
+    return {name: sum(getattr(score, attribute) == name for score in scores.values()) for name in names}
+
+
+def test_scenarios_match_the_scalar_engine(engine, learner_manager):
+    simulator = ScoringSimulator(engine, learner_manager)
+    report = simulator.simulate(decay_factors=[0.995, 0.9, 0.8], performance_thresholds=[0.75, 0.6],
+                                evidence_thresholds=[30.0, 15.0])
+
+    assert report['cohort']['learners'] == 25
+    assert len(report['scenarios']) == 12
+    current = (engine.decay_factor, engine.performance_thresholds.get('at_level', 0.75),
+               engine.evidence_thresholds.get('sufficient', 30.0))
+    baseline = scalar_statuses(engine, learner_manager, simulator, *current)
+    assert report['cohort']['skill_pairs'] == len(baseline)
+    assert report['baseline']['status_counts'] == _counts(baseline, 'overall_status', OVERALL_STATUSES)
+
+    for scenario in report['scenarios']:
+        expected = scalar_statuses(engine, learner_manager, simulator, scenario['decay_factor'],
+                                   scenario['performance_threshold'], scenario['evidence_threshold'])
+        context = (scenario['decay_factor'], scenario['performance_threshold'], scenario['evidence_threshold'])
+        assert scenario['status_counts'] == _counts(expected, 'overall_status', OVERALL_STATUSES), context
+        assert scenario['gate_1_counts'] == _counts(expected, 'gate_1_status', STATUS_LEVELS), context
+        assert scenario['gate_2_counts'] == _counts(expected, 'gate_2_status', STATUS_LEVELS), context
+        assert scenario['mean_score'] == pytest.approx(
+            sum(score.cumulative_score for score in expected.values()) / len(expected), abs=1e-6)
+
+        levels = {key: OVERALL_STATUSES.index(score.overall_status) for key, score in expected.items()}
+        baseline_levels = {key: OVERALL_STATUSES.index(score.overall_status) for key, score in baseline.items()}
+        assert scenario['shifts'] == {
+            'changed': sum(levels[key] != baseline_levels[key] for key in levels),
+            'promoted': sum(levels[key] > baseline_levels[key] for key in levels),
+            'demoted': sum(levels[key] < baseline_levels[key] for key in levels),
+            'newly_mastered': sum(levels[key] == 3 != baseline_levels[key] for key in levels),
+            'lost_mastery': sum(baseline_levels[key] == 3 != levels[key] for key in levels)
+        }, context
+
+    # The grid actually moves statuses around
+    assert any(scenario['shifts']['changed'] for scenario in report['scenarios'])
+    assert len({tuple(scenario['status_counts'].values()) for scenario in report['scenarios']}) > 1
+
+
+def test_threshold_ladder_keeps_offsets_and_ratios(engine, learner_manager):
+    gate_1, gate_2 = ScoringSimulator(engine, learner_manager).threshold_ladder(0.8, 15.0)
+    # Default cut-offs: 0.75 / 0.65 / 0.50 and 30 / 20 / 10
+    assert gate_1 == pytest.approx((0.8, 0.7, 0.55))
+    assert gate_2 == pytest.approx((15.0, 10.0, 5.0))
+
+
+def _database_digest(path):
+    digest = hashlib.sha256()
+    for suffix in ('', '-wal'):
+        try:
+            with open(path + suffix, 'rb') as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            pass
+    return digest.hexdigest()
+
+
+def test_cli_never_writes_to_the_database(engine, learner_manager, monkeypatch, capsys):
+    before = _database_digest(learner_manager.db_path)
+    monkeypatch.setenv('DATABASE_PATH', learner_manager.db_path)
+    monkeypatch.setattr(sys, 'argv', ['simulate_scoring.py', '--decay', '0.9', '0.99', '--performance', '0.7'])
+
+    assert simulate_scoring.main() == 0
+
+    output = capsys.readouterr().out
+    assert 'Cohort: 25 learners' in output and '(current)' in output
+    assert _database_digest(learner_manager.db_path) == before
+
+    reader = LearnerManager(engine.config_manager, read_only=True, db_path=learner_manager.db_path)
+    try:
+        with reader._get_db_connection() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute('DELETE FROM activity_history')
+    finally:
+        reader._connections.close_all()
@@ -0,0 +1,165 @@
+"""Scoring an activity as one unit of work against rescoring every skill from its history"""
+
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from learner_manager import LearnerManager, LearnerProfile
+from scoring_engine import ScoringEngine
+
+SKILLS = ('S001', 'S002', 'S003', 'S004')
+LEARNER_ID = 'learner'
+PROGRESS_COLUMNS = ('cumulative_score', 'total_adjusted_evidence', 'activity_count', 'gate_1_status',
+                    'gate_2_status', 'overall_status', 'confidence_interval_lower',
+                    'confidence_interval_upper', 'standard_error')
+
+
+def _evaluations(seed, count=20):
+    """Activities targeting one to three skills each"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [{
+        'activity_id': f'activity_{day:03d}',
+        'learner_id': LEARNER_ID,
+        'timestamp': (start + timedelta(days=day)).isoformat(),
+        'activity_generation_output': {'skills_targeted': rng.sample(SKILLS, rng.randint(1, 3))},
+        'evaluation_results': {'phase_1_combined_evaluation': {
+            'overall_score': round(rng.random(), 3),
+            'validity_modifier': rng.choice([1.0, 0.9, 0.6]),
+            'target_evidence_volume': round(rng.uniform(0.5, 4.0), 2)
+        }}
+    } for day in range(count)]
+
+
+def _score(engine, learner_manager, evaluations):
+    if learner_manager.get_learner(LEARNER_ID) is None:
+        learner_manager.create_learner(LearnerProfile(
+            learner_id=LEARNER_ID, name='Learner', email='learner@test.local',
+            enrollment_date=datetime(2025, 1, 1, tzinfo=timezone.utc).isoformat()))
+    history = {'learner_id': LEARNER_ID, 'activities': []}
+    results = []
+    for evaluation in evaluations:
+        result = engine.score_activity(history, evaluation)
+        engine.update_learner_progress(history, result, learner_manager)
+        results.append(result)
+    return results
+
+
+def _tables(learner_manager):
+    with learner_manager._get_db_connection() as conn:
+        history = [dict(row) for row in conn.execute(
+            'SELECT * FROM activity_history ORDER BY skill_id, completion_timestamp')]
+        progress = {row['skill_id']: dict(row) for row in conn.execute('SELECT * FROM skill_progress')}
+    for row in history:
+        del row['id']
+    return history, progress
+
+
+def _assert_rows_match(actual, expected, context):
+    assert actual.keys() == expected.keys(), context
+    for column, value in expected.items():
+        if isinstance(value, float):
+            assert math.isclose(actual[column], value, rel_tol=1e-9, abs_tol=1e-12), (context, column)
+        else:
+            assert actual[column] == value, (context, column)
+
+
+@pytest.fixture
+def reference_manager(config_manager, tmp_path):
+    manager = LearnerManager(config_manager, db_path=str(tmp_path / 'reference.db'))
+    manager.json_mirror_dir = str(tmp_path / 'reference_learners')
+    yield manager
+    manager.json_mirror.close()
+    manager._connections.close_all()
+
+
+@pytest.mark.parametrize('window', [None, 5])
+def test_unit_of_work_matches_rescoring_from_history(config_manager, learner_manager, reference_manager,
+                                                     monkeypatch, window):
+    engine = ScoringEngine(config_manager, learner_manager)
+    engine.max_activities_for_scoring = window
+    reference = ScoringEngine(config_manager, reference_manager)
+    reference.max_activities_for_scoring = window
+    # Every skill of every activity rescored from its full history
+    monkeypatch.setattr(reference, '_next_scoring_state', lambda *args, **kwargs: None)
+
+    evaluations = _evaluations(seed=3)
+    results = _score(engine, learner_manager, evaluations)
+    expected_results = _score(reference, reference_manager, evaluations)
+
+    for result, expected in zip(results, expected_results):
+        assert result.skill_scores.keys() == expected.skill_scores.keys()
+        assert result.progress_persisted
+        for skill_id, score in expected.skill_scores.items():
+            assert math.isclose(result.skill_scores[skill_id].cumulative_score, score.cumulative_score, rel_tol=1e-9)
+
+    history, progress = _tables(learner_manager)
+    expected_history, expected_progress = _tables(reference_manager)
+    assert len(history) == len(expected_history) == sum(
+        len(evaluation['activity_generation_output']['skills_targeted']) for evaluation in evaluations)
+    for row, expected in zip(history, expected_history):
+        _assert_rows_match(row, expected, (row['activity_id'], row['skill_id']))
+    assert progress.keys() == expected_progress.keys()
+    for skill_id, expected in expected_progress.items():
+        _assert_rows_match({column: progress[skill_id][column] for column in PROGRESS_COLUMNS},
+                           {column: expected[column] for column in PROGRESS_COLUMNS}, skill_id)
+    if window is None:
+        assert engine.rebuild_skill_scoring_state(LEARNER_ID, verify_only=True)['mismatches'] == []
+
+
+def test_incremental_activity_reads_no_history_and_writes_once(config_manager, learner_manager, monkeypatch):
+    engine = ScoringEngine(config_manager, learner_manager)
+    engine.max_activities_for_scoring = None
+    evaluations = _evaluations(seed=4)
+    _score(engine, learner_manager, evaluations[:-1])
+
+    calls = {'history_reads': 0, 'applies': [], 'progress_writes': 0, 'mirror_marks': 0}
+    read_history = learner_manager.get_activity_history_chronological
+    apply_updates = learner_manager.apply_scoring_updates
+    mark_dirty = learner_manager.json_mirror.mark_dirty
+
+    def counting_read(*args, **kwargs):
+        calls['history_reads'] += 1
+        return read_history(*args, **kwargs)
+
+    def counting_apply(learner_id, history_records, *args, **kwargs):
+        calls['applies'].append(len(history_records))
+        return apply_updates(learner_id, history_records, *args, **kwargs)
+
+    def counting_progress_write(progress):
+        calls['progress_writes'] += 1
+
+    def counting_mark(learner_id):
+        calls['mirror_marks'] += 1
+        return mark_dirty(learner_id)
+
+    monkeypatch.setattr(learner_manager, 'get_activity_history_chronological', counting_read)
+    monkeypatch.setattr(learner_manager, 'apply_scoring_updates', counting_apply)
+    monkeypatch.setattr(learner_manager, 'update_skill_progress', counting_progress_write)
+    monkeypatch.setattr(learner_manager.json_mirror, 'mark_dirty', counting_mark)
+
+    last = evaluations[-1]
+    last['activity_generation_output']['skills_targeted'] = ['S001', 'S002', 'S003']
+    _score(engine, learner_manager, [last])
+
+    assert calls == {'history_reads': 0, 'applies': [3], 'progress_writes': 0, 'mirror_marks': 1}
+    assert engine.rebuild_skill_scoring_state(LEARNER_ID, verify_only=True)['mismatches'] == []
+
+
+def test_failed_unit_of_work_writes_nothing(config_manager, learner_manager, monkeypatch):
+    engine = ScoringEngine(config_manager, learner_manager)
+    evaluations = _evaluations(seed=5, count=3)
+    _score(engine, learner_manager, evaluations[:2])
+    before = _tables(learner_manager)
+
+    def failing_write(cursor, progress):
+        raise RuntimeError('disk full')
+
+    # The last write of the transaction fails after the history rows and states
+    monkeypatch.setattr(learner_manager, '_write_skill_progress', failing_write)
+    result = engine.score_activity({'learner_id': LEARNER_ID}, evaluations[2])
+
+    assert not result.progress_persisted
+    assert _tables(learner_manager) == before
@@ -0,0 +1,131 @@
+"""Sliding scoring window: bounded reads, parity with scoring the last N activities of the full history"""
+
+import math
+import random
+
+import pytest
+
+from scoring_engine import ScoringEngine
+
+SKILLS = ('S001', 'S002')
+
+
+def _activities(seed, count=40):
+    rng = random.Random(seed)
+    return [{'skill_id': rng.choice(SKILLS), 'score': round(rng.random(), 3),
+             'validity': rng.choice([1.0, 0.9, 0.6]), 'evidence': round(rng.uniform(0.5, 4.0), 2),
+             'day': day} for day in range(count)]
+
+
+def _last_n_score(engine, learner_manager, learner_id, skill_id, window):
+    """Cumulative score, evidence, count and SEM over the last `window` rows of the full history"""
+    rows = learner_manager.get_activity_history_chronological(learner_id, skill_id)
+    activities = [{'performance_score': row['performance_score'], 'target_evidence': row['target_evidence_volume'],
+                   'validity_modifier': row['validity_modifier']} for row in rows]
+    if window:
+        activities = activities[-window:]
+    return (engine._calculate_cumulative_score(activities), engine._calculate_total_evidence(activities),
+            len(activities), engine._calculate_standard_error(activities))
+
+
+def _as_tuple(skill_score):
+    return (skill_score.cumulative_score, skill_score.total_adjusted_evidence,
+            skill_score.activity_count, skill_score.standard_error)
+
+
+def _assert_close(actual, expected, context):
+    assert all(math.isclose(a, e, rel_tol=1e-12, abs_tol=1e-15) for a, e in zip(actual, expected)), context
+
+
+@pytest.fixture
+def engine(config_manager, learner_manager):
+    engine = ScoringEngine(config_manager, learner_manager)
+    engine.max_activities_for_scoring = 8
+    return engine
+
+
+@pytest.fixture
+def history_reads(learner_manager, monkeypatch):
+    """Sizes of the full-history and windowed reads made while scoring"""
+    reads = {'full': [], 'window': []}
+    read_full = learner_manager.get_activity_history_chronological
+    read_window = learner_manager.get_recent_activity_history
+
+    def counting_full(*args, **kwargs):
+        rows = read_full(*args, **kwargs)
+        reads['full'].append(len(rows))
+        return rows
+
+    def counting_window(*args, **kwargs):
+        rows = read_window(*args, **kwargs)
+        reads['window'].append(len(rows))
+        return rows
+
+    monkeypatch.setattr(learner_manager, 'get_activity_history_chronological', counting_full)
+    monkeypatch.setattr(learner_manager, 'get_recent_activity_history', counting_window)
+    return reads
+
+
+def test_window_scores_match_the_last_n_of_the_full_history(engine, learner_manager, score_activities, history_reads):
+    activities = _activities(seed=8)
+    results = score_activities(engine, 'learner', activities)
+    reads = dict(full=list(history_reads['full']), window=list(history_reads['window']))
+
+    assert reads['full'] == [] and len(reads['window']) == len(activities)
+    assert max(reads['window']) == 8
+
+    seen = {skill_id: 0 for skill_id in SKILLS}
+    for activity, result in zip(activities, results):
+        skill_id = activity['skill_id']
+        seen[skill_id] += 1
+        # Rescore the history as it stood right after this activity
+        rows = learner_manager.get_activity_history_chronological('learner', skill_id)[:seen[skill_id]]
+        window_rows = [{'performance_score': row['performance_score'], 'target_evidence': row['target_evidence_volume'],
+                        'validity_modifier': row['validity_modifier']} for row in rows][-8:]
+        expected = (engine._calculate_cumulative_score(window_rows), engine._calculate_total_evidence(window_rows),
+                    len(window_rows), engine._calculate_standard_error(window_rows))
+        _assert_close(_as_tuple(result.skill_scores[skill_id]), expected, activity)
+        assert result.skill_scores[skill_id].activity_count == min(seen[skill_id], 8)
+
+    progress = learner_manager.get_skill_progress('learner')
+    for skill_id in SKILLS:
+        assert seen[skill_id] > 8
+        expected = _last_n_score(engine, learner_manager, 'learner', skill_id, 8)
+        assert math.isclose(progress[skill_id].cumulative_score, expected[0], rel_tol=1e-12)
+        # The running sums still cover the full history
+        assert learner_manager.get_skill_scoring_state('learner', skill_id).activity_count == seen[skill_id]
+
+
+def test_window_is_never_below_the_reliability_minimum(engine):
+    engine.max_activities_for_scoring = 2
+    engine.minimum_activities_for_reliability = 3
+    assert engine.scoring_window == 3
+    engine.max_activities_for_scoring = None
+    assert engine.scoring_window is None
+
+
+def test_out_of_order_activity_drops_the_state_instead_of_reading_history(engine, learner_manager,
+                                                                          score_activities, history_reads):
+    score_activities(engine, 'learner', [{'skill_id': 'S001', 'score': 0.1 * day, 'day': day} for day in range(1, 12)])
+
+    late = score_activities(engine, 'learner', [{'skill_id': 'S001', 'score': 0.9, 'day': 0, 'activity_id': 'late'}])[0]
+
+    assert history_reads['full'] == []
+    assert learner_manager.get_skill_scoring_state('learner', 'S001') is None
+    _assert_close(_as_tuple(late.skill_scores['S001']),
+                  _last_n_score(engine, learner_manager, 'learner', 'S001', 8), 'late')
+
+
+def test_carry_forward_matches_full_history_without_reading_it(engine, learner_manager,
+                                                               score_activities, history_reads):
+    engine.carry_forward_older_evidence = True
+    activities = _activities(seed=9, count=30)
+    results = score_activities(engine, 'learner', activities)
+
+    assert history_reads == {'full': [], 'window': []}
+    for skill_id in SKILLS:
+        latest = next(result for activity, result in reversed(list(zip(activities, results)))
+                      if activity['skill_id'] == skill_id)
+        full = _last_n_score(engine, learner_manager, 'learner', skill_id, None)
+        _assert_close(_as_tuple(latest.skill_scores[skill_id]), full, skill_id)
+        assert full[2] > 8
@@ -0,0 +1,127 @@
+"""Incremental per-skill scoring state against full rescoring of the history"""
+
+import math
+import random
+import sys
+
+import pytest
+
+import rebuild_scoring_state
+from scoring_engine import ScoringEngine
+
+SKILLS = ('S001', 'S002', 'S003')
+SCORE_FIELDS = ('cumulative_score', 'total_adjusted_evidence', 'activity_count', 'standard_error',
+                'gate_1_status', 'gate_2_status', 'overall_status')
+
+
+def _activities(seed, count=30):
+    rng = random.Random(seed)
+    return [{'skill_id': rng.choice(SKILLS), 'score': round(rng.random(), 3),
+             'validity': rng.choice([1.0, 0.95, 0.8, 0.5]), 'evidence': round(rng.uniform(0.5, 4.0), 2),
+             'day': day} for day in range(count)]
+
+
+@pytest.fixture
+def engine(config_manager, learner_manager):
+    engine = ScoringEngine(config_manager, learner_manager)
+    # Score the full history so every activity goes through the persisted state
+    engine.max_activities_for_scoring = None
+    return engine
+
+
+@pytest.fixture
+def full_rescoring_engine(config_manager, learner_manager, monkeypatch):
+    """The engine as it was before the scoring state: every activity rescores the history"""
+    engine = ScoringEngine(config_manager, learner_manager)
+    engine.max_activities_for_scoring = None
+    monkeypatch.setattr(engine, '_next_scoring_state', lambda *args, **kwargs: None)
+    return engine
+
+
+def _history(learner_manager, learner_id, skill_id):
+    return learner_manager.get_activity_history_chronological(learner_id, skill_id)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_incremental_scores_match_full_rescoring(engine, full_rescoring_engine, learner_manager,
+                                                 score_activities, seed):
+    activities = _activities(seed)
+    incremental = score_activities(engine, 'incremental', activities)
+    rescored = score_activities(full_rescoring_engine, 'rescored', activities)
+
+    for activity, fast, slow in zip(activities, incremental, rescored):
+        fast_score, slow_score = fast.skill_scores[activity['skill_id']], slow.skill_scores[activity['skill_id']]
+        assert 0 < fast_score.cumulative_score < 1
+        for name in SCORE_FIELDS:
+            expected, actual = getattr(slow_score, name), getattr(fast_score, name)
+            if isinstance(expected, float):
+                assert math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-12), (activity, name)
+            else:
+                assert actual == expected, (activity, name)
+
+    for skill_id in SKILLS:
+        fast_rows, slow_rows = _history(learner_manager, 'incremental', skill_id), _history(learner_manager, 'rescored', skill_id)
+        assert len(fast_rows) == len(slow_rows)
+        for fast_row, slow_row in zip(fast_rows, slow_rows):
+            for column in ('cumulative_performance', 'cumulative_evidence', 'decay_adjusted_evidence_volume'):
+                assert math.isclose(fast_row[column], slow_row[column], rel_tol=1e-9, abs_tol=1e-12), column
+
+        # The stored running sums are exactly what a rebuild from history produces
+        state = learner_manager.get_skill_scoring_state('incremental', skill_id)
+        assert state.activity_count == len(fast_rows)
+    assert engine.rebuild_skill_scoring_state('incremental', verify_only=True)['mismatches'] == []
+
+
+def test_out_of_order_and_repeated_activities_fall_back_and_rebuild(engine, learner_manager, score_activities):
+    activities = [{'skill_id': 'S001', 'score': 0.5 + 0.1 * day, 'day': day} for day in range(1, 5)]
+    score_activities(engine, 'learner', activities)
+
+    late = {'skill_id': 'S001', 'score': 0.2, 'day': 0, 'activity_id': 'late_activity'}
+    result = score_activities(engine, 'learner', [late])[0]
+
+    rows = _history(learner_manager, 'learner', 'S001')
+    expected = engine._calculate_cumulative_score([
+        {'performance_score': row['performance_score'], 'target_evidence': row['target_evidence_volume'],
+         'validity_modifier': row['validity_modifier']} for row in rows])
+    assert rows[0]['activity_id'] == 'late_activity'
+    assert math.isclose(result.skill_scores['S001'].cumulative_score, expected, rel_tol=1e-9)
+    assert learner_manager.get_skill_scoring_state('learner', 'S001').activity_count == 5
+    assert engine.rebuild_skill_scoring_state('learner', verify_only=True)['mismatches'] == []
+
+    # Re-evaluating an activity already in the history also rescores
+    score_activities(engine, 'learner', [{'skill_id': 'S001', 'score': 0.9, 'day': 10, 'activity_id': 'activity_000'}])
+    assert engine.rebuild_skill_scoring_state('learner', verify_only=True)['mismatches'] == []
+
+
+def test_decay_factor_change_rebuilds_the_state(engine, learner_manager, score_activities):
+    score_activities(engine, 'learner', [{'skill_id': 'S002', 'score': 0.6, 'day': day} for day in range(3)])
+    assert learner_manager.get_skill_scoring_state('learner', 'S002').decay_factor == engine.decay_factor
+
+    engine.decay_factor = 0.9
+    score_activities(engine, 'learner', [{'skill_id': 'S002', 'score': 0.3, 'day': 5, 'activity_id': 'after_change'}])
+
+    state = learner_manager.get_skill_scoring_state('learner', 'S002')
+    assert state.decay_factor == 0.9 and state.activity_count == 4
+    assert engine.rebuild_skill_scoring_state('learner', verify_only=True)['mismatches'] == []
+
+
+def test_cli_verifies_and_rebuilds(engine, learner_manager, score_activities, monkeypatch, capsys):
+    score_activities(engine, 'learner', _activities(seed=4, count=9))
+    monkeypatch.setenv('DATABASE_PATH', learner_manager.db_path)
+
+    with learner_manager._get_db_connection() as conn:
+        conn.execute("UPDATE skill_scoring_state SET weighted_score_sum = weighted_score_sum + 1 "
+                     "WHERE learner_id = 'learner' AND skill_id = 'S001'")
+        conn.commit()
+
+    monkeypatch.setattr(sys, 'argv', ['rebuild_scoring_state.py', '--verify'])
+    assert rebuild_scoring_state.main() == 1
+    output = capsys.readouterr().out
+    assert 'learner / S001' in output and 'weighted_score_sum' in output
+
+    monkeypatch.setattr(sys, 'argv', ['rebuild_scoring_state.py', '--learner', 'learner'])
+    assert rebuild_scoring_state.main() == 0
+    assert 'Rebuilt 1 scoring states' in capsys.readouterr().out
+
+    monkeypatch.setattr(sys, 'argv', ['rebuild_scoring_state.py', '--verify'])
+    assert rebuild_scoring_state.main() == 0
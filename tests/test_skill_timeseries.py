@@ -0,0 +1,107 @@
+"""Skill time series: parity with the history table's previous UI computation and cache invalidation"""
+
+import math
+import random
+
+import pytest
+
+from learner_manager import LearnerManager
+from scoring_engine import ScoringEngine, evidence_decay_factors
+
+
+def _activities(seed, count=25, skill_id='S001', first_day=0):
+    rng = random.Random(seed)
+    return [{'skill_id': skill_id, 'score': round(rng.random(), 3), 'validity': rng.choice([1.0, 0.9, 0.6]),
+             'evidence': round(rng.uniform(0.5, 4.0), 2), 'day': day, 'activity_id': f'activity_{day:03d}'}
+            for day in range(first_day, first_day + count)]
+
+
+def ui_history_table(learner_manager, learner_id, skill_id, decay_factor):
+    """display_single_skill_table's derivation as it was: stored rows newest first, decay computed per render"""
+    with learner_manager._get_db_connection() as conn:
+        records = [dict(row) for row in conn.execute(
+            'SELECT * FROM activity_history WHERE learner_id = ? AND skill_id = ? '
+            'ORDER BY completion_timestamp DESC', (learner_id, skill_id))]
+    decay_factors = evidence_decay_factors([record['adjusted_evidence_volume'] for record in records], decay_factor)
+    for record, actual_decay_factor in zip(records, decay_factors):
+        record['evidence_based_decay'] = actual_decay_factor
+        record['decay_adjusted_evidence_volume'] = record['adjusted_evidence_volume'] * actual_decay_factor
+    return records
+
+
+def _assert_close(actual, expected, context):
+    assert math.isclose(actual, expected, rel_tol=1e-12, abs_tol=1e-15), context
+
+
+@pytest.fixture
+def engine(config_manager, learner_manager, score_activities):
+    engine = ScoringEngine(config_manager, learner_manager)
+    engine.max_activities_for_scoring = None
+    score_activities(engine, 'learner', _activities(seed=1))
+    return engine
+
+
+@pytest.mark.parametrize('window', [None, 6])
+def test_timeseries_matches_the_previous_table_and_stored_columns(config_manager, learner_manager,
+                                                                  score_activities, window):
+    engine = ScoringEngine(config_manager, learner_manager)
+    engine.max_activities_for_scoring = window
+    score_activities(engine, 'learner', _activities(seed=2))
+
+    timeseries = engine.get_skill_timeseries('learner', 'S001')
+    table = ui_history_table(learner_manager, 'learner', 'S001', engine.decay_factor)
+
+    assert [record['activity_id'] for record in timeseries] == [record['activity_id'] for record in reversed(table)]
+    for record, expected in zip(timeseries, reversed(table)):
+        for column in ('evidence_based_decay', 'decay_adjusted_evidence_volume'):
+            _assert_close(record[column], expected[column], (record['activity_id'], column))
+        # Cumulative values are those score_activity stored as of each activity
+        for column in ('cumulative_performance', 'cumulative_evidence'):
+            _assert_close(record[column], expected[column], (record['activity_id'], column))
+    assert timeseries[-1]['evidence_based_decay'] == 1.0
+    _assert_close(timeseries[-1]['cumulative_performance'],
+                  learner_manager.get_skill_progress('learner')['S001'].cumulative_score, 'current performance')
+
+
+def test_repeat_calls_are_served_from_the_cache(engine, learner_manager, monkeypatch):
+    first = engine.get_skill_timeseries('learner', 'S001')
+    assert engine.get_skill_timeseries('nobody', 'S001') == []
+
+    def no_history_reads(*args, **kwargs):
+        raise AssertionError('history read for a cached time series')
+
+    monkeypatch.setattr(learner_manager, 'get_activity_history_chronological', no_history_reads)
+    assert engine.get_skill_timeseries('learner', 'S001') is first
+    assert engine.get_skill_timeseries('nobody', 'S001') == []
+
+
+def test_new_activity_and_decay_change_recompute(engine, learner_manager, score_activities):
+    first = engine.get_skill_timeseries('learner', 'S001')
+
+    score_activities(engine, 'learner', _activities(seed=3, count=1, first_day=100))
+    second = engine.get_skill_timeseries('learner', 'S001')
+    assert len(second) == len(first) + 1 and second[-1]['activity_id'] == 'activity_100'
+
+    engine.decay_factor = 0.8
+    third = engine.get_skill_timeseries('learner', 'S001')
+    assert third is not second
+    expected = ui_history_table(learner_manager, 'learner', 'S001', 0.8)
+    _assert_close(third[0]['evidence_based_decay'], expected[-1]['evidence_based_decay'], 'oldest')
+
+
+def test_writes_through_another_manager_invalidate(engine, config_manager, learner_manager):
+    first = engine.get_skill_timeseries('learner', 'S001')
+
+    # Another connection to the same database, as another process would have
+    other = LearnerManager(config_manager, db_path=learner_manager.db_path)
+    try:
+        with other._get_db_connection() as conn:
+            conn.execute("UPDATE activity_history SET adjusted_evidence_volume = adjusted_evidence_volume * 2 "
+                         "WHERE learner_id = 'learner' AND activity_id = 'activity_000'")
+            conn.commit()
+    finally:
+        other._connections.close_all()
+
+    second = engine.get_skill_timeseries('learner', 'S001')
+    assert second is not first
+    _assert_close(second[0]['adjusted_evidence_volume'], first[0]['adjusted_evidence_volume'] * 2, 'rewritten')
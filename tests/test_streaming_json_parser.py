@@ -0,0 +1,137 @@
+"""Tolerant JSON parsing of LLM responses: fences, chunked streams and truncation"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from learner_manager import LearnerProfile
+from pipeline_benchmark import MockLLMClient, build_synthetic_transcript
+from streaming_json_parser import (IncrementalJSONParser, PHASE_EMIT_PATTERNS, TruncatedResponseError,
+                                   parse_json_response)
+
+COMBINED = {
+    'aspect_scores': [
+        {'aspect_id': 'clarity', 'score': 0.8, 'rationale': 'Clear, "quoted" {braces}'},
+        {'aspect_id': 'depth', 'score': 0.6, 'rationale': 'Some depth'}
+    ],
+    'overall_score': 0.72,
+    'rationale': 'Solid work',
+    'validity_modifier': 0.9,
+    'validity_analysis': 'Light assistance',
+    'key_observations': ['one', 'two'],
+    'flags': [True, False, None]
+}
+
+
+@pytest.mark.parametrize('wrapped', [
+    '```json\n{}\n```',
+    '```\n{}\n```',
+    'Here is the evaluation:\n\n```json\n{}\n```\nLet me know if you need more.',
+    'Sure! {}'
+])
+def test_fenced_and_prose_wrapped_responses(wrapped):
+    content = wrapped.replace('{}', json.dumps(COMBINED, indent=2))
+    assert parse_json_response(content, strict=True) == COMBINED
+
+
+def test_trailing_commas_are_accepted():
+    content = '{"a": [1, 2,], "b": {"c": "x",},}'
+    assert parse_json_response(content, strict=True) == {'a': [1, 2], 'b': {'c': 'x'}}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 16, 64])
+def test_chunk_split_matches_one_shot_parse(chunk_size):
+    content = '```json\n' + json.dumps(COMBINED) + '\n```'
+    parser = IncrementalJSONParser(PHASE_EMIT_PATTERNS['combined'])
+    emitted = []
+    for start in range(0, len(content), chunk_size):
+        emitted.extend(parser.feed(content[start:start + chunk_size]))
+
+    assert parser.close() == COMBINED
+    assert not parser.repaired
+    assert emitted == [
+        ('aspect_scores[0]', COMBINED['aspect_scores'][0]),
+        ('aspect_scores[1]', COMBINED['aspect_scores'][1]),
+        ('overall_score', 0.72),
+        ('rationale', 'Solid work'),
+        ('validity_modifier', 0.9),
+        ('validity_analysis', 'Light assistance'),
+        ('key_observations', ['one', 'two'])
+    ]
+
+
+def test_fields_are_emitted_as_soon_as_they_close():
+    parser = IncrementalJSONParser(['overall_score', 'rationale'])
+    assert parser.feed('{"overall_score": 0.7') == []
+    assert parser.feed(', "ratio') == [('overall_score', 0.7)]
+    assert parser.feed('nale": "ok"') == [('rationale', 'ok')]
+    assert parser.feed('}') == []
+    assert parser.complete
+
+
+@pytest.mark.parametrize('content, partial', [
+    ('{"a": 1, "c": tru', {'a': 1}),
+    ('{"a": 1, "b": 0.', {'a': 1}),
+    ('```json\n{"a": {"x": 1}, "c": nul', {'a': {'x': 1}}),
+    ('{"a": 1, "b": "half a sent', {'a': 1}),
+    ('{"a": [1, 2', {'a': [1, 2]})
+])
+def test_truncated_responses_are_reported(content, partial):
+    parser = IncrementalJSONParser([])
+    parser.feed(content)
+    assert parser.close() == partial
+    assert parser.repaired
+
+    assert parse_json_response(content) == partial
+    with pytest.raises(TruncatedResponseError) as excinfo:
+        parse_json_response(content, strict=True)
+    assert excinfo.value.partial == partial
+
+
+def test_complete_trailing_scalar_is_not_a_repair():
+    parser = IncrementalJSONParser([])
+    parser.feed('[1, 2, 3]')
+    assert parser.close() == [1, 2, 3]
+    assert not parser.repaired
+
+
+def _evaluate_with_combined_response(make_pipeline, learner_manager, tmp_path, combined_content, on_event=None):
+    recording = tmp_path / 'responses.json'
+    recording.write_text(json.dumps({'combined_evaluation': [combined_content]}), encoding='utf-8')
+    pipeline = make_pipeline(MockLLMClient(recorded_responses_path=str(recording)))
+    learner_manager.create_learner(LearnerProfile(
+        learner_id='parse_learner', name='Parse Learner', email='parse@test.local',
+        enrollment_date=datetime.now(timezone.utc).isoformat()))
+    activity = pipeline.activity_manager.load_activities()['user_requirements_clarification_cr']
+    transcript = build_synthetic_transcript(activity, 0)
+    return pipeline.evaluate_activity(activity.activity_id, 'parse_learner', transcript, on_event=on_event)
+
+
+@pytest.mark.parametrize('streamed', [False, True])
+def test_truncated_combined_response_is_not_scored(make_pipeline, learner_manager, tmp_path, streamed):
+    truncated = json.dumps(COMBINED)[:60]
+    events = []
+    result = _evaluate_with_combined_response(make_pipeline, learner_manager, tmp_path, truncated,
+                                              on_event=events.append if streamed else None)
+
+    phases = {phase.phase: phase for phase in result.pipeline_phases}
+    assert not result.overall_success
+    assert not phases['combined_evaluation'].success
+    assert phases['combined_evaluation'].result['partial']
+    assert 'truncated' in phases['combined_evaluation'].error
+    assert not phases['scoring'].success
+    # Nothing defaulted to 0.5 / 1.0 reached the learner's history
+    assert learner_manager.get_activity_history_skill_pairs('parse_learner') == []
+    assert learner_manager.get_skill_progress('parse_learner') == {}
+
+
+def test_fenced_combined_response_is_scored(make_pipeline, learner_manager, tmp_path):
+    fenced = '```json\n' + json.dumps(COMBINED) + '\n```'
+    result = _evaluate_with_combined_response(make_pipeline, learner_manager, tmp_path, fenced)
+
+    phases = {phase.phase: phase for phase in result.pipeline_phases}
+    assert result.overall_success, result.error_summary
+    assert phases['combined_evaluation'].result['overall_score'] == 0.72
+    assert phases['scoring'].result['activity_score'] == 0.72
+    assert learner_manager.get_activity_history_skill_pairs('parse_learner') != []
@@ -0,0 +1,88 @@
+"""Role-play transcript compaction: digest of older turns, evidence kept verbatim"""
+
+import json
+
+from context_compactor import estimate_tokens
+from transcript_compactor import RolePlayTranscriptCompactor
+
+
+def _alternating_conversation(exchanges, character_words=60):
+    """Character turn, then an evidence-bearing learner answer, repeated"""
+    messages = []
+    for exchange in range(exchanges):
+        messages.append({'role': 'assistant', 'timestamp': '2025-07-29T13:02:51Z',
+                         'content': ' '.join(f'concern{exchange}_{word}' for word in range(character_words))})
+        messages.append({'role': 'user', 'timestamp': '2025-07-29T13:03:12Z',
+                         'content': f'Answer {exchange}: which of these deadlines matters most to your team?'})
+    return messages
+
+
+def test_alternating_conversation_is_digested_per_stretch():
+    compactor = RolePlayTranscriptCompactor()
+    messages = _alternating_conversation(20)
+
+    lines, report = compactor.compact_conversation(messages)
+
+    older_turns = len(messages) - compactor.settings['keep_recent_turns']
+    summaries = [line for line in lines if line.startswith('[Summary of turns')]
+    # One digest line per stretch of ten older turns, not one per character turn
+    assert len(summaries) == -(-older_turns // compactor.settings['summary_stretch_turns']) == 4
+    assert summaries[0].startswith('[Summary of turns 1-10] character: concern0_0')
+    assert report.summarized_turns == older_turns // 2
+    assert report.turns_after == len(lines) == len(summaries) + 20 + 3
+    assert report.tokens_after < report.tokens_before * 0.6
+
+
+def test_evidence_turns_stay_verbatim_and_in_order():
+    compactor = RolePlayTranscriptCompactor()
+    messages = _alternating_conversation(20)
+
+    lines, report = compactor.compact_conversation(messages)
+
+    learner_lines = [line for line in lines if line.startswith('Learner: ')]
+    assert learner_lines == [f"Learner: {message['content']}" for message in messages if message['role'] == 'user']
+    assert report.evidence_turns_kept == 20
+    # Each stretch's evidence follows its digest line; the recent turns close the transcript verbatim
+    assert lines[0].startswith('[Summary of turns 1-10]')
+    assert lines[1:6] == learner_lines[:5]
+    assert lines[-6:] == [f"{'Learner' if message['role'] == 'user' else 'Character'}: {message['content']}"
+                          for message in messages[-6:]]
+
+
+def test_short_learner_replies_are_digested_with_the_stretch():
+    compactor = RolePlayTranscriptCompactor({'token_budget': 50, 'keep_recent_turns': 2})
+    messages = [{'role': 'assistant', 'content': 'We keep missing deadlines because nobody agrees on scope.'},
+                {'role': 'user', 'content': 'ok'},
+                {'role': 'assistant', 'content': 'Marketing wants the launch moved up by two weeks.'},
+                {'role': 'user', 'content': 'Why does marketing need the earlier date for this launch?'},
+                {'role': 'assistant', 'content': 'They booked a conference slot.'},
+                {'role': 'user', 'content': 'Understood.'}]
+
+    lines, report = compactor.compact_conversation(messages)
+
+    assert lines == [
+        '[Summary of turns 1-4] character: We keep missing deadlines because nobody agrees on scope. | learner: ok'
+        ' | character: Marketing wants the launch moved up by two weeks.',
+        'Learner: Why does marketing need the earlier date for this launch?',
+        'Character: They booked a conference slot.',
+        'Learner: Understood.'
+    ]
+    assert report.summarized_turns == 3
+
+
+def test_transcript_under_budget_is_only_normalized():
+    compactor = RolePlayTranscriptCompactor()
+    transcript = {'student_engagement': {
+        'start_timestamp': '2025-07-29T13:00:00Z',
+        'component_responses': [{'response_content': json.dumps(_alternating_conversation(2, 5)),
+                                 'metadata': {'ui': 'chat'}}]
+    }}
+
+    compacted, report = compactor.compact_transcript(transcript)
+
+    engagement = compacted['student_engagement']
+    assert 'start_timestamp' not in engagement
+    assert 'metadata' not in engagement['component_responses'][0]
+    assert report.summarized_turns == 0 and report.turns_after == 4
+    assert report.tokens_after == estimate_tokens(engagement['component_responses'][0]['response_content'])
+    assert report.tokens_after < report.tokens_before